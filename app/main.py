@@ -14,21 +14,126 @@ if PROJECT_ROOT not in sys.path:
 
 import streamlit as st
 
+from utils.multiplicity import adjusted_alpha, adjusted_power, dunnett_correlation
+from utils.array_utils import outer_grid
+
 # Continuous calculators
-from calculators.continuous.one_sample_mean import calculate_one_sample_mean
+from calculators.continuous.one_sample_mean import (
+    calculate_one_sample_mean,
+    calculate_one_sample_mean_precision
+)
 from calculators.continuous.two_independent_means import calculate_two_independent_means
 from calculators.continuous.paired_mean import calculate_paired_mean
 from calculators.continuous.anova_oneway import calculate_anova_oneway
+from calculators.continuous.repeated_measures import calculate_repeated_measures
 # Binary calculators
-from calculators.binary.one_proportion import calculate_one_proportion
-from calculators.binary.two_proportions import calculate_two_proportions
+from calculators.binary.one_proportion import (
+    PRECISION_LABELS,
+    calculate_one_proportion,
+    calculate_one_proportion_precision
+)
+from calculators.binary.simon_two_stage import (
+    calculate_ahern_single_stage,
+    calculate_simon_two_stage
+)
+from calculators.binary.two_proportions import (
+    METHODS as TWO_PROPORTION_METHODS,
+    METHOD_LABELS as TWO_PROPORTION_METHOD_LABELS,
+    calculate_two_proportions,
+    exact_power_two_proportions,
+    two_proportions_methods
+)
+from calculators.binary.matched_case_control import (
+    calculate_matched_case_control
+)
+from calculators.binary.case_control_or import calculate_case_control_or
+from calculators.binary.cohort_rr import calculate_cohort_rr
+# Association calculators
+from calculators.association.correlation import (
+    calculate_correlation,
+    calculate_correlation_precision
+)
+from calculators.association.prediction_model import (
+    calculate_prediction_model,
+    prediction_model_grid
+)
+from calculators.association.linear_regression import calculate_linear_regression
+from calculators.association.logistic_regression import calculate_logistic_regression
+from calculators.survival.logrank import (
+    METHODS as LOGRANK_METHODS,
+    METHOD_LABELS as LOGRANK_METHOD_LABELS,
+    calculate_logrank,
+    logrank_methods
+)
+# Ordinal and count calculators
+from calculators.ordinal.proportional_odds import (
+    calculate_ordinal_whitehead,
+    simulate_ordinal_power,
+    whitehead_sample_sizes
+)
+from calculators.count.rate_ratio import (
+    METHODS as RATE_RATIO_METHODS,
+    METHOD_LABELS as RATE_RATIO_METHOD_LABELS,
+    calculate_negative_binomial_rate_ratio,
+    rate_ratio_sample_sizes,
+    simulate_rate_ratio_power
+)
+# Bayesian planning
+from calculators.bayesian.assurance import (
+    calculate_assurance,
+    calculate_assurance_sample_size
+)
+from calculators.bayesian.posterior_probability import calculate_bayesian_two_proportions
+# Adaptive designs
+from calculators.adaptive.sample_size_reestimation import (
+    RULES as SSR_RULES,
+    RULE_LABELS as SSR_RULE_LABELS,
+    simulate_sample_size_reestimation
+)
+from calculators.adaptive.conditional_power import calculate_conditional_power
+# Cluster calculators
+from calculators.cluster.cluster_randomized import (
+    calculate_cluster_two_means,
+    calculate_cluster_two_proportions
+)
+from calculators.cluster.stepped_wedge import calculate_stepped_wedge
+
+# Design finder
+from flowchart.decision_tree import NODES, ROOT, build_graph, is_leaf
 
 # Templates
 from templates.paragraph_templates import (
+    LANGUAGES,
     paragraph_one_sample_mean,
+    paragraph_mean_precision,
     paragraph_two_independent_means,
+    paragraph_two_means_margin,
+    paragraph_two_means_assurance,
+    paragraph_sample_size_reestimation,
     paragraph_paired_mean,
-    paragraph_anova
+    paragraph_anova,
+    paragraph_one_proportion,
+    paragraph_simon_two_stage,
+    paragraph_proportion_precision,
+    paragraph_two_proportions,
+    paragraph_two_proportions_margin,
+    paragraph_bayesian_two_proportions,
+    paragraph_case_control_or,
+    paragraph_matched_case_control,
+    paragraph_cohort_rr,
+    paragraph_correlation,
+    paragraph_correlation_precision,
+    paragraph_linear_regression,
+    paragraph_linear_regression_exact,
+    paragraph_logistic_regression_wald,
+    paragraph_logrank,
+    paragraph_conditional_power,
+    paragraph_ordinal,
+    paragraph_rate_ratio,
+    paragraph_stepped_wedge,
+    paragraph_cluster_parallel,
+    paragraph_repeated_measures,
+    paragraph_prediction_model
 )
 
 # --------------------------------------------------
@@ -38,6 +143,45 @@ st.title("ClinSample AI — Sample Size Calculator")
 st.markdown("Mathematically standardized, thesis-ready sample size planning.")
 
 # --------------------------------------------------
+# Design finder: walks the decision tree one question at a time and
+# can open the suggested calculator page (with its design preset)
+# --------------------------------------------------
+def _open_design(node_id):
+    leaf = NODES[node_id]
+    st.session_state["study_type"] = leaf["page"]
+    for key, value in leaf.get("preset", {}).items():
+        st.session_state[key] = value
+
+
+with st.expander("🧭 Not sure which design? Use the design finder", expanded=False):
+
+    finder_answers = []
+    finder_node = ROOT
+
+    while not is_leaf(finder_node):
+        branches = NODES[finder_node]["branches"]
+        choice = st.radio(
+            NODES[finder_node]["question"],
+            [answer for answer, _ in branches],
+            index=None,
+            key=f"finder_{finder_node}"
+        )
+        if choice is None:
+            break
+        finder_answers.append(choice)
+        finder_node = dict(branches)[choice]
+
+    st.graphviz_chart(build_graph(finder_answers))
+
+    if is_leaf(finder_node):
+        st.success(f"Suggested design: {NODES[finder_node]['label']}")
+        st.button(
+            "Open this calculator",
+            on_click=_open_design,
+            args=(finder_node,),
+            key="finder_open"
+        )
+
 # --------------------------------------------------
 study_type = st.selectbox(
     "Select Study Type",
@@ -47,6 +191,7 @@ study_type = st.selectbox(
         "Two Independent Means",
         "Paired Mean",
         "One-Way ANOVA",
+        "Repeated Measures (Longitudinal)",
 
         # Binary
         "One Proportion",
@@ -58,10 +203,19 @@ study_type = st.selectbox(
         "Correlation",
         "Linear Regression",
         "Logistic Regression",
+        "Prediction Model (Riley Criteria)",
 
         # Survival
-        "Survival (Log-Rank)"
-    ]
+        "Survival (Log-Rank)",
+
+        # Ordinal / counts
+        "Ordinal Outcome (Proportional Odds)",
+        "Count Outcomes (Rate Ratio)",
+
+        # Cluster
+        "Cluster Randomized Trial"
+    ],
+    key="study_type"
 )
 
 # Sidebar
@@ -71,13 +225,64 @@ alpha = st.sidebar.number_input("Alpha (Type I error)", 0.001, 0.2, 0.05, 0.001)
 power = st.sidebar.number_input("Power (1 - Beta)", 0.5, 0.99, 0.8, 0.01)
 dropout_rate = st.sidebar.number_input("Dropout Rate (0–1)", 0.0, 0.9, 0.0, 0.01)
 two_sided = st.sidebar.checkbox("Two-sided test", True)
+manuscript_language = st.sidebar.selectbox(
+    "Manuscript paragraph language",
+    list(LANGUAGES),
+    format_func=LANGUAGES.get,
+    key="manuscript_language"
+)
+
+# Multiplicity: calculators receive the per-comparison alpha and
+# per-endpoint power computed here
+st.sidebar.markdown("---")
+multiplicity = st.sidebar.selectbox(
+    "Multiplicity Adjustment",
+    ["None", "Bonferroni", "Holm", "Dunnett (k arms vs control)", "Co-primary endpoints"],
+    key="mult_method"
+)
+
+if multiplicity != "None":
+
+    method_key = {
+        "Bonferroni": "bonferroni",
+        "Holm": "holm",
+        "Dunnett (k arms vs control)": "dunnett",
+        "Co-primary endpoints": "coprimary"
+    }[multiplicity]
+
+    if method_key == "coprimary":
+        n_tests = st.sidebar.number_input("Number of co-primary endpoints", 2, 10, 2, 1, key="mult_k")
+        endpoint_corr = st.sidebar.number_input("Correlation between endpoints", 0.0, 0.95, 0.3, 0.05, key="mult_corr")
+    else:
+        n_tests = st.sidebar.number_input("Number of comparisons (k)", 1, 50, 2, 1, key="mult_k")
+        endpoint_corr = 0.0
+
+    mult_rho = 0.5
+    if method_key == "dunnett":
+        control_ratio = st.sidebar.number_input(
+            "Control-to-treatment ratio", 0.1, 10.0, 1.0, 0.1, key="mult_control_ratio"
+        )
+        mult_rho = dunnett_correlation(control_ratio)
+
+    alpha_nominal, power_nominal = alpha, power
+
+    alpha = adjusted_alpha(alpha_nominal, method_key, int(n_tests), two_sided, mult_rho)
+    power = adjusted_power(power_nominal, method_key, int(n_tests), endpoint_corr)
+
+    st.sidebar.caption(f"Per-comparison α = {alpha:.5f}")
+    if method_key == "holm":
+        st.sidebar.caption("Holm is planned at its first (strictest) step, α / k.")
+    if method_key == "coprimary":
+        st.sidebar.caption(
+            f"Per-endpoint power = {power:.4f} so that all {int(n_tests)} endpoints succeed "
+            f"jointly with power {power_nominal}. Use the largest n across endpoints."
+        )
 
 # ==========================================================
 # ONE SAMPLE MEAN
 # ==========================================================
 if study_type == "One-Sample Mean":
 
-    import scipy.stats as stats
     import math
 
     st.header("One-Sample Mean")
@@ -179,16 +384,12 @@ Smaller Δ → larger sample size
             sd,
             delta,
             two_sided,
-            dropout_rate
+            dropout_rate,
+            trace=True
         )
 
-        # Manual display of components
-        if two_sided:
-            Z_alpha = stats.norm.ppf(1 - alpha/2)
-        else:
-            Z_alpha = stats.norm.ppf(1 - alpha)
-
-        Z_beta = stats.norm.ppf(power)
+        Z_alpha = result["trace"]["z_alpha"]
+        Z_beta = result["trace"]["z_beta"]
 
         st.markdown("### 🔎 Intermediate Values")
 
@@ -211,7 +412,81 @@ Smaller Δ → larger sample size
             delta,
             two_sided,
             dropout_rate,
-            result["n_required"]
+            result["n_required"],
+            language=manuscript_language
+        )
+
+        st.code(paragraph)
+
+    # --------------------------------------------------
+    st.markdown("---")
+    st.subheader("📏 Precision-Based Planning (Confidence Interval Width)")
+
+    st.markdown("""
+For descriptive studies: the n needed to estimate the mean within **± d** (half-width of the
+two-sided t-interval), using the SD above. With an **assurance**, the realised half-width
+(which depends on the sample SD) is at most d with that probability.
+    """)
+
+    precision_d = st.number_input(
+        "Target half-width (d)",
+        min_value=0.0001,
+        value=0.25,
+        key="onemean_precision_d"
+    )
+
+    precision_assurance = st.number_input(
+        "Assurance (0 = expected half-width)",
+        min_value=0.0,
+        max_value=0.99,
+        value=0.0,
+        key="onemean_precision_assurance"
+    )
+
+    precision_known_sd = st.checkbox(
+        "SD known (z-interval)",
+        value=False,
+        key="onemean_precision_known_sd"
+    )
+
+    if st.button("Calculate Precision Sample Size", key="onemean_precision_btn"):
+
+        assurance = precision_assurance if precision_assurance > 0 else None
+
+        try:
+            result = calculate_one_sample_mean_precision(
+                alpha,
+                sd,
+                precision_d,
+                assurance=assurance,
+                known_sd=precision_known_sd,
+                dropout_rate=dropout_rate,
+                trace=True
+            )
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
+
+        st.markdown("### 🔎 Intermediate Values")
+        st.write(f"Zα/2 = {round(result['trace']['z_alpha'],4)}")
+        st.write(f"z-interval n (unrounded) = {round(result['trace']['n_raw'],2)}")
+        st.write(f"Criterion: {result['formula']}")
+        st.write(f"Half-width at n: {round(result['half_width'],4)}")
+
+        st.success(f"Required Sample Size: {result['n_required']}")
+        st.write("Before Dropout Adjustment:", result["n_before_dropout"])
+
+        st.markdown("### 📄 Copy for Thesis / Manuscript")
+
+        paragraph = paragraph_mean_precision(
+            alpha,
+            sd,
+            precision_d,
+            assurance,
+            dropout_rate,
+            result["n_before_dropout"],
+            result["n_required"],
+            language=manuscript_language
         )
 
         st.code(paragraph)
@@ -221,7 +496,6 @@ Smaller Δ → larger sample size
 # ==========================================================
 elif study_type == "Two Independent Means":
 
-    import scipy.stats as stats
     import math
 
     st.header("Two Independent Means")
@@ -355,11 +629,86 @@ Unequal allocation increases total sample size.
     st.markdown("---")
     st.subheader("🎯 Final Sample Size Planning")
 
+    hypothesis_label = st.radio(
+        "Hypothesis",
+        ["Superiority", "Non-inferiority", "Equivalence"],
+        horizontal=True,
+        key="twomeans_hypothesis"
+    )
+
     sd_planning = st.number_input("SD for Planning", min_value=0.0001, value=1.0)
-    delta = st.number_input("Mean Difference (Δ) for Planning", min_value=0.0001, value=0.5)
+
+    if hypothesis_label == "Superiority":
+        delta = st.number_input("Mean Difference (Δ) for Planning", min_value=0.0001, value=0.5)
+    else:
+        delta = st.number_input(
+            "Expected True Difference (Mean1 − Mean2)",
+            value=0.0,
+            key="twomeans_true_diff"
+        )
+        margin = st.number_input(
+            "Margin (M)",
+            min_value=0.0001,
+            value=0.5,
+            key="twomeans_margin"
+        )
+
     ratio = st.number_input("Allocation Ratio (n2 / n1)", min_value=0.1, value=1.0)
 
-    if st.button("Calculate Sample Size"):
+    if hypothesis_label != "Superiority" and st.button("Calculate Sample Size", key="twomeans_margin_calc"):
+
+        hypothesis = hypothesis_label.lower().replace("-", "_")
+
+        try:
+            result = calculate_two_independent_means(
+                alpha,
+                power,
+                sd_planning,
+                delta,
+                ratio,
+                two_sided,
+                dropout_rate,
+                hypothesis=hypothesis,
+                margin=margin
+            )
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
+
+        st.markdown("### 🔎 Method")
+        st.write(result["formula"])
+        for item in result["assumptions"]:
+            st.write(f"• {item}")
+
+        if hypothesis == "non_inferiority":
+            st.latex(r"n_1 = \left(1 + \frac{1}{r}\right)\left(\frac{(Z_{\alpha} + Z_{\beta}) \cdot SD}{\Delta + M}\right)^2")
+        else:
+            st.latex(r"H_0: |\mu_1 - \mu_2| \geq M \quad \text{vs} \quad H_1: |\mu_1 - \mu_2| < M")
+
+        st.success(f"Group 1 Required: {result['n_group1']}")
+        st.success(f"Group 2 Required: {result['n_group2']}")
+        st.write("Total Sample Size:", result["n_total"])
+
+        st.markdown("### 📄 Copy for Thesis")
+
+        paragraph = paragraph_two_means_margin(
+            alpha,
+            power,
+            sd_planning,
+            delta,
+            margin,
+            ratio,
+            hypothesis,
+            two_sided,
+            dropout_rate,
+            result["n_group1"],
+            result["n_group2"],
+            language=manuscript_language
+        )
+
+        st.code(paragraph)
+
+    if hypothesis_label == "Superiority" and st.button("Calculate Sample Size"):
 
         delta_used = abs(delta)
 
@@ -370,16 +719,12 @@ Unequal allocation increases total sample size.
             delta_used,
             ratio,
             two_sided,
-            dropout_rate
+            dropout_rate,
+            trace=True
         )
 
-        # Z values
-        if two_sided:
-            Z_alpha = stats.norm.ppf(1 - alpha/2)
-        else:
-            Z_alpha = stats.norm.ppf(1 - alpha)
-
-        Z_beta = stats.norm.ppf(power)
+        Z_alpha = result["trace"]["z_alpha"]
+        Z_beta = result["trace"]["z_beta"]
 
         st.markdown("### 🔎 Intermediate Values")
 
@@ -410,17 +755,224 @@ Unequal allocation increases total sample size.
             two_sided,
             dropout_rate,
             result["n_group1"],
-            result["n_group2"]
+            result["n_group2"],
+            language=manuscript_language
         )
 
         st.code(paragraph)
 
+    if hypothesis_label == "Superiority":
+
+        # --------------------------------------------------
+        st.markdown("---")
+        st.subheader("🎲 Assurance (Probability of Success)")
+
+        st.markdown("""
+Assurance averages the power over a **prior** for the true difference (and optionally the SD),
+instead of treating Δ as known. It is always below the power at the planning Δ
+and cannot exceed the prior probability that the effect is in the expected direction.
+        """)
+
+        prior_sd_delta = st.number_input(
+            "Prior SD of Δ (uncertainty about the difference)",
+            min_value=0.0001,
+            value=max(abs(delta) / 2, 0.0001),
+            key="twomeans_prior_sd"
+        )
+
+        sd_cv = st.number_input(
+            "Coefficient of variation of the SD (0 = SD known)",
+            min_value=0.0,
+            max_value=1.0,
+            value=0.0,
+            key="twomeans_sd_cv"
+        )
+
+        target_assurance = st.number_input(
+            "Target assurance",
+            min_value=0.05,
+            max_value=0.99,
+            value=0.70,
+            key="twomeans_target_assurance"
+        )
+
+        if st.button("Calculate Assurance", key="twomeans_assurance_btn"):
+
+            priors = {"delta": {"distribution": "normal", "mean": abs(delta), "sd": prior_sd_delta}}
+            fixed = {"sd": sd_planning}
+
+            if sd_cv > 0:
+                # Gamma prior with mean = planning SD
+                priors["sd"] = {"distribution": "gamma", "shape": 1 / sd_cv ** 2, "scale": sd_planning * sd_cv ** 2}
+                fixed = {}
+
+            n_planned = calculate_two_independent_means(
+                alpha, power, sd_planning, abs(delta), ratio, two_sided
+            )["n_before_dropout_group1"]
+
+            try:
+                at_planned = calculate_assurance(
+                    "two_means", alpha, n_planned, priors, fixed, ratio, two_sided
+                )
+                result = calculate_assurance_sample_size(
+                    "two_means", alpha, target_assurance, priors, fixed,
+                    ratio, two_sided, dropout_rate
+                )
+            except ValueError as e:
+                st.error(str(e))
+                st.stop()
+
+            rule = "Gauss–Hermite quadrature" if result["rule"] == "gauss_hermite" else "quasi-Monte Carlo"
+
+            st.write(f"Assurance at the planned n₁ = {n_planned}: {round(at_planned['assurance'],4)}")
+            st.write(f"Maximum attainable assurance: {round(result['assurance_limit'],4)}")
+            st.write(f"Integration: {rule}")
+
+            st.success(f"Group 1 Required: {result['n_group1']}")
+            st.success(f"Group 2 Required: {result['n_group2']}")
+            st.write("Total Sample Size:", result["n_total"])
+
+            st.markdown("### 📄 Copy for Thesis / Manuscript")
+
+            paragraph = paragraph_two_means_assurance(
+                alpha,
+                target_assurance,
+                abs(delta),
+                prior_sd_delta,
+                sd_planning,
+                sd_cv,
+                ratio,
+                dropout_rate,
+                result["n_group1"],
+                result["n_group2"],
+                result["assurance"],
+                language=manuscript_language
+            )
+
+            st.code(paragraph)
+
+        # --------------------------------------------------
+        st.markdown("---")
+        st.subheader("🔁 Sample Size Re-estimation (Promising Zone)")
+
+        st.markdown("""
+At an unblinded interim the **conditional power** (under the observed trend) decides the zone:
+unfavourable or favourable trials keep the planned n, promising trials are increased towards a
+target conditional power, up to a maximum. Operating characteristics are simulated (one-sided α = α/2 if two-sided).
+        """)
+
+        ssr_true_delta = st.number_input(
+            "True Δ to simulate",
+            min_value=0.0,
+            value=float(abs(delta)),
+            key="twomeans_ssr_true_delta"
+        )
+
+        ssr_interim = st.number_input(
+            "Interim fraction of the planned n",
+            min_value=0.1,
+            max_value=0.9,
+            value=0.5,
+            key="twomeans_ssr_interim"
+        )
+
+        ssr_max_factor = st.number_input(
+            "Maximum n as a multiple of the planned n",
+            min_value=1.0,
+            max_value=4.0,
+            value=2.0,
+            key="twomeans_ssr_max_factor"
+        )
+
+        ssr_target_cp = st.number_input(
+            "Target conditional power",
+            min_value=0.5,
+            max_value=0.99,
+            value=0.9,
+            key="twomeans_ssr_target_cp"
+        )
+
+        ssr_rule = st.radio(
+            "Final test",
+            list(SSR_RULES),
+            format_func=lambda k: SSR_RULE_LABELS[k],
+            horizontal=True,
+            key="twomeans_ssr_rule"
+        )
+
+        if st.button("Simulate Re-estimation", key="twomeans_ssr_btn"):
+
+            one_sided_alpha = alpha / 2 if two_sided else alpha
+
+            n_planned = calculate_two_independent_means(
+                alpha, power, sd_planning, abs(delta), ratio, two_sided
+            )["n_before_dropout_group1"]
+
+            try:
+                result = simulate_sample_size_reestimation(
+                    "two_means",
+                    one_sided_alpha,
+                    {"delta": ssr_true_delta, "sd": sd_planning},
+                    n_planned,
+                    max(1, round(ssr_interim * n_planned)),
+                    max(n_planned, round(ssr_max_factor * n_planned)),
+                    ratio,
+                    ssr_rule,
+                    ssr_target_cp,
+                    dropout_rate=dropout_rate,
+                    n_sims=10 ** 6
+                )
+            except ValueError as e:
+                st.error(str(e))
+                st.stop()
+
+            st.write(f"Planned n₁ = {n_planned}; promising zone starts at CP = {round(result['cp_min'],3)}")
+            st.write(f"Fixed-design power at the true Δ: {round(result['fixed_power'],4)}")
+            st.write(f"Simulated type I error: {round(result['type_i_error'],4)}")
+
+            st.success(f"Power with re-estimation: {round(result['power'],4)}")
+            st.write(f"Expected n₁ (before dropout): {round(result['expected_n_before_dropout_group1'],1)}")
+            st.write(f"Expected total sample size: {round(result['expected_n_total'],1)}")
+
+            st.dataframe({
+                "Zone": list(result["zone_probabilities"]),
+                "Probability": [round(v, 4) for v in result["zone_probabilities"].values()]
+            })
+
+            dist = result["n_distribution"]
+            st.dataframe({
+                "n₁ (before dropout)": dist["n_before_dropout_group1"],
+                "Total n": dist["n_total"],
+                "Probability": dist["probability"].round(4)
+            })
+
+            st.markdown("### 📄 Copy for Thesis / Manuscript")
+
+            paragraph = paragraph_sample_size_reestimation(
+                ssr_rule,
+                ssr_interim,
+                n_planned,
+                result["cp_min"],
+                ssr_target_cp,
+                ssr_max_factor,
+                10 ** 6,
+                ssr_true_delta,
+                sd_planning,
+                result["power"],
+                result["fixed_power"],
+                result["type_i_error"],
+                result["expected_n_total"],
+                dropout_rate,
+                language=manuscript_language
+            )
+
+            st.code(paragraph)
+
 # ==========================================================
 # PAIRED MEAN (Before–After / Matched Pairs)
 # ==========================================================
 elif study_type == "Paired Mean":
 
-    import scipy.stats as stats
     import math
 
     st.header("Paired Mean (Before–After / Matched Pairs)")
@@ -573,16 +1125,12 @@ Smaller Δ → larger sample size.
             sd_diff,
             delta_used,
             two_sided,
-            dropout_rate
+            dropout_rate,
+            trace=True
         )
 
-        # Intermediate Z-values
-        if two_sided:
-            Z_alpha = stats.norm.ppf(1 - alpha/2)
-        else:
-            Z_alpha = stats.norm.ppf(1 - alpha)
-
-        Z_beta = stats.norm.ppf(power)
+        Z_alpha = result["trace"]["z_alpha"]
+        Z_beta = result["trace"]["z_beta"]
 
         st.markdown("### 🔎 Intermediate Values")
         st.write(f"Zα = {round(Z_alpha,4)}")
@@ -608,7 +1156,8 @@ Smaller Δ → larger sample size.
             delta_used,
             two_sided,
             dropout_rate,
-            result["n_required"]
+            result["n_required"],
+            language=manuscript_language
         )
 
         st.code(paragraph)
@@ -783,7 +1332,8 @@ Avoid overestimating f.
             k_groups,
             dropout_rate,
             result["n_total"],
-            result["n_per_group"]
+            result["n_per_group"],
+            language=manuscript_language
         )
 
         st.code(paragraph)
@@ -792,7 +1342,6 @@ Avoid overestimating f.
 # ==========================================================
 elif study_type == "One Proportion":
 
-    import scipy.stats as stats
     import math
 
     st.header("One Proportion (Single-Group Proportion Test)")
@@ -937,23 +1486,19 @@ Choosing p₁ unrealistically far from p₀.
 
     if st.button("Calculate Sample Size", key="oneprop_calc_btn"):
 
-        delta_used = abs(p1 - p0)
-
         result = calculate_one_proportion(
             alpha,
             power,
             p0,
             p1,
             two_sided,
-            dropout_rate
+            dropout_rate,
+            trace=True
         )
 
-        if two_sided:
-            Z_alpha = stats.norm.ppf(1 - alpha/2)
-        else:
-            Z_alpha = stats.norm.ppf(1 - alpha)
-
-        Z_beta = stats.norm.ppf(power)
+        Z_alpha = result["trace"]["z_alpha"]
+        Z_beta = result["trace"]["z_beta"]
+        delta_used = result["trace"]["delta"]
 
         st.markdown("### 🔎 Intermediate Values")
         st.write(f"Zα = {round(Z_alpha,4)}")
@@ -978,18 +1523,165 @@ Choosing p₁ unrealistically far from p₀.
 
         st.markdown("### 📄 Copy for Thesis / Manuscript")
 
-        st.code(f"""
-Sample size was calculated for a one-sample proportion test with α={alpha} and power={power}.
-Assuming a reference proportion of {p0} and an expected proportion of {p1},
-the required sample size was {result['n_required']} participants
-(after adjusting for {dropout_rate*100:.1f}% anticipated dropout).
-        """)
+        paragraph = paragraph_one_proportion(
+            alpha,
+            power,
+            p0,
+            p1,
+            two_sided,
+            dropout_rate,
+            result["n_required"],
+            language=manuscript_language
+        )
+
+        st.code(paragraph)
+
+    # --------------------------------------------------
+    st.markdown("---")
+    st.subheader("🧪 Single-Arm Phase II Designs (Simon Two-Stage / A'Hern)")
+
+    st.markdown("""
+Exact binomial designs for a single-arm trial testing H₀: p ≤ p₀ against p₁ > p₀,
+using p₀ and p₁ above. α is treated as **one-sided**.
+
+• **Simon optimal** — smallest expected size if the treatment is inactive  
+• **Simon minimax** — smallest maximum size  
+• **A'Hern** — single-stage exact design  
+    """)
+
+    phase2_max_n = st.number_input(
+        "Maximum total sample size searched",
+        min_value=10,
+        max_value=300,
+        value=150,
+        step=10,
+        key="oneprop_phase2_max_n"
+    )
+
+    if st.button("Search Phase II Designs", key="oneprop_phase2_btn"):
+
+        try:
+            with st.spinner("Searching designs..."):
+                simon = calculate_simon_two_stage(
+                    alpha, power, p0, p1, dropout_rate, int(phase2_max_n)
+                )
+                ahern = calculate_ahern_single_stage(
+                    alpha, power, p0, p1, dropout_rate, int(phase2_max_n)
+                )
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
+
+        opt, mm = simon["optimal"], simon["minimax"]
+
+        st.dataframe({
+            "Design": ["Simon optimal", "Simon minimax", "A'Hern single-stage"],
+            "Stage 1 (r₁/n₁)": [f"{opt['r1']}/{opt['n1']}", f"{mm['r1']}/{mm['n1']}", "—"],
+            "Total (r/n)": [f"{opt['r']}/{opt['n']}", f"{mm['r']}/{mm['n']}", f"{ahern['r']}/{ahern['n_before_dropout']}"],
+            "EN₀": [round(opt["en0"], 1), round(mm["en0"], 1), ahern["n_before_dropout"]],
+            "PET₀": [round(opt["pet0"], 3), round(mm["pet0"], 3), 0.0],
+            "Actual α": [round(opt["alpha_actual"], 4), round(mm["alpha_actual"], 4), round(ahern["alpha_actual"], 4)],
+            "Actual power": [round(opt["power_actual"], 4), round(mm["power_actual"], 4), round(ahern["power_actual"], 4)]
+        })
+
+        st.write("Stop after stage 1 with ≤ r₁ responses; reject the treatment with ≤ r responses in total.")
+
+        if two_sided:
+            st.info("Phase II designs use a one-sided α; the sidebar α is applied one-sided here.")
+
+        st.success(f"Simon optimal: enrol {opt['n1_required']} in stage 1, {opt['n_required']} in total")
+        st.success(f"Simon minimax: enrol {mm['n1_required']} in stage 1, {mm['n_required']} in total")
+
+        st.markdown("### 📄 Copy for Thesis / Manuscript")
+
+        st.code(paragraph_simon_two_stage(alpha, power, p0, p1, dropout_rate, opt, language=manuscript_language))
+
+    # --------------------------------------------------
+    st.markdown("---")
+    st.subheader("📏 Precision-Based Planning (Confidence Interval Width)")
+
+    st.markdown("""
+For prevalence and other descriptive studies: the n needed to estimate the proportion within **± d**,
+using the expected proportion p₁ above. Wilson and Clopper–Pearson widths are averaged exactly over
+the binomial distribution of the number of responses; with an **assurance**, the realised half-width
+is at most d with that probability.
+    """)
+
+    precision_method = st.radio(
+        "Interval",
+        list(PRECISION_LABELS.values()),
+        index=1,
+        horizontal=True,
+        key="oneprop_precision_method"
+    )
+
+    precision_d = st.number_input(
+        "Target half-width (d)",
+        min_value=0.001,
+        max_value=0.5,
+        value=0.05,
+        step=0.005,
+        format="%.3f",
+        key="oneprop_precision_d"
+    )
+
+    precision_assurance = st.number_input(
+        "Assurance (0 = expected half-width)",
+        min_value=0.0,
+        max_value=0.99,
+        value=0.0,
+        key="oneprop_precision_assurance"
+    )
+
+    if st.button("Calculate Precision Sample Size", key="oneprop_precision_btn"):
+
+        method = next(k for k, v in PRECISION_LABELS.items() if v == precision_method)
+        assurance = precision_assurance if precision_assurance > 0 else None
+
+        try:
+            with st.spinner("Searching n..."):
+                result = calculate_one_proportion_precision(
+                    alpha,
+                    p1,
+                    precision_d,
+                    method=method,
+                    assurance=assurance,
+                    dropout_rate=dropout_rate,
+                    trace=True
+                )
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
+
+        st.markdown("### 🔎 Intermediate Values")
+        st.write(f"Zα/2 = {round(result['trace']['z_alpha'],4)}")
+        st.write(f"Wald n (unrounded) = {round(result['trace']['n_wald_raw'],2)}")
+        st.write(f"Criterion: {result['formula']}")
+        st.write(f"Half-width at n: {round(result['half_width'],4)}")
+
+        st.success(f"Required Sample Size: {result['n_required']}")
+        st.write("Before Dropout Adjustment:", result["n_before_dropout"])
+
+        st.markdown("### 📄 Copy for Thesis / Manuscript")
+
+        paragraph = paragraph_proportion_precision(
+            alpha,
+            p1,
+            method,
+            precision_d,
+            assurance,
+            dropout_rate,
+            result["n_before_dropout"],
+            result["n_required"],
+            language=manuscript_language
+        )
+
+        st.code(paragraph)
 # ==========================================================
 # TWO PROPORTIONS (Two Independent Groups)
 # ==========================================================
 elif study_type == "Two Proportions":
 
-    import scipy.stats as stats
     import math
 
     st.header("Two Independent Proportions")
@@ -1115,45 +1807,148 @@ Unequal allocation increases total sample size.
         key="twoprop_ratio"
     )
 
-    if st.button("Calculate Sample Size", key="twoprop_calc_btn"):
+    hypothesis_label = st.radio(
+        "Hypothesis",
+        ["Superiority", "Non-inferiority", "Equivalence"],
+        horizontal=True,
+        key="twoprop_hypothesis"
+    )
 
-        delta_used = abs(p1 - p2)
-        p_bar = (p1 + p2) / 2
+    if hypothesis_label != "Superiority":
 
-        result = calculate_two_proportions(
-            alpha,
-            power,
-            p1,
-            p2,
-            ratio,
-            two_sided,
-            dropout_rate
+        margin = st.number_input(
+            "Margin on p₁ − p₂ (M)",
+            min_value=0.0001,
+            max_value=0.9999,
+            value=0.10,
+            key="twoprop_margin"
         )
 
-        if two_sided:
-            Z_alpha = stats.norm.ppf(1 - alpha/2)
-        else:
-            Z_alpha = stats.norm.ppf(1 - alpha)
+        margin_method = "pooled"
+
+        if hypothesis_label == "Non-inferiority":
+            margin_method = st.radio(
+                "Null variance",
+                ["pooled", "farrington_manning"],
+                format_func={
+                    "pooled": "Unpooled Wald (variance at p₁, p₂)",
+                    "farrington_manning": "Farrington–Manning (restricted MLE)"
+                }.get,
+                horizontal=True,
+                key="twoprop_margin_method"
+            )
+
+        if st.button("Calculate Sample Size", key="twoprop_margin_calc"):
+
+            hypothesis = hypothesis_label.lower().replace("-", "_")
+
+            try:
+                result = calculate_two_proportions(
+                    alpha,
+                    power,
+                    p1,
+                    p2,
+                    ratio,
+                    two_sided,
+                    dropout_rate,
+                    hypothesis=hypothesis,
+                    margin=margin,
+                    method=margin_method
+                )
+            except ValueError as e:
+                st.error(str(e))
+                st.stop()
+
+            st.markdown("### 🔎 Method")
+            st.write(result["formula"])
+            for item in result["assumptions"]:
+                st.write(f"• {item}")
+
+            if hypothesis == "non_inferiority":
+                exact = exact_power_two_proportions(
+                    alpha,
+                    result["n1_before_dropout"],
+                    result["n2_before_dropout"],
+                    p1,
+                    p2,
+                    margin_method,
+                    two_sided,
+                    null_difference=-margin
+                )
+                test_name = "Farrington–Manning" if margin_method == "farrington_manning" else "unpooled Wald"
+                st.write(f"Exact power of the {test_name} test at this n = {round(exact,4)}")
+
+            st.success(f"Group 1 Required: {result['n_group1']}")
+            st.success(f"Group 2 Required: {result['n_group2']}")
+            st.write("Total Sample Size:", result["n_total"])
+
+            st.markdown("### 📄 Copy for Thesis / Manuscript")
+
+            paragraph = paragraph_two_proportions_margin(
+                alpha,
+                power,
+                p1,
+                p2,
+                margin,
+                ratio,
+                hypothesis,
+                dropout_rate,
+                result["n_group1"],
+                result["n_group2"],
+                language=manuscript_language
+            )
+
+            st.code(paragraph)
+
+    if hypothesis_label == "Superiority":
+        twoprop_method = st.selectbox(
+            "Method",
+            TWO_PROPORTION_METHODS,
+            format_func=TWO_PROPORTION_METHOD_LABELS.get,
+            key="twoprop_method"
+        )
+
+    if hypothesis_label == "Superiority" and st.button("Calculate Sample Size", key="twoprop_calc_btn"):
+
+        try:
+            result = calculate_two_proportions(
+                alpha,
+                power,
+                p1,
+                p2,
+                ratio,
+                two_sided,
+                dropout_rate,
+                trace=True,
+                method=twoprop_method
+            )
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
 
-        Z_beta = stats.norm.ppf(power)
+        tr = result["trace"]
+        Z_alpha = tr["z_alpha"]
+        Z_beta = tr["z_beta"]
 
         st.markdown("### 🔎 Intermediate Values")
         st.write(f"Zα = {round(Z_alpha,4)}")
         st.write(f"Zβ = {round(Z_beta,4)}")
-        st.write(f"Pooled proportion (p̄) = {round(p_bar,4)}")
+        st.write(f"Pooled proportion (p̄) = {round(tr['p_bar'],4)}")
+        st.write(f"Null variance p̄(1−p̄)(1 + 1/r) = {round(tr['var_null'],4)}")
+        st.write(f"Alternative variance p₁q₁ + p₂q₂/r = {round(tr['var_alt'],4)}")
+        st.write(f"Method: {result['formula']}")
 
-        # Safe LaTeX
+        # Safe LaTeX (pooled formula; the other methods adjust this n₁)
         latex_formula = f"""
         n_1 =
-        \\left(1 + \\frac{{1}}{{{ratio}}}\\right)
         \\frac{{
         \\left(
-        {round(Z_alpha,4)}\\sqrt{{2\\cdot{round(p_bar,4)}(1-{round(p_bar,4)})}}
+        {round(Z_alpha,4)}\\sqrt{{{round(tr['var_null'],4)}}}
         +
-        {round(Z_beta,4)}\\sqrt{{{p1}(1-{p1})+{p2}(1-{p2})}}
+        {round(Z_beta,4)}\\sqrt{{{round(tr['var_alt'],4)}}}
         \\right)^2
         }}
-        {{({round(delta_used,4)})^2}}
+        {{({round(tr['delta'],4)})^2}}
         """
 
         st.latex(latex_formula)
@@ -1162,41 +1957,144 @@ Unequal allocation increases total sample size.
         st.success(f"Group 2 Required: {result['n_group2']}")
         st.write("Total Sample Size:", result["n_total"])
 
-        st.markdown("### 📄 Copy for Thesis / Manuscript")
-
-        st.code(f"""
-Sample size was calculated for comparison of two independent proportions with α={alpha} and power={power}.
-Assuming event rates of {p1} and {p2} in the two groups and allocation ratio {ratio},
-the required sample size was {result['n_group1']} in group 1 and {result['n_group2']} in group 2
-(after adjusting for {dropout_rate*100:.1f}% anticipated dropout).
-        """)
-# ==========================================================
-# CASE–CONTROL (Odds Ratio)
-# ==========================================================
-elif study_type == "Case-Control (Odds Ratio)":
-
-    import scipy.stats as stats
-    import math
+        exact = exact_power_two_proportions(
+            alpha,
+            result["n1_before_dropout"],
+            result["n2_before_dropout"],
+            p1,
+            p2,
+            twoprop_method,
+            two_sided
+        )
+        st.write(f"Exact power at n₁ = {result['n1_before_dropout']}, n₂ = {result['n2_before_dropout']} (binomial enumeration) = {round(exact,4)}")
 
-    st.header("Case–Control Study (Odds Ratio Based Sample Size)")
+        # --------------------------------------------------
+        st.markdown("### ⚖️ Method Comparison (before dropout)")
 
-    # --------------------------------------------------
-    with st.expander("📘 When to Use This Design", expanded=True):
-        st.markdown("""
-Used for unmatched case–control studies.
+        table = two_proportions_methods(alpha, power, p1, p2, ratio, two_sided)
 
-Examples:
-• Association between smoking and lung cancer  
-• Genetic variant and disease risk  
-• Exposure vs outcome (retrospective design)
+        st.dataframe({
+            "Method": [TWO_PROPORTION_METHOD_LABELS[m] for m in TWO_PROPORTION_METHODS],
+            "n₁": [int(table["n_group1"][m]) if table["n_group1"][m] > 0 else None for m in TWO_PROPORTION_METHODS],
+            "n₂": [int(table["n_group2"][m]) if table["n_group2"][m] > 0 else None for m in TWO_PROPORTION_METHODS]
+        })
 
-Design:
-• Binary exposure
-• Binary outcome
-• Comparison based on Odds Ratio (OR)
-        """)
+        st.markdown("### 📄 Copy for Thesis / Manuscript")
 
-    # --------------------------------------------------
+        paragraph = paragraph_two_proportions(
+            alpha,
+            power,
+            p1,
+            p2,
+            ratio,
+            two_sided,
+            dropout_rate,
+            result["n_group1"],
+            result["n_group2"],
+            method=twoprop_method,
+            language=manuscript_language
+        )
+
+        st.code(paragraph)
+
+    if hypothesis_label == "Superiority":
+
+        # --------------------------------------------------
+        st.markdown("---")
+        st.subheader("🧮 Bayesian Posterior-Probability Design")
+
+        st.markdown("""
+The trial succeeds if the **posterior probability** that group 1 does better than group 2
+exceeds a threshold (beta priors on each rate). The sample size is the smallest n₁ for which
+the probability of success reaches the target, computed exactly over all trial outcomes.
+        """)
+
+        bayes_threshold = st.number_input(
+            "Posterior probability threshold",
+            min_value=0.51,
+            max_value=0.999,
+            value=0.975,
+            key="twoprop_bayes_threshold"
+        )
+
+        bayes_target = st.number_input(
+            "Target probability of success",
+            min_value=0.05,
+            max_value=0.99,
+            value=float(power),
+            key="twoprop_bayes_target"
+        )
+
+        bayes_prior = st.radio(
+            "Analysis prior for each rate",
+            ["Uniform Beta(1, 1)", "Jeffreys Beta(0.5, 0.5)"],
+            horizontal=True,
+            key="twoprop_bayes_prior"
+        )
+
+        if st.button("Calculate Bayesian Sample Size", key="twoprop_bayes_btn"):
+
+            prior = (1.0, 1.0) if bayes_prior.startswith("Uniform") else (0.5, 0.5)
+
+            try:
+                result = calculate_bayesian_two_proportions(
+                    bayes_target, p1, p2, ratio, bayes_threshold,
+                    dropout_rate, prior, prior
+                )
+            except ValueError as e:
+                st.error(str(e))
+                st.stop()
+
+            st.write(f"Probability of success at n₁ = {result['n1_before_dropout']}: {round(result['probability_of_success'],4)}")
+            st.write(f"Evaluation: {'exact enumeration' if result['method'] == 'exact' else 'simulation'}")
+
+            st.success(f"Group 1 Required: {result['n_group1']}")
+            st.success(f"Group 2 Required: {result['n_group2']}")
+            st.write("Total Sample Size:", result["n_total"])
+
+            st.markdown("### 📄 Copy for Thesis / Manuscript")
+
+            paragraph = paragraph_bayesian_two_proportions(
+                bayes_threshold,
+                p1,
+                p2,
+                ratio,
+                "uniform" if bayes_prior.startswith("Uniform") else "jeffreys",
+                result["method"],
+                dropout_rate,
+                result["n_group1"],
+                result["n_group2"],
+                result["probability_of_success"],
+                language=manuscript_language
+            )
+
+            st.code(paragraph)
+# ==========================================================
+# CASE–CONTROL (Odds Ratio)
+# ==========================================================
+elif study_type == "Case-Control (Odds Ratio)":
+
+    import math
+
+    st.header("Case–Control Study (Odds Ratio Based Sample Size)")
+
+    # --------------------------------------------------
+    with st.expander("📘 When to Use This Design", expanded=True):
+        st.markdown("""
+Used for unmatched and matched (1:M) case–control studies.
+
+Examples:
+• Association between smoking and lung cancer  
+• Genetic variant and disease risk  
+• Exposure vs outcome (retrospective design)
+
+Design:
+• Binary exposure
+• Binary outcome
+• Comparison based on Odds Ratio (OR)
+        """)
+
+    # --------------------------------------------------
     with st.expander("📐 Mathematical Formula (Log Odds Ratio Method)", expanded=True):
 
         st.latex(r"""
@@ -1267,40 +2165,115 @@ r = n_controls / n_cases
         key="cc_or"
     )
 
-    ratio = st.number_input(
-        "Control-to-Case Ratio (r)",
-        min_value=0.1,
-        value=1.0,
-        key="cc_ratio"
+    cc_design = st.radio(
+        "Design",
+        ["Unmatched", "Matched (1:M)"],
+        horizontal=True,
+        key="cc_design"
     )
 
-    if st.button("Calculate Sample Size (Case-Control)", key="cc_calc"):
-
-        # Derive p1
-        p1 = (OR * p0) / (1 - p0 + OR * p0)
-
-        # Z values
-        if two_sided:
-            Z_alpha = stats.norm.ppf(1 - alpha/2)
-        else:
-            Z_alpha = stats.norm.ppf(1 - alpha)
+    if cc_design == "Unmatched":
+        ratio = st.number_input(
+            "Control-to-Case Ratio (r)",
+            min_value=0.1,
+            value=1.0,
+            key="cc_ratio"
+        )
+    else:
+        n_matched = st.number_input(
+            "Matched Controls per Case (M)",
+            min_value=1,
+            value=1,
+            step=1,
+            key="cc_m"
+        )
+        phi = st.number_input(
+            "Exposure Correlation Between Matched Members (φ)",
+            min_value=0.0,
+            max_value=0.99,
+            value=0.2,
+            step=0.05,
+            help="Correlation of exposure between a case and its matched controls; 0.2 is a common planning value.",
+            key="cc_phi"
+        )
 
-        Z_beta = stats.norm.ppf(power)
+        if st.button("Calculate Sample Size (Matched Case-Control)", key="cc_matched_calc"):
+
+            try:
+                result = calculate_matched_case_control(
+                    alpha,
+                    power,
+                    p0,
+                    OR,
+                    int(n_matched),
+                    phi,
+                    two_sided,
+                    dropout_rate,
+                    trace=True
+                )
+            except ValueError as e:
+                st.error(str(e))
+                st.stop()
+
+            tr = result["trace"]
+
+            st.markdown("### 🔎 Intermediate Values")
+            st.write(f"Zα = {round(tr['z_alpha'],4)}")
+            st.write(f"Zβ = {round(tr['z_beta'],4)}")
+            st.write(f"Estimated p₁ (cases) = {round(tr['p1'],4)}")
+            st.write(f"P(control exposed | case exposed) = {round(tr['p0_plus'],4)}")
+            st.write(f"P(control exposed | case unexposed) = {round(tr['p0_minus'],4)}")
+            st.write(f"Matched sets (before dropout) = {result['n_before_dropout']}")
+
+            st.latex(r"""
+            n = \frac{\left[Z_{\alpha}\sqrt{\sum_m t_m v_{0m}} + Z_{\beta}\sqrt{\sum_m t_m v_m}\right]^2}
+            {\left[\sum_m t_m (e_m - e_{0m})\right]^2}
+            """)
 
-        ln_or = math.log(OR)
+            st.success(f"Required Cases (matched sets): {result['n_cases']}")
+            st.success(f"Required Controls: {result['n_controls']}")
+            st.write(f"Total Sample Size: {result['n_total']}")
+
+            st.markdown("### 📄 Copy for Thesis / Manuscript")
+
+            paragraph = paragraph_matched_case_control(
+                p0,
+                OR,
+                int(n_matched),
+                phi,
+                dropout_rate,
+                result["n_cases"],
+                result["n_controls"],
+                result["n_total"],
+                language=manuscript_language
+            )
 
-        # Core formula
-        numerator = (Z_alpha + Z_beta)**2 * (
-            (1 / (p0*(1-p0))) +
-            (1 / (ratio * p1*(1-p1)))
-        )
+            st.code(paragraph)
+
+    if cc_design == "Unmatched" and st.button("Calculate Sample Size (Case-Control)", key="cc_calc"):
+
+        try:
+            result = calculate_case_control_or(
+                alpha,
+                power,
+                p0,
+                OR,
+                ratio,
+                two_sided,
+                dropout_rate,
+                method="log_or",
+                trace=True
+            )
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
 
-        n1 = numerator / (ln_or**2)
-        n2 = ratio * n1
+        tr = result["trace"]
+        Z_alpha, Z_beta = tr["z_alpha"], tr["z_beta"]
+        p1, ln_or = tr["p1"], tr["log_or"]
 
-        # Dropout adjustment
-        n1_adj = math.ceil(n1 / (1 - dropout_rate))
-        n2_adj = math.ceil(n2 / (1 - dropout_rate))
+        n1_adj = result["n_group1"]
+        n2_adj = result["n_group2"]
 
         # --------------------------------------------------
         st.markdown("### 🔎 Intermediate Values")
@@ -1316,8 +2289,8 @@ r = n_controls / n_cases
         \frac{{
         ({round(Z_alpha,4)} + {round(Z_beta,4)})^2
         \left(
-        \frac{{1}}{{{round(p0,4)}(1-{round(p0,4)})}} +
-        \frac{{1}}{{{round(ratio,4)} \cdot {round(p1,4)}(1-{round(p1,4)})}}
+        \frac{{1}}{{{round(p1,4)}(1-{round(p1,4)})}} +
+        \frac{{1}}{{{round(ratio,4)} \cdot {round(p0,4)}(1-{round(p0,4)})}}
         \right)
         }}
         {{({round(ln_or,4)})^2}}
@@ -1331,21 +2304,25 @@ r = n_controls / n_cases
         # --------------------------------------------------
         st.markdown("### 📄 Copy for Thesis / Manuscript")
 
-        st.code(f"""
-Sample size was calculated for an unmatched case–control study using the log odds ratio method.
-Assuming an exposure prevalence among controls of {p0},
-a target odds ratio of {OR},
-and a control-to-case ratio of {ratio},
-the required sample size was {n1_adj} cases and {n2_adj} controls
-(total {n1_adj + n2_adj}),
-after adjusting for {dropout_rate*100:.1f}% anticipated dropout.
-        """)
+        paragraph = paragraph_case_control_or(
+            alpha,
+            power,
+            p0,
+            OR,
+            ratio,
+            two_sided,
+            dropout_rate,
+            n1_adj,
+            n2_adj,
+            language=manuscript_language
+        )
+
+        st.code(paragraph)
 # ==========================================================
 # COHORT (Risk Ratio)
 # ==========================================================
 elif study_type == "Cohort (Risk Ratio)":
 
-    import scipy.stats as stats
     import math
 
     st.header("Cohort Study (Risk Ratio Based Sample Size)")
@@ -1448,34 +2425,30 @@ r = n₂ / n₁
 
     if st.button("Calculate Sample Size (Cohort)", key="cohort_calc"):
 
-        p1 = p0 * RR
-
-        if p1 >= 1:
-            st.error("RR too large for given baseline risk (p₁ ≥ 1).")
+        # The calculator's group 1 is the exposed group, with its ratio
+        # defined as control / exposed
+        try:
+            result = calculate_cohort_rr(
+                alpha,
+                power,
+                p0,
+                RR,
+                1 / ratio,
+                two_sided,
+                dropout_rate,
+                method="log_rr",
+                trace=True
+            )
+        except ValueError as e:
+            st.error(str(e))
             st.stop()
 
-        # Z values
-        if two_sided:
-            Z_alpha = stats.norm.ppf(1 - alpha/2)
-        else:
-            Z_alpha = stats.norm.ppf(1 - alpha)
-
-        Z_beta = stats.norm.ppf(power)
-
-        ln_rr = math.log(RR)
-
-        # Core formula
-        numerator = (Z_alpha + Z_beta)**2 * (
-            ((1 - p0) / p0) +
-            ((1 - p1) / (ratio * p1))
-        )
-
-        n1 = numerator / (ln_rr**2)
-        n2 = ratio * n1
+        tr = result["trace"]
+        Z_alpha, Z_beta = tr["z_alpha"], tr["z_beta"]
+        p1, ln_rr = tr["p1"], tr["log_rr"]
 
-        # Dropout adjustment
-        n1_adj = math.ceil(n1 / (1 - dropout_rate))
-        n2_adj = math.ceil(n2 / (1 - dropout_rate))
+        n1_adj = result["n_group2"]
+        n2_adj = result["n_group1"]
 
         # --------------------------------------------------
         st.markdown("### 🔎 Intermediate Values")
@@ -1506,22 +2479,25 @@ r = n₂ / n₁
         # --------------------------------------------------
         st.markdown("### 📄 Copy for Thesis / Manuscript")
 
-        st.code(f"""
-Sample size was calculated for a cohort study using the log risk ratio method.
-Assuming a baseline risk of {p0} in the control group,
-a target risk ratio of {RR},
-and an allocation ratio of {ratio},
-the required sample size was {n1_adj} participants in the control group
-and {n2_adj} in the exposed group
-(total {n1_adj + n2_adj}),
-after adjusting for {dropout_rate*100:.1f}% anticipated dropout.
-        """)
+        paragraph = paragraph_cohort_rr(
+            alpha,
+            power,
+            p0,
+            RR,
+            ratio,
+            two_sided,
+            dropout_rate,
+            n1_adj,
+            n2_adj,
+            language=manuscript_language
+        )
+
+        st.code(paragraph)
 # ==========================================================
 # CORRELATION (Fisher z)
 # ==========================================================
 elif study_type == "Correlation":
 
-    import scipy.stats as stats
     import math
 
     st.header("Correlation (Pearson r) — Sample Size via Fisher z-transform")
@@ -1619,49 +2595,67 @@ Notes:
         key="corr_r_target"
     )
 
+    rho0 = st.number_input(
+        "Null Correlation (ρ₀)",
+        min_value=-0.95,
+        max_value=0.95,
+        value=0.0,
+        step=0.01,
+        key="corr_rho0"
+    )
+
+    corr_method = st.radio(
+        "Method",
+        ["Fisher z (approximate)", "Exact (distribution of r)"],
+        horizontal=True,
+        key="corr_method"
+    )
+
     if st.button("Calculate Sample Size (Correlation)", key="corr_calc"):
 
-        if abs(r_target) < 1e-6:
-            st.error("r cannot be 0 for sample size planning. Choose a non-zero target correlation.")
+        if abs(r_target - rho0) < 1e-6:
+            st.error("r must differ from ρ₀ for sample size planning. Choose a different target correlation.")
             st.stop()
 
-        if r_target <= -0.99 or r_target >= 0.99:
-            st.error("r must be between -0.99 and 0.99.")
+        try:
+            result = calculate_correlation(
+                alpha,
+                power,
+                r_target,
+                two_sided,
+                dropout_rate,
+                rho0=rho0,
+                method="exact" if corr_method.startswith("Exact") else "fisher_z",
+                trace=True
+            )
+        except ValueError as e:
+            st.error(str(e))
             st.stop()
 
-        # Z values
-        if two_sided:
-            Z_alpha = stats.norm.ppf(1 - alpha/2)
-        else:
-            Z_alpha = stats.norm.ppf(1 - alpha)
-
-        Z_beta = stats.norm.ppf(power)
-
-        # Fisher z
-        z = 0.5 * math.log((1 + r_target) / (1 - r_target))
-
-        # Sample size
-        n_raw = ((Z_alpha + Z_beta) ** 2) / (z ** 2) + 3
-        n = math.ceil(n_raw)
-
-        # Dropout adjustment
-        n_adj = math.ceil(n / (1 - dropout_rate))
+        tr = result["trace"]
+        Z_alpha, Z_beta = tr["z_alpha"], tr["z_beta"]
+        z = tr["fisher_z"]
+        n = result["n_before_dropout"]
+        n_adj = result["n_required"]
 
         # --------------------------------------------------
         st.markdown("### 🔎 Intermediate Values")
         st.write(f"Zα = {round(Z_alpha,4)}")
         st.write(f"Zβ = {round(Z_beta,4)}")
-        st.write(f"Fisher z = {round(z,4)}")
+        st.write(f"Fisher z difference = {round(z,4)}")
         st.write(f"n (before dropout) = {n}")
+        st.write(f"Method: {result['formula']}")
 
         st.latex(rf"""
         z = \frac{{1}}{{2}}\ln\left(\frac{{1+({round(r_target,4)})}}{{1-({round(r_target,4)})}}\right)
+        - \frac{{1}}{{2}}\ln\left(\frac{{1+({round(rho0,4)})}}{{1-({round(rho0,4)})}}\right)
         """)
 
-        st.latex(rf"""
-        n =
-        \frac{{({round(Z_alpha,4)} + {round(Z_beta,4)})^2}}{{({round(z,4)})^2}} + 3
-        """)
+        if not corr_method.startswith("Exact"):
+            st.latex(rf"""
+            n =
+            \frac{{({round(Z_alpha,4)} + {round(Z_beta,4)})^2}}{{({round(z,4)})^2}} + 3
+            """)
 
         st.success(f"Required Sample Size (adjusted): {n_adj}")
         st.write(f"Before Dropout Adjustment: {n}")
@@ -1669,21 +2663,79 @@ Notes:
         # --------------------------------------------------
         st.markdown("### 📄 Copy for Thesis / Manuscript")
 
-        sided_txt = "two-sided" if two_sided else "one-sided"
+        paragraph = paragraph_correlation(
+            alpha,
+            power,
+            r_target,
+            two_sided,
+            dropout_rate,
+            n_adj,
+            rho0=rho0,
+            method="exact" if corr_method.startswith("Exact") else "fisher_z",
+            language=manuscript_language
+        )
 
-        st.code(f"""
-Sample size was calculated for detecting a Pearson correlation using Fisher’s z-transformation ({sided_txt}).
-With α={alpha} and power={power}, and assuming a target correlation of r={r_target},
-the required sample size was {n_adj} participants after adjusting for {dropout_rate*100:.1f}% anticipated dropout.
-        """)
+        st.code(paragraph)
+
+    # --------------------------------------------------
+    st.markdown("---")
+    st.subheader("📏 Precision-Based Planning (Confidence Interval Width)")
+
+    st.markdown("""
+When the aim is to **estimate** the correlation rather than test it: the n for which the Fisher-z
+confidence interval around the target r above has half-width at most **d** (the interval is
+asymmetric; d is half its length).
+    """)
+
+    precision_d = st.number_input(
+        "Target half-width (d)",
+        min_value=0.005,
+        max_value=0.9,
+        value=0.10,
+        step=0.01,
+        key="corr_precision_d"
+    )
+
+    if st.button("Calculate Precision Sample Size", key="corr_precision_btn"):
+
+        try:
+            result = calculate_correlation_precision(
+                alpha,
+                r_target,
+                precision_d,
+                dropout_rate=dropout_rate,
+                trace=True
+            )
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
+
+        st.markdown("### 🔎 Intermediate Values")
+        st.write(f"Zα/2 = {round(result['trace']['z_alpha'],4)}")
+        st.write(f"Fisher z of r = {round(result['trace']['fisher_z'],4)}")
+        st.write(f"Half-width at n: {round(result['half_width'],4)}")
+
+        st.success(f"Required Sample Size: {result['n_required']}")
+        st.write("Before Dropout Adjustment:", result["n_before_dropout"])
+
+        st.markdown("### 📄 Copy for Thesis / Manuscript")
+
+        paragraph = paragraph_correlation_precision(
+            alpha,
+            r_target,
+            precision_d,
+            dropout_rate,
+            result["n_before_dropout"],
+            result["n_required"],
+            language=manuscript_language
+        )
+
+        st.code(paragraph)
 # ==========================================================
 # LINEAR REGRESSION (Cohen's f²)
 # ==========================================================
 elif study_type == "Linear Regression":
 
-    import scipy.stats as stats
-    import math
-
     st.header("Multiple Linear Regression — Sample Size via Cohen’s f²")
 
     # --------------------------------------------------
@@ -1712,6 +2764,13 @@ Typical assumptions:
         f^2 = \frac{R^2}{1 - R^2}
         """)
 
+        st.markdown("Exact power (noncentral F-test, default):")
+        st.latex(r"""
+        \text{Power} = P\left(F_{q,\; n-p-1,\; \lambda} > F_{1-\alpha;\; q,\; n-p-1}\right),
+        \qquad \lambda = f^2 \cdot n
+        """)
+        st.markdown("n is the smallest integer reaching the target power.")
+
         st.markdown("Sample size planning (large-sample z-approximation):")
         st.latex(r"""
         n =
@@ -1722,7 +2781,9 @@ Typical assumptions:
         st.write("• R² = expected proportion of variance explained by predictors")
         st.write("• f² = Cohen’s effect size for regression")
         st.write("• p = number of predictors (planned predictors in the model)")
+        st.write("• q = number of predictors tested (q = p for the overall model)")
         st.write("• Zα depends on one/two-sided α; Zβ depends on desired power")
+        st.write("• The F-test is always two-sided in effect; the sidedness setting applies to the z-approximation only")
 
         st.markdown("Optional: partial effect (incremental R²) for a block of predictors:")
         st.latex(r"""
@@ -1842,36 +2903,76 @@ If you plan model selection / many candidate predictors, you often need more sam
         key="linreg_p"
     )
 
-    if st.button("Calculate Sample Size (Linear Regression)", key="linreg_calc_n"):
+    q = st.number_input(
+        "Number of Predictors Tested (q)",
+        min_value=1,
+        value=int(p),
+        step=1,
+        help="q = p tests the overall model; q < p tests a block of predictors (use partial f²).",
+        key="linreg_q"
+    )
 
-        # Z values
-        if two_sided:
-            Z_alpha = stats.norm.ppf(1 - alpha/2)
-        else:
-            Z_alpha = stats.norm.ppf(1 - alpha)
+    linreg_method = st.radio(
+        "Method",
+        ["Exact F-test", "z-approximation"],
+        horizontal=True,
+        key="linreg_method"
+    )
 
-        Z_beta = stats.norm.ppf(power)
+    if st.button("Calculate Sample Size (Linear Regression)", key="linreg_calc_n"):
 
-        # Sample size formula
-        n_raw = ((Z_alpha + Z_beta) ** 2) / f2 + p + 1
-        n = math.ceil(n_raw)
+        exact = linreg_method == "Exact F-test"
+
+        try:
+            result = calculate_linear_regression(
+                alpha,
+                power,
+                f2,
+                int(p),
+                two_sided,
+                dropout_rate,
+                n_tested=int(q),
+                method="f_test" if exact else "z_approx",
+                trace=True
+            )
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
 
-        # Dropout adjustment
-        n_adj = math.ceil(n / (1 - dropout_rate))
+        tr = result["trace"]
+        n = result["n_before_dropout"]
+        n_adj = result["n_required"]
 
         # --------------------------------------------------
         st.markdown("### 🔎 Intermediate Values")
-        st.write(f"Zα = {round(Z_alpha,4)}")
-        st.write(f"Zβ = {round(Z_beta,4)}")
         st.write(f"f² = {round(f2,4)}")
         st.write(f"p = {int(p)}")
+        st.write(f"q = {int(q)}")
         st.write(f"n (before dropout) = {n}")
+        st.write(f"Method: {result['formula']}")
+
+        if exact:
+            lam = tr["noncentrality"]
+            df1, df2 = tr["df"]
+            st.write(f"λ = f² · n = {round(lam,4)}")
+            st.write(f"df = ({df1}, {df2})")
+            st.write(f"Achieved power = {round(tr['achieved_power'],4)}")
+
+            st.latex(rf"""
+            \lambda = {round(f2,4)} \times {n} = {round(lam,4)},
+            \quad F_{{{df1},\; {df2},\; \lambda}}
+            """)
+        else:
+            Z_alpha, Z_beta = tr["z_alpha"], tr["z_beta"]
 
-        st.latex(rf"""
-        n =
-        \frac{{({round(Z_alpha,4)} + {round(Z_beta,4)})^2}}{{{round(f2,4)}}}
-        + {int(p)} + 1
-        """)
+            st.write(f"Zα = {round(Z_alpha,4)}")
+            st.write(f"Zβ = {round(Z_beta,4)}")
+
+            st.latex(rf"""
+            n =
+            \frac{{({round(Z_alpha,4)} + {round(Z_beta,4)})^2}}{{{round(f2,4)}}}
+            + {int(p)} + 1
+            """)
 
         st.success(f"Required Sample Size (adjusted): {n_adj}")
         st.write(f"Before Dropout Adjustment: {n}")
@@ -1879,19 +2980,23 @@ If you plan model selection / many candidate predictors, you often need more sam
         # --------------------------------------------------
         st.markdown("### 📄 Copy for Thesis / Manuscript")
 
-        sided_txt = "two-sided" if two_sided else "one-sided"
+        if exact:
+            paragraph = paragraph_linear_regression_exact(
+                alpha, power, f2, int(p), int(q), dropout_rate, n_adj,
+                language=manuscript_language
+            )
+        else:
+            paragraph = paragraph_linear_regression(
+                alpha, power, f2, int(p), two_sided, dropout_rate, n_adj,
+                language=manuscript_language
+            )
 
-        st.code(f"""
-Sample size was calculated for multiple linear regression ({sided_txt}) using Cohen’s f² method.
-With α={alpha} and power={power}, assuming an effect size of f²={f2} and {int(p)} predictors,
-the required sample size was {n_adj} participants after adjusting for {dropout_rate*100:.1f}% anticipated dropout.
-        """)
+        st.code(paragraph)
 # ==========================================================
 # LOGISTIC REGRESSION (Full Upgrade: Meaning + Example + Derivation Tools)
 # ==========================================================
 elif study_type == "Logistic Regression":
 
-    import scipy.stats as stats
     import math
 
     st.header("Logistic Regression — Power-Based Sample Size (Beyond EPV)")
@@ -2097,34 +3202,33 @@ That’s why we also provide an EPV stability check.
 
     if st.button("Calculate Sample Size (Logistic Regression)", key="logreg_calc_final"):
 
-        # Z values
-        if two_sided:
-            Z_alpha = stats.norm.ppf(1 - alpha/2)
-        else:
-            Z_alpha = stats.norm.ppf(1 - alpha)
-
-        Z_beta = stats.norm.ppf(power)
-
-        ln_or = math.log(OR)
-
-        if abs(ln_or) < 1e-12:
-            st.error("OR cannot be 1 (no effect). Choose an OR different from 1.")
+        try:
+            result = calculate_logistic_regression(
+                p_event,
+                int(n_predictors),
+                int(epv_target),
+                dropout_rate,
+                method="wald",
+                odds_ratio=OR,
+                alpha=alpha,
+                power=power,
+                two_sided=two_sided,
+                trace=True
+            )
+        except ValueError as e:
+            st.error(str(e))
             st.stop()
 
-        p_term = p_event * (1 - p_event)
-
-        if p_term <= 0:
-            st.error("p must be strictly between 0 and 1.")
-            st.stop()
+        tr = result["trace"]
+        Z_alpha, Z_beta = tr["z_alpha"], tr["z_beta"]
+        ln_or, p_term = tr["log_or"], tr["p_term"]
 
-        # Wald planning formula
-        n_raw = ((Z_alpha + Z_beta) ** 2) / (p_term * (ln_or ** 2))
-        n_before_dropout = math.ceil(n_raw)
-        n_adj = math.ceil(n_before_dropout / (1 - dropout_rate))
+        n_before_dropout = result["n_before_dropout"]
+        n_adj = result["n_required"]
 
         # EPV check
-        required_events = epv_target * int(n_predictors)
-        expected_events = n_adj * p_event
+        required_events = result["required_events"]
+        expected_events = result["expected_events"]
 
         st.markdown("### 🔎 Intermediate Values")
         st.write(f"Zα = {round(Z_alpha,4)}")
@@ -2156,21 +3260,26 @@ That’s why we also provide an EPV stability check.
             st.success("✔ EPV stability criterion met.")
 
         st.markdown("### 📄 Copy for Thesis / Manuscript")
-        sided_txt = "two-sided" if two_sided else "one-sided"
 
-        st.code(f"""
-Sample size for logistic regression ({sided_txt}) was planned using a power-based Wald approximation.
-With α={alpha} and power={power}, assuming an outcome event probability of p={p_event}
-and a target odds ratio of OR={OR} (β=ln(OR)),
-the required sample size was {n_adj} participants after adjusting for {dropout_rate*100:.1f}% anticipated dropout.
-Model stability was additionally assessed using an EPV threshold of {epv_target} with {int(n_predictors)} predictors.
-        """)
+        paragraph = paragraph_logistic_regression_wald(
+            alpha,
+            power,
+            p_event,
+            OR,
+            int(n_predictors),
+            int(epv_target),
+            two_sided,
+            dropout_rate,
+            n_adj,
+            language=manuscript_language
+        )
+
+        st.code(paragraph)
 # ==========================================================
 # SURVIVAL (LOG-RANK) — Full Professional Version
 # ==========================================================
 elif study_type == "Survival (Log-Rank)":
 
-    import scipy.stats as stats
     import math
 
     st.header("Survival Analysis — Log-Rank Test Sample Size (Event-Driven)")
@@ -2270,31 +3379,41 @@ Lower event rate → larger required N.
         key="surv_event_rate"
     )
 
-    if st.button("Calculate Survival Sample Size", key="surv_calc"):
-
-        # Z-values
-        if two_sided:
-            Z_alpha = stats.norm.ppf(1 - alpha/2)
-        else:
-            Z_alpha = stats.norm.ppf(1 - alpha)
-
-        Z_beta = stats.norm.ppf(power)
-
-        ln_hr = math.log(hr)
-
-        # allocation proportion p
-        p = 1 / (1 + alloc_ratio)
+    surv_method = st.radio(
+        "Method",
+        LOGRANK_METHODS,
+        format_func=LOGRANK_METHOD_LABELS.get,
+        horizontal=True,
+        key="surv_method"
+    )
 
-        # required events
-        D = ((Z_alpha + Z_beta)**2) / ((ln_hr**2) * p * (1 - p))
+    if st.button("Calculate Survival Sample Size", key="surv_calc"):
 
-        # total sample size approximation
-        N_total = D / event_rate
+        try:
+            result = calculate_logrank(
+                alpha,
+                power,
+                hr,
+                alloc_ratio,
+                event_rate,
+                two_sided,
+                dropout_rate,
+                trace=True,
+                method=surv_method
+            )
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
 
-        N_total_adj = math.ceil(N_total / (1 - dropout_rate))
+        tr = result["trace"]
+        Z_alpha, Z_beta = tr["z_alpha"], tr["z_beta"]
+        ln_hr = tr["log_hr"]
+        p = tr["allocation_fraction"]
 
-        n1 = math.ceil(N_total_adj * p)
-        n2 = math.ceil(N_total_adj * (1 - p))
+        D = result["required_events"]
+        N_total_adj = result["n_total"]
+        n1 = result["n_group1"]
+        n2 = result["n_group2"]
 
         # --------------------------------------------------
         st.markdown("### 🔎 Intermediate Values")
@@ -2303,32 +3422,906 @@ Lower event rate → larger required N.
         st.write(f"Zβ = {round(Z_beta,4)}")
         st.write(f"log(HR) = {round(ln_hr,4)}")
         st.write(f"Allocation proportion p = {round(p,4)}")
-        st.write(f"Required Events (D) = {math.ceil(D)}")
+        st.write(f"Required Events (D) = {D}")
+        st.write(f"Method: {result['formula']}")
 
-        st.latex(
-            rf"D = \frac{{({round(Z_alpha,3)} + {round(Z_beta,3)})^2}}{{({round(ln_hr,3)})^2 \cdot {round(p,3)}(1-{round(p,3)})}}"
-        )
+        if surv_method == "schoenfeld":
+            st.latex(
+                rf"D = \frac{{({round(Z_alpha,3)} + {round(Z_beta,3)})^2}}{{({round(ln_hr,3)})^2 \cdot {round(p,3)}(1-{round(p,3)})}}"
+            )
 
         st.success(f"Total Required Sample Size: {N_total_adj}")
         st.success(f"Group 1 (n₁): {n1}")
         st.success(f"Group 2 (n₂): {n2}")
 
         # --------------------------------------------------
+        st.markdown("### ⚖️ Method Comparison (before dropout)")
+
+        table = logrank_methods(alpha, power, hr, alloc_ratio, event_rate, two_sided)
+
+        st.dataframe({
+            "Method": [LOGRANK_METHOD_LABELS[m] for m in LOGRANK_METHODS],
+            "Events": [int(table["events"][m]) for m in LOGRANK_METHODS],
+            "Total N": [int(table["n_total"][m]) for m in LOGRANK_METHODS]
+        })
+
+        # --------------------------------------------------
+        st.markdown("### 📄 Copy for Thesis / Manuscript")
+
+        paragraph = paragraph_logrank(
+            alpha,
+            power,
+            hr,
+            alloc_ratio,
+            event_rate,
+            two_sided,
+            dropout_rate,
+            n1,
+            n2,
+            N_total_adj,
+            D,
+            method=surv_method,
+            language=manuscript_language
+        )
+
+        st.code(paragraph)
+
+    # --------------------------------------------------
+    st.markdown("---")
+    st.subheader("📊 Interim Monitoring — Conditional & Predictive Power")
+
+    st.markdown("""
+For DMC reports: the probability of a significant final log-rank test given the interim hazard ratio,
+under the **current trend**, the **design HR**, and averaged over a prior (**predictive power**).
+The information fraction is observed events / planned events (Schoenfeld).
+    """)
+
+    cp_observed_hr = st.number_input(
+        "Observed interim HR",
+        min_value=0.01,
+        value=0.80,
+        key="surv_cp_observed_hr"
+    )
+
+    cp_fraction = st.number_input(
+        "Information fraction (events observed / planned)",
+        min_value=0.05,
+        max_value=0.95,
+        value=0.50,
+        key="surv_cp_fraction"
+    )
+
+    cp_prior_sd = st.number_input(
+        "Prior SD of log(HR) for predictive power (0 = flat prior)",
+        min_value=0.0,
+        value=0.0,
+        key="surv_cp_prior_sd"
+    )
+
+    if st.button("Calculate Conditional Power", key="surv_cp_btn"):
+
+        prior = None
+        if cp_prior_sd > 0:
+            prior = {"distribution": "lognormal", "mean": math.log(hr), "sd": cp_prior_sd}
+
+        fractions = sorted({0.25, 0.5, 0.75, cp_fraction})
+        observed = sorted({hr, (1 + hr) / 2, 1.0, cp_observed_hr})
+        fraction_axis, observed_axis = outer_grid(fractions, observed)
+
+        try:
+            at_interim = calculate_conditional_power(
+                "logrank", alpha, power, {"hazard_ratio": hr}, cp_fraction,
+                observed_effect=cp_observed_hr, prior=prior,
+                allocation_ratio=alloc_ratio, two_sided=two_sided, event_fraction=event_rate
+            )
+            surface = calculate_conditional_power(
+                "logrank", alpha, power, {"hazard_ratio": hr}, fraction_axis,
+                observed_effect=observed_axis, prior=prior,
+                allocation_ratio=alloc_ratio, two_sided=two_sided, event_fraction=event_rate
+            )
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
+
+        cp = at_interim["conditional_power"]
+
+        st.write(f"Planned events: {at_interim['events']}")
+        st.write(f"Interim z = {round(float(at_interim['z_interim']),4)}")
+        st.success(f"Conditional power (current trend): {round(float(cp['current_trend']),4)}")
+        st.success(f"Conditional power (design HR = {hr}): {round(float(cp['design']),4)}")
+        st.success(f"Predictive power: {round(float(cp['predictive']),4)}")
+
+        st.markdown("### 🗺️ Conditional Power Surface (current trend)")
+
+        table = {"Information fraction": fractions}
+        for j, h in enumerate(observed):
+            table[f"HR {round(h,3)}"] = surface["conditional_power"]["current_trend"][:, j].round(4)
+        st.dataframe(table)
+
         st.markdown("### 📄 Copy for Thesis / Manuscript")
 
-        st.code(f"""
-Sample size was calculated for a survival analysis using the log-rank test
-based on Schoenfeld’s method.
+        paragraph = paragraph_conditional_power(
+            cp_fraction,
+            at_interim["events"],
+            cp_observed_hr,
+            hr,
+            cp_prior_sd,
+            float(cp["current_trend"]),
+            float(cp["design"]),
+            float(cp["predictive"]),
+            language=manuscript_language
+        )
+
+        st.code(paragraph)
+# ==========================================================
+# ORDINAL OUTCOME (Proportional Odds / Whitehead)
+# ==========================================================
+elif study_type == "Ordinal Outcome (Proportional Odds)":
+
+    st.header("Ordinal Outcome — Proportional Odds (Whitehead Method)")
+
+    # --------------------------------------------------
+    with st.expander("📘 When to Use This Design", expanded=True):
+        st.markdown("""
+Used when the outcome is an **ordered category** compared between two groups.
 
-Assuming:
-• Two-sided α = {alpha}
-• Power = {power}
-• Target hazard ratio = {hr}
-• Expected event rate = {event_rate}
-• Allocation ratio (n2/n1) = {alloc_ratio}
+Examples:
+• Modified Rankin Scale (mRS 0–6) in stroke trials  
+• Glasgow Outcome Scale  
+• Symptom severity (none / mild / moderate / severe)  
 
-The required number of events was {math.ceil(D)},
-resulting in a total sample size of {N_total_adj} participants
-(after adjusting for {dropout_rate*100:.1f}% anticipated dropout),
-with {n1} participants in group 1 and {n2} in group 2.
+Key principle:
+A single **common odds ratio** describes the shift across every cut-point
+(proportional odds); ties between categories reduce the information.
         """)
+
+    # --------------------------------------------------
+    with st.expander("📐 Mathematical Formula (Whitehead, 1993)", expanded=True):
+
+        st.latex(r"""
+        N = \frac{3 (1 + r)^2 (Z_{\alpha} + Z_{\beta})^2}{r \, (\ln OR)^2 \left(1 - \sum_j \bar{p}_j^3\right)}
+        """)
+
+        st.latex(r"Q_1(j) = \frac{OR \cdot Q_2(j)}{1 - Q_2(j) + OR \cdot Q_2(j)}")
+
+        st.write("Where:")
+        st.write("• Q₂(j) = cumulative control probability of category ≤ j")
+        st.write("• p̄ⱼ = allocation-weighted mean probability of category j")
+        st.write("• OR = common odds ratio of being in category ≤ j (group 1 vs 2)")
+        st.write("• r = n₂ / n₁")
+
+    # --------------------------------------------------
+    st.markdown("---")
+    st.subheader("🎯 Ordinal Sample Size Calculation")
+
+    ordinal_k = st.number_input(
+        "Number of categories",
+        min_value=2,
+        max_value=10,
+        value=7,
+        step=1,
+        key="ordinal_k"
+    )
+
+    # mRS-like default distribution for 7 categories, uniform otherwise
+    default_probs = [0.10, 0.15, 0.15, 0.20, 0.15, 0.10, 0.15]
+    if int(ordinal_k) != 7:
+        default_probs = [round(1 / int(ordinal_k), 4)] * int(ordinal_k)
+
+    control_probs = [
+        st.number_input(
+            f"Control probability of category {j}",
+            min_value=0.0,
+            max_value=1.0,
+            value=default_probs[j],
+            key=f"ordinal_p{int(ordinal_k)}_{j}"
+        )
+        for j in range(int(ordinal_k))
+    ]
+
+    # Uniform defaults may not sum exactly to 1
+    prob_sum = sum(control_probs)
+    if abs(prob_sum - 1) > 0.01:
+        st.warning(f"Category probabilities sum to {round(prob_sum,4)}; they will be rescaled to 1.")
+    control_probs = [p / prob_sum for p in control_probs] if prob_sum > 0 else control_probs
+
+    ordinal_or = st.number_input(
+        "Common Odds Ratio (OR, group 1 vs group 2)",
+        min_value=0.01,
+        value=1.5,
+        key="ordinal_or"
+    )
+
+    ordinal_ratio = st.number_input(
+        "Allocation Ratio (n₂ / n₁)",
+        min_value=0.1,
+        value=1.0,
+        key="ordinal_ratio"
+    )
+
+    if st.button("Calculate Sample Size", key="ordinal_calc"):
+
+        try:
+            result = calculate_ordinal_whitehead(
+                alpha,
+                power,
+                control_probs,
+                ordinal_or,
+                ordinal_ratio,
+                two_sided,
+                dropout_rate,
+                trace=True
+            )
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
+
+        tr = result["trace"]
+
+        st.markdown("### 🔎 Intermediate Values")
+        st.write(f"Zα = {round(tr['z_alpha'],4)}")
+        st.write(f"Zβ = {round(tr['z_beta'],4)}")
+        st.write(f"ln(OR) = {round(tr['log_or'],4)}")
+        st.write(f"1 − Σ p̄³ = {round(tr['tie_factor'],4)}")
+
+        st.dataframe({
+            "Category": list(range(len(control_probs))),
+            "Control (group 2)": [round(p, 4) for p in control_probs],
+            "Treatment (group 1)": [round(p, 4) for p in result["treatment_probs"]],
+            "Mean p̄": [round(p, 4) for p in tr["mean_probs"]]
+        })
+
+        st.success(f"Group 1 Required: {result['n_group1']}")
+        st.success(f"Group 2 Required: {result['n_group2']}")
+        st.write("Total Sample Size:", result["n_total"])
+
+        # --------------------------------------------------
+        st.markdown("### ⚖️ Sensitivity to the Odds Ratio (before dropout)")
+
+        odds_grid = [ordinal_or * f for f in (0.9, 1.0, 1.1)]
+        grid = whitehead_sample_sizes(alpha, power, control_probs, odds_grid, ordinal_ratio, two_sided)
+
+        st.dataframe({
+            "OR": [round(o, 3) for o in odds_grid],
+            "n₁": [int(n) if n > 0 else None for n in grid["n_group1"]],
+            "n₂": [int(n) if n > 0 else None for n in grid["n_group2"]]
+        })
+
+        sim = simulate_ordinal_power(
+            alpha,
+            result["n1_before_dropout"],
+            control_probs,
+            ordinal_or,
+            ordinal_ratio,
+            two_sided
+        )
+        st.write(f"Simulated power of the score test at this n ({sim['n_sims']} trials): {round(sim['power'],4)}")
+
+        st.markdown("### 📄 Copy for Thesis / Manuscript")
+
+        paragraph = paragraph_ordinal(
+            alpha,
+            power,
+            control_probs,
+            ordinal_or,
+            ordinal_ratio,
+            dropout_rate,
+            result["n_group1"],
+            result["n_group2"],
+            language=manuscript_language
+        )
+
+        st.code(paragraph)
+# ==========================================================
+# COUNT OUTCOMES (Poisson / Negative Binomial Rate Ratio)
+# ==========================================================
+elif study_type == "Count Outcomes (Rate Ratio)":
+
+    st.header("Count Outcomes — Rate Ratio (Poisson / Negative Binomial)")
+
+    # --------------------------------------------------
+    with st.expander("📘 When to Use This Design", expanded=True):
+        st.markdown("""
+Used when the outcome is a **number of events per participant** over follow-up.
+
+Examples:
+• COPD / asthma exacerbations per year  
+• Hypoglycaemic episodes  
+• Seizure counts  
+• Hospital admissions  
+
+Key principle:
+Counts vary more between patients than a Poisson model allows (**overdispersion**);
+the negative binomial model adds a dispersion parameter k with Var(Y) = μ + kμ².
+        """)
+
+    # --------------------------------------------------
+    with st.expander("📐 Mathematical Formula (Wald Test of log Rate Ratio)", expanded=True):
+
+        st.latex(r"""
+        n_1 = \frac{\left(Z_{\alpha}\sqrt{V_0} + Z_{\beta}\sqrt{V_1}\right)^2}{(\ln RR)^2},
+        \quad V_1 = V(\lambda_1) + \frac{V(\lambda_2)}{r}
+        """)
+
+        st.latex(r"V(\lambda) = \frac{1}{\lambda \, E\left[t / (1 + k\lambda t)\right]}")
+
+        st.write("Where:")
+        st.write("• λ₁, λ₂ = event rates per unit time, RR = λ₁ / λ₂")
+        st.write("• k = dispersion (0 = Poisson), t = follow-up time")
+        st.write("• V₀ = V₁ (Keene), or evaluated at the group 2 rate (Zhu–Lakkis M2) or the pooled rate (M3)")
+        st.write("• r = n₂ / n₁")
+
+    # --------------------------------------------------
+    st.markdown("---")
+    st.subheader("🎯 Rate Ratio Sample Size Calculation")
+
+    rate1 = st.number_input(
+        "Event rate in group 1 (per unit time)",
+        min_value=0.0001,
+        value=0.8,
+        key="count_rate1"
+    )
+
+    rate2 = st.number_input(
+        "Event rate in group 2 (per unit time)",
+        min_value=0.0001,
+        value=1.2,
+        key="count_rate2"
+    )
+
+    count_dispersion = st.number_input(
+        "Dispersion k (0 = Poisson)",
+        min_value=0.0,
+        value=0.4,
+        key="count_dispersion"
+    )
+
+    count_follow_up = st.number_input(
+        "Follow-up per participant (maximum if variable)",
+        min_value=0.01,
+        value=1.0,
+        key="count_follow_up"
+    )
+
+    count_variable = st.checkbox(
+        "Variable follow-up (uniform between a minimum and the maximum)",
+        value=False,
+        key="count_variable"
+    )
+
+    count_min_follow_up = None
+    if count_variable:
+        count_min_follow_up = st.number_input(
+            "Minimum follow-up",
+            min_value=0.0,
+            max_value=float(count_follow_up),
+            value=float(count_follow_up) / 2,
+            key="count_min_follow_up"
+        )
+
+    count_ratio = st.number_input(
+        "Allocation Ratio (n₂ / n₁)",
+        min_value=0.1,
+        value=1.0,
+        key="count_ratio"
+    )
+
+    count_method = st.radio(
+        "Method",
+        RATE_RATIO_METHODS,
+        format_func=RATE_RATIO_METHOD_LABELS.get,
+        key="count_method"
+    )
+
+    if st.button("Calculate Sample Size", key="count_calc"):
+
+        try:
+            result = calculate_negative_binomial_rate_ratio(
+                alpha,
+                power,
+                rate1,
+                rate2,
+                count_dispersion,
+                count_follow_up,
+                count_ratio,
+                two_sided,
+                dropout_rate,
+                count_min_follow_up,
+                count_method,
+                trace=True
+            )
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
+
+        tr = result["trace"]
+
+        st.markdown("### 🔎 Intermediate Values")
+        st.write(f"Zα = {round(tr['z_alpha'],4)}")
+        st.write(f"Zβ = {round(tr['z_beta'],4)}")
+        st.write(f"ln(RR) = {round(tr['log_rate_ratio'],4)}")
+        st.write(f"V₁ = {round(tr['variance_alt'],4)}")
+        st.write(f"Method: {result['formula']}")
+
+        st.success(f"Group 1 Required: {result['n_group1']}")
+        st.success(f"Group 2 Required: {result['n_group2']}")
+        st.write("Total Sample Size:", result["n_total"])
+
+        # --------------------------------------------------
+        st.markdown("### ⚖️ Method and Dispersion Comparison (n₁ before dropout)")
+
+        dispersions = sorted({0.0, count_dispersion, 2 * count_dispersion})
+        table = {"Method": [RATE_RATIO_METHOD_LABELS[m] for m in RATE_RATIO_METHODS]}
+
+        for k in dispersions:
+            column = []
+            for m in RATE_RATIO_METHODS:
+                n1_grid = rate_ratio_sample_sizes(
+                    alpha, power, rate1, rate2, k, count_follow_up, count_ratio,
+                    two_sided, count_min_follow_up, m
+                )["n_group1"]
+                column.append(int(n1_grid))
+            table[f"k = {round(k,3)}" + (" (Poisson)" if k == 0 else "")] = column
+
+        st.dataframe(table)
+
+        st.markdown("### 📄 Copy for Thesis / Manuscript")
+
+        mean_follow_up = (
+            count_follow_up if count_min_follow_up is None
+            else (count_follow_up + count_min_follow_up) / 2
+        )
+
+        st.code(paragraph_rate_ratio(
+            alpha,
+            power,
+            rate1,
+            rate2,
+            count_dispersion,
+            mean_follow_up,
+            count_ratio,
+            two_sided,
+            dropout_rate,
+            result["n_group1"],
+            result["n_group2"],
+            language=manuscript_language
+        ))
+
+    # --------------------------------------------------
+    st.markdown("---")
+    st.subheader("🎲 Simulation Check (Negative Binomial Wald Test)")
+
+    count_sim_n1 = st.number_input(
+        "Group 1 size to simulate (before dropout)",
+        min_value=2,
+        value=100,
+        step=1,
+        key="count_sim_n1"
+    )
+
+    if st.button("Simulate Power", key="count_sim_btn"):
+
+        try:
+            sim = simulate_rate_ratio_power(
+                alpha,
+                int(count_sim_n1),
+                rate1,
+                rate2,
+                count_dispersion,
+                count_follow_up,
+                count_ratio,
+                two_sided,
+                count_min_follow_up
+            )
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
+
+        st.success(f"Simulated power: {round(sim['power'],4)} ({sim['n_sims']} trials)")
+        st.write(f"Formula (Wald, true rates) power: {round(sim['power_formula'],4)}")
+        st.write(f"Mean estimated dispersion: {round(sim['mean_dispersion_estimate'],4)}")
+# ==========================================================
+# CLUSTER RANDOMIZED TRIAL (Parallel / Stepped-Wedge)
+# ==========================================================
+elif study_type == "Cluster Randomized Trial":
+
+    st.header("Cluster Randomized Trial — Design Effect Based Sample Size")
+
+    # --------------------------------------------------
+    with st.expander("📘 When to Use This Design", expanded=True):
+        st.markdown("""
+Used when **groups of participants** (clinics, schools, villages) are randomized
+instead of individuals.
+
+Examples:
+• Hospital-level infection control program  
+• School-based nutrition intervention  
+• Staggered roll-out of a care pathway (stepped-wedge)  
+
+Key principle:
+Outcomes within a cluster are correlated (ICC), so the individually
+randomized sample size must be inflated by the **design effect**.
+        """)
+
+    # --------------------------------------------------
+    with st.expander("📐 Mathematical Formula", expanded=True):
+
+        st.markdown("Design effect (parallel design):")
+
+        st.latex(r"DE = 1 + \left((CV^2 + 1)\,\bar{m} - 1\right)\rho")
+
+        st.latex(r"n_{cluster} = n_{individual} \times DE")
+
+        st.markdown("Stepped-wedge variance (Hussey & Hughes):")
+
+        st.latex(r"""
+        Var(\hat{\theta}) =
+        \frac{I\sigma^2(\sigma^2 + T\tau^2)}
+        {(IU - W)\sigma^2 + (U^2 + ITU - TW - IV)\tau^2}
+        """)
+
+        st.write("Where:")
+        st.latex(r"\bar{m} = \text{mean cluster size}, \quad \rho = ICC")
+        st.latex(r"CV = \text{coefficient of variation of cluster sizes}")
+        st.latex(r"\sigma^2 = (1-\rho)SD^2/m, \quad \tau^2 = \rho\,SD^2")
+
+    # --------------------------------------------------
+    st.markdown("---")
+    st.subheader("🎯 Final Sample Size Planning")
+
+    cluster_design = st.radio(
+        "Cluster design",
+        ["Parallel", "Stepped-wedge"],
+        key="cluster_design"
+    )
+
+    if cluster_design == "Parallel":
+        outcome = st.radio(
+            "Outcome type",
+            ["Continuous (means)", "Binary (proportions)"],
+            key="cluster_outcome"
+        )
+    else:
+        outcome = "Continuous (means)"
+
+    if outcome == "Continuous (means)":
+        sd_planning = st.number_input("SD for Planning", min_value=0.0001, value=1.0, key="cluster_sd")
+        delta = st.number_input("Mean Difference (Δ)", min_value=0.0001, value=0.5, key="cluster_delta")
+    else:
+        p1 = st.number_input("Proportion Group 1 (p₁)", min_value=0.0001, max_value=0.9999, value=0.30, key="cluster_p1")
+        p2 = st.number_input("Proportion Group 2 (p₂)", min_value=0.0001, max_value=0.9999, value=0.20, key="cluster_p2")
+
+    m = st.number_input(
+        "Cluster size (participants per cluster" + (" per period)" if cluster_design == "Stepped-wedge" else ")"),
+        min_value=1.0,
+        value=20.0,
+        key="cluster_m"
+    )
+
+    icc = st.number_input("ICC (ρ)", min_value=0.0, max_value=0.99, value=0.05, step=0.01, key="cluster_icc")
+
+    if cluster_design == "Parallel":
+        cv = st.number_input("CV of cluster size", min_value=0.0, value=0.0, step=0.05, key="cluster_cv")
+    else:
+        n_steps = st.number_input("Number of steps", min_value=2, value=4, step=1, key="cluster_steps")
+
+    if st.button("Calculate Sample Size (Cluster)", key="cluster_calc"):
+
+        try:
+            if cluster_design == "Stepped-wedge":
+                result = calculate_stepped_wedge(
+                    alpha, power, sd_planning, delta, m, icc, int(n_steps),
+                    two_sided=two_sided, dropout_rate=dropout_rate, trace=True
+                )
+            elif outcome == "Continuous (means)":
+                result = calculate_cluster_two_means(
+                    alpha, power, sd_planning, delta, m, icc, cv,
+                    two_sided=two_sided, dropout_rate=dropout_rate, trace=True
+                )
+            else:
+                result = calculate_cluster_two_proportions(
+                    alpha, power, p1, p2, m, icc, cv,
+                    two_sided=two_sided, dropout_rate=dropout_rate, trace=True
+                )
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
+
+        st.markdown("### 🔎 Intermediate Values")
+
+        if cluster_design == "Stepped-wedge":
+            st.write(f"Periods (T) = {result['n_periods']}")
+            st.write(f"Clusters per step = {result['clusters_per_step']}")
+            st.write(f"σ² (cluster-period mean) = {round(result['trace']['sigma2'],5)}, τ² = {round(result['trace']['tau2'],5)}")
+            st.write(f"Var(θ̂) (Hussey–Hughes) = {round(result['trace']['variance'],6)}")
+            st.write(f"Achieved power = {round(result['achieved_power'],4)}")
+
+            st.success(f"Required Clusters: {result['n_clusters']}")
+            st.write("Total Participants:", result["n_total"])
+
+            paragraph = paragraph_stepped_wedge(
+                alpha,
+                power,
+                sd_planning,
+                delta,
+                icc,
+                int(n_steps),
+                m,
+                dropout_rate,
+                result["n_clusters"],
+                result["clusters_per_step"],
+                result["n_total"],
+                language=manuscript_language
+            )
+        else:
+            st.write(f"Design effect (DE) = {round(result['design_effect'],4)}")
+            st.write(f"Individually randomized n per group = {result['n1_individual']} / {result['n2_individual']}")
+            st.write(f"Inflated n per group (unrounded) = {round(result['trace']['n1_inflated_raw'],2)} / {round(result['trace']['n2_inflated_raw'],2)}")
+
+            st.success(f"Clusters Group 1: {result['clusters_group1']}")
+            st.success(f"Clusters Group 2: {result['clusters_group2']}")
+            st.write("Total Participants:", result["n_total"])
+
+            paragraph = paragraph_cluster_parallel(
+                alpha,
+                power,
+                result["design_effect"],
+                icc,
+                m,
+                cv,
+                dropout_rate,
+                result["clusters_group1"],
+                result["clusters_group2"],
+                result["n_total"],
+                language=manuscript_language
+            )
+
+        st.markdown("### 📄 Copy for Thesis / Manuscript")
+        st.code(paragraph)
+# ==========================================================
+# REPEATED MEASURES (Longitudinal, k time points)
+# ==========================================================
+elif study_type == "Repeated Measures (Longitudinal)":
+
+    st.header("Repeated Measures — Longitudinal Two-Group Design")
+
+    # --------------------------------------------------
+    with st.expander("📘 When to Use This Design", expanded=True):
+        st.markdown("""
+Used when each participant is measured at **k time points** and two groups are
+compared on the rate of change (slope), the time-averaged mean, or a contrast.
+
+Examples:
+• HbA1c measured every 3 months for 1 year  
+• Lung function decline (slope) in treated vs untreated patients  
+• Pain score averaged over repeated visits  
+
+Correlation between repeated measurements:
+• Compound symmetry (CS): equal correlation between any two visits  
+• AR(1): correlation decays with time lag (ρ^|lag|)  
+        """)
+
+    # --------------------------------------------------
+    with st.expander("📐 Mathematical Formula", expanded=True):
+
+        st.latex(r"""
+        n_1 = \left(1 + \frac{1}{r}\right)
+        \frac{(Z_{\alpha} + Z_{\beta})^2 \cdot SD^2 \cdot v}{\Delta^2}
+        """)
+
+        st.write("Variance factor v:")
+        st.latex(r"v_{slope} = \left[(X^\top R^{-1} X)^{-1}\right]_{22}, \quad X = [1, t]")
+        st.latex(r"v_{mean} = c^\top R c, \quad c = \frac{1}{k}\mathbf{1}")
+
+        st.write("Compound symmetry shortcuts:")
+        st.latex(r"v_{slope} = \frac{1-\rho}{\sum (t_j - \bar{t})^2}, \quad v_{mean} = \frac{1 + (k-1)\rho}{k}")
+
+    # --------------------------------------------------
+    st.markdown("---")
+    st.subheader("🎯 Final Sample Size Planning")
+
+    rm_estimand = st.radio(
+        "Estimand",
+        ["Slope (rate of change)", "Time-averaged mean"],
+        key="rm_estimand"
+    )
+
+    rm_structure = st.radio(
+        "Correlation structure",
+        ["Compound symmetry", "AR(1)"],
+        horizontal=True,
+        key="rm_structure"
+    )
+
+    k_points = st.number_input("Number of time points (k)", min_value=2, value=4, step=1, key="rm_k")
+    rho = st.number_input("Correlation (ρ)", min_value=0.0, max_value=0.99, value=0.5, step=0.05, key="rm_rho")
+    sd_planning = st.number_input("SD at each time point", min_value=0.0001, value=1.0, key="rm_sd")
+
+    delta = st.number_input(
+        "Difference in slope per visit (Δ)" if rm_estimand.startswith("Slope") else "Difference in time-averaged mean (Δ)",
+        min_value=0.0001,
+        value=0.2 if rm_estimand.startswith("Slope") else 0.5,
+        key="rm_delta"
+    )
+
+    ratio = st.number_input("Allocation Ratio (n₂ / n₁)", min_value=0.1, value=1.0, key="rm_ratio")
+
+    if st.button("Calculate Sample Size (Repeated Measures)", key="rm_calc"):
+
+        result = calculate_repeated_measures(
+            alpha,
+            power,
+            sd_planning,
+            delta,
+            int(k_points),
+            rho,
+            structure="cs" if rm_structure == "Compound symmetry" else "ar1",
+            estimand="slope" if rm_estimand.startswith("Slope") else "mean",
+            allocation_ratio=ratio,
+            two_sided=two_sided,
+            dropout_rate=dropout_rate,
+            trace=True
+        )
+
+        st.markdown("### 🔎 Intermediate Values")
+        st.write(f"Zα = {round(result['trace']['z_alpha'],4)}")
+        st.write(f"Zβ = {round(result['trace']['z_beta'],4)}")
+        st.write(f"Variance factor v = {round(result['variance_factor'],5)}")
+        st.write(f"n₁ (unrounded) = {round(result['trace']['n1_raw'],2)}")
+
+        st.success(f"Group 1 Required: {result['n_group1']}")
+        st.success(f"Group 2 Required: {result['n_group2']}")
+        st.write("Total Sample Size:", result["n_total"])
+
+        st.markdown("### 📄 Copy for Thesis / Manuscript")
+
+        paragraph = paragraph_repeated_measures(
+            alpha,
+            power,
+            sd_planning,
+            delta,
+            int(k_points),
+            rho,
+            "cs" if rm_structure == "Compound symmetry" else "ar1",
+            "slope" if rm_estimand.startswith("Slope") else "mean",
+            dropout_rate,
+            result["n_group1"],
+            result["n_group2"],
+            language=manuscript_language
+        )
+
+        st.code(paragraph)
+
+# ==========================================================
+# PREDICTION MODEL (RILEY CRITERIA)
+# ==========================================================
+elif study_type == "Prediction Model (Riley Criteria)":
+
+    st.header("Prediction Model Development — Minimum Sample Size (Riley et al.)")
+
+    # --------------------------------------------------
+    with st.expander("📘 When to Use This Design", expanded=True):
+        st.markdown("""
+Used when the aim is to **develop a multivariable prediction model** (diagnostic or prognostic),
+rather than to test a single association.
+
+The required sample size is the largest of several criteria:
+• **Criterion 1:** small overfitting — expected shrinkage ≥ 0.9  
+• **Criterion 2:** small optimism — apparent vs adjusted R² differ by ≤ 0.05  
+• **Criterion 3:** precise overall risk (binary / survival) or residual SD (continuous)  
+• **Criterion 4:** precise mean outcome (continuous, optional)  
+
+Parameters (p) count **all candidate predictor parameters**, including
+categories and non-linear terms, not only the final predictors.
+        """)
+
+    # --------------------------------------------------
+    with st.expander("📐 Mathematical Formula", expanded=True):
+
+        st.latex(r"""
+        n_1 = \frac{p}{(S - 1)\,\ln\left(1 - \frac{R^2_{CS}}{S}\right)}
+        """)
+        st.latex(r"""
+        S_{VH} = \frac{R^2_{CS}}{R^2_{CS} + \delta \cdot \max(R^2_{CS})},
+        \qquad n_2 = \frac{p}{(S_{VH} - 1)\,\ln\left(1 - \frac{R^2_{CS}}{S_{VH}}\right)}
+        """)
+        st.latex(r"""
+        n_3 = \left(\frac{1.96}{0.05}\right)^2 \phi (1 - \phi)
+        """)
+
+        st.write("Where:")
+        st.write("• R²_CS = anticipated Cox–Snell R² (R²_Nagelkerke × max R²_CS)")
+        st.write("• S = target shrinkage, δ = tolerated optimism in R²_Nagelkerke")
+        st.write("• φ = outcome proportion (binary); continuous and survival use analogous criteria")
+
+    # --------------------------------------------------
+    st.markdown("---")
+    st.subheader("🎯 Final Sample Size Planning")
+
+    pm_outcome = st.radio(
+        "Outcome type",
+        ["Binary", "Continuous", "Time-to-event"],
+        horizontal=True,
+        key="pm_outcome"
+    )
+
+    n_params = st.number_input("Candidate predictor parameters (p)", min_value=1, value=10, step=1, key="pm_p")
+
+    outcome_key = {"Binary": "binary", "Continuous": "continuous", "Time-to-event": "survival"}[pm_outcome]
+    inputs = {}
+
+    if outcome_key == "continuous":
+        r2_value = st.number_input("Anticipated adjusted R²", min_value=0.001, max_value=0.89, value=0.2, step=0.01, key="pm_r2")
+        inputs["r2_cs"] = r2_value
+        inputs["intercept"] = st.number_input("Mean outcome value", value=1.9, key="pm_intercept")
+        inputs["sd"] = st.number_input("Outcome SD", min_value=0.0001, value=0.6, key="pm_sd")
+    else:
+        r2_type = st.radio("R² supplied as", ["Cox–Snell R²", "Nagelkerke R²"], horizontal=True, key="pm_r2_type")
+        r2_value = st.number_input("Anticipated R²", min_value=0.001, max_value=0.99, value=0.1, step=0.01, key="pm_r2")
+        inputs["r2_cs" if r2_type == "Cox–Snell R²" else "r2_nagelkerke"] = r2_value
+
+        if outcome_key == "binary":
+            inputs["prevalence"] = st.number_input("Outcome proportion (φ)", min_value=0.001, max_value=0.999, value=0.2, key="pm_prev")
+        else:
+            inputs["rate"] = st.number_input("Event rate (per person-year)", min_value=0.0001, value=0.065, key="pm_rate")
+            inputs["mean_followup"] = st.number_input("Mean follow-up (years)", min_value=0.01, value=2.07, key="pm_fup")
+            inputs["timepoint"] = st.number_input("Prediction horizon (years)", min_value=0.01, value=2.0, key="pm_time")
+
+    if st.button("Calculate Sample Size (Prediction Model)", key="pm_calc"):
+
+        try:
+            result = calculate_prediction_model(
+                outcome_key,
+                int(n_params),
+                dropout_rate=dropout_rate,
+                trace=True,
+                **inputs
+            )
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
+
+        st.markdown("### 🔎 Intermediate Values")
+        st.write(f"R²_CS = {round(result['r2_cs'],4)}")
+        if outcome_key != "continuous":
+            st.write(f"Max R²_CS = {round(result['max_r2_cs'],4)}")
+        for i, (n_i, raw) in enumerate(zip(result["criteria"], result["trace"]["criteria_raw"]), start=1):
+            st.write(f"Criterion {i}: n = {n_i} (unrounded {round(raw,2)})")
+        st.write(f"Binding criterion: {result['binding_criterion']}")
+        if "events" in result:
+            st.write(f"Events = {round(result['events'],1)} (events per parameter = {round(result['epp'],2)})")
+
+        st.success(f"Required Sample Size (adjusted): {result['n_required']}")
+        st.write(f"Before Dropout Adjustment: {result['n_before_dropout']}")
+
+        # --------------------------------------------------
+        st.markdown("### 📊 Planning Table (n by parameters × R²_CS)")
+
+        grid_kwargs = {k: v for k, v in inputs.items() if k not in ("r2_cs", "r2_nagelkerke")}
+        p_axis = sorted({max(1, int(n_params) + d) for d in (-10, -5, 0, 5, 10)})
+        r2_axis = [round(result["r2_cs"] * f, 4) for f in (0.5, 0.75, 1.0, 1.25, 1.5)]
+
+        table = prediction_model_grid(outcome_key, p_axis, r2_axis, **grid_kwargs)
+
+        columns = {"p": p_axis}
+        for j, r2 in enumerate(r2_axis):
+            columns[f"R²_CS = {r2}"] = [int(n) if n > 0 else None for n in table["n_required"][:, j]]
+
+        st.dataframe(columns)
+
+        # --------------------------------------------------
+        st.markdown("### 📄 Copy for Thesis / Manuscript")
+
+        paragraph = paragraph_prediction_model(
+            outcome_key,
+            int(n_params),
+            result["r2_cs"],
+            0.9,
+            0.05,
+            dropout_rate,
+            result["n_required"],
+            result["binding_criterion"],
+            language=manuscript_language
+        )
+
+        st.code(paragraph)
@@ -0,0 +1,177 @@
+
+# ==========================================
+# Conditional and Predictive Power — Interim Monitoring
+# ==========================================
+
+import math
+
+import numpy as np
+from scipy.special import ndtr
+
+from utils.array_utils import as_float_array
+from utils.stat_utils import z_alpha, validate_positive
+
+from calculators.continuous.two_independent_means import calculate_two_independent_means
+from calculators.survival.logrank import calculate_logrank
+
+
+DESIGNS = ("two_means", "logrank")
+
+# Priors with a conjugate normal update on the drift scale
+# (lognormal = normal prior on the log hazard ratio)
+PRIOR_FAMILIES = {"two_means": "normal", "logrank": "lognormal"}
+
+
+def conditional_power(z_interim, information_fraction, critical_value, drift):
+    """
+    P(Z_final > c | Z_t = z) for a Brownian motion with drift θ
+    (the expected final Z), vectorized over z, t and θ:
+
+    CP = Φ((z √t + θ (1 − t) − c) / √(1 − t))
+    """
+
+    z = as_float_array(z_interim)
+    t = as_float_array(information_fraction)
+
+    return ndtr((z * np.sqrt(t) + drift * (1 - t) - critical_value) / np.sqrt(1 - t))
+
+
+def predictive_power(z_interim, information_fraction, critical_value, prior_mean=0.0, prior_sd=None):
+    """
+    Conditional power averaged over the posterior of the drift θ given
+    the interim data, for a N(prior_mean, prior_sd²) prior on θ
+    (flat if prior_sd is None):
+
+    PP = Φ((z √t + m (1 − t) − c) / √((1 − t) + (1 − t)² v)),
+    m, v = posterior mean and variance of θ
+    """
+
+    z = as_float_array(z_interim)
+    t = as_float_array(information_fraction)
+
+    prior_precision = 0.0 if prior_sd is None else 1 / prior_sd ** 2
+    precision = prior_precision + t
+
+    m = (prior_mean * prior_precision + z * np.sqrt(t)) / precision
+    v = 1 / precision
+
+    return ndtr(
+        (z * np.sqrt(t) + m * (1 - t) - critical_value)
+        / np.sqrt((1 - t) + (1 - t) ** 2 * v)
+    )
+
+
+def _planned_design(design, alpha, power, params, allocation_ratio, two_sided, event_fraction):
+    """
+    Planned size (from the fixed-design calculator), the standard error
+    of the final effect estimate and the design effect, on the analysis
+    scale (difference in means, or log HR).
+    """
+
+    r = allocation_ratio
+
+    if design == "two_means":
+        n1 = calculate_two_independent_means(
+            alpha, power, params["sd"], params["delta"], r, two_sided
+        )["n_before_dropout_group1"]
+        se = params["sd"] * math.sqrt((1 + 1 / r) / n1)
+        return {"n_group1": n1}, se, params["delta"]
+
+    events = calculate_logrank(
+        alpha, power, params["hazard_ratio"], r, event_fraction, two_sided
+    )["required_events"]
+    se = 1 / math.sqrt(events * r / (1 + r) ** 2)
+    return {"events": events}, se, math.log(params["hazard_ratio"])
+
+
+def calculate_conditional_power(
+    design: str,
+    alpha: float,
+    power: float,
+    params: dict,
+    information_fraction,
+    z_interim=None,
+    observed_effect=None,
+    prior: dict = None,
+    allocation_ratio: float = 1.0,
+    two_sided: bool = True,
+    event_fraction: float = 0.5
+) -> dict:
+    """
+    Conditional power at an interim look under the current trend and
+    the design effect, and predictive power over a prior, for a trial
+    planned with calculate_two_independent_means ("two_means", params:
+    delta, sd) or calculate_logrank ("logrank", params: hazard_ratio).
+
+    information_fraction = t in (0, 1); events / planned events for
+                           the log-rank test
+    z_interim / observed_effect = interim result as a z statistic
+                  (positive = favourable) or as an estimate (mean
+                  difference or HR); exactly one is given
+    prior = {"distribution": "normal" | "lognormal", "mean", "sd"} on
+            delta, or on log HR for the log-rank test; None = flat
+
+    All of t, z and the observed effect broadcast, so outer_grid
+    axes give whole conditional power surfaces in one call.
+    """
+
+    if design not in DESIGNS:
+        raise ValueError(f"Design must be one of {DESIGNS}.")
+
+    if (z_interim is None) == (observed_effect is None):
+        raise ValueError("Give either the interim z or the observed effect.")
+
+    validate_positive(allocation_ratio, "Allocation ratio")
+
+    t = as_float_array(information_fraction)
+    if np.any((t <= 0) | (t >= 1)):
+        raise ValueError("Information fractions must be between 0 and 1.")
+
+    planned, se, effect = _planned_design(
+        design, alpha, power, params, allocation_ratio, two_sided, event_fraction
+    )
+
+    # Favourable direction = sign of the design effect
+    direction = math.copysign(1.0, effect)
+    drift = abs(effect) / se
+    c = z_alpha(alpha, two_sided)
+
+    if z_interim is None:
+        observed = as_float_array(observed_effect)
+        if design == "logrank":
+            validate_positive(np.min(observed), "Observed hazard ratio")
+            observed = np.log(observed)
+        # Interim SE is se / √t
+        z = direction * observed * np.sqrt(t) / se
+    else:
+        z = as_float_array(z_interim)
+
+    if prior is None:
+        prior_mean, prior_sd = 0.0, None
+    else:
+        if prior.get("distribution") != PRIOR_FAMILIES[design]:
+            raise ValueError(f"The prior for '{design}' must be {PRIOR_FAMILIES[design]}.")
+        validate_positive(prior["sd"], "Prior SD")
+        prior_mean = direction * prior["mean"] / se
+        prior_sd = prior["sd"] / se
+
+    z, t = np.broadcast_arrays(z, t)
+
+    return {
+        "information_fraction": t,
+        "z_interim": z,
+        "conditional_power": {
+            "current_trend": conditional_power(z, t, c, z / np.sqrt(t)),
+            "design": conditional_power(z, t, c, drift),
+            "predictive": predictive_power(z, t, c, prior_mean, prior_sd)
+        },
+        "drift": drift,
+        "critical_value": c,
+        **planned,
+        "formula": "CP = Φ((z√t + θ(1 − t) − c)/√(1 − t)); θ = trend z/√t, design drift, or posterior (predictive)",
+        "assumptions": [
+            "Test statistic follows a Brownian motion in information time",
+            "Final analysis at the planned information",
+            "Flat prior for predictive power" if prior is None else "Normal prior on the effect (analysis scale)"
+        ]
+    }
@@ -0,0 +1,294 @@
+
+# ==========================================
+# Adaptive Sample Size Re-estimation — Promising Zone Simulator
+# ==========================================
+
+import numpy as np
+from scipy.special import ndtr, ndtri
+
+from utils.array_utils import search_min_n
+from utils.stat_utils import adjust_for_dropout, ceil_int, validate_positive, validate_proportion
+
+from calculators.continuous.two_independent_means import power_two_independent_means
+from calculators.binary.two_proportions import power_two_proportions
+
+
+DESIGNS = ("two_means", "two_proportions")
+
+RULES = ("chw", "mehta_pocock")
+
+RULE_LABELS = {
+    "chw": "Cui–Hung–Wang (weighted test)",
+    "mehta_pocock": "Mehta–Pocock (conventional test)"
+}
+
+ZONES = ("futility", "unfavourable", "promising", "favourable")
+
+# Simulated trials per vectorized batch
+_BATCH = 2 ** 20
+
+# Interim z values scanned for the Mehta–Pocock promising-zone bound
+_CP_MIN_GRID = 4001
+
+
+def _drift(design, params, r):
+    """
+    Model for the final test statistic: with n group 1 subjects
+    Z ~ N(θ √n, scale²), with independent increments between looks.
+    θ and scale reproduce the power functions of the fixed designs
+    (scale ≠ 1 only for the pooled two-proportion test).
+    """
+
+    if design == "two_means":
+        validate_positive(params["sd"], "SD")
+        return abs(params["delta"]) / (params["sd"] * np.sqrt(1 + 1 / r)), 1.0
+
+    p1 = validate_proportion(params["p1"])
+    p2 = validate_proportion(params["p2"])
+    p_bar = (p1 + r * p2) / (1 + r)
+
+    var_null = p_bar * (1 - p_bar) * (1 + 1 / r)
+    var_alt = p1 * (1 - p1) + p2 * (1 - p2) / r
+
+    return abs(p1 - p2) / np.sqrt(var_null), np.sqrt(var_alt / var_null)
+
+
+def _fixed_power(design, alpha, n, params, r):
+    if design == "two_means":
+        return float(power_two_independent_means(alpha, n, params["sd"], params["delta"], r, False))
+    return float(power_two_proportions(alpha, n, params["p1"], params["p2"], r, False))
+
+
+def _stage2_bound(rule, z1, n1, n2, n_planned, c):
+    """
+    Critical value b for the standardized stage 2 statistic Z2 (on n2
+    subjects): H0 is rejected when Z2 > b.
+
+    CHW: w1 Z1 + w2 Z2 > c with weights fixed at the planned fractions
+    Mehta–Pocock: (√n1 Z1 + √n2 Z2) / √(n1 + n2) > c
+    """
+
+    if rule == "chw":
+        w1 = np.sqrt(n1 / n_planned)
+        w2 = np.sqrt(1 - n1 / n_planned)
+        return (c - w1 * z1) / w2
+
+    return (c * np.sqrt(n1 + n2) - np.sqrt(n1) * z1) / np.sqrt(n2)
+
+
+def _conditional_power(rule, z1, n1, n2, n_planned, c):
+    """
+    Conditional power under the current trend θ̂ = z1 / √n1.
+    """
+    return ndtr(z1 * np.sqrt(n2 / n1) - _stage2_bound(rule, z1, n1, n2, n_planned, c))
+
+
+def _increased_n2(rule, z1, n1, n2_planned, n2_max, n_planned, c, target_cp):
+    """
+    Smallest stage 2 size in [n2_planned, n2_max] giving conditional
+    power ≥ target_cp (n2_max when unreachable), bisected for all
+    interim values together.
+    """
+
+    def enough(n2):
+        return _conditional_power(rule, z1, n1, n2, n_planned, c) >= target_cp
+
+    n2 = search_min_n(enough, np.full(z1.shape, n2_planned), np.full(z1.shape, n2_max))
+    return np.where(n2 < 0, n2_max, n2)
+
+
+def promising_zone_lower_bound(n_interim, n_planned, n_max, alpha, target_cp=0.9) -> float:
+    """
+    Mehta–Pocock lower bound of the promising zone: the smallest
+    conditional power (at the planned n) from which increasing n and
+    using the conventional test never raises the conditional type I
+    error above that of the planned design, so the overall type I
+    error is preserved.
+    """
+
+    c = ndtri(1 - alpha)
+    n1 = n_interim
+    n2_planned = n_planned - n_interim
+
+    # Interim z from a near-zero conditional power up to the target
+    z_lo = _interim_z(1e-4, n1, n2_planned, n_planned, c)
+    z_hi = _interim_z(target_cp, n1, n2_planned, n_planned, c)
+    z1 = np.linspace(z_lo, z_hi, _CP_MIN_GRID)
+
+    n2 = _increased_n2("mehta_pocock", z1, n1, n2_planned, n_max - n_interim, n_planned, c, target_cp)
+
+    error_new = ndtr(-_stage2_bound("mehta_pocock", z1, n1, n2, n_planned, c))
+    error_planned = ndtr(-_stage2_bound("chw", z1, n1, n2_planned, n_planned, c))
+
+    unsafe = np.flatnonzero(error_new > error_planned * (1 + 1e-9))
+
+    if not unsafe.size:
+        return 1e-4
+
+    first_safe = min(unsafe[-1] + 1, z1.size - 1)
+    return float(_conditional_power("chw", z1[first_safe], n1, n2_planned, n_planned, c))
+
+
+def _interim_z(cp, n1, n2, n_planned, c):
+    """
+    Interim z at which the conditional power at the planned n equals cp
+    (closed form: CP = Φ(z1 (√(n2/n1) + w1/w2) − c/w2)).
+    """
+
+    w1 = np.sqrt(n1 / n_planned)
+    w2 = np.sqrt(n2 / n_planned)
+    return (ndtri(cp) + c / w2) / (np.sqrt(n2 / n1) + w1 / w2)
+
+
+def _simulate(rule, theta, scale, n1, n2_planned, n2_max, n_planned, c, target_cp, cp_min, futility_cp, n_sims, rng):
+    """
+    Batched simulation of the interim and final statistics.
+    Returns (rejections, counts of final group 1 size, zone counts).
+    """
+
+    rejections = 0
+    sizes = np.zeros(n1 + n2_max + 1, dtype=np.int64)
+    zones = np.zeros(len(ZONES), dtype=np.int64)
+
+    for start in range(0, n_sims, _BATCH):
+        size = min(_BATCH, n_sims - start)
+
+        z1 = theta * np.sqrt(n1) + scale * rng.standard_normal(size)
+        cp = _conditional_power(rule, z1, n1, n2_planned, n_planned, c)
+
+        zone = np.select([cp < futility_cp, cp < cp_min, cp < target_cp], [0, 1, 2], 3)
+
+        n2 = np.full(size, n2_planned, dtype=np.int64)
+        promising = zone == 2
+        if promising.any():
+            n2[promising] = _increased_n2(
+                rule, z1[promising], n1, n2_planned, n2_max, n_planned, c, target_cp
+            )
+
+        stopped = zone == 0
+        n2[stopped] = 0
+
+        # Stage 2 increment on its own n2 subjects
+        n2_safe = np.maximum(n2, 1)
+        z2 = theta * np.sqrt(n2_safe) + scale * rng.standard_normal(size)
+
+        reject = ~stopped & (z2 > _stage2_bound(rule, z1, n1, n2_safe, n_planned, c))
+
+        rejections += int(reject.sum())
+        sizes += np.bincount(n1 + n2, minlength=sizes.size)
+        zones += np.bincount(zone, minlength=len(ZONES))
+
+    return rejections, sizes, zones
+
+
+def simulate_sample_size_reestimation(
+    design: str,
+    alpha: float,
+    params: dict,
+    n_planned: int,
+    n_interim: int,
+    n_max: int,
+    allocation_ratio: float = 1.0,
+    rule: str = "mehta_pocock",
+    target_cp: float = 0.9,
+    cp_min: float = None,
+    futility_cp: float = 0.0,
+    dropout_rate: float = 0.0,
+    n_sims: int = 10 ** 7,
+    seed: int = 20240601
+) -> dict:
+    """
+    Operating characteristics of unblinded sample size re-estimation at
+    one interim look, simulated from the interim and stage 2 test
+    statistics directly (no patient-level data).
+
+    design = "two_means" (params: delta, sd) or "two_proportions"
+             (params: p1, p2); params are the true values simulated
+    alpha = one-sided type I error
+    n_planned, n_interim, n_max = planned, interim and maximum group 1
+             sizes (group 2 = allocation_ratio × group 1)
+    rule = "chw" (weighted statistic; any re-estimation keeps alpha) or
+           "mehta_pocock" (conventional statistic; n is only increased
+           in the promising zone)
+    target_cp = conditional power the increase aims for (trend θ̂)
+    cp_min = lower bound of the promising zone (None = the Mehta–Pocock
+             bound that preserves alpha for the conventional test)
+    futility_cp = stop at the interim below this conditional power
+
+    Zones by conditional power at the planned n: futility (stop),
+    unfavourable (keep n), promising (increase towards target_cp,
+    capped at n_max), favourable (≥ target_cp, keep n). The type I
+    error is simulated as well, at θ = 0.
+    """
+
+    if design not in DESIGNS:
+        raise ValueError(f"Design must be one of {DESIGNS}.")
+
+    if rule not in RULES:
+        raise ValueError(f"Rule must be one of {RULES}.")
+
+    if not 0 < alpha < 0.5:
+        raise ValueError("One-sided alpha must be between 0 and 0.5.")
+
+    validate_positive(allocation_ratio, "Allocation ratio")
+
+    n_planned, n_interim, n_max = int(n_planned), int(n_interim), int(n_max)
+
+    if not 0 < n_interim < n_planned <= n_max:
+        raise ValueError("Sizes must satisfy 0 < interim n < planned n ≤ maximum n.")
+
+    if not 0 < target_cp < 1:
+        raise ValueError("Target conditional power must be between 0 and 1.")
+
+    if cp_min is None:
+        cp_min = promising_zone_lower_bound(n_interim, n_planned, n_max, alpha, target_cp)
+
+    if not 0 <= futility_cp <= cp_min <= target_cp:
+        raise ValueError("Need futility CP ≤ promising-zone lower bound ≤ target CP.")
+
+    r = allocation_ratio
+    theta, scale = _drift(design, params, r)
+    c = ndtri(1 - alpha)
+
+    n1 = n_interim
+    n2_planned = n_planned - n_interim
+    n2_max = n_max - n_interim
+
+    settings = (rule, n1, n2_planned, n2_max, n_planned, c, target_cp, cp_min, futility_cp, n_sims)
+
+    rejections, sizes, zones = _simulate(
+        settings[0], theta, scale, *settings[1:], np.random.default_rng(seed)
+    )
+    null_rejections, _, _ = _simulate(
+        settings[0], 0.0, 1.0, *settings[1:], np.random.default_rng(seed + 1)
+    )
+
+    n_group1 = np.flatnonzero(sizes)
+    probability = sizes[n_group1] / n_sims
+    n_total = np.array([
+        adjust_for_dropout(int(n), dropout_rate) + adjust_for_dropout(ceil_int(r * n), dropout_rate)
+        for n in n_group1
+    ])
+
+    return {
+        "power": rejections / n_sims,
+        "type_i_error": null_rejections / n_sims,
+        "fixed_power": _fixed_power(design, alpha, n_planned, params, r),
+        "expected_n_before_dropout_group1": float(probability @ n_group1),
+        "expected_n_total": float(probability @ n_total),
+        "cp_min": cp_min,
+        "zone_probabilities": dict(zip(ZONES, (zones / n_sims).tolist())),
+        "n_distribution": {
+            "n_before_dropout_group1": n_group1,
+            "n_total": n_total,
+            "probability": probability
+        },
+        "rule": rule,
+        "formula": f"{RULE_LABELS[rule]}; stage 2 increased to reach CP ≥ {target_cp} in the promising zone",
+        "assumptions": [
+            "One interim look, unblinded effect estimate",
+            "Normal test statistics with independent increments",
+            "Conditional power under the observed trend",
+            "Re-estimation on evaluable subjects; totals adjusted for dropout"
+        ]
+    }
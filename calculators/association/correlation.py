@@ -5,6 +5,8 @@
 
 import math
 
+# numpy / scipy are imported inside the vectorized functions so that the
+# closed-form Fisher-z calculator loads with the standard library only
 from utils.stat_utils import (
     z_alpha,
     z_beta,
@@ -13,39 +15,360 @@ from utils.stat_utils import (
 )
 
 
+METHODS = ("fisher_z", "exact")
+
+# Integration half-width in Fisher-z standard deviations
+_WINDOW = 12.0
+
+
 def calculate_correlation(
     alpha: float,
     power: float,
     r: float,
     two_sided: bool = True,
-    dropout_rate: float = 0.0
+    dropout_rate: float = 0.0,
+    rho0: float = 0.0,
+    method: str = "fisher_z",
+    trace: bool = False
 ) -> dict:
     """
     Calculates required sample size for detecting correlation.
 
-    Uses Fisher z-transformation.
+    Uses Fisher z-transformation by default.
+
+    rho0 = correlation under H0 (default 0)
+    method = "fisher_z" (large-sample approximation) or "exact"
+             (exact distribution of the sample correlation coefficient)
+    trace = also return the intermediate values in result["trace"]
     """
 
     if r <= -0.99 or r >= 0.99:
         raise ValueError("Correlation must be between -0.99 and 0.99.")
 
+    if rho0 <= -0.99 or rho0 >= 0.99:
+        raise ValueError("Null correlation must be between -0.99 and 0.99.")
+
+    if r == rho0:
+        raise ValueError("Target correlation must differ from the null correlation.")
+
+    if method not in METHODS:
+        raise ValueError(f"Method must be one of {METHODS}.")
+
     Z_alpha = z_alpha(alpha, two_sided)
     Z_beta = z_beta(power)
 
-    z = 0.5 * math.log((1 + r) / (1 - r))
+    z = 0.5 * math.log((1 + r) / (1 - r)) - 0.5 * math.log((1 + rho0) / (1 - rho0))
 
     n_raw = ((Z_alpha + Z_beta) ** 2) / (z ** 2) + 3
 
-    n_ceiled = ceil_int(n_raw)
+    if method == "exact":
+        n_ceiled = int(solve_correlation_n(alpha, power, r, rho0, two_sided))
+        if n_ceiled < 0:
+            raise ValueError("Target power not reached by the exact method.")
+        formula = "Exact distribution of Pearson r (hypergeometric density)"
+        approximation = "Exact power under bivariate normality"
+    else:
+        n_ceiled = ceil_int(n_raw)
+        formula = "Fisher z-transformation method"
+        approximation = "Large-sample approximation"
+
     n_final = adjust_for_dropout(n_ceiled, dropout_rate)
 
-    return {
+    result = {
         "n_required": n_final,
         "n_before_dropout": n_ceiled,
-        "formula": "Fisher z-transformation method",
+        "fisher_z": z,
+        "formula": formula,
         "assumptions": [
             "Bivariate normal distribution",
-            "Testing H0: rho = 0",
-            "Large-sample approximation"
+            f"Testing H0: rho = {rho0:g}",
+            approximation
         ]
     }
+
+    if trace:
+        # n_raw is the Fisher-z value (the exact method's starting point)
+        result["trace"] = {"z_alpha": Z_alpha, "z_beta": Z_beta, "fisher_z": z, "n_raw": n_raw}
+
+    return result
+
+
+def _log_density(x, rho, n):
+    """
+    Log density of the sample correlation coefficient (Hotelling form):
+
+    f(x) = (n−2) Γ(n−1) (1−ρ²)^((n−1)/2) (1−x²)^((n−4)/2)
+           / (√(2π) Γ(n−½) (1−ρx)^(n−3/2)) · 2F1(½, ½; n−½; (1+ρx)/2)
+    """
+
+    import numpy as np
+    from scipy.special import gammaln, hyp2f1
+
+    log_norm = (
+        np.log(n - 2) + gammaln(n - 1) - gammaln(n - 0.5)
+        - 0.5 * np.log(2 * np.pi)
+    )
+
+    return (
+        log_norm
+        + (n - 1) / 2 * np.log1p(-rho ** 2)
+        + (n - 4) / 2 * np.log1p(-x ** 2)
+        - (n - 1.5) * np.log1p(-rho * x)
+        + np.log(hyp2f1(0.5, 0.5, n - 0.5, (1 + rho * x) / 2))
+    )
+
+
+def correlation_tail(x, rho, n, upper: bool = True, n_nodes: int = 96):
+    """
+    Exact tail probability P(R >= x) (upper) or P(R <= x) of the
+    sample correlation for n bivariate-normal observations.
+
+    Integrates the density in Fisher-z space (r = tanh z), where it
+    is close to normal, over a ±12 SD window. Vectorized; quadrature
+    nodes are cached.
+    """
+
+    import numpy as np
+    from utils.array_utils import as_float_array
+    from utils.quadrature import integrate_interval
+
+    x, rho, n = np.broadcast_arrays(
+        as_float_array(x), as_float_array(rho), as_float_array(n)
+    )
+
+    z_x = np.arctanh(np.clip(x, -1 + 1e-15, 1 - 1e-15))
+    mu = np.arctanh(rho) + rho / (2 * (n - 1))
+    half = _WINDOW / np.sqrt(n - 3)
+
+    if upper:
+        a = np.maximum(z_x, mu - half)
+        b = mu + half
+    else:
+        a = mu - half
+        b = np.minimum(z_x, mu + half)
+
+    rho_e, n_e = rho[..., None], n[..., None]
+
+    def integrand(z):
+        r = np.tanh(z)
+        return np.exp(_log_density(r, rho_e, n_e)) * (1 - r ** 2)
+
+    prob = integrate_interval(integrand, a, np.maximum(a, b), n_nodes)
+
+    return np.clip(np.where(b > a, prob, 0.0), 0, 1)
+
+
+# Exact critical values per (alpha, rho0, two_sided): arrays indexed by n,
+# filled on demand so that n searches and repeated calls reuse them.
+_CRITICAL_CACHE = {}
+
+
+def _solve_critical(a, rho0, n, upper, iterations: int = 8):
+    """
+    Vectorized Newton iterations (in Fisher-z space) for the exact
+    critical value, started from the Fisher-z approximation.
+    """
+
+    import numpy as np
+
+    sign = 1.0 if upper else -1.0
+    z_a = z_alpha(a, two_sided=False)
+    z = np.arctanh(rho0) + sign * z_a / np.sqrt(n - 3)
+
+    for _ in range(iterations):
+        x = np.tanh(z)
+        tail = correlation_tail(x, rho0, n, upper)
+        slope = np.exp(_log_density(x, rho0, n)) * (1 - x ** 2)
+        z = z + sign * (tail - a) / slope
+
+    return np.tanh(z)
+
+
+def _critical_values(alpha, rho0, two_sided, n):
+    """
+    Exact critical values (lower, upper) under H0: rho = rho0, each
+    tail at alpha/2 (two-sided) or alpha, for integer n >= 4.
+    """
+
+    import numpy as np
+    from scipy.special import stdtrit
+
+    n = np.asarray(n, dtype=np.int64)
+    key = (float(alpha), float(rho0), bool(two_sided))
+    a = alpha / 2 if two_sided else alpha
+
+    lower, upper = _CRITICAL_CACHE.get(key, (np.empty(0), np.empty(0)))
+
+    size = int(n.max()) + 1
+    if lower.size < size:
+        grown = max(size, 2 * lower.size)
+        lower = np.concatenate([lower, np.full(grown - lower.size, np.nan)])
+        upper = np.concatenate([upper, np.full(grown - upper.size, np.nan)])
+
+    missing = np.unique(n[np.isnan(upper[n])])
+
+    if missing.size:
+        m = missing.astype(float)
+        if rho0 == 0:
+            t_c = stdtrit(m - 2, 1 - a)
+            upper[missing] = t_c / np.sqrt(m - 2 + t_c ** 2)
+            lower[missing] = -upper[missing]
+        else:
+            upper[missing] = _solve_critical(a, rho0, m, True)
+            lower[missing] = _solve_critical(a, rho0, m, False)
+
+    _CRITICAL_CACHE[key] = (lower, upper)
+
+    return lower[n], upper[n]
+
+
+def power_correlation(
+    alpha: float,
+    n,
+    r,
+    rho0: float = 0.0,
+    two_sided: bool = True,
+    method: str = "exact"
+):
+    """
+    Power for testing H0: rho = rho0 with n observations.
+
+    method = "exact" (distribution of r) or "fisher_z".
+    Vectorized over n and r.
+    """
+
+    import numpy as np
+    from scipy.special import ndtr
+    from utils.array_utils import as_float_array
+
+    n = np.asarray(n, dtype=np.int64)
+    r = as_float_array(r)
+
+    if method == "fisher_z":
+        dz = np.arctanh(r) - np.arctanh(rho0)
+        return ndtr(np.abs(dz) * np.sqrt(n - 3) - z_alpha(alpha, two_sided))
+
+    lower, upper = _critical_values(alpha, rho0, two_sided, n)
+
+    if two_sided:
+        return (
+            correlation_tail(upper, r, n, upper=True)
+            + correlation_tail(lower, r, n, upper=False)
+        )
+
+    return np.where(
+        r > rho0,
+        correlation_tail(upper, r, n, upper=True),
+        correlation_tail(lower, r, n, upper=False)
+    )
+
+
+def solve_correlation_n(
+    alpha: float,
+    power: float,
+    r,
+    rho0: float = 0.0,
+    two_sided: bool = True,
+    max_n: int = 10 ** 7
+):
+    """
+    Smallest n (before dropout) with exact power >= target.
+
+    Vectorized over r; the Fisher-z solution starts the bracket, which
+    is doubled where it is still short. Returns -1 where the target is
+    not reached with n ≤ max_n.
+    """
+
+    import numpy as np
+    from utils.array_utils import as_float_array, search_min_n
+
+    r = as_float_array(r)
+
+    Z_alpha = z_alpha(alpha, two_sided)
+    Z_beta = z_beta(power)
+    dz = np.arctanh(r) - np.arctanh(rho0)
+
+    n_fisher = np.ceil(((Z_alpha + Z_beta) / dz) ** 2 + 3)
+    hi = np.minimum(np.maximum(2 * n_fisher, n_fisher + 20), max_n).astype(np.int64)
+
+    def enough(n):
+        return power_correlation(alpha, n, r, rho0, two_sided, "exact") >= power
+
+    short = ~enough(hi)
+    while np.any(short & (hi < max_n)):
+        hi = np.where(short, np.minimum(2 * hi, max_n), hi)
+        short = ~enough(hi)
+
+    return search_min_n(enough, 4, hi)
+
+
+def correlation_half_width(alpha: float, n, r):
+    """
+    Half-width of the Fisher-z 100(1 − alpha)% interval around an
+    observed correlation r, vectorized over n and r:
+
+    (tanh(atanh r + Z / √(n − 3)) − tanh(atanh r − Z / √(n − 3))) / 2
+    """
+
+    import numpy as np
+
+    n = np.asarray(n, dtype=float)
+    z = np.arctanh(np.asarray(r, dtype=float))
+    c = z_alpha(alpha, True) / np.sqrt(n - 3)
+
+    return (np.tanh(z + c) - np.tanh(z - c)) / 2
+
+
+def calculate_correlation_precision(
+    alpha: float,
+    r: float,
+    half_width: float,
+    dropout_rate: float = 0.0,
+    max_n: int = 10 ** 7,
+    trace: bool = False
+) -> dict:
+    """
+    Sample size for a target half-width d of the Fisher-z confidence
+    interval around an anticipated correlation r (the interval is
+    asymmetric on the r scale; d is half its length).
+    """
+
+    from utils.array_utils import search_min_n
+
+    if r <= -0.99 or r >= 0.99:
+        raise ValueError("Correlation must be between -0.99 and 0.99.")
+
+    if not 0 < half_width < 1:
+        raise ValueError("Half-width must be between 0 and 1.")
+
+    # Symmetric approximation (1 − r²) Z / √(n − 3) as a starting point
+    n_raw = (z_alpha(alpha, True) * (1 - r ** 2) / half_width) ** 2 + 3
+
+    def enough(n):
+        return correlation_half_width(alpha, n, r) <= half_width
+
+    hi = max(4, ceil_int(n_raw))
+    while not enough(hi):
+        if hi >= max_n:
+            raise ValueError(f"Half-width not reached with n ≤ {max_n}.")
+        hi = min(2 * hi, max_n)
+
+    n_ceiled = int(search_min_n(enough, 4, hi))
+    n_final = adjust_for_dropout(n_ceiled, dropout_rate)
+
+    result = {
+        "n_required": n_final,
+        "n_before_dropout": n_ceiled,
+        "half_width": float(correlation_half_width(alpha, n_ceiled, r)),
+        "formula": "Smallest n with (tanh(z_r + Z/√(n−3)) − tanh(z_r − Z/√(n−3)))/2 ≤ d",
+        "assumptions": [
+            "Bivariate normal distribution",
+            "Fisher z-transformation interval",
+            "Anticipated correlation close to the observed one"
+        ]
+    }
+
+    if trace:
+        result["trace"] = {"z_alpha": z_alpha(alpha, True), "fisher_z": math.atanh(r), "n_raw": n_raw}
+
+    return result
@@ -1,9 +1,13 @@
 
 # ==========================================
-# Logistic Regression — Sample Size (EPV)
+# Logistic Regression — Sample Size (EPV / Riley criteria)
 # ==========================================
 
+import math
+
 from utils.stat_utils import (
+    z_alpha,
+    z_beta,
     ceil_int,
     adjust_for_dropout,
     validate_positive,
@@ -15,7 +19,16 @@ def calculate_logistic_regression(
     event_rate: float,
     n_predictors: int,
     epv: int = 10,
-    dropout_rate: float = 0.0
+    dropout_rate: float = 0.0,
+    method: str = "epv",
+    r2_cs: float = None,
+    r2_nagelkerke: float = None,
+    shrinkage: float = 0.9,
+    odds_ratio: float = None,
+    alpha: float = 0.05,
+    power: float = 0.8,
+    two_sided: bool = True,
+    trace: bool = False
 ) -> dict:
     """
     Calculates minimum sample size for logistic regression
@@ -24,10 +37,42 @@ def calculate_logistic_regression(
     event_rate = outcome prevalence
     n_predictors = number of predictors
     epv = events per variable (default 10)
+    method = "epv", "riley" (prediction model criteria: shrinkage,
+             optimism in R²_Nagelkerke, precise overall risk; needs
+             r2_cs or r2_nagelkerke) or "wald" (power for one
+             coefficient; needs odds_ratio, alpha, power):
+             n = (Z_alpha + Z_beta)^2 / (p(1 − p) ln(OR)^2)
+    trace = also return the intermediate values in result["trace"]
+             (riley and wald methods)
     """
 
     event_rate = validate_proportion(event_rate)
     validate_positive(n_predictors, "Number of predictors")
+
+    if method == "riley":
+        from calculators.association.prediction_model import calculate_prediction_model
+
+        result = calculate_prediction_model(
+            "binary",
+            n_predictors,
+            r2_cs=r2_cs,
+            r2_nagelkerke=r2_nagelkerke,
+            prevalence=event_rate,
+            shrinkage=shrinkage,
+            dropout_rate=dropout_rate,
+            trace=trace
+        )
+        result["required_events"] = result["events"]
+        return result
+
+    if method == "wald":
+        return _calculate_wald(
+            alpha, power, event_rate, odds_ratio, n_predictors, epv,
+            two_sided, dropout_rate, trace
+        )
+
+    if method != "epv":
+        raise ValueError("Method must be 'epv', 'riley' or 'wald'.")
     validate_positive(epv, "EPV")
 
     required_events = epv * n_predictors
@@ -47,3 +92,51 @@ def calculate_logistic_regression(
             "Not a hypothesis-testing power calculation"
         ]
     }
+
+
+def _calculate_wald(
+    alpha, power, event_rate, odds_ratio, n_predictors, epv,
+    two_sided, dropout_rate, trace
+):
+    if odds_ratio is None:
+        raise ValueError("The wald method needs a target odds ratio.")
+
+    validate_positive(odds_ratio, "Odds ratio")
+
+    if odds_ratio == 1:
+        raise ValueError("Odds ratio must differ from 1.")
+
+    Z_alpha = z_alpha(alpha, two_sided)
+    Z_beta = z_beta(power)
+
+    log_or = math.log(odds_ratio)
+    p_term = event_rate * (1 - event_rate)
+
+    n_raw = ((Z_alpha + Z_beta) ** 2) / (p_term * log_or ** 2)
+
+    n_ceiled = ceil_int(n_raw)
+    n_final = adjust_for_dropout(n_ceiled, dropout_rate)
+
+    result = {
+        "n_required": n_final,
+        "n_before_dropout": n_ceiled,
+        "required_events": epv * n_predictors,
+        "expected_events": n_final * event_rate,
+        "formula": "n = (Z_alpha + Z_beta)^2 / (p(1 − p) ln(OR)^2)",
+        "assumptions": [
+            "Wald test for a single coefficient",
+            "OR per unit of a standardized predictor",
+            "EPV reported as a stability check"
+        ]
+    }
+
+    if trace:
+        result["trace"] = {
+            "z_alpha": Z_alpha,
+            "z_beta": Z_beta,
+            "log_or": log_or,
+            "p_term": p_term,
+            "n_raw": n_raw
+        }
+
+    return result
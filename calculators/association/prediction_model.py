@@ -0,0 +1,344 @@
+
+# ==========================================
+# Prediction Model Development — Minimum Sample Size (Riley)
+# ==========================================
+
+from functools import lru_cache
+
+import numpy as np
+from scipy.special import chdtri, stdtrit
+
+from utils.array_utils import as_float_array, outer_grid
+from utils.stat_utils import (
+    adjust_for_dropout,
+    validate_positive,
+    validate_proportion
+)
+
+
+OUTCOMES = ("binary", "continuous", "survival")
+
+Z_95 = 1.959963984540054
+
+
+def max_r2_cs(
+    outcome: str,
+    prevalence=None,
+    rate=None,
+    mean_followup=None
+):
+    """
+    Maximum achievable Cox–Snell R²: 1 − exp(2 · lnL_null / n).
+
+    binary:   lnL_null / n = φ ln φ + (1 − φ) ln(1 − φ)
+    survival: lnL_null / n = e ln e − e, e = rate × mean follow-up
+              (events per participant, exponential null model)
+    continuous: 1 (no upper bound below 1)
+    """
+
+    if outcome == "binary":
+        phi = as_float_array(prevalence)
+        ll_null = phi * np.log(phi) + (1 - phi) * np.log1p(-phi)
+    elif outcome == "survival":
+        e = as_float_array(rate) * as_float_array(mean_followup)
+        ll_null = e * np.log(e) - e
+    elif outcome == "continuous":
+        return np.float64(1.0)
+    else:
+        raise ValueError(f"Outcome must be one of {OUTCOMES}.")
+
+    return -np.expm1(2 * ll_null)
+
+
+def shrinkage_sample_size(n_parameters, r2_cs, shrinkage):
+    """
+    n giving expected uniform shrinkage S (van Houwelingen):
+
+    n = p / ((S − 1) · ln(1 − R²_CS / S))
+
+    Vectorized over all arguments.
+    """
+
+    S = as_float_array(shrinkage)
+
+    return as_float_array(n_parameters) / ((S - 1) * np.log1p(-as_float_array(r2_cs) / S))
+
+
+@lru_cache(maxsize=64)
+def _residual_sd_df(margin: float, max_df: int = 100000) -> int:
+    """
+    Smallest residual df for which the 95% CI of the residual SD lies
+    within a multiplicative margin: max(√(df/χ²_.025), √(χ²_.975/df)).
+
+    Independent of the number of predictors, so cached per margin.
+    """
+
+    df = np.arange(1, max_df + 1, dtype=float)
+    mmoe = np.maximum(
+        np.sqrt(df / chdtri(df, 0.975)),
+        np.sqrt(chdtri(df, 0.025) / df)
+    )
+
+    return int(df[np.argmax(mmoe <= margin)])
+
+
+def _intercept_sample_size(n_parameters, r2, sd, intercept, margin):
+    """
+    Smallest n with t_{.975, n−p−1} · sd · √((1 − R²) / n) ≤ margin·|intercept|
+    (mean outcome estimated within a relative margin).
+    """
+
+    p = np.asarray(n_parameters, dtype=np.int64)
+    scale = (sd * np.sqrt(1 - as_float_array(r2)) / (margin * abs(intercept))) ** 2
+
+    p, scale = np.broadcast_arrays(p, scale)
+    n = np.maximum(np.ceil(Z_95 ** 2 * scale), p + 2).astype(np.int64)
+
+    def short(n_):
+        return n_ < stdtrit(n_ - p - 1, 0.975) ** 2 * scale
+
+    # z gives a lower bound; a few fixed-point steps absorb the t quantile
+    for _ in range(3):
+        n = np.where(short(n), np.ceil(stdtrit(n - p - 1, 0.975) ** 2 * scale), n).astype(np.int64)
+
+    while short(n).any():
+        n = np.where(short(n), n + 1, n)
+
+    return n
+
+
+def riley_criteria(
+    outcome: str,
+    n_parameters,
+    r2_cs,
+    prevalence=None,
+    rate=None,
+    mean_followup=None,
+    timepoint=None,
+    shrinkage: float = 0.9,
+    optimism: float = 0.05,
+    risk_margin: float = 0.05,
+    sd_margin: float = 1.1,
+    intercept=None,
+    sd=None,
+    intercept_margin: float = 0.1
+) -> dict:
+    """
+    Riley et al. minimum sample size criteria, vectorized over the
+    number of candidate parameters and the anticipated R².
+
+    Criterion 1: expected shrinkage ≥ S
+    Criterion 2: optimism in R²_Nagelkerke ≤ δ (R²_adj ≥ R² − δ
+                 for continuous outcomes)
+    Criterion 3: overall risk (binary) or cumulative incidence at the
+                 timepoint (survival) within ±risk_margin;
+                 residual SD within sd_margin (continuous)
+    Criterion 4 (continuous, optional): mean outcome within
+                 ±intercept_margin (relative)
+
+    max R²_CS is computed once and shared by criterion 2 and the
+    validity check; the residual-SD df (criterion 3, continuous) is
+    cached per margin. Each criterion is rounded up before the max.
+    """
+
+    p = as_float_array(n_parameters)
+    r2 = as_float_array(r2_cs)
+
+    max_r2 = max_r2_cs(outcome, prevalence, rate, mean_followup)
+
+    # Criterion 1 needs R² < S as well as R² below its maximum
+    if np.any(r2 >= np.minimum(max_r2, shrinkage)):
+        raise ValueError("Anticipated R² must be below its maximum and the target shrinkage.")
+
+    # Criterion 1
+    n1 = shrinkage_sample_size(p, r2, shrinkage)
+
+    if outcome == "continuous":
+        # Apparent minus adjusted R² ≤ δ (R² taken as the adjusted value)
+        n2 = 1 + p * (1 - r2) / optimism
+        s_optimism = np.full(np.broadcast(p, r2).shape, np.nan)
+
+        n3 = _residual_sd_df(float(sd_margin)) + p + 1
+
+        criteria = [n1, n2, n3]
+
+        if intercept is not None and sd is not None:
+            criteria.append(_intercept_sample_size(p, r2, sd, intercept, intercept_margin))
+    else:
+        # Criterion 2: shrinkage that keeps optimism in R²_N below δ
+        s_optimism = r2 / (r2 + optimism * max_r2)
+        n2 = shrinkage_sample_size(p, r2, s_optimism)
+
+        if outcome == "binary":
+            phi = as_float_array(prevalence)
+            n3 = (Z_95 / risk_margin) ** 2 * phi * (1 - phi)
+        else:
+            rate_ = as_float_array(rate)
+            t = as_float_array(timepoint)
+            risk = -np.expm1(-rate_ * t)
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                d_upper = np.where(
+                    risk + risk_margin < 1,
+                    -np.log1p(-(risk + risk_margin)) / t - rate_,
+                    np.inf
+                )
+            d_lower = rate_ + np.log1p(-(risk - risk_margin)) / t
+
+            person_time = rate_ * (Z_95 / np.minimum(d_upper, d_lower)) ** 2
+            n3 = person_time / as_float_array(mean_followup)
+
+        criteria = [n1, n2, n3]
+
+    raw = np.stack(np.broadcast_arrays(*[as_float_array(c) for c in criteria]))
+    stacked = np.ceil(raw)
+
+    return {
+        "max_r2_cs": max_r2,
+        "shrinkage_optimism": s_optimism,
+        "criteria_raw": raw,
+        "criteria": stacked,
+        "n_required": stacked.max(axis=0).astype(np.int64),
+        "binding": stacked.argmax(axis=0) + 1
+    }
+
+
+def calculate_prediction_model(
+    outcome: str,
+    n_parameters: int,
+    r2_cs: float = None,
+    r2_nagelkerke: float = None,
+    prevalence: float = None,
+    rate: float = None,
+    mean_followup: float = None,
+    timepoint: float = None,
+    shrinkage: float = 0.9,
+    optimism: float = 0.05,
+    intercept: float = None,
+    sd: float = None,
+    dropout_rate: float = 0.0,
+    trace: bool = False
+) -> dict:
+    """
+    Minimum sample size for developing a clinical prediction model
+    (Riley et al., BMJ 2020; Stat Med 2019).
+
+    outcome = "binary", "continuous" or "survival"
+    n_parameters = candidate predictor parameters (p)
+    r2_cs = anticipated Cox–Snell R² (R² for continuous outcomes);
+            alternatively give r2_nagelkerke (binary / survival)
+    prevalence = outcome proportion (binary)
+    rate, mean_followup, timepoint = event rate per person-time,
+            mean follow-up and prediction horizon (survival)
+    intercept, sd = mean and SD of the outcome (continuous, optional)
+    trace = also return the intermediate values in result["trace"]
+    """
+
+    if outcome not in OUTCOMES:
+        raise ValueError(f"Outcome must be one of {OUTCOMES}.")
+
+    validate_positive(n_parameters, "Number of parameters")
+
+    if outcome == "binary":
+        prevalence = validate_proportion(prevalence)
+    elif outcome == "survival":
+        validate_positive(rate, "Event rate")
+        validate_positive(mean_followup, "Mean follow-up")
+        validate_positive(timepoint, "Timepoint")
+
+    max_r2 = float(max_r2_cs(outcome, prevalence, rate, mean_followup))
+
+    if r2_cs is None:
+        if r2_nagelkerke is None or outcome == "continuous":
+            raise ValueError("Provide the anticipated R² (Cox–Snell, or Nagelkerke for binary/survival).")
+        r2_cs = r2_nagelkerke * max_r2
+
+    limit = min(max_r2, shrinkage)
+    if not 0 < r2_cs < limit:
+        raise ValueError(f"Anticipated R² must be between 0 and {limit:.4f}.")
+
+    res = riley_criteria(
+        outcome, n_parameters, r2_cs,
+        prevalence=prevalence,
+        rate=rate,
+        mean_followup=mean_followup,
+        timepoint=timepoint,
+        shrinkage=shrinkage,
+        optimism=optimism,
+        intercept=intercept,
+        sd=sd
+    )
+
+    criteria = [int(c) for c in res["criteria"]]
+    n_ceiled = int(res["n_required"])
+    n_final = adjust_for_dropout(n_ceiled, dropout_rate)
+
+    result = {
+        "n_required": n_final,
+        "n_before_dropout": n_ceiled,
+        "criteria": criteria,
+        "binding_criterion": int(res["binding"]),
+        "max_r2_cs": max_r2,
+        "r2_cs": r2_cs,
+        "formula": "n = max(criteria); criterion 1: n = p / ((S − 1) ln(1 − R²_CS / S))",
+        "assumptions": [
+            f"Prediction model for a {outcome} outcome",
+            f"Target expected shrinkage ≥ {shrinkage}",
+            f"Optimism in R² ≤ {optimism}",
+            "Riley et al. minimum sample size criteria"
+        ]
+    }
+
+    if outcome == "binary":
+        result["events"] = n_ceiled * prevalence
+        result["epp"] = n_ceiled * prevalence / n_parameters
+    elif outcome == "survival":
+        result["events"] = n_ceiled * rate * mean_followup
+        result["epp"] = result["events"] / n_parameters
+
+    if trace:
+        result["trace"] = {
+            "criteria_raw": [float(c) for c in res["criteria_raw"]],
+            "shrinkage_optimism": float(res["shrinkage_optimism"]),
+            "max_r2_cs": max_r2
+        }
+
+    return result
+
+
+def prediction_model_grid(
+    outcome: str,
+    parameter_counts,
+    r2_values,
+    **kwargs
+) -> dict:
+    """
+    Planning table over candidate parameters × anticipated R²_CS.
+
+    kwargs are passed to riley_criteria (prevalence, rate, ...).
+    Cells with R² at or above the achievable maximum (or the target
+    shrinkage) return -1.
+    """
+
+    P, R = outer_grid(parameter_counts, r2_values)
+    P, R = np.broadcast_arrays(P, R)
+
+    max_r2 = max_r2_cs(
+        outcome, kwargs.get("prevalence"), kwargs.get("rate"), kwargs.get("mean_followup")
+    )
+    valid = (R > 0) & (R < np.minimum(max_r2, kwargs.get("shrinkage", 0.9)))
+
+    n = np.full(P.shape, -1, dtype=np.int64)
+    binding = np.zeros(P.shape, dtype=np.int64)
+
+    res = riley_criteria(outcome, P[valid], R[valid], **kwargs)
+    n[valid] = res["n_required"]
+    binding[valid] = res["binding"]
+
+    return {
+        "n_parameters": np.asarray(parameter_counts),
+        "r2_cs": np.asarray(r2_values),
+        "max_r2_cs": float(max_r2),
+        "n_required": n,
+        "binding_criterion": binding
+    }
@@ -0,0 +1,403 @@
+
+# ==========================================
+# Assurance (Probability of Success) — Sample Size
+# ==========================================
+
+import numpy as np
+from scipy import stats
+
+from utils.array_utils import search_min_n
+from utils.multiplicity import qmc_points
+from utils.quadrature import gauss_hermite, gauss_legendre
+from utils.stat_utils import adjust_for_dropout, ceil_int
+
+from calculators.continuous.two_independent_means import power_two_independent_means
+from calculators.binary.two_proportions import power_two_proportions
+from calculators.survival.logrank import power_logrank
+
+
+# Each design names its effect parameter and the nuisance parameters
+# that may also carry a prior. n is the group 1 size for the two-group
+# designs and the total size for the log-rank test.
+DESIGNS = {
+    "two_means": {"effect": "delta", "nuisance": ("sd",)},
+    "two_proportions": {"effect": "difference", "nuisance": ("p2",)},
+    "logrank": {"effect": "hazard_ratio", "nuisance": ("event_fraction",)}
+}
+
+# Prior families and their parameters. Normal and lognormal priors are
+# integrated with Gauss–Hermite nodes (Gauss–Legendre over the favourable
+# side for the effect); any other family switches the whole integral to
+# quasi-Monte Carlo.
+PRIORS = {
+    "normal": ("mean", "sd"),
+    "lognormal": ("mean", "sd"),
+    "truncated_normal": ("mean", "sd", "lower", "upper"),
+    "beta": ("a", "b"),
+    "gamma": ("shape", "scale"),
+    "uniform": ("lower", "upper")
+}
+
+_GAUSSIAN = ("normal", "lognormal")
+
+# Keeps proportions drawn from a prior on the difference inside (0, 1)
+_P_CLIP = 1e-9
+
+
+def _validate_prior(name, prior):
+    family = prior.get("distribution")
+
+    if family not in PRIORS:
+        raise ValueError(f"Prior for '{name}' must be one of {tuple(PRIORS)}.")
+
+    missing = [k for k in PRIORS[family] if k not in prior]
+    if missing:
+        raise ValueError(f"Prior for '{name}' needs {missing}.")
+
+    if family in ("normal", "lognormal", "truncated_normal") and prior["sd"] <= 0:
+        raise ValueError(f"Prior SD for '{name}' must be positive.")
+
+
+def _from_normal(prior, z):
+    """
+    Transforms standard normal nodes to a normal / lognormal prior.
+    """
+    x = prior["mean"] + prior["sd"] * z
+    return np.exp(x) if prior["distribution"] == "lognormal" else x
+
+
+def _from_uniform(prior, u):
+    """
+    Inverse CDF of a prior at quasi-random points u in (0, 1).
+    """
+
+    family = prior["distribution"]
+
+    if family in _GAUSSIAN:
+        return _from_normal(prior, stats.norm.ppf(u))
+
+    if family == "truncated_normal":
+        a = (prior["lower"] - prior["mean"]) / prior["sd"]
+        b = (prior["upper"] - prior["mean"]) / prior["sd"]
+        return stats.truncnorm.ppf(u, a, b, loc=prior["mean"], scale=prior["sd"])
+
+    if family == "beta":
+        return stats.beta.ppf(u, prior["a"], prior["b"])
+
+    if family == "gamma":
+        return stats.gamma.ppf(u, prior["shape"], scale=prior["scale"])
+
+    return prior["lower"] + (prior["upper"] - prior["lower"]) * u
+
+
+def _normal_rule(n_nodes, mass=None):
+    """
+    Standard normal nodes and weights: Gauss–Hermite over the real
+    line, or Gauss–Legendre on the probability scale over the interval
+    mass = (u_lo, u_hi) (weights then sum to u_hi − u_lo).
+    """
+
+    if mass is None:
+        return gauss_hermite(n_nodes)
+
+    x, w = gauss_legendre(n_nodes)
+    half = (mass[1] - mass[0]) / 2
+
+    return stats.norm.ppf(mass[0] + half * (x + 1)), w * half
+
+
+def prior_nodes(
+    priors: dict,
+    n_nodes: int = 64,
+    log2_draws: int = 12,
+    masses: dict = None
+):
+    """
+    Integration rule for the prior: ({name: values}, weights, rule).
+
+    Only normal / lognormal priors → tensor Gauss–Hermite grid
+    (n_nodes per prior); otherwise scrambled Sobol points (2^log2_draws).
+    Each prior's centre (z = 0 or u = 1/2) is returned as well, to fix
+    the favourable direction of the effect.
+
+    masses = {name: (u_lo, u_hi)} restricts a normal / lognormal prior
+             to that range of its CDF, so an integrand that is zero
+             outside it is integrated without a step
+    """
+
+    names = list(priors)
+    masses = masses or {}
+
+    for name in names:
+        _validate_prior(name, priors[name])
+
+    if all(priors[k]["distribution"] in _GAUSSIAN for k in names):
+        rules = [_normal_rule(n_nodes, masses.get(name)) for name in names]
+
+        grids = np.meshgrid(*[x for x, _ in rules], indexing="ij")
+        weights = np.ones_like(grids[0])
+        for g in np.meshgrid(*[w for _, w in rules], indexing="ij"):
+            weights = weights * g
+
+        values = {
+            name: _from_normal(priors[name], grid.ravel())
+            for name, grid in zip(names, grids)
+        }
+        centres = {name: _from_normal(priors[name], 0.0) for name in names}
+
+        return values, weights.ravel(), "gauss_hermite", centres
+
+    u = qmc_points(len(names), log2_draws)
+    # Sobol points can hit 0 exactly; keep the inverse CDFs finite
+    u = np.clip(u, 1e-12, 1 - 1e-12)
+    weights = np.full(u.shape[0], 1 / u.shape[0])
+
+    values = {}
+    for j, name in enumerate(names):
+        u_lo, u_hi = masses.get(name, (0.0, 1.0))
+        values[name] = _from_uniform(priors[name], u_lo + (u_hi - u_lo) * u[:, j])
+        weights = weights * (u_hi - u_lo)
+
+    centres = {name: float(_from_uniform(priors[name], 0.5)) for name in names}
+
+    return values, weights, "qmc", centres
+
+
+def _conditional_power(design, alpha, n, params, allocation_ratio, two_sided, direction):
+    """
+    Power given parameter values (arrays), counting only rejections in
+    the favourable direction: draws with the effect on the other side
+    contribute 0, as the normal approximations ignore that tail.
+    Proportion and event fraction draws are clipped into (0, 1).
+    """
+
+    r = allocation_ratio
+
+    if design == "two_means":
+        effect = params["delta"]
+        p = power_two_independent_means(alpha, n, params["sd"], effect, r, two_sided)
+
+    elif design == "two_proportions":
+        effect = params["difference"]
+        p2 = np.clip(params["p2"], _P_CLIP, 1 - _P_CLIP)
+        p1 = np.clip(p2 + effect, _P_CLIP, 1 - _P_CLIP)
+        p = power_two_proportions(alpha, n, p1, p2, r, two_sided)
+
+    else:
+        effect = np.log(params["hazard_ratio"])
+        events = n * np.clip(params["event_fraction"], _P_CLIP, 1.0)
+        p = power_logrank(alpha, events, params["hazard_ratio"], r, two_sided)
+
+    return np.where(effect * direction > 0, p, 0.0)
+
+
+def _prepare(design, priors, fixed, n_nodes, log2_draws) -> dict:
+    """
+    Parameter values, weights and favourable direction for one design
+    and prior, built once so assurance at many n reuses the nodes.
+    """
+
+    if design not in DESIGNS:
+        raise ValueError(f"Design must be one of {tuple(DESIGNS)}.")
+
+    spec = DESIGNS[design]
+    names = (spec["effect"],) + spec["nuisance"]
+    fixed = dict(fixed or {})
+
+    unknown = [k for k in list(priors) + list(fixed) if k not in names]
+    if unknown:
+        raise ValueError(f"Unknown parameters {unknown} for '{design}'; expected {names}.")
+
+    if spec["effect"] not in priors:
+        raise ValueError(f"A prior on '{spec['effect']}' is required.")
+
+    missing = [k for k in names if k not in priors and k not in fixed]
+    if missing:
+        raise ValueError(f"Give a prior or a fixed value for {missing}.")
+
+    prior = priors[spec["effect"]]
+    masses = None
+    limit = None
+
+    if prior["distribution"] in _GAUSSIAN:
+        # No effect in standard normal units; the centre is z = 0
+        null = 1.0 if design == "logrank" else 0.0
+        if prior["distribution"] == "lognormal":
+            cut = (np.log(null) - prior["mean"]) / prior["sd"] if null > 0 else -np.inf
+        else:
+            cut = (null - prior["mean"]) / prior["sd"]
+
+        if cut == 0:
+            raise ValueError("The prior for the effect must be centred away from no effect.")
+
+        # Limit as n → ∞: Φ(|mean| / sd) on the effect scale. Power is
+        # zero on the other side, so only the favourable side is
+        # integrated and the assurance converges to this limit.
+        limit = float(stats.norm.cdf(abs(cut)))
+        p_cut = float(stats.norm.cdf(cut))
+        masses = {spec["effect"]: (p_cut, 1.0) if cut < 0 else (0.0, p_cut)}
+
+    values, weights, rule, centres = prior_nodes(priors, n_nodes, log2_draws, masses)
+
+    params = {k: np.asarray(fixed[k], dtype=float) for k in fixed}
+    params.update(values)
+
+    effect = params[spec["effect"]]
+    centre = centres[spec["effect"]]
+    if design == "logrank":
+        effect, centre = np.log(effect), np.log(centre)
+
+    if centre == 0:
+        raise ValueError("The prior for the effect must be centred away from no effect.")
+
+    direction = np.sign(centre)
+
+    if limit is None:
+        # Prior probability of a favourable effect at the QMC points
+        limit = float((weights * (effect * direction > 0)).sum())
+
+    return {
+        "design": design,
+        "params": params,
+        "weights": weights,
+        "rule": rule,
+        "direction": direction,
+        "limit": limit
+    }
+
+
+def _assurance(prepared, alpha, n, allocation_ratio, two_sided):
+    """
+    Expected power at n (scalar or array of sizes).
+    """
+
+    n = np.asarray(n, dtype=float)[..., None]
+
+    power = _conditional_power(
+        prepared["design"], alpha, n, prepared["params"],
+        allocation_ratio, two_sided, prepared["direction"]
+    )
+
+    return (power * prepared["weights"]).sum(axis=-1)
+
+
+def calculate_assurance(
+    design: str,
+    alpha: float,
+    n,
+    priors: dict,
+    fixed: dict = None,
+    allocation_ratio: float = 1.0,
+    two_sided: bool = True,
+    n_nodes: int = 64,
+    log2_draws: int = 12
+) -> dict:
+    """
+    Assurance (expected power over a prior) at sample size n.
+
+    design = "two_means", "two_proportions" or "logrank"
+    n = group 1 size (two-group designs) or total size (logrank);
+        scalar or array
+    priors = {parameter: {"distribution": ..., parameters}}, e.g.
+             {"delta": {"distribution": "normal", "mean": 5, "sd": 2}}
+    fixed = values of the parameters without a prior
+    """
+
+    prepared = _prepare(design, priors, fixed, n_nodes, log2_draws)
+    value = _assurance(prepared, alpha, n, allocation_ratio, two_sided)
+
+    return {
+        "assurance": float(value) if np.ndim(value) == 0 else value,
+        "assurance_limit": prepared["limit"],
+        "rule": prepared["rule"],
+        "nodes": prepared["weights"].size
+    }
+
+
+def calculate_assurance_sample_size(
+    design: str,
+    alpha: float,
+    target: float,
+    priors: dict,
+    fixed: dict = None,
+    allocation_ratio: float = 1.0,
+    two_sided: bool = True,
+    dropout_rate: float = 0.0,
+    max_n: int = 10 ** 7,
+    n_nodes: int = 64,
+    log2_draws: int = 12
+) -> dict:
+    """
+    Smallest n whose assurance reaches the target.
+
+    The prior nodes are built once; assurance is increasing in n, so
+    an upper bound is found by doubling and the answer by bisection.
+    The target must be below the limiting assurance (the prior
+    probability of a favourable effect).
+    """
+
+    if not 0 < target < 1:
+        raise ValueError("Target assurance must be between 0 and 1.")
+
+    prepared = _prepare(design, priors, fixed, n_nodes, log2_draws)
+
+    if target >= prepared["limit"]:
+        raise ValueError(
+            f"Target assurance {target} is not reachable; "
+            f"the prior gives at most {prepared['limit']:.3f}."
+        )
+
+    def enough(n):
+        return _assurance(prepared, alpha, n, allocation_ratio, two_sided) >= target
+
+    hi = 4
+    while not enough(hi):
+        if hi >= max_n:
+            raise ValueError(f"Target assurance not reached with n ≤ {max_n}.")
+        hi = min(hi * 2, max_n)
+
+    n = int(search_min_n(enough, 2, hi))
+    achieved = float(_assurance(prepared, alpha, n, allocation_ratio, two_sided))
+
+    result = {
+        "assurance": achieved,
+        "assurance_limit": prepared["limit"],
+        "rule": prepared["rule"],
+        "formula": "Assurance = ∫ power(n, θ) π(θ) dθ, smallest n with assurance ≥ target",
+        "assumptions": [
+            "Prior distributions reflect pre-trial uncertainty",
+            "Normal-approximation power given the parameters",
+            "Success = significant result in the favourable direction"
+        ]
+    }
+
+    if design == "logrank":
+        n_final = adjust_for_dropout(n, dropout_rate)
+        r = allocation_ratio
+        n1 = ceil_int(n_final / (1 + r))
+        n2 = ceil_int(n_final * r / (1 + r))
+        result.update({
+            "n_total": n1 + n2,
+            "n_group1": n1,
+            "n_group2": n2,
+            "n_before_dropout": n
+        })
+    else:
+        n2 = ceil_int(allocation_ratio * n)
+        n1_adj = adjust_for_dropout(n, dropout_rate)
+        n2_adj = adjust_for_dropout(n2, dropout_rate)
+
+        # Same keys as the underlying calculators
+        if design == "two_means":
+            before = {"n_before_dropout_group1": n, "n_before_dropout_group2": n2}
+        else:
+            before = {"n1_before_dropout": n, "n2_before_dropout": n2}
+
+        result.update({
+            "n_group1": n1_adj,
+            "n_group2": n2_adj,
+            "n_total": n1_adj + n2_adj,
+            **before
+        })
+
+    return result
@@ -0,0 +1,394 @@
+
+# ==========================================
+# Bayesian Posterior-Probability Designs — Sample Size
+# ==========================================
+
+from functools import lru_cache
+
+import numpy as np
+from scipy import stats
+from scipy.special import betaincc, betaincinv, betaln, ndtr, ndtri
+
+from utils.array_utils import search_min_n
+from utils.quadrature import integrate_interval
+from utils.stat_utils import (
+    adjust_for_dropout,
+    ceil_int,
+    validate_positive,
+    validate_proportion
+)
+
+
+METHODS = ("auto", "exact", "simulation")
+
+# "auto" enumerates the outcome space up to this many control outcomes,
+# and simulates beyond it
+MAX_ENUMERATION = 10000
+
+# Gauss–Legendre nodes for P(p1 > p2 | data), and the posterior mass
+# left out in each tail of group 2
+_POSTERIOR_NODES = 96
+_POSTERIOR_TAIL = 1e-15
+
+# Simulated trials per candidate n, evaluated in batches
+_SIM_BATCH = 50000
+
+
+def _validate_beta(prior, name):
+    a, b = prior
+    validate_positive(a, f"{name} prior a")
+    validate_positive(b, f"{name} prior b")
+    return float(a), float(b)
+
+
+def posterior_prob_greater(x1, n1, x2, n2, prior1=(1.0, 1.0), prior2=(1.0, 1.0)):
+    """
+    P(p1 > p2 | data) under independent beta priors, vectorized over
+    the response counts x1, x2:
+
+    ∫ f2(y) (1 − F1(y)) dy, with f2 / F1 the posterior beta density of
+    group 2 and CDF of group 1, integrated between the _POSTERIOR_TAIL
+    quantiles of group 2's posterior (skewed posteriors, e.g. with no
+    responses, have long tails in SD units).
+
+    The range is split at the posterior mean. Below it the variable is
+    t = y^c and above it s = (1 − y)^d, with c = a2 and d = b1 + b2 when
+    below 2 (1 otherwise): the integrand behaves as y^(a2 − 1) at 0 and
+    (1 − y)^(b1 + b2 − 1) at 1, so small shape parameters (e.g. Jeffreys
+    priors with 0 or all responses) leave no endpoint singularity.
+    """
+
+    a1 = prior1[0] + np.asarray(x1, dtype=float)
+    b1 = prior1[1] + n1 - np.asarray(x1, dtype=float)
+    a2 = prior2[0] + np.asarray(x2, dtype=float)
+    b2 = prior2[1] + n2 - np.asarray(x2, dtype=float)
+
+    a1, b1, a2, b2 = np.broadcast_arrays(a1, b1, a2, b2)
+
+    mean2 = a2 / (a2 + b2)
+    lower = betaincinv(a2, b2, _POSTERIOR_TAIL)
+    upper = betaincinv(a2, b2, 1 - _POSTERIOR_TAIL)
+
+    c = np.where(a2 < 2, a2, 1.0)
+    d = np.where(b1 + b2 < 2, b1 + b2, 1.0)
+    t_range = (lower ** c, mean2 ** c)
+    s_range = ((1 - upper) ** d, (1 - mean2) ** d)
+
+    a1, b1, a2, b2, c, d = (v[..., None] for v in (a1, b1, a2, b2, c, d))
+    log_norm2 = betaln(a2, b2)
+
+    # f2(y) dy/dt, with the powers of y (or 1 − y) collected in the log
+    def below(t):
+        y = t ** (1 / c)
+        log_density = (a2 - c) * np.log(y) + (b2 - 1) * np.log1p(-y) - log_norm2 - np.log(c)
+        return np.exp(log_density) * betaincc(a1, b1, y)
+
+    def above(s):
+        y = -np.expm1(np.log(s) / d)
+        log_density = (a2 - 1) * np.log(y) + (b2 - d) * np.log(s) / d - log_norm2 - np.log(d)
+        return np.exp(log_density) * betaincc(a1, b1, y)
+
+    nodes = _POSTERIOR_NODES // 2
+    total = integrate_interval(below, *t_range, nodes) + integrate_interval(above, *s_range, nodes)
+
+    return np.clip(total, 0, 1)
+
+
+@lru_cache(maxsize=512)
+def _predictive(n: int, design: tuple):
+    """
+    Predictive distribution of the responses among n: binomial for a
+    fixed rate ("fixed", p) or beta-binomial for a design prior
+    ("beta", a, b). Returns the PMF and tails P(X ≥ k), k = 0..n + 1,
+    read-only and shared across candidate n.
+    """
+
+    k = np.arange(n + 1)
+
+    if design[0] == "fixed":
+        pmf = stats.binom.pmf(k, n, design[1])
+    else:
+        pmf = stats.betabinom.pmf(k, n, design[1], design[2])
+
+    tail = np.append(np.cumsum(pmf[::-1])[::-1], 0.0)
+
+    pmf.setflags(write=False)
+    tail.setflags(write=False)
+
+    return pmf, tail
+
+
+@lru_cache(maxsize=512)
+def _boundary(n1: int, n2: int, prior1: tuple, prior2: tuple, threshold: float):
+    """
+    For each control count x2 = 0..n2, the smallest x1 with
+    P(p1 > p2 | data) > threshold (n1 + 1 if none).
+
+    The posterior probability increases in x1 and decreases in x2, so
+    the boundary is non-decreasing in x2: one sweep that only moves x1
+    forward finds it with at most n1 + n2 + 2 posterior evaluations.
+    """
+
+    x1_min = np.full(n2 + 1, n1 + 1, dtype=np.int64)
+    x1 = 0
+
+    for x2 in range(n2 + 1):
+        while x1 <= n1 and posterior_prob_greater(x1, n1, x2, n2, prior1, prior2) <= threshold:
+            x1 += 1
+        if x1 > n1:
+            break
+        x1_min[x2] = x1
+
+    x1_min.setflags(write=False)
+    return x1_min
+
+
+def _success_exact(n1, n2, design1, design2, prior1, prior2, threshold):
+    """
+    P(success) over the full outcome space: Σ P(x2) P(X1 ≥ boundary(x2)).
+    """
+
+    _, tail1 = _predictive(n1, design1)
+    pmf2, _ = _predictive(n2, design2)
+
+    return float(pmf2 @ tail1[_boundary(n1, n2, prior1, prior2, threshold)])
+
+
+def _draw(rng, n, design, size):
+    if design[0] == "fixed":
+        return rng.binomial(n, design[1], size)
+    return rng.binomial(n, rng.beta(design[1], design[2], size))
+
+
+def _success_simulated(n1, n2, design1, design2, prior1, prior2, threshold, n_sims, seed):
+    """
+    P(success) from simulated trials (batched); the same seed is used
+    at every n. Draws repeat outcomes heavily, so the posterior is
+    evaluated once per distinct (x1, x2).
+    """
+
+    rng = np.random.default_rng(seed)
+    hits = 0
+    done = 0
+
+    while done < n_sims:
+        size = min(_SIM_BATCH, n_sims - done)
+        x1 = _draw(rng, n1, design1, size)
+        x2 = _draw(rng, n2, design2, size)
+        pairs, counts = np.unique(np.column_stack([x1, x2]), axis=0, return_counts=True)
+        success = posterior_prob_greater(pairs[:, 0], n1, pairs[:, 1], n2, prior1, prior2) > threshold
+        hits += int(counts[success].sum())
+        done += size
+
+    return hits / n_sims
+
+
+def calculate_bayesian_two_proportions(
+    target: float,
+    p1: float,
+    p2: float,
+    allocation_ratio: float = 1.0,
+    threshold: float = 0.975,
+    dropout_rate: float = 0.0,
+    prior1: tuple = (1.0, 1.0),
+    prior2: tuple = (1.0, 1.0),
+    design_prior1: tuple = None,
+    design_prior2: tuple = None,
+    method: str = "auto",
+    max_n: int = 5000,
+    n_sims: int = 20000,
+    seed: int = 20240601
+) -> dict:
+    """
+    Smallest n1 such that P(posterior P(p1 > p2) > threshold) ≥ target
+    (beta-binomial conjugate analysis of two arms).
+
+    p1, p2 = expected response rates (group 1 = experimental); if
+             p1 < p2 the criterion is P(p1 < p2)
+    allocation_ratio = n2 / n1
+    prior1, prior2 = analysis beta priors (a, b)
+    design_prior1, design_prior2 = beta (a, b) for the data-generating
+             rates (predictive probability of success); None uses the
+             fixed rates p1, p2
+    method = "exact" (enumerates all outcomes via per-x2 decision
+             boundaries), "simulation" or "auto" (exact up to
+             MAX_ENUMERATION control outcomes)
+
+    The criterion is saw-toothed in n (discrete outcomes); n is found
+    by bisection on its increasing trend.
+    """
+
+    p1 = validate_proportion(p1)
+    p2 = validate_proportion(p2)
+    validate_positive(allocation_ratio, "Allocation ratio")
+    prior1 = _validate_beta(prior1, "Group 1")
+    prior2 = _validate_beta(prior2, "Group 2")
+
+    if p1 == p2:
+        raise ValueError("Expected response rates must differ.")
+
+    if not 0 < target < 1 or not 0.5 < threshold < 1:
+        raise ValueError("Target must be in (0, 1) and the threshold in (0.5, 1).")
+
+    if method not in METHODS:
+        raise ValueError(f"Method must be one of {METHODS}.")
+
+    design1 = ("fixed", p1) if design_prior1 is None else ("beta",) + _validate_beta(design_prior1, "Group 1 design")
+    design2 = ("fixed", p2) if design_prior2 is None else ("beta",) + _validate_beta(design_prior2, "Group 2 design")
+
+    # Lower is better: count non-responses instead, so the criterion
+    # is always P(rate1 > rate2)
+    if p1 < p2:
+        prior1, prior2 = prior1[::-1], prior2[::-1]
+        design1 = ("fixed", 1 - p1) if design1[0] == "fixed" else ("beta", design1[2], design1[1])
+        design2 = ("fixed", 1 - p2) if design2[0] == "fixed" else ("beta", design2[2], design2[1])
+
+    r = allocation_ratio
+
+    def use_exact(n2):
+        return method == "exact" or (method == "auto" and n2 < MAX_ENUMERATION)
+
+    def probability(n1):
+        n1 = int(n1)
+        n2 = max(1, ceil_int(r * n1))
+        if use_exact(n2):
+            return _success_exact(n1, n2, design1, design2, prior1, prior2, threshold)
+        return _success_simulated(n1, n2, design1, design2, prior1, prior2, threshold, n_sims, seed)
+
+    def enough(n):
+        return np.vectorize(lambda m: probability(m) >= target)(n)
+
+    hi = 8
+    while not enough(hi):
+        if hi >= max_n:
+            raise ValueError(f"Target not reached with n1 ≤ {max_n}.")
+        hi = min(hi * 2, max_n)
+
+    n1 = int(search_min_n(enough, 2, hi))
+    n2 = max(1, ceil_int(r * n1))
+
+    n1_adj = adjust_for_dropout(n1, dropout_rate)
+    n2_adj = adjust_for_dropout(n2, dropout_rate)
+
+    return {
+        "n_group1": n1_adj,
+        "n_group2": n2_adj,
+        "n_total": n1_adj + n2_adj,
+        "n1_before_dropout": n1,
+        "n2_before_dropout": n2,
+        "probability_of_success": probability(n1),
+        "method": "exact" if use_exact(n2) else "simulation",
+        "formula": f"Smallest n with P(P(p1 > p2 | data) > {threshold}) ≥ {target}",
+        "assumptions": [
+            "Independent beta-binomial arms",
+            "Analysis priors: " + f"Beta{prior1} / Beta{prior2}",
+            "Fixed design rates" if design_prior1 is None and design_prior2 is None
+            else "Design priors on the true rates (predictive probability)"
+        ]
+    }
+
+
+def bayesian_two_means_probability(
+    n1,
+    delta: float,
+    sd: float,
+    allocation_ratio: float = 1.0,
+    threshold: float = 0.975,
+    prior_mean: float = 0.0,
+    prior_sd: float = None,
+    design_prior_sd: float = 0.0
+):
+    """
+    P(posterior P(δ > 0) > threshold) for a normal endpoint with known
+    SD and a N(prior_mean, prior_sd²) analysis prior on δ (flat if
+    None). Vectorized over n1.
+
+    The criterion is d̂ > c with c = se² (z_threshold √prec − m0/s0²),
+    so with d̂ ~ N(δ, se² + design_prior_sd²) it is available in
+    closed form.
+    """
+
+    n1 = np.asarray(n1, dtype=float)
+    se2 = sd ** 2 * (1 / n1 + 1 / (allocation_ratio * n1))
+
+    prior_prec = 0.0 if prior_sd is None else 1 / prior_sd ** 2
+    precision = prior_prec + 1 / se2
+
+    c = se2 * (ndtri(threshold) * np.sqrt(precision) - prior_mean * prior_prec)
+
+    return ndtr((delta - c) / np.sqrt(se2 + design_prior_sd ** 2))
+
+
+def calculate_bayesian_two_means(
+    target: float,
+    delta: float,
+    sd: float,
+    allocation_ratio: float = 1.0,
+    threshold: float = 0.975,
+    dropout_rate: float = 0.0,
+    prior_mean: float = 0.0,
+    prior_sd: float = None,
+    design_prior_sd: float = 0.0,
+    max_n: int = 10 ** 7
+) -> dict:
+    """
+    Smallest n1 such that P(posterior P(δ > 0) > threshold) ≥ target
+    (normal-normal conjugate analysis, known SD).
+
+    delta = expected difference (mean1 − mean2); if negative the
+            criterion is P(δ < 0)
+    prior_mean, prior_sd = analysis prior on δ (prior_sd None = flat)
+    design_prior_sd = SD of the design prior around delta (0 = fixed δ)
+    """
+
+    validate_positive(sd, "SD")
+    validate_positive(allocation_ratio, "Allocation ratio")
+
+    if delta == 0:
+        raise ValueError("Expected difference must be non-zero.")
+
+    if not 0 < target < 1 or not 0.5 < threshold < 1:
+        raise ValueError("Target must be in (0, 1) and the threshold in (0.5, 1).")
+
+    if prior_sd is not None:
+        validate_positive(prior_sd, "Prior SD")
+
+    # Negative effects: mirror the problem
+    sign = 1.0 if delta > 0 else -1.0
+
+    def probability(n):
+        return bayesian_two_means_probability(
+            n, sign * delta, sd, allocation_ratio, threshold,
+            sign * prior_mean, prior_sd, design_prior_sd
+        )
+
+    limit = ndtr(abs(delta) / design_prior_sd) if design_prior_sd > 0 else 1.0
+    if target >= limit:
+        raise ValueError(f"Target not reachable; the design prior gives at most {limit:.3f}.")
+
+    hi = 4
+    while probability(hi) < target:
+        if hi >= max_n:
+            raise ValueError(f"Target not reached with n1 ≤ {max_n}.")
+        hi = min(hi * 2, max_n)
+
+    n1 = int(search_min_n(lambda n: probability(n) >= target, 2, hi))
+    n2 = ceil_int(allocation_ratio * n1)
+
+    n1_adj = adjust_for_dropout(n1, dropout_rate)
+    n2_adj = adjust_for_dropout(n2, dropout_rate)
+
+    return {
+        "n_group1": n1_adj,
+        "n_group2": n2_adj,
+        "n_total": n1_adj + n2_adj,
+        "n_before_dropout_group1": n1,
+        "n_before_dropout_group2": n2,
+        "probability_of_success": float(probability(n1)),
+        "formula": f"Smallest n with P(P(δ > 0 | data) > {threshold}) ≥ {target}",
+        "assumptions": [
+            "Normal outcome with known SD",
+            "Normal analysis prior on the difference" if prior_sd is not None else "Flat analysis prior on the difference",
+            "Fixed design difference" if design_prior_sd == 0 else "Normal design prior on the difference"
+        ]
+    }
@@ -3,10 +3,22 @@
 # Case-Control (Odds Ratio) — Sample Size
 # ==========================================
 
-from utils.stat_utils import validate_proportion, validate_positive
+import math
+
+from utils.stat_utils import (
+    z_alpha,
+    z_beta,
+    ceil_int,
+    adjust_for_dropout,
+    validate_proportion,
+    validate_positive
+)
 from calculators.binary.two_proportions import calculate_two_proportions
 
 
+METHODS = ("two_proportions", "log_or")
+
+
 def calculate_case_control_or(
     alpha: float,
     power: float,
@@ -14,7 +26,9 @@ def calculate_case_control_or(
     odds_ratio: float,
     control_case_ratio: float = 1.0,
     two_sided: bool = True,
-    dropout_rate: float = 0.0
+    dropout_rate: float = 0.0,
+    method: str = "two_proportions",
+    trace: bool = False
 ) -> dict:
     """
     Calculates sample size for unmatched case-control study.
@@ -22,15 +36,69 @@ def calculate_case_control_or(
     p0 = exposure prevalence among controls
     odds_ratio = target OR
     control_case_ratio = number of controls per case
+    method = "two_proportions" (pooled two-proportion z-test on the
+             derived exposure prevalences) or "log_or" (Wald test of
+             log OR, Woolf variance):
+             n_cases = (Z_alpha + Z_beta)^2 [1/(p1 q1) + 1/(r p0 q0)] / ln(OR)^2
+    trace = also return the intermediate values in result["trace"]
     """
 
     p0 = validate_proportion(p0)
     validate_positive(odds_ratio, "Odds ratio")
     validate_positive(control_case_ratio, "Control-case ratio")
 
+    if method not in METHODS:
+        raise ValueError(f"Method must be one of {METHODS}.")
+
     # Derive exposure prevalence among cases
     p1 = (odds_ratio * p0) / (1 - p0 + odds_ratio * p0)
 
+    if method == "log_or":
+        if odds_ratio == 1:
+            raise ValueError("Odds ratio must differ from 1.")
+
+        Z_alpha = z_alpha(alpha, two_sided)
+        Z_beta = z_beta(power)
+
+        r = control_case_ratio
+        log_or = math.log(odds_ratio)
+        variance = 1 / (p1 * (1 - p1)) + 1 / (r * p0 * (1 - p0))
+
+        n1_raw = (Z_alpha + Z_beta) ** 2 * variance / log_or ** 2
+
+        n1 = ceil_int(n1_raw)
+        n2 = ceil_int(r * n1)
+
+        n1_adj = adjust_for_dropout(n1, dropout_rate)
+        n2_adj = adjust_for_dropout(n2, dropout_rate)
+
+        result = {
+            "n_group1": n1_adj,
+            "n_group2": n2_adj,
+            "n_total": n1_adj + n2_adj,
+            "n1_before_dropout": n1,
+            "n2_before_dropout": n2,
+            "formula": "n_cases = (Z_alpha + Z_beta)^2 [1/(p1 q1) + 1/(r p0 q0)] / ln(OR)^2",
+            "assumptions": [
+                "Independent groups",
+                "Binary exposure",
+                "Wald test of log OR (Woolf variance)",
+                "Unmatched case-control design"
+            ]
+        }
+
+        if trace:
+            result["trace"] = {
+                "z_alpha": Z_alpha,
+                "z_beta": Z_beta,
+                "p1": p1,
+                "log_or": log_or,
+                "variance": variance,
+                "n1_raw": n1_raw
+            }
+
+        return result
+
     result = calculate_two_proportions(
         alpha=alpha,
         power=power,
@@ -38,10 +106,14 @@ def calculate_case_control_or(
         p2=p0,
         allocation_ratio=control_case_ratio,
         two_sided=two_sided,
-        dropout_rate=dropout_rate
+        dropout_rate=dropout_rate,
+        trace=trace
     )
 
     result["formula"] = "Derived p1 from OR and applied two-proportion normal approximation"
     result["assumptions"].append("Unmatched case-control design")
 
+    if trace:
+        result["trace"]["p1"] = p1
+
     return result
@@ -3,10 +3,22 @@
 # Cohort / Risk Ratio — Sample Size
 # ==========================================
 
-from utils.stat_utils import validate_proportion, validate_positive
+import math
+
+from utils.stat_utils import (
+    z_alpha,
+    z_beta,
+    ceil_int,
+    adjust_for_dropout,
+    validate_proportion,
+    validate_positive
+)
 from calculators.binary.two_proportions import calculate_two_proportions
 
 
+METHODS = ("two_proportions", "log_rr")
+
+
 def calculate_cohort_rr(
     alpha: float,
     power: float,
@@ -14,24 +26,80 @@ def calculate_cohort_rr(
     risk_ratio: float,
     allocation_ratio: float = 1.0,
     two_sided: bool = True,
-    dropout_rate: float = 0.0
+    dropout_rate: float = 0.0,
+    method: str = "two_proportions",
+    trace: bool = False
 ) -> dict:
     """
     Calculates sample size for cohort or RCT with binary outcome.
 
     baseline_risk = risk in control group (p0)
     risk_ratio = target RR
+    allocation_ratio = n2 / n1 (group 1 exposed, group 2 control)
+    method = "two_proportions" (pooled two-proportion z-test) or
+             "log_rr" (Wald test of log RR):
+             n1 = (Z_alpha + Z_beta)^2 [q1/p1 + q0/(r p0)] / ln(RR)^2
+    trace = also return the intermediate values in result["trace"]
     """
 
     p0 = validate_proportion(baseline_risk)
     validate_positive(risk_ratio, "Risk ratio")
     validate_positive(allocation_ratio, "Allocation ratio")
 
+    if method not in METHODS:
+        raise ValueError(f"Method must be one of {METHODS}.")
+
     p1 = p0 * risk_ratio
 
     if p1 >= 1:
         raise ValueError("Risk ratio too large for given baseline risk.")
 
+    if method == "log_rr":
+        if risk_ratio == 1:
+            raise ValueError("Risk ratio must differ from 1.")
+
+        Z_alpha = z_alpha(alpha, two_sided)
+        Z_beta = z_beta(power)
+
+        r = allocation_ratio
+        log_rr = math.log(risk_ratio)
+        variance = (1 - p1) / p1 + (1 - p0) / (r * p0)
+
+        n1_raw = (Z_alpha + Z_beta) ** 2 * variance / log_rr ** 2
+
+        n1 = ceil_int(n1_raw)
+        n2 = ceil_int(r * n1)
+
+        n1_adj = adjust_for_dropout(n1, dropout_rate)
+        n2_adj = adjust_for_dropout(n2, dropout_rate)
+
+        result = {
+            "n_group1": n1_adj,
+            "n_group2": n2_adj,
+            "n_total": n1_adj + n2_adj,
+            "n1_before_dropout": n1,
+            "n2_before_dropout": n2,
+            "formula": "n1 = (Z_alpha + Z_beta)^2 [q1/p1 + q0/(r p0)] / ln(RR)^2",
+            "assumptions": [
+                "Independent groups",
+                "Binary outcome",
+                "Wald test of log RR",
+                "Cohort or randomized controlled design"
+            ]
+        }
+
+        if trace:
+            result["trace"] = {
+                "z_alpha": Z_alpha,
+                "z_beta": Z_beta,
+                "p1": p1,
+                "log_rr": log_rr,
+                "variance": variance,
+                "n1_raw": n1_raw
+            }
+
+        return result
+
     result = calculate_two_proportions(
         alpha=alpha,
         power=power,
@@ -39,10 +107,14 @@ def calculate_cohort_rr(
         p2=p0,
         allocation_ratio=allocation_ratio,
         two_sided=two_sided,
-        dropout_rate=dropout_rate
+        dropout_rate=dropout_rate,
+        trace=trace
     )
 
     result["formula"] = "Derived p1 = RR × p0 and applied two-proportion normal approximation"
     result["assumptions"].append("Cohort or randomized controlled design")
 
+    if trace:
+        result["trace"]["p1"] = p1
+
     return result
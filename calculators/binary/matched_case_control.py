@@ -0,0 +1,278 @@
+
+# ==========================================
+# Matched Case-Control (1:M) — Sample Size
+# ==========================================
+
+from functools import lru_cache
+
+import numpy as np
+from scipy.special import comb, ndtr
+
+from utils.array_utils import as_float_array, outer_grid
+from utils.stat_utils import (
+    z_alpha,
+    z_beta,
+    ceil_int,
+    adjust_for_dropout,
+    validate_positive,
+    validate_proportion
+)
+
+
+@lru_cache(maxsize=None)
+def _binomial_coefficients(M: int):
+    """
+    C(M, k) for k = 0..M, cached per matching ratio (read-only).
+    """
+    coef = comb(M, np.arange(M + 1))
+    coef.flags.writeable = False
+    return coef
+
+
+def _padded_coefficients(Ms):
+    """
+    Stacks cached binomial rows for several matching ratios into one
+    (len(Ms), M_max + 1) table, zero-padded beyond each M.
+    """
+    Ms = np.asarray(Ms, dtype=np.int64).ravel()
+    M_max = int(Ms.max())
+
+    table = np.zeros((Ms.size, M_max + 1))
+    for i, M in enumerate(Ms):
+        table[i, :M + 1] = _binomial_coefficients(int(M))
+
+    return table
+
+
+def conditional_exposure(p0, odds_ratio, correlation):
+    """
+    Dupont (1988) exposure probabilities for a matched control.
+
+    p1  = ψ p0 / (1 + p0 (ψ − 1))            (cases)
+    p0+ = p0 + φ √(q1 p0 q0 / p1)            (given case exposed)
+    p0− = p0 − φ √(p1 p0 q0 / q1)            (given case unexposed)
+    """
+
+    p0 = as_float_array(p0)
+    psi = as_float_array(odds_ratio)
+    phi = as_float_array(correlation)
+
+    p1 = psi * p0 / (1 + p0 * (psi - 1))
+    q0, q1 = 1 - p0, 1 - p1
+
+    p0_plus = p0 + phi * np.sqrt(q1 * p0 * q0 / p1)
+    p0_minus = p0 - phi * np.sqrt(p1 * p0 * q0 / q1)
+
+    return p1, p0_plus, p0_minus
+
+
+def dupont_moments(p0, odds_ratio, controls_per_case, correlation=0.0):
+    """
+    Sums over matched sets with m = 1..M exposed members (the
+    informative, discordant configurations):
+
+    t_m = p1 C(M, m−1) p0+^(m−1) q0+^(M−m+1) + q1 C(M, m) p0−^m q0−^(M−m)
+    e_m = mψ / (mψ + M − m + 1),  v_m = e_m (1 − e_m)
+    null: e0_m = m / (M + 1),     v0_m = e0_m (1 − e0_m)
+
+    Returns (Σ t(e − e0), Σ t v0, Σ t v). Vectorized over all
+    arguments; M may vary across scenarios (padded trailing axis).
+    """
+
+    p0, psi, M, phi = np.broadcast_arrays(
+        as_float_array(p0),
+        as_float_array(odds_ratio),
+        np.asarray(controls_per_case, dtype=np.int64),
+        as_float_array(correlation)
+    )
+    shape = p0.shape
+
+    M_unique, M_index = np.unique(M, return_inverse=True)
+    coef = _padded_coefficients(M_unique)[M_index.reshape(shape)]
+    M_max = coef.shape[-1] - 1
+
+    p1, pp, pm = conditional_exposure(p0, psi, phi)
+
+    m = np.arange(1, M_max + 1, dtype=float)
+    e = (..., None)
+    Mf = M.astype(float)[e]
+    valid = m <= Mf
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exposed_case = (
+            p1[e] * coef[..., :-1]
+            * pp[e] ** (m - 1) * (1 - pp[e]) ** np.maximum(Mf - m + 1, 0)
+        )
+        unexposed_case = (
+            (1 - p1)[e] * coef[..., 1:]
+            * pm[e] ** m * (1 - pm[e]) ** np.maximum(Mf - m, 0)
+        )
+
+    t = np.where(valid, exposed_case + unexposed_case, 0.0)
+
+    e_m = m * psi[e] / (m * psi[e] + Mf - m + 1)
+    e0_m = m / (Mf + 1)
+
+    v_m = e_m * (1 - e_m)
+    v0_m = e0_m * (1 - e0_m)
+
+    return (
+        (t * (e_m - e0_m)).sum(-1),
+        (t * v0_m).sum(-1),
+        (t * v_m).sum(-1)
+    )
+
+
+def _check_correlation(p0, odds_ratio, correlation):
+    """
+    Conditional exposure probabilities must lie in [0, 1].
+    """
+    _, pp, pm = conditional_exposure(p0, odds_ratio, correlation)
+    return (pp >= 0) & (pp <= 1) & (pm >= 0) & (pm <= 1)
+
+
+def calculate_matched_case_control(
+    alpha: float,
+    power: float,
+    p0: float,
+    odds_ratio: float,
+    controls_per_case: int = 1,
+    correlation: float = 0.0,
+    two_sided: bool = True,
+    dropout_rate: float = 0.0,
+    trace: bool = False
+) -> dict:
+    """
+    Calculates the number of matched sets (cases) for a 1:M matched
+    case-control study analysed by conditional logistic regression /
+    McNemar (Dupont, 1988).
+
+    p0 = exposure prevalence among controls
+    controls_per_case = M matched controls per case
+    correlation = exposure correlation between matched members (φ)
+    trace = also return the intermediate values in result["trace"]
+
+    Formula:
+    n = [Zα √Σ t v0 + Zβ √Σ t v]² / [Σ t (e − e0)]²
+    """
+
+    p0 = validate_proportion(p0)
+    validate_positive(odds_ratio, "Odds ratio")
+
+    if odds_ratio == 1:
+        raise ValueError("Odds ratio must differ from 1.")
+
+    if controls_per_case < 1:
+        raise ValueError("At least one control per case is required.")
+
+    if not bool(_check_correlation(p0, odds_ratio, correlation)):
+        raise ValueError("Correlation too large for this p0 and OR (conditional exposure probability outside [0, 1]).")
+
+    Z_alpha = z_alpha(alpha, two_sided)
+    Z_beta = z_beta(power)
+
+    shift, var0, var1 = (
+        float(x) for x in dupont_moments(p0, odds_ratio, controls_per_case, correlation)
+    )
+
+    n_raw = (Z_alpha * np.sqrt(var0) + Z_beta * np.sqrt(var1)) ** 2 / shift ** 2
+
+    n_cases = ceil_int(n_raw)
+    n_cases_final = adjust_for_dropout(n_cases, dropout_rate)
+    n_controls_final = controls_per_case * n_cases_final
+
+    result = {
+        "n_cases": n_cases_final,
+        "n_controls": n_controls_final,
+        "n_total": n_cases_final + n_controls_final,
+        "n_before_dropout": n_cases,
+        "formula": "n = [Zα √Σ t·v0 + Zβ √Σ t·v]² / [Σ t·(e − e0)]² (Dupont)",
+        "assumptions": [
+            f"1:{controls_per_case} matched case-control design",
+            f"Exposure correlation between matched members φ = {correlation}",
+            "Conditional logistic regression / McNemar test",
+            "Normal approximation"
+        ]
+    }
+
+    if trace:
+        p1, p0_plus, p0_minus = (
+            float(x) for x in conditional_exposure(p0, odds_ratio, correlation)
+        )
+        result["trace"] = {
+            "z_alpha": Z_alpha,
+            "z_beta": Z_beta,
+            "p1": p1,
+            "p0_plus": p0_plus,
+            "p0_minus": p0_minus,
+            "shift": shift,
+            "var_null": var0,
+            "var_alt": var1,
+            "n_raw": float(n_raw)
+        }
+
+    return result
+
+
+def power_matched_case_control(
+    alpha: float,
+    n_cases,
+    p0,
+    odds_ratio,
+    controls_per_case=1,
+    correlation=0.0,
+    two_sided: bool = True
+):
+    """
+    Power of the matched analysis with n_cases matched sets.
+    Vectorized over all scenario arguments.
+    """
+
+    shift, var0, var1 = dupont_moments(p0, odds_ratio, controls_per_case, correlation)
+
+    Z_alpha = z_alpha(alpha, two_sided)
+
+    return ndtr(
+        (np.sqrt(as_float_array(n_cases)) * np.abs(shift) - Z_alpha * np.sqrt(var0))
+        / np.sqrt(var1)
+    )
+
+
+def matched_case_control_grid(
+    alpha: float,
+    power: float,
+    p0: float,
+    odds_ratios,
+    controls_per_case,
+    correlations,
+    two_sided: bool = True
+) -> dict:
+    """
+    Number of matched sets over OR × M × φ (before dropout).
+
+    All matching ratios share one padded evaluation; binomial terms
+    are cached per M. Cells with an infeasible correlation return -1.
+    """
+
+    psi, M, phi = outer_grid(odds_ratios, controls_per_case, correlations)
+    psi, M, phi = np.broadcast_arrays(psi, M.astype(np.int64), phi)
+
+    Z_alpha = z_alpha(alpha, two_sided)
+    Z_beta = z_beta(power)
+
+    ok = _check_correlation(p0, psi, phi) & (psi != 1)
+
+    shift, var0, var1 = dupont_moments(p0, psi, M, phi)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        n_raw = (Z_alpha * np.sqrt(var0) + Z_beta * np.sqrt(var1)) ** 2 / shift ** 2
+
+    n = np.where(ok, np.ceil(np.nan_to_num(n_raw, nan=-1.0)), -1).astype(np.int64)
+
+    return {
+        "odds_ratio": np.asarray(odds_ratios, dtype=float),
+        "controls_per_case": np.asarray(controls_per_case, dtype=np.int64),
+        "correlation": np.asarray(correlations, dtype=float),
+        "n_cases": n,
+        "n_total": np.where(n > 0, n * (M + 1), -1)
+    }
@@ -4,7 +4,10 @@
 # ==========================================
 
 import math
+from functools import lru_cache
 
+# numpy / scipy are imported inside the precision functions so that the
+# closed-form calculator loads with the standard library only
 from utils.stat_utils import (
     z_alpha,
     z_beta,
@@ -14,13 +17,27 @@ from utils.stat_utils import (
 )
 
 
+PRECISION_METHODS = ("wald", "wilson", "clopper_pearson")
+
+PRECISION_LABELS = {
+    "wald": "Wald (normal approximation)",
+    "wilson": "Wilson score",
+    "clopper_pearson": "Clopper–Pearson exact"
+}
+
+# Binomial outcomes with probability below this are left out of the
+# interval-width distribution
+PMF_CUTOFF = 1e-12
+
+
 def calculate_one_proportion(
     alpha: float,
     power: float,
     p0: float,
     p1: float,
     two_sided: bool = True,
-    dropout_rate: float = 0.0
+    dropout_rate: float = 0.0,
+    trace: bool = False
 ) -> dict:
     """
     Calculates sample size for one-sample proportion test.
@@ -28,6 +45,8 @@ def calculate_one_proportion(
     Formula:
     n = ((Z_alpha * sqrt(p0(1-p0)) +
           Z_beta * sqrt(p1(1-p1)))^2) / (p1 - p0)^2
+
+    trace = also return the intermediate values in result["trace"]
     """
 
     p0 = validate_proportion(p0)
@@ -51,7 +70,7 @@ def calculate_one_proportion(
     n_ceiled = ceil_int(n_raw)
     n_final = adjust_for_dropout(n_ceiled, dropout_rate)
 
-    return {
+    result = {
         "n_required": n_final,
         "n_before_dropout": n_ceiled,
         "formula": "Normal approximation for one-sample proportion",
@@ -61,3 +80,171 @@ def calculate_one_proportion(
             "Two-sided or one-sided test specified"
         ]
     }
+
+    if trace:
+        result["trace"] = {
+            "z_alpha": Z_alpha,
+            "z_beta": Z_beta,
+            "delta": abs(p1 - p0),
+            "n_raw": n_raw
+        }
+
+    return result
+
+
+@lru_cache(maxsize=512)
+def _binomial_window(n: int, p: float):
+    """
+    Binomial(n, p) PMF over the outcomes with non-negligible
+    probability: (first outcome, read-only PMF array). Cached, so the
+    bracketing and bisection steps of a search share tables.
+    """
+
+    import numpy as np
+    from scipy.stats import binom
+
+    pmf = binom.pmf(np.arange(n + 1), n, p)
+    kept = np.nonzero(pmf > PMF_CUTOFF)[0]
+    lo, hi = kept[0], kept[-1] + 1
+
+    pmf = pmf[lo:hi]
+    pmf.setflags(write=False)
+
+    return int(lo), pmf
+
+
+@lru_cache(maxsize=512)
+def _half_widths(n: int, alpha: float, method: str, lo: int, hi: int):
+    """
+    Confidence interval half-widths for x = lo..hi−1 responses out of n
+    (read-only, cached per n).
+    """
+
+    import numpy as np
+    from scipy.special import betaincinv
+
+    x = np.arange(lo, hi, dtype=float)
+    ph = x / n
+    z = z_alpha(alpha, True)
+
+    if method == "wald":
+        width = z * np.sqrt(ph * (1 - ph) / n)
+
+    elif method == "wilson":
+        width = z / (1 + z ** 2 / n) * np.sqrt(ph * (1 - ph) / n + z ** 2 / (4 * n ** 2))
+
+    else:
+        # Exact limits are beta quantiles; 0 and n have one-sided limits
+        lower = np.where(x > 0, betaincinv(np.maximum(x, 1), n - x + 1, alpha / 2), 0.0)
+        upper = np.where(x < n, betaincinv(x + 1, np.maximum(n - x, 1), 1 - alpha / 2), 1.0)
+        width = (upper - lower) / 2
+
+    width.setflags(write=False)
+    return width
+
+
+def proportion_half_width(alpha: float, n: int, p: float, method: str = "wilson", assurance: float = None) -> float:
+    """
+    Half-width of the 100(1 − alpha)% interval for a proportion with n
+    observations and true proportion p: its expected value over the
+    binomial outcomes, or (assurance given) the half-width that is not
+    exceeded with that probability.
+    """
+
+    import numpy as np
+
+    lo, pmf = _binomial_window(int(n), float(p))
+    width = _half_widths(int(n), float(alpha), method, lo, lo + pmf.size)
+
+    if assurance is None:
+        return float(pmf @ width / pmf.sum())
+
+    order = np.argsort(width, kind="stable")
+    cumulative = np.cumsum(pmf[order]) / pmf.sum()
+    return float(width[order][np.searchsorted(cumulative, assurance - 1e-12)])
+
+
+def calculate_one_proportion_precision(
+    alpha: float,
+    p: float,
+    half_width: float,
+    method: str = "wilson",
+    assurance: float = None,
+    dropout_rate: float = 0.0,
+    max_n: int = 10 ** 7,
+    trace: bool = False
+) -> dict:
+    """
+    Sample size for a target confidence interval half-width around an
+    anticipated proportion (descriptive / precision studies).
+
+    alpha = 1 − confidence level (two-sided interval)
+    method = "wald", "wilson" or "clopper_pearson"
+    assurance = None for the expected half-width, or the probability
+                that the realised half-width is at most half_width
+
+    Wald with the expected width is the closed form
+    n = Z^2 p(1 − p) / d^2. Otherwise the exact width distribution is
+    evaluated over the binomial outcomes, with n bracketed from the
+    Wald size and bisected; the widths are saw-toothed in n, so the
+    result is the first n found on the decreasing trend.
+    """
+
+    import numpy as np
+    from utils.array_utils import search_min_n
+
+    p = validate_proportion(p)
+
+    if not 0 < half_width < 0.5:
+        raise ValueError("Half-width must be between 0 and 0.5.")
+
+    if method not in PRECISION_METHODS:
+        raise ValueError(f"Method must be one of {PRECISION_METHODS}.")
+
+    if assurance is not None and not 0 < assurance < 1:
+        raise ValueError("Assurance must be between 0 and 1.")
+
+    Z = z_alpha(alpha, True)
+    n_wald = Z ** 2 * p * (1 - p) / half_width ** 2
+
+    if method == "wald" and assurance is None:
+        n_ceiled = ceil_int(n_wald)
+    else:
+        def enough(n):
+            return np.vectorize(
+                lambda m: proportion_half_width(alpha, int(m), p, method, assurance) <= half_width
+            )(n)
+
+        hi = max(2, ceil_int(n_wald))
+        while not enough(hi):
+            if hi >= max_n:
+                raise ValueError(f"Half-width not reached with n ≤ {max_n}.")
+            hi = min(2 * hi, max_n)
+
+        n_ceiled = int(search_min_n(enough, 1, hi))
+
+    n_final = adjust_for_dropout(n_ceiled, dropout_rate)
+    achieved = proportion_half_width(alpha, n_ceiled, p, method, assurance)
+
+    criterion = (
+        "expected half-width ≤ d" if assurance is None
+        else f"P(half-width ≤ d) ≥ {assurance}"
+    )
+
+    result = {
+        "n_required": n_final,
+        "n_before_dropout": n_ceiled,
+        "half_width": achieved,
+        "method": method,
+        "formula": f"{PRECISION_LABELS[method]} interval: smallest n with {criterion}",
+        "assumptions": [
+            "Simple random sample",
+            "Binomial distribution",
+            "Anticipated proportion close to the true value"
+        ]
+    }
+
+    if trace:
+        result["trace"] = {"z_alpha": Z, "n_wald_raw": n_wald}
+
+    return result
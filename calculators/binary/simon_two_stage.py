@@ -0,0 +1,264 @@
+
+# ==========================================
+# Phase II Single-Arm Designs — Simon Two-Stage / A'Hern
+# ==========================================
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+from scipy.stats import binom
+
+from utils.stat_utils import adjust_for_dropout, validate_proportion
+
+
+# Largest total n searched by default
+MAX_N = 150
+
+
+def _validate(alpha, power, p0, p1, max_n):
+    p0 = validate_proportion(p0)
+    p1 = validate_proportion(p1)
+
+    if p1 <= p0:
+        raise ValueError("Target response rate p1 must exceed p0.")
+
+    if not 0 < alpha < 1 or not 0 < power < 1:
+        raise ValueError("Alpha and power must be between 0 and 1.")
+
+    if max_n < 2:
+        raise ValueError("Maximum sample size must be at least 2.")
+
+    return p0, p1
+
+
+@lru_cache(maxsize=1024)
+def _binomial_tables(m: int, p: float):
+    """
+    Binomial(m, p) PMF and a padded survival table: entry k + m + 1
+    is P(X > k) for k in [−m − 1, 2m + 1] (1 below 0, 0 from m on).
+    Shared by every candidate design with the same stage size.
+    """
+
+    pmf = binom.pmf(np.arange(m + 1), m, p)
+
+    sf = np.concatenate([
+        np.ones(m + 1),
+        binom.sf(np.arange(m), m, p),
+        np.zeros(m + 2)
+    ])
+
+    pmf.setflags(write=False)
+    sf.setflags(write=False)
+
+    return pmf, sf
+
+
+def _continue_probabilities(n1: int, n: int, p: float):
+    """
+    Matrix C[r1, r] = P(X1 > r1 and X1 + X2 > r) for r1 < n1, r < n:
+    the probability of declaring the treatment promising.
+    """
+
+    pmf1, _ = _binomial_tables(n1, p)
+    _, sf2 = _binomial_tables(n - n1, p)
+
+    x1 = np.arange(n1 + 1)[:, None]
+    r = np.arange(n)[None, :]
+
+    # Offset into the padded table of the second stage (size n − n1)
+    terms = pmf1[:, None] * sf2[np.clip(r - x1 + (n - n1) + 1, 0, sf2.size - 1)]
+
+    # Reverse cumulative sum over x1 > r1
+    tail = np.cumsum(terms[::-1], axis=0)[::-1]
+
+    return tail[1:]
+
+
+def _search_n(alpha, power, p0, p1, n, best_en0=np.inf):
+    """
+    Admissible two-stage designs with total size n, as rows
+    (n1, r1, n, r, EN0, PET0, alpha, power), pruning first stages with
+    n1 ≥ best_en0 (EN0 ≥ n1, so they cannot be optimal).
+
+    For each (n1, r1) only the smallest r with type I error ≤ alpha is
+    kept: power falls as r grows, so any other r is dominated.
+    """
+
+    rows = []
+
+    for n1 in range(1, n):
+        if n1 >= best_en0:
+            break
+
+        c0 = _continue_probabilities(n1, n, p0)
+        c1 = _continue_probabilities(n1, n, p1)
+
+        r1 = np.arange(n1)[:, None]
+        r = np.arange(n)[None, :]
+
+        ok_alpha = (c0 <= alpha) & (r >= r1)
+        has_r = ok_alpha.any(axis=1)
+        first_r = np.argmax(ok_alpha, axis=1)
+
+        sel = np.arange(n1)
+        achieved = c1[sel, first_r]
+        keep = has_r & (achieved >= power)
+
+        if not keep.any():
+            continue
+
+        pet0 = binom.cdf(sel[keep], n1, p0)
+        en0 = n1 + (1 - pet0) * (n - n1)
+
+        rows.append(np.column_stack([
+            np.full(keep.sum(), n1),
+            sel[keep],
+            np.full(keep.sum(), n),
+            first_r[keep],
+            en0,
+            pet0,
+            c0[sel[keep], first_r[keep]],
+            achieved[keep]
+        ]))
+
+    return np.concatenate(rows) if rows else np.empty((0, 8))
+
+
+def _search_chunk(args):
+    alpha, power, p0, p1, n_values = args
+    found = [_search_n(alpha, power, p0, p1, n) for n in n_values]
+    return np.concatenate(found) if found else np.empty((0, 8))
+
+
+def _design(row, dropout_rate) -> dict:
+    n1, r1, n, r, en0, pet0, alpha_actual, power_actual = row
+
+    return {
+        "n1": int(n1),
+        "r1": int(r1),
+        "n": int(n),
+        "r": int(r),
+        "en0": float(en0),
+        "pet0": float(pet0),
+        "alpha_actual": float(alpha_actual),
+        "power_actual": float(power_actual),
+        "n1_required": adjust_for_dropout(int(n1), dropout_rate),
+        "n_required": adjust_for_dropout(int(n), dropout_rate)
+    }
+
+
+def calculate_simon_two_stage(
+    alpha: float,
+    power: float,
+    p0: float,
+    p1: float,
+    dropout_rate: float = 0.0,
+    max_n: int = MAX_N,
+    workers: int = 1
+) -> dict:
+    """
+    Exact Simon two-stage designs (optimal and minimax) for a
+    single-arm phase II trial.
+
+    p0 = uninteresting response rate (H0), p1 = target response rate
+    alpha = one-sided type I error, power = power at p1
+    max_n = largest total sample size searched
+    workers = processes for the search (the n range is dealt out
+              round-robin; 1 searches in-process with pruning)
+
+    Stage 1 enrols n1 and stops for futility with ≤ r1 responses;
+    otherwise n in total are enrolled and the treatment is rejected
+    with ≤ r responses.
+    Optimal minimises the expected size under p0 (EN0); minimax
+    minimises n, then EN0.
+    """
+
+    p0, p1 = _validate(alpha, power, p0, p1, max_n)
+    max_n = int(max_n)
+
+    if workers > 1:
+        chunks = [
+            (alpha, power, p0, p1, list(range(2 + i, max_n + 1, workers)))
+            for i in range(workers)
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            found = np.concatenate(list(pool.map(_search_chunk, chunks)))
+    else:
+        found = []
+        best_en0 = np.inf
+        for n in range(2, max_n + 1):
+            rows = _search_n(alpha, power, p0, p1, n, best_en0)
+            if len(rows):
+                best_en0 = min(best_en0, rows[:, 4].min())
+                found.append(rows)
+        found = np.concatenate(found) if found else np.empty((0, 8))
+
+    if not len(found):
+        raise ValueError(f"No two-stage design found with n ≤ {max_n}; increase the maximum n.")
+
+    # Optimal: min EN0 (ties: smaller n); minimax: min n, then EN0
+    optimal = found[np.lexsort((found[:, 2], found[:, 4]))[0]]
+    minimax = found[np.lexsort((found[:, 4], found[:, 2]))[0]]
+
+    return {
+        "optimal": _design(optimal, dropout_rate),
+        "minimax": _design(minimax, dropout_rate),
+        "formula": "Exact binomial search over (n1, r1, n, r) (Simon, 1989)",
+        "assumptions": [
+            "Single-arm trial with binary response",
+            "One-sided test of H0: p ≤ p0",
+            "Futility stop after stage 1 only"
+        ]
+    }
+
+
+def calculate_ahern_single_stage(
+    alpha: float,
+    power: float,
+    p0: float,
+    p1: float,
+    dropout_rate: float = 0.0,
+    max_n: int = MAX_N
+) -> dict:
+    """
+    A'Hern exact single-stage design: the smallest n with a cut-off r
+    such that P(X > r | p0) ≤ alpha and P(X > r | p1) ≥ power.
+
+    The treatment is rejected with ≤ r responses (same convention as
+    the Simon designs; A'Hern's r is this r + 1).
+    """
+
+    p0, p1 = _validate(alpha, power, p0, p1, max_n)
+
+    n = np.arange(1, int(max_n) + 1)[:, None]
+    r = np.arange(int(max_n))[None, :]
+
+    alpha_r = binom.sf(r, n, p0)
+    power_r = binom.sf(r, n, p1)
+
+    # Smallest r meeting alpha has the highest power for that n
+    ok_alpha = (alpha_r <= alpha) & (r < n)
+    first_r = np.argmax(ok_alpha, axis=1)
+    rows = np.arange(n.shape[0])
+
+    feasible = ok_alpha.any(axis=1) & (power_r[rows, first_r] >= power)
+
+    if not feasible.any():
+        raise ValueError(f"No single-stage design found with n ≤ {max_n}; increase the maximum n.")
+
+    i = int(np.argmax(feasible))
+    n_ceiled = int(n[i, 0])
+
+    return {
+        "n_required": adjust_for_dropout(n_ceiled, dropout_rate),
+        "n_before_dropout": n_ceiled,
+        "r": int(first_r[i]),
+        "alpha_actual": float(alpha_r[i, first_r[i]]),
+        "power_actual": float(power_r[i, first_r[i]]),
+        "formula": "Exact binomial single-stage design (A'Hern, 2001)",
+        "assumptions": [
+            "Single-arm trial with binary response",
+            "One-sided exact binomial test of H0: p ≤ p0"
+        ]
+    }
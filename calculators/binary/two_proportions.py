@@ -3,6 +3,10 @@
 # ==========================================
 
 import math
+from functools import lru_cache
+
+# numpy / scipy are imported inside the vectorized functions so that the
+# closed-form calculator loads with the standard library only
 from utils.stat_utils import (
     z_alpha,
     z_beta,
@@ -12,6 +16,34 @@ from utils.stat_utils import (
     validate_positive
 )
 
+HYPOTHESES = ("superiority", "non_inferiority", "equivalence")
+
+METHODS = ("pooled", "fleiss_cc", "casagrande_pike", "arcsine", "farrington_manning")
+
+METHOD_LABELS = {
+    "pooled": "Pooled normal approximation",
+    "fleiss_cc": "Fleiss continuity correction",
+    "casagrande_pike": "Casagrande–Pike–Smith",
+    "arcsine": "Arcsine transformation",
+    "farrington_manning": "Farrington–Manning score"
+}
+
+FORMULAS = {
+    "pooled": "Two-proportion Z-test (pooled variance approach)",
+    "fleiss_cc": "n1' = n1/4 (1 + √(1 + 2(r + 1)/(r n1 |Δ|)))^2 (Fleiss–Tytun–Ury)",
+    "casagrande_pike": "n' = A (1 + √(1 + 4|Δ|/A))^2 / (4Δ^2) (Casagrande–Pike–Smith, 1:1)",
+    "arcsine": "n1 = (Z_alpha + Z_beta)^2 (1 + 1/r) / (2 asin√p1 − 2 asin√p2)^2",
+    "farrington_manning": "Score test, null variance at the restricted MLE (Farrington–Manning)"
+}
+
+# Binomial outcomes with probability below this are dropped from the
+# exact power enumeration
+PMF_CUTOFF = 1e-14
+
+# Upper bound for equivalence n searches
+MAX_N = 10 ** 7
+
+
 def calculate_two_proportions(
     alpha: float,
     power: float,
@@ -19,7 +51,11 @@ def calculate_two_proportions(
     p2: float,
     allocation_ratio: float = 1.0,
     two_sided: bool = True,
-    dropout_rate: float = 0.0
+    dropout_rate: float = 0.0,
+    hypothesis: str = "superiority",
+    margin: float = 0.0,
+    trace: bool = False,
+    method: str = "pooled"
 ) -> dict:
     """
     Calculates sample size for comparing two independent proportions.
@@ -27,6 +63,19 @@ def calculate_two_proportions(
     p1 = proportion in group 1
     p2 = proportion in group 2
     allocation_ratio = n2 / n1
+
+    hypothesis = "superiority", "non_inferiority" or "equivalence"
+    margin = non-inferiority / equivalence margin on the risk
+    difference p1 − p2 (positive; higher p1 favours group 1).
+    Each one-sided bound is tested at alpha/2 when two_sided=True,
+    otherwise at alpha.
+
+    trace = also return the intermediate values in result["trace"]
+
+    method = "pooled", "fleiss_cc" (continuity corrected),
+             "casagrande_pike" (1:1 allocation only), "arcsine" or
+             "farrington_manning" (restricted-MLE null variance; equals
+             pooled for superiority, also available for non_inferiority)
     """
 
     # Validation
@@ -34,6 +83,26 @@ def calculate_two_proportions(
     p2 = validate_proportion(p2)
     validate_positive(allocation_ratio, "Allocation ratio")
 
+    if hypothesis not in HYPOTHESES:
+        raise ValueError(f"Hypothesis must be one of {HYPOTHESES}.")
+
+    if method not in METHODS:
+        raise ValueError(f"Method must be one of {METHODS}.")
+
+    if method == "casagrande_pike" and allocation_ratio != 1:
+        raise ValueError("The Casagrande–Pike–Smith method assumes equal allocation.")
+
+    if hypothesis != "superiority":
+        if method not in ("pooled", "farrington_manning") or (
+            hypothesis == "equivalence" and method != "pooled"
+        ):
+            raise ValueError(f"Method '{method}' is not available for {hypothesis}.")
+
+        return _calculate_margin_based(
+            alpha, power, p1, p2, allocation_ratio, two_sided,
+            dropout_rate, hypothesis, margin, trace, method
+        )
+
     delta = abs(p1 - p2)
 
     if delta == 0:
@@ -55,19 +124,24 @@ def calculate_two_proportions(
     n1_raw = ((Z_alpha * math.sqrt(var_null) +
                Z_beta * math.sqrt(var_alt)) ** 2) / (delta ** 2)
 
+    if method not in ("pooled", "farrington_manning"):
+        terms = _shared_terms(Z_alpha, Z_beta, p1, p2, r)
+        n1_raw = float(_method_n1_raw(method, terms))
+
     n1 = ceil_int(n1_raw)
     n2 = ceil_int(r * n1)
 
     n1_adj = adjust_for_dropout(n1, dropout_rate)
     n2_adj = adjust_for_dropout(n2, dropout_rate)
 
-    return {
+    result = {
         "n_group1": n1_adj,
         "n_group2": n2_adj,
         "n_total": n1_adj + n2_adj,
         "n1_before_dropout": n1,
         "n2_before_dropout": n2,
-        "formula": "Two-proportion Z-test (pooled variance approach)",
+        "method": method,
+        "formula": FORMULAS[method],
         "assumptions": [
             "Independent groups",
             "Binary outcome",
@@ -75,3 +149,535 @@ def calculate_two_proportions(
             "Adequate expected cell counts"
         ]
     }
+
+    if trace:
+        result["trace"] = {
+            "z_alpha": Z_alpha,
+            "z_beta": Z_beta,
+            "delta": delta,
+            "p_bar": p_bar,
+            "var_null": var_null,
+            "var_alt": var_alt,
+            "n1_raw": n1_raw
+        }
+
+    return result
+
+
+def _calculate_margin_based(
+    alpha, power, p1, p2, allocation_ratio, two_sided,
+    dropout_rate, hypothesis, margin, trace=False, method="pooled"
+):
+    validate_positive(margin, "Margin")
+
+    diff = p1 - p2
+    r = allocation_ratio
+
+    Z_alpha = z_alpha(alpha, two_sided)
+    Z_beta = z_beta(power)
+    var_alt = p1 * (1 - p1) + (p2 * (1 - p2)) / r
+
+    if hypothesis == "non_inferiority":
+        if diff + margin <= 0:
+            raise ValueError("Expected difference must exceed −margin for non-inferiority.")
+
+        if method == "farrington_manning":
+            terms = _shared_terms(Z_alpha, Z_beta, p1, p2, r)
+            n1_raw = float(_method_n1_raw(method, terms, null_difference=-margin))
+            formula = FORMULAS[method]
+        else:
+            n1_raw = ((Z_alpha + Z_beta) ** 2) * var_alt / (diff + margin) ** 2
+            formula = "n1 = (Z_alpha + Z_beta)^2 (p1q1 + p2q2/r) / (p1 − p2 + margin)^2"
+
+        n1 = ceil_int(n1_raw)
+        null_text = "H0: p1 − p2 ≤ −margin"
+    else:
+        if abs(diff) >= margin:
+            raise ValueError("Expected difference must lie inside the equivalence margin.")
+
+        n1_raw = None
+        n1 = int(_solve_equivalence_n1(alpha, power, p1, p2, margin, r, two_sided))
+
+        if n1 < 0:
+            raise ValueError("Target power not reachable; the expected difference is too close to the margin.")
+        formula = "TOST power, unpooled normal approximation"
+        null_text = "H0: |p1 − p2| ≥ margin"
+
+    n2 = ceil_int(r * n1)
+
+    n1_adj = adjust_for_dropout(n1, dropout_rate)
+    n2_adj = adjust_for_dropout(n2, dropout_rate)
+
+    result = {
+        "n_group1": n1_adj,
+        "n_group2": n2_adj,
+        "n_total": n1_adj + n2_adj,
+        "n1_before_dropout": n1,
+        "n2_before_dropout": n2,
+        "hypothesis": hypothesis,
+        "margin": margin,
+        "method": method,
+        "formula": formula,
+        "assumptions": [
+            "Independent groups",
+            "Binary outcome",
+            "Unpooled variance under the alternative",
+            null_text
+        ]
+    }
+
+    if trace:
+        # Equivalence is solved by search (no closed-form n1_raw)
+        result["trace"] = {
+            "z_alpha": Z_alpha,
+            "z_beta": Z_beta,
+            "delta": diff,
+            "var_alt": var_alt,
+            "n1_raw": n1_raw
+        }
+
+    return result
+
+
+def power_two_proportions(
+    alpha: float,
+    n1,
+    p1,
+    p2,
+    allocation_ratio=1.0,
+    two_sided: bool = True
+):
+    """
+    Normal-approximation power of the pooled two-proportion Z-test.
+
+    Vectorized: n1, p1, p2 and allocation_ratio may be arrays
+    (broadcast together).
+    """
+
+    import numpy as np
+    from scipy.special import ndtr
+    from utils.array_utils import as_float_array
+
+    n1 = as_float_array(n1)
+    p1 = as_float_array(p1)
+    p2 = as_float_array(p2)
+    r = as_float_array(allocation_ratio)
+
+    Z_alpha = z_alpha(alpha, two_sided)
+
+    p_bar = (p1 + r * p2) / (1 + r)
+
+    var_null = p_bar * (1 - p_bar) * (1 + 1/r)
+    var_alt = p1 * (1 - p1) + (p2 * (1 - p2)) / r
+
+    return ndtr(
+        (np.abs(p1 - p2) * np.sqrt(n1) - Z_alpha * np.sqrt(var_null))
+        / np.sqrt(var_alt)
+    )
+
+
+def power_two_proportions_tost(
+    alpha: float,
+    n1,
+    p1,
+    p2,
+    margin,
+    allocation_ratio=1.0,
+    two_sided: bool = True
+):
+    """
+    Normal-approximation power of the two one-sided tests (TOST)
+    for equivalence of two proportions (unpooled variance).
+
+    Vectorized over all array arguments.
+    """
+
+    import numpy as np
+    from scipy.special import ndtr
+    from utils.array_utils import as_float_array
+
+    n1 = as_float_array(n1)
+    p1 = as_float_array(p1)
+    p2 = as_float_array(p2)
+    margin = as_float_array(margin)
+    r = as_float_array(allocation_ratio)
+
+    Z_alpha = z_alpha(alpha, two_sided)
+
+    se = np.sqrt((p1 * (1 - p1) + (p2 * (1 - p2)) / r) / n1)
+    diff = p1 - p2
+
+    return np.clip(
+        ndtr((margin - diff) / se - Z_alpha)
+        - ndtr((-margin - diff) / se + Z_alpha),
+        0, 1
+    )
+
+
+def _solve_equivalence_n1(alpha, power, p1, p2, margin, r, two_sided):
+    """
+    Smallest n1 with TOST power >= target (vectorized over inputs).
+    """
+
+    import numpy as np
+    from utils.array_utils import as_float_array, search_min_n
+
+    p1, p2, margin = np.broadcast_arrays(
+        as_float_array(p1), as_float_array(p2), as_float_array(margin)
+    )
+
+    inside = np.abs(p1 - p2) < margin
+    gap = np.where(inside, margin - np.abs(p1 - p2), np.nan)
+
+    Z_alpha = z_alpha(alpha, two_sided)
+    Z_beta = z_beta(1 - (1 - power) / 2)
+    var_alt = p1 * (1 - p1) + (p2 * (1 - p2)) / r
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        n_approx = ((Z_alpha + Z_beta) ** 2) * var_alt / gap ** 2
+
+    hi = np.where(
+        inside, np.minimum(np.ceil(n_approx) + 1, MAX_N), 1
+    ).astype(np.int64)
+
+    def enough(n):
+        return power_two_proportions_tost(
+            alpha, n, p1, p2, margin, r, two_sided
+        ) >= power
+
+    n1 = search_min_n(enough, 1, hi)
+
+    return np.where(inside, n1, -1)
+
+
+def two_proportions_margin_grid(
+    alpha: float,
+    power: float,
+    p2: float,
+    margins,
+    differences,
+    hypothesis: str = "equivalence",
+    allocation_ratio: float = 1.0,
+    two_sided: bool = True
+) -> dict:
+    """
+    Vectorized n1 (before dropout) over a margin × true difference grid.
+
+    p2 = reference (group 2) proportion; p1 = p2 + difference.
+    Cells where the hypothesis cannot be established, or p1 falls
+    outside (0, 1), are returned as -1.
+    """
+
+    import numpy as np
+    from utils.array_utils import outer_grid
+
+    if hypothesis not in ("non_inferiority", "equivalence"):
+        raise ValueError("Grid hypothesis must be non_inferiority or equivalence.")
+
+    M, D = outer_grid(margins, differences)
+    p1 = p2 + D
+    valid = (p1 > 0) & (p1 < 1)
+    p1 = np.where(valid, p1, 0.5)
+    r = allocation_ratio
+
+    if hypothesis == "non_inferiority":
+        Z_alpha = z_alpha(alpha, two_sided)
+        Z_beta = z_beta(power)
+        var_alt = p1 * (1 - p1) + (p2 * (1 - p2)) / r
+        gap = D + M
+        with np.errstate(divide="ignore", invalid="ignore"):
+            n1 = np.ceil(((Z_alpha + Z_beta) ** 2) * var_alt / gap ** 2)
+        n1 = np.where(gap > 0, n1, -1).astype(np.int64)
+    else:
+        n1 = _solve_equivalence_n1(alpha, power, p1, p2, M, r, two_sided)
+
+    n1 = np.where(valid, n1, -1)
+    n2 = np.where(n1 > 0, np.ceil(r * n1), -1).astype(np.int64)
+
+    return {
+        "margin": M.ravel(),
+        "difference": D.ravel(),
+        "n_group1": n1,
+        "n_group2": n2
+    }
+
+
+def restricted_mle(p1, p2, allocation_ratio, null_difference):
+    """
+    Farrington–Manning restricted MLE (p̃1, p̃2) under
+    H0: p1 − p2 = null_difference, from the closed-form cubic root.
+
+    Vectorized; with a zero null difference this is the pooled
+    proportion (p1 + r p2) / (1 + r).
+    """
+
+    import numpy as np
+
+    p1, p2, r, d = np.broadcast_arrays(
+        np.asarray(p1, dtype=float),
+        np.asarray(p2, dtype=float),
+        np.asarray(allocation_ratio, dtype=float),
+        np.asarray(null_difference, dtype=float)
+    )
+
+    a = 1 + r
+    b = -(1 + r + p1 + r * p2 + d * (r + 2))
+    c = d ** 2 + d * (2 * p1 + r + 1) + p1 + r * p2
+    e = -p1 * d * (1 + d)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        v = b ** 3 / (27 * a ** 3) - b * c / (6 * a ** 2) + e / (2 * a)
+        u = np.sign(v) * np.sqrt(np.maximum(b ** 2 / (9 * a ** 2) - c / (3 * a), 0))
+        w = (np.pi + np.arccos(np.clip(v / u ** 3, -1, 1))) / 3
+        t1 = 2 * u * np.cos(w) - b / (3 * a)
+
+    pooled = (p1 + r * p2) / (1 + r)
+    t1 = np.where(d == 0, pooled, t1)
+
+    return t1, t1 - d
+
+
+def _shared_terms(Z_alpha, Z_beta, p1, p2, r) -> dict:
+    """
+    Terms common to every method: Z values, variances under H0 and H1
+    and the pooled (uncorrected) n1.
+    """
+
+    import numpy as np
+
+    p_bar = (p1 + r * p2) / (1 + r)
+    var_null = p_bar * (1 - p_bar) * (1 + 1 / r)
+    var_alt = p1 * (1 - p1) + (p2 * (1 - p2)) / r
+    delta = np.abs(p1 - p2)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        n_pooled = (Z_alpha * np.sqrt(var_null) + Z_beta * np.sqrt(var_alt)) ** 2 / delta ** 2
+
+    return {
+        "z_alpha": Z_alpha,
+        "z_beta": Z_beta,
+        "p1": p1,
+        "p2": p2,
+        "r": r,
+        "delta": delta,
+        "var_alt": var_alt,
+        "n_pooled": n_pooled
+    }
+
+
+def _method_n1_raw(method, terms, null_difference=0.0):
+    """
+    Unrounded n1 of one method from the shared terms (vectorized).
+    null_difference = −margin for non-inferiority (Farrington–Manning)
+    """
+
+    import numpy as np
+
+    Z_alpha, Z_beta = terms["z_alpha"], terms["z_beta"]
+    p1, p2, r = terms["p1"], terms["p2"], terms["r"]
+    delta, n = terms["delta"], terms["n_pooled"]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if method == "pooled":
+            return n
+
+        if method == "fleiss_cc":
+            return n / 4 * (1 + np.sqrt(1 + 2 * (r + 1) / (n * r * delta))) ** 2
+
+        if method == "casagrande_pike":
+            A = n * delta ** 2
+            n_cps = A * (1 + np.sqrt(1 + 4 * delta / A)) ** 2 / (4 * delta ** 2)
+            return np.where(r == 1, n_cps, np.nan)
+
+        if method == "arcsine":
+            h = 2 * np.arcsin(np.sqrt(p1)) - 2 * np.arcsin(np.sqrt(p2))
+            return (Z_alpha + Z_beta) ** 2 * (1 + 1 / r) / h ** 2
+
+        # Farrington–Manning: superiority tests in the direction of the
+        # expected difference
+        t1, t2 = restricted_mle(p1, p2, r, null_difference)
+        var_null = t1 * (1 - t1) + t2 * (1 - t2) / r
+        gap = np.where(
+            np.asarray(null_difference) == 0, delta, p1 - p2 - null_difference
+        )
+
+        return np.where(
+            gap > 0,
+            (Z_alpha * np.sqrt(var_null) + Z_beta * np.sqrt(terms["var_alt"])) ** 2 / gap ** 2,
+            np.nan
+        )
+
+
+def two_proportions_methods(
+    alpha: float,
+    power: float,
+    p1,
+    p2,
+    allocation_ratio=1.0,
+    two_sided: bool = True,
+    methods=METHODS
+) -> dict:
+    """
+    Comparison table of n1 / n2 (superiority, before dropout) for
+    several methods over broadcast p1 × p2 × allocation ratio arrays.
+
+    Z values, variances and the pooled n are computed once and shared.
+    Invalid cells (p outside (0, 1), p1 = p2, Casagrande–Pike with
+    unequal allocation) return -1.
+    """
+
+    import numpy as np
+
+    unknown = [m for m in methods if m not in METHODS]
+    if unknown:
+        raise ValueError(f"Unknown methods {unknown}; choose from {METHODS}.")
+
+    P1, P2, R = np.broadcast_arrays(
+        np.asarray(p1, dtype=float),
+        np.asarray(p2, dtype=float),
+        np.asarray(allocation_ratio, dtype=float)
+    )
+
+    ok = (P1 > 0) & (P1 < 1) & (P2 > 0) & (P2 < 1) & (P1 != P2) & (R > 0)
+
+    # Placeholders keep invalid cells finite; they are masked below
+    terms = _shared_terms(
+        z_alpha(alpha, two_sided),
+        z_beta(power),
+        np.where(ok, P1, 0.3),
+        np.where(ok, P2, 0.2),
+        np.where(ok, R, 1.0)
+    )
+
+    table = {
+        "p1": P1,
+        "p2": P2,
+        "allocation_ratio": R,
+        "n_group1": {},
+        "n_group2": {}
+    }
+
+    for method in methods:
+        n1_raw = _method_n1_raw(method, terms)
+        valid = ok & np.isfinite(n1_raw)
+
+        n1 = np.ceil(np.where(valid, n1_raw, 1))
+        n2 = np.ceil(terms["r"] * n1)
+
+        table["n_group1"][method] = np.where(valid, n1, -1).astype(np.int64)
+        table["n_group2"][method] = np.where(valid, n2, -1).astype(np.int64)
+
+    return table
+
+
+@lru_cache(maxsize=256)
+def _binomial_pmf(n: int, p: float):
+    """
+    Binomial(n, p) PMF over the outcomes with non-negligible
+    probability: (first outcome, read-only PMF array).
+    """
+
+    import numpy as np
+    from scipy.stats import binom
+
+    pmf = binom.pmf(np.arange(n + 1), n, p)
+    kept = np.nonzero(pmf > PMF_CUTOFF)[0]
+    lo, hi = kept[0], kept[-1] + 1
+
+    pmf = pmf[lo:hi]
+    pmf.setflags(write=False)
+
+    return int(lo), pmf
+
+
+def _test_statistic(method, x1, x2, n1, n2, null_difference):
+    """
+    Z statistic of the test each method plans for, over outcome grids.
+
+    With a non-zero null difference "pooled" is the unpooled Wald
+    statistic (p̂1 − p̂2 − d0) / √(p̂1q̂1/n1 + p̂2q̂2/n2), matching the
+    non-inferiority sample size formula.
+    """
+
+    import numpy as np
+
+    ph1, ph2 = x1 / n1, x2 / n2
+    diff = ph1 - ph2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if method == "arcsine":
+            z = (2 * np.arcsin(np.sqrt(ph1)) - 2 * np.arcsin(np.sqrt(ph2))) / np.sqrt(1 / n1 + 1 / n2)
+
+        elif method == "farrington_manning":
+            t1, t2 = restricted_mle(ph1, ph2, n2 / n1, null_difference)
+            z = (diff - null_difference) / np.sqrt(t1 * (1 - t1) / n1 + t2 * (1 - t2) / n2)
+
+        elif null_difference != 0:
+            se = np.sqrt(ph1 * (1 - ph1) / n1 + ph2 * (1 - ph2) / n2)
+            z = (diff - null_difference) / se
+
+        else:
+            p_bar = (x1 + x2) / (n1 + n2)
+            se = np.sqrt(p_bar * (1 - p_bar) * (1 / n1 + 1 / n2))
+
+            if method in ("fleiss_cc", "casagrande_pike"):
+                cc = (1 / n1 + 1 / n2) / 2
+                diff = np.sign(diff) * np.maximum(np.abs(diff) - cc, 0)
+
+            z = diff / se
+
+    return np.nan_to_num(z, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def exact_power_two_proportions(
+    alpha: float,
+    n1: int,
+    n2: int,
+    p1: float,
+    p2: float,
+    method: str = "pooled",
+    two_sided: bool = True,
+    null_difference: float = 0.0
+) -> float:
+    """
+    Exact power of the method's test at given group sizes, by
+    enumerating the binomial outcomes of both groups.
+
+    null_difference = −margin for a non-inferiority test (rejects for
+    large Z only; "pooled" or "farrington_manning"). Superiority tests are two-sided, or one-sided in the
+    direction of p1 − p2, at the repo's Z_alpha.
+    Binomial PMF tables are cached per (n, p).
+    """
+
+    import numpy as np
+
+    if method not in METHODS:
+        raise ValueError(f"Method must be one of {METHODS}.")
+
+    if null_difference != 0 and method not in ("pooled", "farrington_manning"):
+        raise ValueError(f"Method '{method}' does not test a non-zero null difference.")
+
+    n1, n2 = int(n1), int(n2)
+    if n1 < 1 or n2 < 1:
+        raise ValueError("Group sizes must be positive.")
+
+    p1 = validate_proportion(p1)
+    p2 = validate_proportion(p2)
+
+    lo1, pmf1 = _binomial_pmf(n1, float(p1))
+    lo2, pmf2 = _binomial_pmf(n2, float(p2))
+
+    x1 = np.arange(lo1, lo1 + len(pmf1), dtype=float)[:, None]
+    x2 = np.arange(lo2, lo2 + len(pmf2), dtype=float)[None, :]
+
+    z = _test_statistic(method, x1, x2, n1, n2, null_difference)
+    Z_alpha = z_alpha(alpha, two_sided)
+
+    if null_difference != 0:
+        reject = z > Z_alpha
+    elif two_sided:
+        reject = np.abs(z) > Z_alpha
+    else:
+        reject = (z if p1 >= p2 else -z) > Z_alpha
+
+    return float(pmf1 @ reject @ pmf2)
@@ -0,0 +1,339 @@
+
+# ==========================================
+# Cluster-Randomized (Parallel) — Sample Size
+# ==========================================
+
+import numpy as np
+
+from utils.array_utils import as_float_array, outer_grid
+from utils.stat_utils import ceil_int, adjust_for_dropout
+from calculators.continuous.two_independent_means import (
+    calculate_two_independent_means,
+    power_two_independent_means
+)
+from calculators.binary.two_proportions import (
+    calculate_two_proportions,
+    power_two_proportions
+)
+
+
+def design_effect(cluster_size, icc, cv_cluster_size=0.0):
+    """
+    Design effect (variance inflation) for cluster randomization.
+
+    Equal cluster sizes:   DE = 1 + (m - 1) * ICC
+    Unequal cluster sizes: DE = 1 + ((CV^2 + 1) * m - 1) * ICC
+    (Eldridge et al., 2006), where m is the mean cluster size.
+
+    Vectorized over all arguments.
+    """
+
+    m = as_float_array(cluster_size)
+    icc = as_float_array(icc)
+    cv = as_float_array(cv_cluster_size)
+
+    return 1 + ((cv ** 2 + 1) * m - 1) * icc
+
+
+def _validate_cluster_inputs(cluster_size, icc, cv_cluster_size):
+    if cluster_size < 1:
+        raise ValueError("Cluster size must be at least 1.")
+    if icc < 0 or icc >= 1:
+        raise ValueError("ICC must be between 0 (inclusive) and 1 (exclusive).")
+    if cv_cluster_size < 0:
+        raise ValueError("CV of cluster size cannot be negative.")
+
+
+def _inflate_to_clusters(n_individual, de, cluster_size, dropout_rate):
+    n_inflated = ceil_int(n_individual * de)
+    n_adj = adjust_for_dropout(n_inflated, dropout_rate)
+    clusters = ceil_int(n_adj / cluster_size)
+    return n_inflated, clusters
+
+
+def _cluster_result(individual, n1_key, n2_key, de, cluster_size, dropout_rate):
+    n1_inflated, k1 = _inflate_to_clusters(
+        individual[n1_key], de, cluster_size, dropout_rate
+    )
+    n2_inflated, k2 = _inflate_to_clusters(
+        individual[n2_key], de, cluster_size, dropout_rate
+    )
+
+    n1 = ceil_int(k1 * cluster_size)
+    n2 = ceil_int(k2 * cluster_size)
+
+    return {
+        "clusters_group1": k1,
+        "clusters_group2": k2,
+        "clusters_total": k1 + k2,
+        "n_group1": n1,
+        "n_group2": n2,
+        "n_total": n1 + n2,
+        "n1_before_dropout": n1_inflated,
+        "n2_before_dropout": n2_inflated,
+        "n1_individual": individual[n1_key],
+        "n2_individual": individual[n2_key],
+        "design_effect": de
+    }
+
+
+def _cluster_trace(individual, de) -> dict:
+    """
+    Intermediates of the individually randomized calculation plus the
+    design-effect inflation (before rounding to whole clusters).
+    """
+    return {
+        **individual["trace"],
+        "design_effect": de,
+        "n1_inflated_raw": individual["n_group1"] * de,
+        "n2_inflated_raw": individual["n_group2"] * de
+    }
+
+
+def calculate_cluster_two_means(
+    alpha: float,
+    power: float,
+    sd: float,
+    delta: float,
+    cluster_size: float,
+    icc: float,
+    cv_cluster_size: float = 0.0,
+    allocation_ratio: float = 1.0,
+    two_sided: bool = True,
+    dropout_rate: float = 0.0,
+    trace: bool = False
+) -> dict:
+    """
+    Calculates sample size for a parallel cluster-randomized trial
+    comparing two means.
+
+    cluster_size = mean number of participants per cluster (m)
+    icc = intra-cluster correlation coefficient
+    cv_cluster_size = coefficient of variation of cluster sizes
+    trace = also return the intermediate values in result["trace"]
+
+    The individually randomized n is inflated by the design effect
+    and converted to whole clusters per group.
+    """
+
+    _validate_cluster_inputs(cluster_size, icc, cv_cluster_size)
+
+    individual = calculate_two_independent_means(
+        alpha=alpha,
+        power=power,
+        sd=sd,
+        delta=delta,
+        allocation_ratio=allocation_ratio,
+        two_sided=two_sided,
+        dropout_rate=0.0,
+        trace=trace
+    )
+
+    de = float(design_effect(cluster_size, icc, cv_cluster_size))
+
+    result = _cluster_result(
+        individual,
+        "n_group1",
+        "n_group2",
+        de,
+        cluster_size,
+        dropout_rate
+    )
+
+    result["formula"] = "n_cluster = n_individual × DE, DE = 1 + ((CV² + 1)m − 1)ICC"
+    result["assumptions"] = individual["assumptions"] + [
+        "Clusters randomized to groups",
+        "Common ICC across groups",
+        "Mean cluster size m with coefficient of variation CV"
+    ]
+
+    if trace:
+        result["trace"] = _cluster_trace(individual, de)
+
+    return result
+
+
+def calculate_cluster_two_proportions(
+    alpha: float,
+    power: float,
+    p1: float,
+    p2: float,
+    cluster_size: float,
+    icc: float,
+    cv_cluster_size: float = 0.0,
+    allocation_ratio: float = 1.0,
+    two_sided: bool = True,
+    dropout_rate: float = 0.0,
+    trace: bool = False
+) -> dict:
+    """
+    Calculates sample size for a parallel cluster-randomized trial
+    comparing two proportions.
+
+    cluster_size = mean number of participants per cluster (m)
+    icc = intra-cluster correlation coefficient
+    cv_cluster_size = coefficient of variation of cluster sizes
+    trace = also return the intermediate values in result["trace"]
+    """
+
+    _validate_cluster_inputs(cluster_size, icc, cv_cluster_size)
+
+    individual = calculate_two_proportions(
+        alpha=alpha,
+        power=power,
+        p1=p1,
+        p2=p2,
+        allocation_ratio=allocation_ratio,
+        two_sided=two_sided,
+        dropout_rate=0.0,
+        trace=trace
+    )
+
+    de = float(design_effect(cluster_size, icc, cv_cluster_size))
+
+    result = _cluster_result(
+        individual,
+        "n_group1",
+        "n_group2",
+        de,
+        cluster_size,
+        dropout_rate
+    )
+
+    result["formula"] = "n_cluster = n_individual × DE, DE = 1 + ((CV² + 1)m − 1)ICC"
+    result["assumptions"] = individual["assumptions"] + [
+        "Clusters randomized to groups",
+        "Common ICC across groups",
+        "Mean cluster size m with coefficient of variation CV"
+    ]
+
+    if trace:
+        result["trace"] = _cluster_trace(individual, de)
+
+    return result
+
+
+def power_cluster_two_means(
+    alpha: float,
+    n_clusters,
+    cluster_size,
+    icc,
+    sd,
+    delta,
+    cv_cluster_size=0.0,
+    allocation_ratio=1.0,
+    two_sided: bool = True
+):
+    """
+    Power of a parallel cluster trial comparing two means.
+
+    n_clusters = clusters in group 1 (group 2 has r times as many).
+    Vectorized over all array arguments.
+    """
+
+    n_eff = (
+        as_float_array(n_clusters) * as_float_array(cluster_size)
+        / design_effect(cluster_size, icc, cv_cluster_size)
+    )
+
+    return power_two_independent_means(
+        alpha, n_eff, sd, delta, allocation_ratio, two_sided
+    )
+
+
+def power_cluster_two_proportions(
+    alpha: float,
+    n_clusters,
+    cluster_size,
+    icc,
+    p1,
+    p2,
+    cv_cluster_size=0.0,
+    allocation_ratio=1.0,
+    two_sided: bool = True
+):
+    """
+    Power of a parallel cluster trial comparing two proportions.
+
+    n_clusters = clusters in group 1 (group 2 has r times as many).
+    Vectorized over all array arguments.
+    """
+
+    n_eff = (
+        as_float_array(n_clusters) * as_float_array(cluster_size)
+        / design_effect(cluster_size, icc, cv_cluster_size)
+    )
+
+    return power_two_proportions(
+        alpha, n_eff, p1, p2, allocation_ratio, two_sided
+    )
+
+
+def cluster_grid(
+    alpha: float,
+    power: float,
+    cluster_sizes,
+    iccs,
+    cv_cluster_size: float = 0.0,
+    allocation_ratio: float = 1.0,
+    two_sided: bool = True,
+    n_clusters=None,
+    sd: float = None,
+    delta: float = None,
+    p1: float = None,
+    p2: float = None
+) -> dict:
+    """
+    Vectorized planning grid over cluster size × ICC.
+
+    Give (sd, delta) for a continuous outcome or (p1, p2) for a
+    binary outcome. Returns required clusters per group for every
+    cluster size × ICC cell. If n_clusters (sequence of clusters in
+    group 1) is given, power is also returned on the
+    n_clusters × cluster size × ICC grid.
+    """
+
+    if sd is not None and delta is not None:
+        individual = calculate_two_independent_means(
+            alpha, power, sd, delta, allocation_ratio, two_sided
+        )
+    elif p1 is not None and p2 is not None:
+        individual = calculate_two_proportions(
+            alpha, power, p1, p2, allocation_ratio, two_sided
+        )
+    else:
+        raise ValueError("Provide either (sd, delta) or (p1, p2).")
+
+    m, rho = outer_grid(cluster_sizes, iccs)
+
+    de = design_effect(m, rho, cv_cluster_size)
+
+    k1 = np.ceil(np.ceil(individual["n_group1"] * de) / m).astype(int)
+    k2 = np.ceil(np.ceil(individual["n_group2"] * de) / m).astype(int)
+
+    grid = {
+        "cluster_size": m.ravel(),
+        "icc": rho.ravel(),
+        "design_effect": de,
+        "clusters_group1": k1,
+        "clusters_group2": k2,
+        "clusters_total": k1 + k2
+    }
+
+    if n_clusters is not None:
+        k, m3, rho3 = outer_grid(n_clusters, cluster_sizes, iccs)
+
+        if sd is not None:
+            grid["power"] = power_cluster_two_means(
+                alpha, k, m3, rho3, sd, delta,
+                cv_cluster_size, allocation_ratio, two_sided
+            )
+        else:
+            grid["power"] = power_cluster_two_proportions(
+                alpha, k, m3, rho3, p1, p2,
+                cv_cluster_size, allocation_ratio, two_sided
+            )
+
+        grid["n_clusters"] = k.ravel()
+
+    return grid
@@ -0,0 +1,263 @@
+
+# ==========================================
+# Stepped-Wedge Cluster Trial — Sample Size
+# ==========================================
+
+import numpy as np
+from scipy.special import ndtr
+
+from utils.array_utils import as_float_array, outer_grid, search_min_n
+from utils.stat_utils import (
+    z_alpha,
+    ceil_int,
+    adjust_for_dropout,
+    validate_positive
+)
+
+
+def _standard_design_sums(n_steps: int, baseline_periods: int = 1):
+    """
+    Per-cluster-per-step design sums of the standard stepped wedge.
+
+    With k clusters randomized to each of S steps:
+        U = k * u,  V = k * v,  W = k^2 * w
+    Returns (u, v, w, T).
+    """
+    S = n_steps
+    T = S + baseline_periods
+
+    # Treated periods per step group: S, S-1, ..., 1
+    row = np.arange(S, 0, -1)
+
+    # Treated step groups per period
+    col = np.clip(np.arange(1, T + 1) - baseline_periods, 0, S)
+
+    return float(row.sum()), float((row ** 2).sum()), float((col ** 2).sum()), T
+
+
+def hussey_hughes_variance(I, T, U, V, W, sigma2, tau2):
+    """
+    Closed-form variance of the treatment effect (Hussey & Hughes, 2007).
+
+    I = number of clusters, T = number of periods
+    U = sum of X_ij, V = sum_i (row sums)^2, W = sum_j (column sums)^2
+    sigma2 = variance of a cluster-period mean (sigma_e^2 / m)
+    tau2 = between-cluster variance
+
+    Var = I·σ²(σ² + Tτ²) / ((IU − W)σ² + (U² + ITU − TW − IV)τ²)
+
+    Vectorized over all arguments.
+    """
+
+    return (
+        I * sigma2 * (sigma2 + T * tau2)
+        / ((I * U - W) * sigma2 + (U ** 2 + I * T * U - T * W - I * V) * tau2)
+    )
+
+
+def design_matrix_variance(design, sd, cluster_size, icc):
+    """
+    Hussey–Hughes variance for an arbitrary stepped-wedge design.
+
+    design = 0/1 matrix (clusters × periods), 1 = intervention.
+    Only the row/column sums of the design are needed, so no
+    covariance matrix is formed.
+    """
+
+    X = np.asarray(design, dtype=float)
+    I, T = X.shape
+
+    U = X.sum()
+    V = (X.sum(axis=1) ** 2).sum()
+    W = (X.sum(axis=0) ** 2).sum()
+
+    sd = as_float_array(sd)
+    icc = as_float_array(icc)
+
+    sigma2 = (1 - icc) * sd ** 2 / as_float_array(cluster_size)
+    tau2 = icc * sd ** 2
+
+    return hussey_hughes_variance(I, T, U, V, W, sigma2, tau2)
+
+
+def power_stepped_wedge(
+    alpha: float,
+    clusters_per_step,
+    cluster_size,
+    icc,
+    sd,
+    delta,
+    n_steps: int,
+    baseline_periods: int = 1,
+    two_sided: bool = True
+):
+    """
+    Power of a standard stepped-wedge design (Hussey & Hughes).
+
+    clusters_per_step = clusters crossing over at each step (k)
+    cluster_size = participants per cluster per period (m)
+
+    Vectorized over clusters_per_step, cluster_size, icc, sd and delta.
+    """
+
+    u, v, w, T = _standard_design_sums(n_steps, baseline_periods)
+
+    k = as_float_array(clusters_per_step)
+    sd = as_float_array(sd)
+    icc = as_float_array(icc)
+
+    sigma2 = (1 - icc) * sd ** 2 / as_float_array(cluster_size)
+    tau2 = icc * sd ** 2
+
+    var = hussey_hughes_variance(
+        k * n_steps, T, k * u, k * v, k ** 2 * w, sigma2, tau2
+    )
+
+    Z_alpha = z_alpha(alpha, two_sided)
+
+    return ndtr(np.abs(as_float_array(delta)) / np.sqrt(var) - Z_alpha)
+
+
+def calculate_stepped_wedge(
+    alpha: float,
+    power: float,
+    sd: float,
+    delta: float,
+    cluster_size: float,
+    icc: float,
+    n_steps: int,
+    baseline_periods: int = 1,
+    two_sided: bool = True,
+    dropout_rate: float = 0.0,
+    max_clusters_per_step: int = 10 ** 6,
+    trace: bool = False
+) -> dict:
+    """
+    Calculates the number of clusters for a standard stepped-wedge
+    cluster-randomized trial (cross-sectional, continuous outcome).
+
+    cluster_size = participants per cluster per period (m)
+    n_steps = number of crossover steps (S); periods T = S + baseline
+    icc = intra-cluster correlation coefficient
+    trace = also return the intermediate values in result["trace"]
+
+    Finds the smallest number of clusters per step (k) with
+    power >= target, using the Hussey–Hughes variance: k is bracketed
+    by doubling up to max_clusters_per_step, then found by bisection.
+    """
+
+    validate_positive(sd, "Standard deviation")
+    validate_positive(delta, "Mean difference")
+    validate_positive(cluster_size, "Cluster size")
+
+    if icc < 0 or icc >= 1:
+        raise ValueError("ICC must be between 0 (inclusive) and 1 (exclusive).")
+
+    if baseline_periods < 1:
+        raise ValueError("Baseline periods must be at least 1.")
+
+    # With a single step every cluster crosses over in the same period,
+    # so the effect is confounded with time
+    if n_steps < 2:
+        raise ValueError("A stepped-wedge design needs at least 2 steps.")
+
+    def achieved(k):
+        return power_stepped_wedge(
+            alpha, k, cluster_size, icc, sd, delta,
+            n_steps, baseline_periods, two_sided
+        )
+
+    def enough(k):
+        return achieved(k) >= power
+
+    hi = 1
+    while not enough(hi):
+        if hi >= max_clusters_per_step:
+            raise ValueError(
+                f"Target power not reached with {max_clusters_per_step} clusters per step; "
+                "increase cluster size or number of steps."
+            )
+        hi = min(hi * 2, max_clusters_per_step)
+
+    k_req = int(search_min_n(enough, 1, hi))
+    n_clusters = k_req * n_steps
+    T = n_steps + baseline_periods
+
+    m_adj = adjust_for_dropout(ceil_int(cluster_size), dropout_rate)
+
+    result = {
+        "clusters_per_step": k_req,
+        "n_clusters": n_clusters,
+        "n_periods": T,
+        "cluster_size_per_period": m_adj,
+        "n_total": n_clusters * T * m_adj,
+        "n_before_dropout": n_clusters * T * ceil_int(cluster_size),
+        "achieved_power": float(achieved(k_req)),
+        "formula": "Hussey–Hughes closed-form variance for stepped-wedge designs",
+        "assumptions": [
+            "Cross-sectional stepped-wedge design",
+            "Equal cluster-period sizes",
+            "Random cluster effect, fixed period effects",
+            "Normal approximation (Wald test)"
+        ]
+    }
+
+    if trace:
+        u, v, w, _ = _standard_design_sums(n_steps, baseline_periods)
+        sigma2 = (1 - icc) * sd ** 2 / cluster_size
+        tau2 = icc * sd ** 2
+
+        result["trace"] = {
+            "z_alpha": z_alpha(alpha, two_sided),
+            "sigma2": sigma2,
+            "tau2": tau2,
+            "design_sums": {"U": k_req * u, "V": k_req * v, "W": k_req ** 2 * w},
+            "variance": float(hussey_hughes_variance(
+                n_clusters, T, k_req * u, k_req * v, k_req ** 2 * w, sigma2, tau2
+            ))
+        }
+
+    return result
+
+
+def stepped_wedge_grid(
+    alpha: float,
+    clusters_per_step,
+    cluster_sizes,
+    iccs,
+    sd: float,
+    delta: float,
+    n_steps: int,
+    baseline_periods: int = 1,
+    two_sided: bool = True,
+    power: float = None
+) -> dict:
+    """
+    Vectorized power grid over clusters per step × cluster size × ICC.
+
+    If power is given, also returns the smallest number of clusters
+    per step achieving it for every cluster size × ICC cell
+    (-1 where it is not reached within clusters_per_step).
+    """
+
+    k, m, rho = outer_grid(clusters_per_step, cluster_sizes, iccs)
+
+    grid_power = power_stepped_wedge(
+        alpha, k, m, rho, sd, delta, n_steps, baseline_periods, two_sided
+    )
+
+    grid = {
+        "clusters_per_step": k.ravel(),
+        "cluster_size": m.ravel(),
+        "icc": rho.ravel(),
+        "power": grid_power
+    }
+
+    if power is not None:
+        ok = grid_power >= power
+        first = np.argmax(ok, axis=0)
+        grid["required_clusters_per_step"] = np.where(
+            ok.any(axis=0), k.ravel()[first], -1
+        ).astype(int)
+
+    return grid
@@ -4,7 +4,9 @@
 # ==========================================
 
 from utils.stat_utils import adjust_for_dropout, ceil_int
-from statsmodels.stats.power import FTestAnovaPower
+
+# statsmodels is imported on first use: it dominates import time and
+# memory, and only this calculator needs it
 
 
 def calculate_anova_oneway(
@@ -12,7 +14,8 @@ def calculate_anova_oneway(
     power: float,
     effect_size_f: float,
     k_groups: int,
-    dropout_rate: float = 0.0
+    dropout_rate: float = 0.0,
+    trace: bool = False
 ) -> dict:
     """
     Calculates required sample size for one-way ANOVA.
@@ -21,8 +24,12 @@ def calculate_anova_oneway(
     k_groups = number of groups
 
     Uses F-test power calculation.
+
+    trace = also return the intermediate values in result["trace"]
     """
 
+    from statsmodels.stats.power import FTestAnovaPower
+
     if effect_size_f <= 0:
         raise ValueError("Effect size f must be positive.")
 
@@ -44,7 +51,7 @@ def calculate_anova_oneway(
 
     n_per_group = ceil_int(n_total_final / k_groups)
 
-    return {
+    result = {
         "n_total": n_per_group * k_groups,
         "n_per_group": n_per_group,
         "n_before_dropout": n_total,
@@ -55,3 +62,8 @@ def calculate_anova_oneway(
             "Effect size expressed as Cohen's f"
         ]
     }
+
+    if trace:
+        result["trace"] = {"n_total_raw": n_total_raw, "df": (k_groups - 1, n_total - k_groups)}
+
+    return result
@@ -18,13 +18,16 @@ def calculate_one_sample_mean(
     sd: float,
     delta: float,
     two_sided: bool = True,
-    dropout_rate: float = 0.0
+    dropout_rate: float = 0.0,
+    trace: bool = False
 ) -> dict:
     """
     Calculates required sample size for one-sample mean test.
 
     Formula:
     n = ((Z_alpha + Z_beta) * sd / delta)^2
+
+    trace = also return the intermediate values in result["trace"]
     """
 
     validate_positive(sd, "Standard deviation")
@@ -37,7 +40,7 @@ def calculate_one_sample_mean(
     n_ceiled = ceil_int(n_raw)
     n_final = adjust_for_dropout(n_ceiled, dropout_rate)
 
-    return {
+    result = {
         "n_required": n_final,
         "n_before_dropout": n_ceiled,
         "formula": "n = ((Z_alpha + Z_beta) * sd / delta)^2",
@@ -47,3 +50,110 @@ def calculate_one_sample_mean(
             "Two-sided or one-sided test specified"
         ]
     }
+
+    if trace:
+        result["trace"] = {"z_alpha": Z_alpha, "z_beta": Z_beta, "n_raw": n_raw}
+
+    return result
+
+
+def mean_half_width(alpha: float, n, sd: float, assurance: float = None):
+    """
+    Half-width of the 100(1 − alpha)% t-interval for a mean, vectorized
+    over n: expected value t σ c4(n) / √n, or (assurance given) the
+    half-width not exceeded with that probability,
+    t σ √(χ²_{assurance, n−1} / (n − 1)) / √n.
+    """
+
+    import numpy as np
+    from scipy.special import chdtri, gammaln, stdtrit
+
+    n = np.asarray(n, dtype=float)
+    df = n - 1
+    t = stdtrit(df, 1 - alpha / 2)
+
+    if assurance is None:
+        # c4(n) = E[S] / σ
+        scale = np.exp(0.5 * np.log(2 / df) + gammaln(n / 2) - gammaln(df / 2))
+    else:
+        # chdtri gives the upper-tail quantile
+        scale = np.sqrt(chdtri(df, 1 - assurance) / df)
+
+    return t * sd * scale / np.sqrt(n)
+
+
+def calculate_one_sample_mean_precision(
+    alpha: float,
+    sd: float,
+    half_width: float,
+    assurance: float = None,
+    known_sd: bool = False,
+    dropout_rate: float = 0.0,
+    max_n: int = 10 ** 7,
+    trace: bool = False
+) -> dict:
+    """
+    Sample size for a target confidence interval half-width d around a
+    mean (descriptive / precision studies).
+
+    alpha = 1 − confidence level (two-sided interval)
+    assurance = None for the expected half-width, or the probability
+                that the realised half-width is at most d
+    known_sd = z-interval with known SD: n = (Z sd / d)^2
+
+    The t-interval widths decrease in n, so n is bracketed by doubling
+    from the z-interval size and bisected over vectorized n.
+    """
+
+    from utils.array_utils import search_min_n
+
+    validate_positive(sd, "Standard deviation")
+    validate_positive(half_width, "Half-width")
+
+    if assurance is not None and not 0 < assurance < 1:
+        raise ValueError("Assurance must be between 0 and 1.")
+
+    Z = z_alpha(alpha, True)
+    n_raw = (Z * sd / half_width) ** 2
+
+    if known_sd:
+        n_ceiled = max(2, ceil_int(n_raw))
+        achieved = Z * sd / n_ceiled ** 0.5
+    else:
+        def enough(n):
+            return mean_half_width(alpha, n, sd, assurance) <= half_width
+
+        hi = max(2, ceil_int(n_raw))
+        while not enough(hi):
+            if hi >= max_n:
+                raise ValueError(f"Half-width not reached with n ≤ {max_n}.")
+            hi = min(2 * hi, max_n)
+
+        n_ceiled = int(search_min_n(enough, 2, hi))
+        achieved = float(mean_half_width(alpha, n_ceiled, sd, assurance))
+
+    n_final = adjust_for_dropout(n_ceiled, dropout_rate)
+
+    if known_sd:
+        formula = "n = (Z sd / d)^2 (z-interval, known SD)"
+    elif assurance is None:
+        formula = "Smallest n with E[t S / √n] = t sd c4(n) / √n ≤ d"
+    else:
+        formula = f"Smallest n with P(t S / √n ≤ d) ≥ {assurance}"
+
+    result = {
+        "n_required": n_final,
+        "n_before_dropout": n_ceiled,
+        "half_width": achieved,
+        "formula": formula,
+        "assumptions": [
+            "Outcome approximately normally distributed",
+            "SD from literature or pilot",
+            "Two-sided confidence interval"
+        ]
+    }
+
+    if trace:
+        result["trace"] = {"z_alpha": Z, "n_raw": n_raw}
+
+    return result
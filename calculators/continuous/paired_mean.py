@@ -18,7 +18,8 @@ def calculate_paired_mean(
     sd_diff: float,
     delta: float,
     two_sided: bool = True,
-    dropout_rate: float = 0.0
+    dropout_rate: float = 0.0,
+    trace: bool = False
 ) -> dict:
     """
     Calculates required sample size for paired mean comparison.
@@ -27,6 +28,8 @@ def calculate_paired_mean(
 
     Formula:
     n = ((Z_alpha + Z_beta) * sd_diff / delta)^2
+
+    trace = also return the intermediate values in result["trace"]
     """
 
     validate_positive(sd_diff, "SD of differences")
@@ -39,7 +42,7 @@ def calculate_paired_mean(
     n_ceiled = ceil_int(n_raw)
     n_final = adjust_for_dropout(n_ceiled, dropout_rate)
 
-    return {
+    result = {
         "n_required": n_final,
         "n_before_dropout": n_ceiled,
         "formula": "n = ((Z_alpha + Z_beta) * sd_diff / delta)^2",
@@ -49,3 +52,8 @@ def calculate_paired_mean(
             "SD is SD of differences (not raw SD)"
         ]
     }
+
+    if trace:
+        result["trace"] = {"z_alpha": Z_alpha, "z_beta": Z_beta, "n_raw": n_raw}
+
+    return result
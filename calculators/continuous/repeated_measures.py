@@ -0,0 +1,308 @@
+
+# ==========================================
+# Repeated Measures (Longitudinal) — Sample Size
+# ==========================================
+
+import numpy as np
+
+from utils.array_utils import as_float_array
+from utils.stat_utils import (
+    z_alpha,
+    z_beta,
+    ceil_int,
+    adjust_for_dropout,
+    validate_positive
+)
+
+
+STRUCTURES = ("cs", "ar1", "unstructured")
+ESTIMANDS = ("slope", "mean", "contrast")
+
+
+def _check_correlation(R):
+    """
+    Raises unless every matrix in the (S, K, K) batch is a symmetric
+    positive definite correlation matrix.
+    """
+
+    if not np.allclose(R, np.swapaxes(R, -1, -2)):
+        raise ValueError("Correlation matrix must be symmetric.")
+
+    if not np.allclose(np.diagonal(R, axis1=-2, axis2=-1), 1.0):
+        raise ValueError("Correlation matrix must have a unit diagonal.")
+
+    try:
+        np.linalg.cholesky(R)
+    except np.linalg.LinAlgError:
+        raise ValueError("Correlation matrix must be positive definite.") from None
+
+
+def _check_variance(v):
+    if not np.all(v > 0):
+        raise ValueError(
+            "Variance factor of the estimand must be positive; check the "
+            "correlation, times and contrast."
+        )
+
+
+def _padded_batch(rhos, n_timepoints, structure, times):
+    """
+    Stacks scenarios with different numbers of time points into one
+    batch by padding with independent dummy occasions.
+
+    Returns (R, mask, t, rhos, ks): R (S, K, K), mask (S, K) marking
+    real occasions, t (S, K) times (zero on padding), and the
+    flattened scenario correlations and time-point counts. times, if
+    given, covers the largest k; shorter schedules use its leading
+    entries.
+    """
+
+    rhos = np.atleast_1d(as_float_array(rhos))
+    ks = np.atleast_1d(np.asarray(n_timepoints, dtype=int))
+    rhos, ks = np.broadcast_arrays(rhos, ks)
+    rhos = rhos.ravel()
+    ks = ks.ravel()
+
+    if np.any(ks < 2):
+        raise ValueError("At least 2 measurements per subject are required.")
+
+    if np.any((rhos <= -1) | (rhos >= 1)):
+        raise ValueError("Correlation must be between -1 and 1.")
+
+    if structure == "cs" and np.any(rhos <= -1 / (ks - 1)):
+        raise ValueError(
+            "Compound symmetry requires rho > −1/(k−1) for a positive "
+            "definite correlation matrix."
+        )
+
+    K = int(ks.max())
+    idx = np.arange(K)
+    mask = idx[None, :] < ks[:, None]
+
+    if times is None:
+        t = np.broadcast_to(idx.astype(float), mask.shape)
+    else:
+        times = np.atleast_1d(as_float_array(times))
+        if times.shape != (K,):
+            raise ValueError(f"times must have {K} entries, one per measurement.")
+        t = np.broadcast_to(times, mask.shape)
+
+    lag = np.abs(t[:, :, None] - t[:, None, :])
+    r = rhos[:, None, None]
+
+    if structure == "cs":
+        R = np.where(lag == 0, 1.0, r)
+    elif structure == "ar1":
+        if np.any(rhos < 0) and np.any(lag != np.round(lag)):
+            raise ValueError("AR(1) with negative rho requires integer time spacing.")
+        R = r ** lag
+    else:
+        raise ValueError("Use corr_matrix for unstructured correlation.")
+
+    # Dummy occasions: independent of everything, unit variance
+    real = mask[:, :, None] & mask[:, None, :]
+    R = np.where(real, R, np.eye(K))
+    _check_correlation(R)
+
+    return R, mask, np.where(mask, t, 0.0), rhos, ks
+
+
+def unit_variance(R, mask, t, estimand: str = "slope", contrast=None):
+    """
+    Per-subject variance factor of the estimand (for SD = 1).
+
+    R = (S, K, K) correlation matrices, mask = (S, K) real occasions,
+    t = (S, K) measurement times.
+
+    slope:    [(X' R^-1 X)^-1]_slope with X = [1, t] (GLS)
+    mean:     c' R c with c = 1/k (time-averaged response)
+    contrast: c' R c for a user contrast over the time points
+
+    All scenarios are processed in a single batched solve; the 2×2
+    information matrices are inverted in closed form.
+    """
+
+    if estimand == "slope":
+        X = np.stack([mask.astype(float), t], axis=-1)
+        RiX = np.linalg.solve(R, X)
+        A = np.einsum("ski,skj->sij", X, RiX)
+        det = A[:, 0, 0] * A[:, 1, 1] - A[:, 0, 1] ** 2
+        return A[:, 0, 0] / det
+
+    if estimand == "mean":
+        c = mask / mask.sum(axis=1, keepdims=True)
+    elif estimand == "contrast":
+        if contrast is None:
+            raise ValueError("A contrast vector is required for estimand='contrast'.")
+        cv = np.atleast_1d(as_float_array(contrast))
+        if cv.ndim != 1 or np.any(mask.sum(axis=1) != cv.size):
+            raise ValueError("contrast must have one entry per measurement (k).")
+        c = np.zeros(mask.shape)
+        c[:, :cv.size] = cv
+    else:
+        raise ValueError(f"Estimand must be one of {ESTIMANDS}.")
+
+    return np.einsum("si,sij,sj->s", c, R, c)
+
+
+def calculate_repeated_measures(
+    alpha: float,
+    power: float,
+    sd: float,
+    delta: float,
+    n_timepoints: int,
+    rho: float = 0.5,
+    structure: str = "cs",
+    estimand: str = "slope",
+    times=None,
+    contrast=None,
+    corr_matrix=None,
+    allocation_ratio: float = 1.0,
+    two_sided: bool = True,
+    dropout_rate: float = 0.0,
+    trace: bool = False
+) -> dict:
+    """
+    Calculates sample size for a two-group longitudinal design with
+    k measurements per subject.
+
+    delta = between-group difference in the estimand
+            (slope per unit time, time-averaged mean, or contrast)
+    structure = "cs", "ar1" or "unstructured" (give corr_matrix)
+    estimand = "slope", "mean" or "contrast"
+    times = measurement times (default 0, 1, ..., k−1)
+    trace = also return the intermediate values in result["trace"]
+
+    Formula:
+    n1 = (1 + 1/r) * (Z_alpha + Z_beta)^2 * sd^2 * v / delta^2
+    where v is the per-subject variance factor of the estimand.
+    """
+
+    validate_positive(sd, "Standard deviation")
+    validate_positive(delta, "Difference")
+    validate_positive(allocation_ratio, "Allocation ratio")
+
+    if structure not in STRUCTURES:
+        raise ValueError(f"Structure must be one of {STRUCTURES}.")
+
+    if estimand not in ESTIMANDS:
+        raise ValueError(f"Estimand must be one of {ESTIMANDS}.")
+
+    if n_timepoints < 2:
+        raise ValueError("At least 2 measurements per subject are required.")
+
+    if structure == "unstructured":
+        if corr_matrix is None:
+            raise ValueError("Unstructured correlation requires corr_matrix.")
+        R = as_float_array(corr_matrix)
+        if R.shape != (n_timepoints, n_timepoints):
+            raise ValueError("corr_matrix must be k × k.")
+        _check_correlation(R)
+        k = n_timepoints
+        t = np.atleast_1d(as_float_array(np.arange(k) if times is None else times))
+        if t.shape != (k,):
+            raise ValueError(f"times must have {k} entries, one per measurement.")
+        v = unit_variance(R[None], np.ones((1, k), bool), t[None], estimand, contrast)
+    else:
+        R, mask, t, _, _ = _padded_batch(rho, n_timepoints, structure, times)
+        v = unit_variance(R, mask, t, estimand, contrast)
+
+    _check_variance(v)
+    v = float(v[0])
+
+    Z_alpha = z_alpha(alpha, two_sided)
+    Z_beta = z_beta(power)
+
+    r = allocation_ratio
+
+    n1_raw = (1 + 1/r) * ((Z_alpha + Z_beta) * sd / delta) ** 2 * v
+
+    n1 = ceil_int(n1_raw)
+    n2 = ceil_int(r * n1)
+
+    n1_final = adjust_for_dropout(n1, dropout_rate)
+    n2_final = adjust_for_dropout(n2, dropout_rate)
+
+    result = {
+        "n_group1": n1_final,
+        "n_group2": n2_final,
+        "n_total": n1_final + n2_final,
+        "n_before_dropout_group1": n1,
+        "n_before_dropout_group2": n2,
+        "variance_factor": v,
+        "formula": "n1 = (1 + 1/r) * (Z_alpha + Z_beta)^2 * sd^2 * v / delta^2",
+        "assumptions": [
+            "Two independent groups measured at k common time points",
+            f"Within-subject correlation: {structure}",
+            f"Estimand: {estimand} (GLS / linear contrast)",
+            "Constant SD across time points",
+            "Normal approximation"
+        ]
+    }
+
+    if trace:
+        result["trace"] = {
+            "z_alpha": Z_alpha,
+            "z_beta": Z_beta,
+            "variance_factor": v,
+            "n1_raw": n1_raw
+        }
+
+    return result
+
+
+def repeated_measures_grid(
+    alpha: float,
+    power: float,
+    sd: float,
+    delta: float,
+    rhos,
+    n_timepoints,
+    structure: str = "cs",
+    estimand: str = "slope",
+    times=None,
+    contrast=None,
+    allocation_ratio: float = 1.0,
+    two_sided: bool = True
+) -> dict:
+    """
+    Vectorized n per group over many correlation / time-point scenarios.
+
+    rhos and n_timepoints are broadcast against each other; pass
+    e.g. rhos[:, None] and n_timepoints[None, :] for a full grid.
+    Scenarios with different k share one batched solve; times, if
+    given, covers the largest k.
+    """
+
+    validate_positive(sd, "Standard deviation")
+    validate_positive(delta, "Difference")
+    validate_positive(allocation_ratio, "Allocation ratio")
+
+    if structure not in ("cs", "ar1"):
+        raise ValueError("Grid structure must be 'cs' or 'ar1'.")
+
+    rhos_b, ks_b = np.broadcast_arrays(
+        as_float_array(rhos), np.asarray(n_timepoints, dtype=int)
+    )
+    shape = rhos_b.shape
+
+    R, mask, t, rho_flat, k_flat = _padded_batch(
+        rhos_b, ks_b, structure, times
+    )
+    v = unit_variance(R, mask, t, estimand, contrast)
+    _check_variance(v)
+
+    Z_alpha = z_alpha(alpha, two_sided)
+    Z_beta = z_beta(power)
+    r = allocation_ratio
+
+    n1_raw = (1 + 1/r) * ((Z_alpha + Z_beta) * sd / delta) ** 2 * v
+    n1 = np.ceil(n1_raw)
+
+    return {
+        "rho": rho_flat.reshape(shape),
+        "n_timepoints": k_flat.reshape(shape),
+        "variance_factor": v.reshape(shape),
+        "n_group1": n1.astype(int).reshape(shape),
+        "n_group2": np.ceil(r * n1).astype(int).reshape(shape)
+    }
@@ -3,6 +3,8 @@
 # Two Independent Means — Sample Size
 # ==========================================
 
+# numpy / scipy are imported inside the vectorized functions so that the
+# closed-form calculator loads with the standard library only
 from utils.stat_utils import (
     z_alpha,
     z_beta,
@@ -12,6 +14,12 @@ from utils.stat_utils import (
 )
 
 
+HYPOTHESES = ("superiority", "non_inferiority", "equivalence")
+
+# Upper bound for equivalence n searches
+MAX_N = 10 ** 7
+
+
 def calculate_two_independent_means(
     alpha: float,
     power: float,
@@ -19,7 +27,11 @@ def calculate_two_independent_means(
     delta: float,
     allocation_ratio: float = 1.0,
     two_sided: bool = True,
-    dropout_rate: float = 0.0
+    dropout_rate: float = 0.0,
+    hypothesis: str = "superiority",
+    margin: float = 0.0,
+    exact: bool = True,
+    trace: bool = False
 ) -> dict:
     """
     Calculates sample size for comparing two independent means.
@@ -29,8 +41,28 @@ def calculate_two_independent_means(
     Formula:
     n1 = (1 + 1/r) * ((Z_alpha + Z_beta) * sd / delta)^2
     n2 = r * n1
+
+    hypothesis = "superiority", "non_inferiority" or "equivalence"
+    margin = non-inferiority / equivalence margin (positive)
+
+    For margin-based hypotheses delta is the expected true difference
+    (group 1 − group 2, positive favours group 1) and may be zero.
+    Each one-sided bound is tested at alpha/2 when two_sided=True
+    (1 − alpha confidence interval approach), otherwise at alpha.
+    Equivalence uses exact TOST power (t-test) unless exact=False.
+
+    trace = also return the intermediate values in result["trace"]
     """
 
+    if hypothesis not in HYPOTHESES:
+        raise ValueError(f"Hypothesis must be one of {HYPOTHESES}.")
+
+    if hypothesis != "superiority":
+        return _calculate_margin_based(
+            alpha, power, sd, delta, allocation_ratio, two_sided,
+            dropout_rate, hypothesis, margin, exact, trace
+        )
+
     validate_positive(sd, "Standard deviation")
     validate_positive(delta, "Mean difference")
     validate_positive(allocation_ratio, "Allocation ratio")
@@ -49,7 +81,7 @@ def calculate_two_independent_means(
     n1_final = adjust_for_dropout(n1, dropout_rate)
     n2_final = adjust_for_dropout(n2, dropout_rate)
 
-    return {
+    result = {
         "n_group1": n1_final,
         "n_group2": n2_final,
         "n_total": n1_final + n2_final,
@@ -63,3 +95,281 @@ def calculate_two_independent_means(
             "Allocation ratio specified"
         ]
     }
+
+    if trace:
+        result["trace"] = {"z_alpha": Z_alpha, "z_beta": Z_beta, "n1_raw": n1_raw}
+
+    return result
+
+
+def _validate_margin(sd, delta, margin, allocation_ratio, hypothesis):
+    validate_positive(sd, "Standard deviation")
+    validate_positive(margin, "Margin")
+    validate_positive(allocation_ratio, "Allocation ratio")
+
+    if hypothesis == "non_inferiority" and delta + margin <= 0:
+        raise ValueError("Expected difference must exceed −margin for non-inferiority.")
+
+    if hypothesis == "equivalence" and abs(delta) >= margin:
+        raise ValueError("Expected difference must lie inside the equivalence margin.")
+
+
+def _calculate_margin_based(
+    alpha, power, sd, delta, allocation_ratio, two_sided,
+    dropout_rate, hypothesis, margin, exact, trace=False
+):
+    _validate_margin(sd, delta, margin, allocation_ratio, hypothesis)
+
+    r = allocation_ratio
+    Z_alpha = z_alpha(alpha, two_sided)
+    Z_beta = z_beta(power)
+
+    if hypothesis == "non_inferiority":
+        n1_raw = (1 + 1/r) * ((Z_alpha + Z_beta) * sd / (delta + margin)) ** 2
+        n1 = ceil_int(n1_raw)
+        formula = "n1 = (1 + 1/r) * ((Z_alpha + Z_beta) * sd / (delta + margin))^2"
+        assumptions = [
+            "Independent groups",
+            "Common SD (pooled estimate)",
+            "Normal approximation",
+            "H0: mean1 − mean2 ≤ −margin"
+        ]
+    else:
+        n1_raw = None
+        n1 = int(_solve_equivalence_n1(
+            alpha, power, sd, delta, margin, r, two_sided, exact
+        ))
+
+        if n1 < 0:
+            raise ValueError("Target power not reachable; the expected difference is too close to the margin.")
+        formula = (
+            "Exact TOST power (bivariate noncentral t)" if exact
+            else "TOST power, normal approximation"
+        )
+        assumptions = [
+            "Independent groups",
+            "Common SD (pooled estimate)",
+            "Two one-sided tests (TOST)",
+            "H0: |mean1 − mean2| ≥ margin"
+        ]
+
+    n2 = ceil_int(r * n1)
+
+    n1_final = adjust_for_dropout(n1, dropout_rate)
+    n2_final = adjust_for_dropout(n2, dropout_rate)
+
+    result = {
+        "n_group1": n1_final,
+        "n_group2": n2_final,
+        "n_total": n1_final + n2_final,
+        "n_before_dropout_group1": n1,
+        "n_before_dropout_group2": n2,
+        "hypothesis": hypothesis,
+        "margin": margin,
+        "formula": formula,
+        "assumptions": assumptions
+    }
+
+    if trace:
+        # Equivalence is solved by search (no closed-form n1_raw)
+        result["trace"] = {"z_alpha": Z_alpha, "z_beta": Z_beta, "n1_raw": n1_raw}
+
+    return result
+
+
+def power_two_independent_means(
+    alpha: float,
+    n1,
+    sd,
+    delta,
+    allocation_ratio=1.0,
+    two_sided: bool = True
+):
+    """
+    Normal-approximation power for comparing two independent means.
+
+    Vectorized: n1, sd, delta and allocation_ratio may be arrays
+    (broadcast together).
+
+    power = Phi(|delta| / (sd * sqrt((1 + 1/r) / n1)) - Z_alpha)
+    """
+
+    import numpy as np
+    from scipy.special import ndtr
+    from utils.array_utils import as_float_array
+
+    n1 = as_float_array(n1)
+    sd = as_float_array(sd)
+    delta = as_float_array(delta)
+    r = as_float_array(allocation_ratio)
+
+    Z_alpha = z_alpha(alpha, two_sided)
+
+    se = sd * np.sqrt((1 + 1/r) / n1)
+
+    return ndtr(np.abs(delta) / se - Z_alpha)
+
+
+def _chi_scale_log_density(u, df):
+    """
+    Log density of u = S / sigma = sqrt(chi2_df / df).
+    """
+
+    import numpy as np
+    from scipy.special import gammaln
+
+    return (
+        np.log(2.0) + (df / 2) * np.log(df / 2) - gammaln(df / 2)
+        + (df - 1) * np.log(u) - df * u ** 2 / 2
+    )
+
+
+def power_two_means_tost(
+    alpha: float,
+    n1,
+    sd,
+    delta,
+    margin,
+    allocation_ratio=1.0,
+    two_sided: bool = True,
+    exact: bool = True,
+    n_nodes: int = 96
+):
+    """
+    Power of the two one-sided tests (TOST) for equivalence of two means.
+
+    Exact power integrates the joint (bivariate noncentral t) rejection
+    region over the distribution of the pooled SD:
+
+    power = ∫ [Phi((M − delta)/s_d − t_c u) − Phi((−M − delta)/s_d + t_c u)] f(u) du
+
+    over 0 < u < M / (t_c s_d), with s_d = sd * sqrt(1/n1 + 1/n2).
+    Vectorized over all array arguments; quadrature nodes are cached.
+    """
+
+    import numpy as np
+    from scipy.special import ndtr, stdtrit
+    from utils.array_utils import as_float_array
+    from utils.quadrature import integrate_interval
+
+    n1 = as_float_array(n1)
+    n2 = np.ceil(as_float_array(allocation_ratio) * n1)
+    sd = as_float_array(sd)
+    delta = as_float_array(delta)
+    margin = as_float_array(margin)
+
+    s_d = sd * np.sqrt(1 / n1 + 1 / n2)
+    lower = (-margin - delta) / s_d
+    upper = (margin - delta) / s_d
+
+    if not exact:
+        Z_alpha = z_alpha(alpha, two_sided)
+        return np.clip(ndtr(upper - Z_alpha) - ndtr(lower + Z_alpha), 0, 1)
+
+    df = n1 + n2 - 2
+    a = alpha / 2 if two_sided else alpha
+    t_c = stdtrit(df, 1 - a)
+
+    # Integration window: support below u* and ±12 SD around the mode of u
+    spread = 12 / np.sqrt(2 * df)
+    u_star = margin / (t_c * s_d)
+    u_lo = np.maximum(1 - spread, 0) * np.ones_like(u_star)
+    u_hi = np.minimum(u_star, 1 + spread)
+
+    lower, upper, t_c, df = (
+        x[..., None] for x in np.broadcast_arrays(lower, upper, t_c, df)
+    )
+
+    def integrand(u):
+        inner = ndtr(upper - t_c * u) - ndtr(lower + t_c * u)
+        return np.clip(inner, 0, None) * np.exp(_chi_scale_log_density(u, df))
+
+    result = integrate_interval(
+        integrand, u_lo, np.maximum(u_hi, u_lo), n_nodes
+    )
+
+    return np.clip(np.where(u_hi > u_lo, result, 0.0), 0, 1)
+
+
+def _solve_equivalence_n1(alpha, power, sd, delta, margin, r, two_sided, exact):
+    """
+    Smallest n1 with TOST power >= target (vectorized over inputs).
+    """
+
+    import numpy as np
+    from utils.array_utils import as_float_array, search_min_n
+
+    sd, delta, margin = np.broadcast_arrays(
+        as_float_array(sd), as_float_array(delta), as_float_array(margin)
+    )
+
+    inside = np.abs(delta) < margin
+    gap = np.where(inside, margin - np.abs(delta), np.nan)
+
+    # Normal-approximation bound with beta split over both tails
+    Z_alpha = z_alpha(alpha, two_sided)
+    Z_beta = z_beta(1 - (1 - power) / 2)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        n_approx = (1 + 1/r) * ((Z_alpha + Z_beta) * sd / gap) ** 2
+
+    hi = np.where(
+        inside, np.minimum(np.ceil(2 * n_approx) + 10, MAX_N), 2
+    ).astype(np.int64)
+
+    def enough(n):
+        return power_two_means_tost(
+            alpha, n, sd, delta, margin, r, two_sided, exact
+        ) >= power
+
+    n1 = search_min_n(enough, 2, hi)
+
+    return np.where(inside, n1, -1)
+
+
+def two_means_margin_grid(
+    alpha: float,
+    power: float,
+    sd: float,
+    margins,
+    deltas,
+    hypothesis: str = "equivalence",
+    allocation_ratio: float = 1.0,
+    two_sided: bool = True,
+    exact: bool = True
+) -> dict:
+    """
+    Vectorized n1 (before dropout) over a margin × true difference grid.
+
+    Cells where the hypothesis cannot be established
+    (delta outside the margin) are returned as -1.
+    """
+
+    import numpy as np
+    from utils.array_utils import outer_grid
+
+    if hypothesis not in ("non_inferiority", "equivalence"):
+        raise ValueError("Grid hypothesis must be non_inferiority or equivalence.")
+
+    M, D = outer_grid(margins, deltas)
+    r = allocation_ratio
+
+    if hypothesis == "non_inferiority":
+        Z_alpha = z_alpha(alpha, two_sided)
+        Z_beta = z_beta(power)
+        gap = D + M
+        with np.errstate(divide="ignore", invalid="ignore"):
+            n1 = np.ceil((1 + 1/r) * ((Z_alpha + Z_beta) * sd / gap) ** 2)
+        n1 = np.where(gap > 0, n1, -1).astype(np.int64)
+    else:
+        n1 = _solve_equivalence_n1(
+            alpha, power, sd, D, M, r, two_sided, exact
+        )
+
+    n2 = np.where(n1 > 0, np.ceil(r * n1), -1).astype(np.int64)
+
+    return {
+        "margin": M.ravel(),
+        "delta": D.ravel(),
+        "n_group1": n1,
+        "n_group2": n2
+    }
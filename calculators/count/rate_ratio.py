@@ -0,0 +1,431 @@
+
+# ==========================================
+# Count Outcomes (Poisson / Negative Binomial) — Rate Ratio Sample Size
+# ==========================================
+
+import math
+
+import numpy as np
+from scipy.special import digamma, ndtr
+
+from utils.stat_utils import (
+    z_alpha,
+    z_beta,
+    ceil_int,
+    adjust_for_dropout,
+    validate_positive
+)
+
+
+# Zhu & Lakkis (2014) number their null variances: Method 2 at the
+# reference (group 2) rate, Method 3 at the restricted MLE under H0,
+# i.e. the pooled rate (λ1 + rλ2) / (1 + r).
+METHODS = ("keene", "zhu_lakkis_control", "zhu_lakkis_pooled")
+
+METHOD_LABELS = {
+    "keene": "Keene (Wald, variance at the true rates)",
+    "zhu_lakkis_control": "Zhu–Lakkis M2 (null variance at the group 2 rate)",
+    "zhu_lakkis_pooled": "Zhu–Lakkis M3 (null variance at the pooled rate)"
+}
+
+FORMULAS = {
+    "keene": "n1 = (Z_alpha + Z_beta)^2 V1 / ln(RR)^2",
+    "zhu_lakkis_control": "n1 = (Z_alpha √V0(λ2) + Z_beta √V1)^2 / ln(RR)^2",
+    "zhu_lakkis_pooled": "n1 = (Z_alpha √V0(λ̄) + Z_beta √V1)^2 / ln(RR)^2"
+}
+
+# Subject × simulation cells per simulated block
+_BLOCK_CELLS = 2 ** 21
+
+# Iterations of the batched negative binomial fit
+_FIT_ROUNDS = 4
+_DISPERSION_BISECTIONS = 30
+_DISPERSION_BOUNDS = (1e-8, 50.0)
+
+
+def expected_information(rate, dispersion, follow_up, min_follow_up=None):
+    """
+    Per-subject Fisher information for log(rate), E[λt / (1 + kλt)],
+    divided by λ: E[t / (1 + kλt)]. Follow-up is fixed at follow_up, or
+    uniform on [min_follow_up, follow_up] (e.g. uniform accrual with a
+    common study end). Vectorized over all arguments.
+    """
+
+    rate = np.asarray(rate, dtype=float)
+    k = np.asarray(dispersion, dtype=float)
+    b = np.asarray(follow_up, dtype=float)
+
+    c = k * rate
+
+    if min_follow_up is None:
+        return b / (1 + c * b)
+
+    a = np.asarray(min_follow_up, dtype=float)
+
+    # ∫ t / (1 + ct) dt = t/c − ln(1 + ct)/c², averaged over [a, b];
+    # mean follow-up when c = 0
+    safe = np.where(c > 0, c, 1.0)
+    integral = (b - a) / safe - (np.log1p(safe * b) - np.log1p(safe * a)) / safe ** 2
+    width = np.where(b > a, b - a, 1.0)
+
+    return np.where(
+        c > 0,
+        np.where(b > a, integral / width, b / (1 + c * b)),
+        (a + b) / 2
+    )
+
+
+def _variance(rate1, rate2, r, dispersion, follow_up, min_follow_up):
+    """
+    n1 × Var(ln RR̂) = V(λ1) + V(λ2) / r, V(λ) = 1 / (λ E[t / (1 + kλt)]).
+    """
+
+    def v(rate):
+        return 1 / (rate * expected_information(rate, dispersion, follow_up, min_follow_up))
+
+    return v(rate1) + v(rate2) / r
+
+
+def _n1_raw(method, Z_alpha, Z_beta, rate1, rate2, r, dispersion, follow_up, min_follow_up):
+    """
+    Unrounded group 1 size for one method (scalars or arrays).
+    """
+
+    V1 = _variance(rate1, rate2, r, dispersion, follow_up, min_follow_up)
+
+    if method == "keene":
+        V0 = V1
+    else:
+        rate0 = (rate1 + r * rate2) / (1 + r) if method == "zhu_lakkis_pooled" else rate2
+        V0 = _variance(rate0, rate0, r, dispersion, follow_up, min_follow_up)
+
+    return (Z_alpha * np.sqrt(V0) + Z_beta * np.sqrt(V1)) ** 2 / np.log(rate1 / rate2) ** 2
+
+
+def _validate(rate1, rate2, dispersion, follow_up, min_follow_up, allocation_ratio, method):
+    validate_positive(rate1, "Event rate in group 1")
+    validate_positive(rate2, "Event rate in group 2")
+    validate_positive(follow_up, "Follow-up")
+    validate_positive(allocation_ratio, "Allocation ratio")
+
+    if rate1 == rate2:
+        raise ValueError("Event rates must differ.")
+
+    if dispersion < 0:
+        raise ValueError("Dispersion must be zero or positive.")
+
+    if min_follow_up is not None and not 0 <= min_follow_up <= follow_up:
+        raise ValueError("Minimum follow-up must be between 0 and the maximum follow-up.")
+
+    if method not in METHODS:
+        raise ValueError(f"Method must be one of {METHODS}.")
+
+
+def calculate_negative_binomial_rate_ratio(
+    alpha: float,
+    power: float,
+    rate1: float,
+    rate2: float,
+    dispersion: float,
+    follow_up: float = 1.0,
+    allocation_ratio: float = 1.0,
+    two_sided: bool = True,
+    dropout_rate: float = 0.0,
+    min_follow_up: float = None,
+    method: str = "keene",
+    trace: bool = False
+) -> dict:
+    """
+    Calculates sample size for comparing event rates with a negative
+    binomial model (Wald test of the log rate ratio).
+
+    rate1, rate2 = event rates per unit time (group 2 = reference)
+    dispersion = k, with Var(Y) = μ + k μ²  (0 = Poisson)
+    follow_up = follow-up per subject, or the maximum follow-up when
+                min_follow_up is given (uniform on [min, max])
+    allocation_ratio = n2 / n1
+    method = "keene", "zhu_lakkis_control" (M2) or "zhu_lakkis_pooled" (M3)
+    """
+
+    _validate(rate1, rate2, dispersion, follow_up, min_follow_up, allocation_ratio, method)
+
+    Z_alpha = z_alpha(alpha, two_sided)
+    Z_beta = z_beta(power)
+
+    r = allocation_ratio
+
+    n1_raw = float(_n1_raw(
+        method, Z_alpha, Z_beta, rate1, rate2, r, dispersion, follow_up, min_follow_up
+    ))
+
+    n1 = ceil_int(n1_raw)
+    n2 = ceil_int(r * n1)
+
+    n1_adj = adjust_for_dropout(n1, dropout_rate)
+    n2_adj = adjust_for_dropout(n2, dropout_rate)
+
+    result = {
+        "n_group1": n1_adj,
+        "n_group2": n2_adj,
+        "n_total": n1_adj + n2_adj,
+        "n1_before_dropout": n1,
+        "n2_before_dropout": n2,
+        "method": method,
+        "formula": f"{METHOD_LABELS[method]}: {FORMULAS[method]}",
+        "assumptions": [
+            "Independent groups",
+            "Poisson counts" if dispersion == 0 else "Negative binomial counts (gamma-distributed subject rates)",
+            "Fixed follow-up" if min_follow_up is None else "Follow-up uniform between the minimum and maximum",
+            "Wald test of the log rate ratio"
+        ]
+    }
+
+    if trace:
+        result["trace"] = {
+            "z_alpha": Z_alpha,
+            "z_beta": Z_beta,
+            "log_rate_ratio": math.log(rate1 / rate2),
+            "variance_alt": float(_variance(rate1, rate2, r, dispersion, follow_up, min_follow_up)),
+            "n1_raw": n1_raw
+        }
+
+    return result
+
+
+def calculate_poisson_rate_ratio(
+    alpha: float,
+    power: float,
+    rate1: float,
+    rate2: float,
+    follow_up: float = 1.0,
+    allocation_ratio: float = 1.0,
+    two_sided: bool = True,
+    dropout_rate: float = 0.0,
+    min_follow_up: float = None,
+    method: str = "keene",
+    trace: bool = False
+) -> dict:
+    """
+    Calculates sample size for comparing Poisson event rates
+    (the negative binomial calculation with no overdispersion).
+    """
+
+    return calculate_negative_binomial_rate_ratio(
+        alpha, power, rate1, rate2, 0.0, follow_up, allocation_ratio,
+        two_sided, dropout_rate, min_follow_up, method, trace
+    )
+
+
+def rate_ratio_sample_sizes(
+    alpha: float,
+    power: float,
+    rate1,
+    rate2,
+    dispersion=0.0,
+    follow_up=1.0,
+    allocation_ratio=1.0,
+    two_sided: bool = True,
+    min_follow_up=None,
+    method: str = "keene"
+) -> dict:
+    """
+    Group sizes (before dropout) over broadcast arrays of rates,
+    dispersion, follow-up and allocation (e.g. from outer_grid).
+    Invalid cells (non-positive rates, equal rates) return -1.
+    """
+
+    if method not in METHODS:
+        raise ValueError(f"Method must be one of {METHODS}.")
+
+    L1, L2, K, T, R = np.broadcast_arrays(*(
+        np.asarray(x, dtype=float)
+        for x in (rate1, rate2, dispersion, follow_up, allocation_ratio)
+    ))
+
+    ok = (L1 > 0) & (L2 > 0) & (L1 != L2) & (K >= 0) & (T > 0) & (R > 0)
+
+    # Placeholders keep invalid cells finite; they are masked below
+    l1 = np.where(ok, L1, 2.0)
+    l2 = np.where(ok, L2, 1.0)
+
+    n1_raw = _n1_raw(
+        method, z_alpha(alpha, two_sided), z_beta(power),
+        l1, l2, np.where(ok, R, 1.0), np.where(ok, K, 0.0), np.where(ok, T, 1.0), min_follow_up
+    )
+
+    n1 = np.ceil(n1_raw)
+    n2 = np.ceil(R * n1)
+
+    return {
+        "n_group1": np.where(ok, n1, -1).astype(np.int64),
+        "n_group2": np.where(ok, n2, -1).astype(np.int64)
+    }
+
+
+def power_rate_ratio(
+    alpha: float,
+    n1,
+    rate1,
+    rate2,
+    dispersion=0.0,
+    follow_up=1.0,
+    allocation_ratio=1.0,
+    two_sided: bool = True,
+    min_follow_up=None
+):
+    """
+    Wald power for the log rate ratio (variance at the true rates),
+    vectorized over all arguments:
+
+    power = Φ(|ln RR| √(n1 / V1) − Z_alpha)
+    """
+
+    V1 = _variance(
+        np.asarray(rate1, dtype=float), np.asarray(rate2, dtype=float),
+        np.asarray(allocation_ratio, dtype=float), dispersion, follow_up, min_follow_up
+    )
+
+    log_rr = np.abs(np.log(np.asarray(rate1, dtype=float) / np.asarray(rate2, dtype=float)))
+
+    return ndtr(log_rr * np.sqrt(np.asarray(n1, dtype=float) / V1) - z_alpha(alpha, two_sided))
+
+
+def _draw_counts(rng, sims, n, rate, dispersion, follow_up, min_follow_up):
+    """
+    Follow-up times and gamma–Poisson counts for a block of trials.
+    """
+
+    if min_follow_up is None:
+        t = np.full((sims, n), float(follow_up))
+    else:
+        t = rng.uniform(min_follow_up, follow_up, (sims, n))
+
+    mu = rate * t
+    if dispersion > 0:
+        mu = rng.gamma(1 / dispersion, dispersion * mu)
+
+    return rng.poisson(mu), t
+
+
+def _fit_rate(y, t, k):
+    """
+    Rate MLE per trial (rows) for a given dispersion per trial:
+    λ solves Σ (y − λt) / (1 + kλt) = 0, by fixed-point updates from
+    the Poisson estimate. Trials without events use 0.5 events.
+    """
+
+    rate = np.maximum(y.sum(axis=1), 0.5) / t.sum(axis=1)
+
+    for _ in range(10):
+        w = 1 / (1 + k[:, None] * rate[:, None] * t)
+        rate = np.maximum((w * y).sum(axis=1), 0.5) / (w * t).sum(axis=1)
+
+    return rate
+
+
+def _dispersion_score(k, y, mu):
+    """
+    d/dk of the negative binomial log-likelihood, summed per trial.
+    """
+
+    k = k[:, None]
+    inv = 1 / k
+
+    return (
+        (digamma(inv) - digamma(y + inv)) / k ** 2
+        + y / k
+        + np.log1p(k * mu) / k ** 2
+        - (y + inv) * mu / (1 + k * mu)
+    ).sum(axis=1)
+
+
+def _fit_dispersion(y, mu):
+    """
+    Dispersion MLE per trial by bisection on log k within
+    _DISPERSION_BOUNDS (boundary values when the score does not change
+    sign, e.g. under-dispersed samples).
+    """
+
+    sims = y.shape[0]
+    lo = np.full(sims, math.log(_DISPERSION_BOUNDS[0]))
+    hi = np.full(sims, math.log(_DISPERSION_BOUNDS[1]))
+
+    for _ in range(_DISPERSION_BISECTIONS):
+        mid = (lo + hi) / 2
+        rising = _dispersion_score(np.exp(mid), y, mu) > 0
+        lo = np.where(rising, mid, lo)
+        hi = np.where(rising, hi, mid)
+
+    return np.exp((lo + hi) / 2)
+
+
+def simulate_rate_ratio_power(
+    alpha: float,
+    n1: int,
+    rate1: float,
+    rate2: float,
+    dispersion: float = 0.0,
+    follow_up: float = 1.0,
+    allocation_ratio: float = 1.0,
+    two_sided: bool = True,
+    min_follow_up: float = None,
+    n_sims: int = 2000,
+    seed: int = 20240601
+) -> dict:
+    """
+    Simulated power of the negative binomial Wald test of the rate
+    ratio. Counts are drawn as gamma–Poisson mixtures in blocks of
+    trials; each block is fitted at once (rates and a common
+    dispersion per trial by alternating maximum likelihood), with
+    Var(ln λ̂g) = 1 / Σ λ̂t / (1 + k̂λ̂t).
+    """
+
+    validate_positive(n1, "Group 1 size")
+    _validate(rate1, rate2, dispersion, follow_up, min_follow_up, allocation_ratio, "keene")
+
+    n1 = int(n1)
+    n2 = ceil_int(allocation_ratio * n1)
+    c = z_alpha(alpha, two_sided)
+
+    rng = np.random.default_rng(seed)
+    block = max(1, _BLOCK_CELLS // (n1 + n2))
+
+    rejections = 0
+    dispersion_sum = 0.0
+
+    for start in range(0, n_sims, block):
+        sims = min(block, n_sims - start)
+
+        y1, t1 = _draw_counts(rng, sims, n1, rate1, dispersion, follow_up, min_follow_up)
+        y2, t2 = _draw_counts(rng, sims, n2, rate2, dispersion, follow_up, min_follow_up)
+
+        y = np.concatenate([y1, y2], axis=1)
+        k = np.zeros(sims)
+
+        for _ in range(_FIT_ROUNDS):
+            l1 = _fit_rate(y1, t1, k)
+            l2 = _fit_rate(y2, t2, k)
+            mu = np.concatenate([l1[:, None] * t1, l2[:, None] * t2], axis=1)
+            k = _fit_dispersion(y, mu)
+            if min_follow_up is None:
+                # Rates do not depend on k with equal follow-up
+                break
+
+        def info(rate, t):
+            return (rate[:, None] * t / (1 + k[:, None] * rate[:, None] * t)).sum(axis=1)
+
+        z = np.log(l1 / l2) / np.sqrt(1 / info(l1, t1) + 1 / info(l2, t2))
+
+        # Rejections in the direction of the true effect
+        direction = math.copysign(1.0, math.log(rate1 / rate2))
+        rejections += int((direction * z > c).sum())
+        dispersion_sum += float(k.sum())
+
+    return {
+        "power": rejections / n_sims,
+        "power_formula": float(power_rate_ratio(
+            alpha, n1, rate1, rate2, dispersion, follow_up, allocation_ratio, two_sided, min_follow_up
+        )),
+        "mean_dispersion_estimate": dispersion_sum / n_sims,
+        "n_sims": n_sims
+    }
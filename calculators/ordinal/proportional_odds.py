@@ -0,0 +1,338 @@
+
+# ==========================================
+# Ordinal Outcome (Proportional Odds) — Whitehead Sample Size
+# ==========================================
+
+import math
+from itertools import accumulate
+
+# numpy / scipy are imported inside the vectorized functions so that the
+# closed-form calculator loads with the standard library only
+from utils.stat_utils import (
+    z_alpha,
+    z_beta,
+    ceil_int,
+    adjust_for_dropout,
+    validate_positive
+)
+
+
+# Category probabilities must sum to 1 within this tolerance
+_SUM_TOLERANCE = 1e-6
+
+# Simulated trials per block (each draws two multinomial vectors)
+_SIM_BLOCK = 2 ** 16
+
+
+def treatment_distribution(control_probs, odds_ratio):
+    """
+    Group 1 (treatment) category probabilities under proportional odds,
+    vectorized over leading axes (categories on the last axis):
+
+    Q1(j) = OR Q2(j) / (1 − Q2(j) + OR Q2(j)),  Q = P(Y ≤ j)
+
+    OR > 1 shifts group 1 towards the lower categories.
+    """
+
+    import numpy as np
+
+    p2 = np.asarray(control_probs, dtype=float)
+    odds_ratio = np.asarray(odds_ratio, dtype=float)[..., None]
+
+    Q2 = np.cumsum(p2, axis=-1)[..., :-1]
+    Q1 = odds_ratio * Q2 / (1 - Q2 + odds_ratio * Q2)
+
+    ones = np.ones(Q1.shape[:-1] + (1,))
+    Q1 = np.concatenate([Q1, ones], axis=-1)
+
+    return np.diff(Q1, axis=-1, prepend=0.0)
+
+
+def _whitehead_terms(control_probs, odds_ratio, r):
+    """
+    Treatment distribution, allocation-weighted mean probabilities p̄
+    and the tie factor 1 − Σ p̄³ (vectorized).
+    """
+
+    import numpy as np
+
+    p2 = np.asarray(control_probs, dtype=float)
+    p1 = treatment_distribution(p2, odds_ratio)
+
+    r = np.asarray(r, dtype=float)[..., None]
+    p_bar = (p1 + r * p2) / (1 + r)
+
+    return p1, p_bar, 1 - (p_bar ** 3).sum(axis=-1)
+
+
+def _total_raw(Z_alpha, Z_beta, odds_ratio, r, tie_factor):
+    """
+    Whitehead (1993) total size:
+    N = 3 (1 + r)² (Z_alpha + Z_beta)² / (r ln(OR)² (1 − Σ p̄³))
+    """
+    import numpy as np
+
+    return 3 * (1 + r) ** 2 * (Z_alpha + Z_beta) ** 2 / (r * np.log(odds_ratio) ** 2 * tie_factor)
+
+
+def _validate_probs(control_probs) -> list:
+    try:
+        p2 = [float(p) for p in control_probs]
+    except (TypeError, ValueError):
+        raise ValueError("Give at least two category probabilities.") from None
+
+    if len(p2) < 2:
+        raise ValueError("Give at least two category probabilities.")
+
+    if min(p2) < 0 or abs(math.fsum(p2) - 1) > _SUM_TOLERANCE:
+        raise ValueError("Category probabilities must be non-negative and sum to 1.")
+
+    return p2
+
+
+def _treatment_probs(p2, odds_ratio) -> list:
+    """
+    Scalar form of treatment_distribution for one category vector.
+    """
+
+    Q1 = [odds_ratio * q / (1 - q + odds_ratio * q) for q in accumulate(p2[:-1])]
+    Q1.append(1.0)
+
+    return [b - a for a, b in zip([0.0] + Q1[:-1], Q1)]
+
+
+def calculate_ordinal_whitehead(
+    alpha: float,
+    power: float,
+    control_probs,
+    odds_ratio: float,
+    allocation_ratio: float = 1.0,
+    two_sided: bool = True,
+    dropout_rate: float = 0.0,
+    trace: bool = False
+) -> dict:
+    """
+    Calculates sample size for an ordinal outcome under proportional
+    odds (Whitehead, 1993).
+
+    control_probs = category probabilities in group 2 (control),
+                    ordered from best to worst (or vice versa)
+    odds_ratio = common OR of being in category ≤ j (group 1 vs 2)
+    allocation_ratio = n2 / n1
+    """
+
+    p2 = _validate_probs(control_probs)
+    validate_positive(odds_ratio, "Odds ratio")
+    validate_positive(allocation_ratio, "Allocation ratio")
+
+    if odds_ratio == 1:
+        raise ValueError("Odds ratio must differ from 1.")
+
+    Z_alpha = z_alpha(alpha, two_sided)
+    Z_beta = z_beta(power)
+
+    r = allocation_ratio
+    p1 = _treatment_probs(p2, odds_ratio)
+    p_bar = [(a + r * b) / (1 + r) for a, b in zip(p1, p2)]
+    tie_factor = 1 - math.fsum(p ** 3 for p in p_bar)
+
+    N_raw = 3 * (1 + r) ** 2 * (Z_alpha + Z_beta) ** 2 / (r * math.log(odds_ratio) ** 2 * tie_factor)
+
+    n1 = ceil_int(N_raw / (1 + r))
+    n2 = ceil_int(r * n1)
+
+    n1_adj = adjust_for_dropout(n1, dropout_rate)
+    n2_adj = adjust_for_dropout(n2, dropout_rate)
+
+    result = {
+        "n_group1": n1_adj,
+        "n_group2": n2_adj,
+        "n_total": n1_adj + n2_adj,
+        "n1_before_dropout": n1,
+        "n2_before_dropout": n2,
+        "treatment_probs": p1,
+        "formula": "N = 3(1 + r)^2 (Z_alpha + Z_beta)^2 / (r ln(OR)^2 (1 − Σ p̄^3)) (Whitehead, 1993)",
+        "assumptions": [
+            "Independent groups",
+            "Ordinal outcome with a common odds ratio across cut-points",
+            "Proportional odds (Wilcoxon-type score) test"
+        ]
+    }
+
+    if trace:
+        result["trace"] = {
+            "z_alpha": Z_alpha,
+            "z_beta": Z_beta,
+            "log_or": math.log(odds_ratio),
+            "mean_probs": p_bar,
+            "tie_factor": tie_factor,
+            "n_total_raw": N_raw
+        }
+
+    return result
+
+
+def whitehead_sample_sizes(
+    alpha: float,
+    power: float,
+    control_probs,
+    odds_ratios,
+    allocation_ratio=1.0,
+    two_sided: bool = True
+) -> dict:
+    """
+    Group sizes (before dropout) for many category vectors at once:
+    control_probs has the categories on its last axis, and its leading
+    axes broadcast with odds_ratios and allocation_ratio.
+
+    Invalid cells (OR ≤ 0 or 1, probabilities not summing to 1) return -1.
+    """
+
+    import numpy as np
+
+    p2 = np.asarray(control_probs, dtype=float)
+    OR = np.asarray(odds_ratios, dtype=float)
+    R = np.asarray(allocation_ratio, dtype=float)
+
+    shape = np.broadcast_shapes(p2.shape[:-1], OR.shape, R.shape)
+    p2 = np.broadcast_to(p2, shape + p2.shape[-1:])
+    OR = np.broadcast_to(OR, shape)
+    R = np.broadcast_to(R, shape)
+
+    ok = (
+        (OR > 0) & (OR != 1) & (R > 0)
+        & np.all(p2 >= 0, axis=-1)
+        & (np.abs(p2.sum(axis=-1) - 1) <= _SUM_TOLERANCE)
+    )
+
+    # Placeholders keep invalid cells finite; they are masked below
+    odds = np.where(ok, OR, 2.0)
+    r = np.where(ok, R, 1.0)
+    probs = np.where(ok[..., None], p2, 1 / p2.shape[-1])
+
+    _, _, tie_factor = _whitehead_terms(probs, odds, r)
+
+    N_raw = _total_raw(z_alpha(alpha, two_sided), z_beta(power), odds, r, tie_factor)
+
+    n1 = np.ceil(N_raw / (1 + r))
+    n2 = np.ceil(r * n1)
+
+    return {
+        "odds_ratio": OR,
+        "n_group1": np.where(ok, n1, -1).astype(np.int64),
+        "n_group2": np.where(ok, n2, -1).astype(np.int64)
+    }
+
+
+def power_ordinal_whitehead(
+    alpha: float,
+    n1,
+    control_probs,
+    odds_ratio,
+    allocation_ratio=1.0,
+    two_sided: bool = True
+):
+    """
+    Whitehead power for group sizes n1 and r n1 (vectorized as in
+    whitehead_sample_sizes):
+
+    power = Φ(|ln OR| √(N r (1 − Σ p̄³) / (3 (1 + r)²)) − Z_alpha)
+    """
+
+    import numpy as np
+    from scipy.special import ndtr
+
+    r = np.asarray(allocation_ratio, dtype=float)
+    _, _, tie_factor = _whitehead_terms(control_probs, odds_ratio, r)
+
+    N = np.asarray(n1, dtype=float) * (1 + r)
+    log_or = np.abs(np.log(np.asarray(odds_ratio, dtype=float)))
+
+    return ndtr(
+        log_or * np.sqrt(N * r * tie_factor / (3 * (1 + r) ** 2))
+        - z_alpha(alpha, two_sided)
+    )
+
+
+def _score_z(x1, x2):
+    """
+    Proportional-odds score test at OR = 1 for category counts (rows =
+    trials): the Wilcoxon rank-sum statistic with mid-ranks and the
+    tie-corrected permutation variance, standardized so that z > 0
+    favours lower categories in group 1.
+    """
+
+    import numpy as np
+
+    n1 = x1.sum(axis=1, keepdims=True)
+    m = x1 + x2
+    N = m.sum(axis=1, keepdims=True)
+
+    mid_rank = np.cumsum(m, axis=1) - (m - 1) / 2
+    centred = mid_rank - (N + 1) / 2
+
+    score = (x1 * centred).sum(axis=1)
+    variance = (n1 * (N - n1) / (N * (N - 1))).ravel() * (m * centred ** 2).sum(axis=1)
+
+    # All observations tied: no information
+    safe = np.where(variance > 0, variance, 1.0)
+    return np.where(variance > 0, -score / np.sqrt(safe), 0.0)
+
+
+def simulate_ordinal_power(
+    alpha: float,
+    n1: int,
+    control_probs,
+    odds_ratio: float,
+    allocation_ratio: float = 1.0,
+    two_sided: bool = True,
+    n_sims: int = 100000,
+    seed: int = 20240601
+) -> dict:
+    """
+    Simulated power of the proportional-odds score test: category
+    counts are drawn as multinomial vectors for blocks of trials and
+    the score test is evaluated for the whole block at once.
+
+    two_sided = reject for |z| > Z_alpha/2 in either direction;
+                otherwise only in the direction of the odds ratio
+    """
+
+    import numpy as np
+
+    p2 = np.asarray(_validate_probs(control_probs))
+    validate_positive(n1, "Group 1 size")
+    validate_positive(odds_ratio, "Odds ratio")
+
+    if odds_ratio == 1:
+        raise ValueError("Odds ratio must differ from 1.")
+
+    n1 = int(n1)
+    n2 = ceil_int(allocation_ratio * n1)
+
+    p1 = treatment_distribution(p2, odds_ratio)
+    # Guard the multinomial against rounding in the last category
+    p1 = p1 / p1.sum()
+
+    c = z_alpha(alpha, two_sided)
+    direction = 1.0 if odds_ratio > 1 else -1.0
+
+    rng = np.random.default_rng(seed)
+    rejections = 0
+
+    for start in range(0, n_sims, _SIM_BLOCK):
+        sims = min(_SIM_BLOCK, n_sims - start)
+
+        x1 = rng.multinomial(n1, p1, size=sims)
+        x2 = rng.multinomial(n2, p2, size=sims)
+
+        z = _score_z(x1, x2)
+        rejections += int(((np.abs(z) if two_sided else direction * z) > c).sum())
+
+    return {
+        "power": rejections / n_sims,
+        "power_formula": float(power_ordinal_whitehead(
+            alpha, n1, p2, odds_ratio, allocation_ratio, two_sided
+        )),
+        "n_sims": n_sims
+    }
@@ -14,6 +14,29 @@ from utils.stat_utils import (
 )
 
 
+METHODS = ("schoenfeld", "freedman", "lachin_foulkes", "lakatos")
+
+METHOD_LABELS = {
+    "schoenfeld": "Schoenfeld (log HR)",
+    "freedman": "Freedman",
+    "lachin_foulkes": "Lachin–Foulkes (exponential)",
+    "lakatos": "Lakatos (Markov, piecewise)"
+}
+
+FORMULAS = {
+    "schoenfeld": "D = (Z_alpha + Z_beta)^2 / (ln(HR)^2 p1 p2)",
+    "freedman": "D = (Z_alpha + Z_beta)^2 (1 + r HR)^2 / (r (1 − HR)^2)",
+    "lachin_foulkes": "N = [Z_alpha σ(λ̄) √(1/p1 + 1/p2) + Z_beta √(σ²(λ1)/p1 + σ²(λ2)/p2)]^2 / (λ1 − λ2)^2",
+    "lakatos": "D = (Z_alpha + Z_beta)^2 Σ ρ_i V_i / (Σ ρ_i E_i)^2"
+}
+
+# Lachin–Foulkes and Lakatos work on exponential hazards over a unit
+# follow-up, with the control hazard chosen so that the overall event
+# fraction matches; Lakatos splits follow-up into equal intervals.
+_LAKATOS_INTERVALS = 100
+_NEWTON_STEPS = 60
+
+
 def calculate_logrank(
     alpha: float,
     power: float,
@@ -21,14 +44,18 @@ def calculate_logrank(
     allocation_ratio: float = 1.0,
     event_fraction: float = 0.5,
     two_sided: bool = True,
-    dropout_rate: float = 0.0
+    dropout_rate: float = 0.0,
+    trace: bool = False,
+    method: str = "schoenfeld"
 ) -> dict:
     """
     Calculates sample size for survival analysis using log-rank test.
 
-    hazard_ratio = target HR
+    hazard_ratio = target HR (group 2 vs group 1)
     allocation_ratio = n2 / n1
     event_fraction = expected proportion of participants with events
+    trace = also return the intermediate values in result["trace"]
+    method = "schoenfeld", "freedman", "lachin_foulkes" or "lakatos"
     """
 
     validate_positive(hazard_ratio, "Hazard ratio")
@@ -38,6 +65,12 @@ def calculate_logrank(
     if event_fraction >= 1:
         raise ValueError("Event fraction must be less than 1.")
 
+    if hazard_ratio == 1:
+        raise ValueError("Hazard ratio must differ from 1.")
+
+    if method not in METHODS:
+        raise ValueError(f"Method must be one of {METHODS}.")
+
     Z_alpha = z_alpha(alpha, two_sided)
     Z_beta = z_beta(power)
 
@@ -45,10 +78,12 @@ def calculate_logrank(
     p1 = 1 / (1 + r)
     p2 = r / (1 + r)
 
+    log_hr = math.log(hazard_ratio)
+
     # Required number of events
-    D_raw = ((Z_alpha + Z_beta) ** 2) / (
-        (math.log(hazard_ratio) ** 2) * p1 * p2
-    )
+    D_raw = float(_events_raw(
+        method, Z_alpha, Z_beta, hazard_ratio, r, p1, p2, log_hr, event_fraction
+    ))
 
     D = ceil_int(D_raw)
 
@@ -60,16 +95,234 @@ def calculate_logrank(
     n1 = ceil_int(N_final * p1)
     n2 = ceil_int(N_final * p2)
 
-    return {
+    assumptions = [
+        "Proportional hazards assumption",
+        "Log-rank test",
+        "Event fraction estimated accurately"
+    ]
+
+    if method in ("lachin_foulkes", "lakatos"):
+        assumptions.append("Exponential survival over a common follow-up")
+
+    result = {
         "n_total": n1 + n2,
         "n_group1": n1,
         "n_group2": n2,
         "required_events": D,
         "n_before_dropout": N,
-        "formula": "Freedman log-rank events-based formula",
-        "assumptions": [
-            "Proportional hazards assumption",
-            "Log-rank test",
-            "Event fraction estimated accurately"
-        ]
+        "method": method,
+        "formula": f"{METHOD_LABELS[method]}: {FORMULAS[method]}",
+        "assumptions": assumptions
+    }
+
+    if trace:
+        result["trace"] = {
+            "z_alpha": Z_alpha,
+            "z_beta": Z_beta,
+            "log_hr": log_hr,
+            "allocation_fraction": p1,
+            "events_raw": D_raw,
+            "n_raw": N_raw
+        }
+
+    return result
+
+
+def power_logrank(
+    alpha: float,
+    events,
+    hazard_ratio,
+    allocation_ratio=1.0,
+    two_sided: bool = True
+):
+    """
+    Schoenfeld power of the log-rank test for a number of events.
+
+    Vectorized: events, hazard_ratio and allocation_ratio may be
+    arrays (broadcast together).
+
+    power = Phi(|ln HR| sqrt(D p1 p2) - Z_alpha)
+    """
+
+    import numpy as np
+    from scipy.special import ndtr
+    from utils.array_utils import as_float_array
+
+    events = as_float_array(events)
+    log_hr = np.log(as_float_array(hazard_ratio))
+    r = as_float_array(allocation_ratio)
+
+    Z_alpha = z_alpha(alpha, two_sided)
+
+    p1 = 1 / (1 + r)
+    p2 = r / (1 + r)
+
+    return ndtr(np.abs(log_hr) * np.sqrt(events * p1 * p2) - Z_alpha)
+
+
+def _events_raw(method, Z_alpha, Z_beta, hr, r, p1, p2, log_hr, event_fraction, lam1=None):
+    """
+    Unrounded required events for one method (scalars or arrays).
+    lam1 = precomputed control hazard for the exponential methods
+    """
+
+    if method == "schoenfeld":
+        return (Z_alpha + Z_beta) ** 2 / (log_hr ** 2 * p1 * p2)
+
+    if method == "freedman":
+        return (Z_alpha + Z_beta) ** 2 * (1 + r * hr) ** 2 / (r * (1 - hr) ** 2)
+
+    if lam1 is None:
+        lam1 = _control_hazard(hr, p1, p2, event_fraction)
+
+    if method == "lachin_foulkes":
+        return _lachin_foulkes_n(Z_alpha, Z_beta, lam1, hr, p1, p2) * event_fraction
+
+    return _lakatos_events(Z_alpha, Z_beta, lam1, hr, p1, p2)
+
+
+def _control_hazard(hr, p1, p2, event_fraction):
+    """
+    Group 1 exponential hazard λ1 over unit follow-up such that
+    p1 (1 − e^−λ1) + p2 (1 − e^−HR·λ1) equals the event fraction.
+
+    Newton's method from a lower bound: the event fraction is concave
+    and increasing in λ1, so the iterates rise monotonically.
+    """
+
+    import numpy as np
+
+    hr = np.asarray(hr, dtype=float)
+    lam = -np.log1p(-np.asarray(event_fraction, dtype=float)) / np.maximum(hr, 1.0)
+
+    for _ in range(_NEWTON_STEPS):
+        s1 = np.exp(-lam)
+        s2 = np.exp(-hr * lam)
+        f = p1 * (1 - s1) + p2 * (1 - s2) - event_fraction
+        step = f / (p1 * s1 + p2 * hr * s2)
+        lam = lam - step
+        if np.all(np.abs(step) <= 1e-12 * lam):
+            break
+
+    return lam
+
+
+def _lachin_foulkes_n(Z_alpha, Z_beta, lam1, hr, p1, p2):
+    """
+    Lachin–Foulkes total N for a difference in exponential hazards
+    with unit follow-up, where σ²(λ) = λ² / (1 − e^−λ).
+    """
+
+    import numpy as np
+
+    lam2 = hr * lam1
+    lam_bar = p1 * lam1 + p2 * lam2
+
+    def sigma2(lam):
+        return lam ** 2 / -np.expm1(-lam)
+
+    null_sd = np.sqrt(sigma2(lam_bar) * (1 / p1 + 1 / p2))
+    alt_sd = np.sqrt(sigma2(lam1) / p1 + sigma2(lam2) / p2)
+
+    return (Z_alpha * null_sd + Z_beta * alt_sd) ** 2 / (lam1 - lam2) ** 2
+
+
+def _lakatos_events(Z_alpha, Z_beta, lam1, hr, p1, p2):
+    """
+    Lakatos events from the at-risk ratio φ_i = n2/n1 at the start of
+    each interval: E_i = φθ/(1 + φθ) − φ/(1 + φ), V_i = φ/(1 + φ)²,
+    weighted by the share of events ρ_i in the interval.
+    """
+
+    import numpy as np
+
+    lam1 = np.asarray(lam1, dtype=float)[..., None]
+    hr = np.asarray(hr, dtype=float)[..., None]
+    p1 = np.asarray(p1, dtype=float)[..., None]
+    p2 = np.asarray(p2, dtype=float)[..., None]
+
+    t = np.linspace(0.0, 1.0, _LAKATOS_INTERVALS + 1)
+    at_risk1 = p1 * np.exp(-lam1 * t)
+    at_risk2 = p2 * np.exp(-hr * lam1 * t)
+
+    events = (
+        at_risk1[..., :-1] - at_risk1[..., 1:]
+        + at_risk2[..., :-1] - at_risk2[..., 1:]
+    )
+    rho = events / events.sum(axis=-1, keepdims=True)
+
+    phi = at_risk2[..., :-1] / at_risk1[..., :-1]
+    E = phi * hr / (1 + phi * hr) - phi / (1 + phi)
+    V = phi / (1 + phi) ** 2
+
+    return (Z_alpha + Z_beta) ** 2 * (rho * V).sum(axis=-1) / (rho * E).sum(axis=-1) ** 2
+
+
+def logrank_methods(
+    alpha: float,
+    power: float,
+    hazard_ratios,
+    allocation_ratios=1.0,
+    event_fractions=0.5,
+    two_sided: bool = True,
+    methods=METHODS
+) -> dict:
+    """
+    Comparison table of required events and total N (before dropout)
+    for several methods over broadcast HR × allocation × event fraction
+    arrays (e.g. from outer_grid).
+
+    The Z values, allocation terms and the exponential control hazard
+    are computed once and shared by all methods. Invalid cells
+    (HR ≤ 0 or 1, event fraction outside (0, 1)) return -1.
+    """
+
+    import numpy as np
+
+    unknown = [m for m in methods if m not in METHODS]
+    if unknown:
+        raise ValueError(f"Unknown methods {unknown}; choose from {METHODS}.")
+
+    HR, R, EF = np.broadcast_arrays(
+        np.asarray(hazard_ratios, dtype=float),
+        np.asarray(allocation_ratios, dtype=float),
+        np.asarray(event_fractions, dtype=float)
+    )
+
+    ok = (HR > 0) & (HR != 1) & (R > 0) & (EF > 0) & (EF < 1)
+
+    # Placeholders keep invalid cells finite; they are masked below
+    hr = np.where(ok, HR, 0.5)
+    r = np.where(ok, R, 1.0)
+    e = np.where(ok, EF, 0.5)
+
+    Z_alpha = z_alpha(alpha, two_sided)
+    Z_beta = z_beta(power)
+
+    p1 = 1 / (1 + r)
+    p2 = r / (1 + r)
+    log_hr = np.log(hr)
+
+    lam1 = None
+    if any(m in ("lachin_foulkes", "lakatos") for m in methods):
+        lam1 = _control_hazard(hr, p1, p2, e)
+
+    table = {
+        "hazard_ratio": HR,
+        "allocation_ratio": R,
+        "event_fraction": EF,
+        "events": {},
+        "n_total": {}
     }
+
+    for method in methods:
+        D_raw = _events_raw(method, Z_alpha, Z_beta, hr, r, p1, p2, log_hr, e, lam1)
+
+        D = np.ceil(D_raw)
+        N = np.ceil(D / e)
+        n_total = np.ceil(N * p1) + np.ceil(N * p2)
+
+        table["events"][method] = np.where(ok, D, -1).astype(np.int64)
+        table["n_total"][method] = np.where(ok, n_total, -1).astype(np.int64)
+
+    return table
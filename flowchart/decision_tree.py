@@ -0,0 +1,402 @@
+
+# ==========================================
+# Study Design Decision Tree
+# ==========================================
+
+import importlib
+from functools import lru_cache
+
+from graphviz import Digraph
+from graphviz.quoting import attr_list, quote
+
+
+ROOT = "start"
+
+# Question nodes have a question and ordered (answer, child) branches;
+# leaves name the app page and the calculator ("module:function").
+# An optional preset maps page widget keys to values (e.g. a design
+# radio on a shared page).
+NODES = {
+    "start": {
+        "question": "What is your primary outcome type?",
+        "branches": [
+            ("Continuous", "continuous"),
+            ("Binary", "binary"),
+            ("Association / prediction", "association"),
+            ("Time-to-event", "logrank"),
+            ("Ordered categories (e.g. mRS)", "ordinal"),
+            ("Event counts / rates", "rate_ratio"),
+            ("Clustered (randomised by cluster)", "cluster"),
+        ]
+    },
+
+    # Continuous
+    "continuous": {
+        "question": "How are the measurements compared?",
+        "branches": [
+            ("One group vs a reference value", "one_sample_mean"),
+            ("Two independent groups", "two_means"),
+            ("Paired / before-after", "paired_mean"),
+            ("Three or more groups", "anova"),
+            ("Repeated over time", "repeated_measures"),
+        ]
+    },
+    "one_sample_mean": {
+        "label": "One-Sample Mean",
+        "page": "One-Sample Mean",
+        "calculator": "calculators.continuous.one_sample_mean:calculate_one_sample_mean"
+    },
+    "two_means": {
+        "label": "Two Independent Means",
+        "page": "Two Independent Means",
+        "calculator": "calculators.continuous.two_independent_means:calculate_two_independent_means"
+    },
+    "paired_mean": {
+        "label": "Paired Mean",
+        "page": "Paired Mean",
+        "calculator": "calculators.continuous.paired_mean:calculate_paired_mean"
+    },
+    "anova": {
+        "label": "One-Way ANOVA",
+        "page": "One-Way ANOVA",
+        "calculator": "calculators.continuous.anova_oneway:calculate_anova_oneway"
+    },
+    "repeated_measures": {
+        "label": "Repeated Measures",
+        "page": "Repeated Measures (Longitudinal)",
+        "calculator": "calculators.continuous.repeated_measures:calculate_repeated_measures"
+    },
+
+    # Binary
+    "binary": {
+        "question": "What is the study design?",
+        "branches": [
+            ("One group vs a reference proportion", "one_proportion"),
+            ("Two-group trial", "two_proportions"),
+            ("Cohort (risk ratio)", "cohort_rr"),
+            ("Case-control", "case_control"),
+        ]
+    },
+    "one_proportion": {
+        "label": "One Proportion",
+        "page": "One Proportion",
+        "calculator": "calculators.binary.one_proportion:calculate_one_proportion"
+    },
+    "two_proportions": {
+        "label": "Two Proportions",
+        "page": "Two Proportions",
+        "calculator": "calculators.binary.two_proportions:calculate_two_proportions"
+    },
+    "cohort_rr": {
+        "label": "Cohort / Risk Ratio",
+        "page": "Cohort (Risk Ratio)",
+        "calculator": "calculators.binary.cohort_rr:calculate_cohort_rr"
+    },
+    "case_control": {
+        "question": "Are controls individually matched to cases?",
+        "branches": [
+            ("No", "case_control_or"),
+            ("Yes (1:M matching)", "matched_case_control"),
+        ]
+    },
+    "case_control_or": {
+        "label": "Case-Control (OR)",
+        "page": "Case-Control (Odds Ratio)",
+        "calculator": "calculators.binary.case_control_or:calculate_case_control_or",
+        "preset": {"cc_design": "Unmatched"}
+    },
+    "matched_case_control": {
+        "label": "Matched Case-Control (1:M)",
+        "page": "Case-Control (Odds Ratio)",
+        "calculator": "calculators.binary.matched_case_control:calculate_matched_case_control",
+        "preset": {"cc_design": "Matched (1:M)"}
+    },
+
+    # Association
+    "association": {
+        "question": "What is the aim of the analysis?",
+        "branches": [
+            ("Correlation between two variables", "correlation"),
+            ("Regression coefficients (continuous outcome)", "linear_regression"),
+            ("Regression coefficients (binary outcome)", "logistic_regression"),
+            ("Develop a prediction model", "prediction_model"),
+        ]
+    },
+    "correlation": {
+        "label": "Correlation",
+        "page": "Correlation",
+        "calculator": "calculators.association.correlation:calculate_correlation"
+    },
+    "linear_regression": {
+        "label": "Linear Regression",
+        "page": "Linear Regression",
+        "calculator": "calculators.association.linear_regression:calculate_linear_regression"
+    },
+    "logistic_regression": {
+        "label": "Logistic Regression",
+        "page": "Logistic Regression",
+        "calculator": "calculators.association.logistic_regression:calculate_logistic_regression"
+    },
+    "prediction_model": {
+        "label": "Prediction Model (Riley)",
+        "page": "Prediction Model (Riley Criteria)",
+        "calculator": "calculators.association.prediction_model:calculate_prediction_model"
+    },
+
+    # Survival
+    "logrank": {
+        "label": "Log-Rank Test",
+        "page": "Survival (Log-Rank)",
+        "calculator": "calculators.survival.logrank:calculate_logrank"
+    },
+
+    # Ordinal / counts
+    "ordinal": {
+        "label": "Ordinal (Whitehead)",
+        "page": "Ordinal Outcome (Proportional Odds)",
+        "calculator": "calculators.ordinal.proportional_odds:calculate_ordinal_whitehead"
+    },
+    "rate_ratio": {
+        "label": "Rate Ratio (Poisson / NB)",
+        "page": "Count Outcomes (Rate Ratio)",
+        "calculator": "calculators.count.rate_ratio:calculate_negative_binomial_rate_ratio"
+    },
+
+    # Cluster
+    "cluster": {
+        "question": "How are clusters randomised?",
+        "branches": [
+            ("Parallel arms", "cluster_parallel"),
+            ("Stepped-wedge rollout", "stepped_wedge"),
+        ]
+    },
+    "cluster_parallel": {
+        "question": "What type of outcome?",
+        "branches": [
+            ("Continuous", "cluster_two_means"),
+            ("Binary", "cluster_two_proportions"),
+        ]
+    },
+    "cluster_two_means": {
+        "label": "Cluster RCT (means)",
+        "page": "Cluster Randomized Trial",
+        "calculator": "calculators.cluster.cluster_randomized:calculate_cluster_two_means",
+        "preset": {"cluster_design": "Parallel"}
+    },
+    "cluster_two_proportions": {
+        "label": "Cluster RCT (proportions)",
+        "page": "Cluster Randomized Trial",
+        "calculator": "calculators.cluster.cluster_randomized:calculate_cluster_two_proportions",
+        "preset": {"cluster_design": "Parallel"}
+    },
+    "stepped_wedge": {
+        "label": "Stepped-Wedge Trial",
+        "page": "Cluster Randomized Trial",
+        "calculator": "calculators.cluster.stepped_wedge:calculate_stepped_wedge",
+        "preset": {"cluster_design": "Stepped-wedge"}
+    },
+}
+
+_QUESTION_STYLE = {"shape": "box", "style": "rounded"}
+_LEAF_STYLE = {"shape": "box", "style": "filled", "fillcolor": "#f2f2f2"}
+_PATH_NODE_STYLE = {"color": "#1f77b4", "penwidth": "2"}
+_PATH_LEAF_STYLE = {"style": "filled", "fillcolor": "#cfe3f5", "color": "#1f77b4", "penwidth": "2"}
+_PATH_EDGE_STYLE = {"color": "#1f77b4", "fontcolor": "#1f77b4", "penwidth": "2"}
+
+
+def is_leaf(node_id: str) -> bool:
+    return "branches" not in NODES[node_id]
+
+
+def validate_tree():
+    """
+    Every branch target exists and every node is reached exactly once
+    from the root (a tree, so each design has a single route).
+    """
+
+    seen = set()
+    stack = [ROOT]
+
+    while stack:
+        node_id = stack.pop()
+
+        if node_id not in NODES:
+            raise ValueError(f"Unknown node '{node_id}'.")
+        if node_id in seen:
+            raise ValueError(f"Node '{node_id}' is reached by more than one route.")
+        seen.add(node_id)
+
+        node = NODES[node_id]
+        if "branches" in node:
+            stack.extend(child for _, child in node["branches"])
+        elif "calculator" not in node or "page" not in node:
+            raise ValueError(f"Leaf '{node_id}' needs a page and a calculator.")
+
+    unreachable = set(NODES) - seen
+    if unreachable:
+        raise ValueError(f"Unreachable nodes: {sorted(unreachable)}.")
+
+
+@lru_cache(maxsize=None)
+def answer_index() -> dict:
+    """
+    Precomputed answers → node lookup for every prefix of every route,
+    so walking the tree is a single dict access.
+    """
+
+    index = {}
+    stack = [((), ROOT)]
+
+    while stack:
+        answers, node_id = stack.pop()
+        index[answers] = node_id
+
+        for answer, child in NODES[node_id].get("branches", ()):
+            stack.append((answers + (answer,), child))
+
+    return index
+
+
+@lru_cache(maxsize=None)
+def routes() -> dict:
+    """
+    Leaf id → answers leading to it.
+    """
+    return {
+        node_id: answers
+        for answers, node_id in answer_index().items()
+        if is_leaf(node_id)
+    }
+
+
+def walk(answers=()) -> str:
+    """
+    Node reached by a sequence of answers from the root.
+    """
+
+    try:
+        return answer_index()[tuple(answers)]
+    except KeyError:
+        raise ValueError(f"No route for answers {list(answers)}.") from None
+
+
+def path_nodes(answers=()) -> tuple:
+    """
+    Node ids visited by a sequence of answers (root first).
+    """
+    answers = tuple(answers)
+    return tuple(walk(answers[:i]) for i in range(len(answers) + 1))
+
+
+def route(node_id: str) -> tuple:
+    """
+    Answers leading to a design leaf.
+    """
+
+    if node_id not in routes():
+        raise ValueError(f"Unknown design '{node_id}'.")
+
+    return routes()[node_id]
+
+
+def load_calculator(node_id: str):
+    """
+    Imports the calculator of a design leaf on demand.
+    """
+
+    if node_id not in NODES or not is_leaf(node_id):
+        raise ValueError(f"Unknown design '{node_id}'.")
+
+    module, name = NODES[node_id]["calculator"].split(":")
+
+    return getattr(importlib.import_module(module), name)
+
+
+def register_design(
+    parent: str,
+    answer: str,
+    node_id: str,
+    label: str,
+    page: str,
+    calculator: str,
+    preset: dict = None
+):
+    """
+    Adds a design leaf as a new branch of a question node; the lookup
+    indexes and rendered views are rebuilt on next use.
+    """
+
+    if parent not in NODES or is_leaf(parent):
+        raise ValueError(f"'{parent}' is not a question node.")
+
+    if node_id in NODES:
+        raise ValueError(f"Design node '{node_id}' is already registered.")
+
+    if any(existing == answer for existing, _ in NODES[parent]["branches"]):
+        raise ValueError(f"'{parent}' already has an answer '{answer}'.")
+
+    NODES[node_id] = {"label": label, "page": page, "calculator": calculator}
+    if preset:
+        NODES[node_id]["preset"] = preset
+
+    NODES[parent]["branches"].append((answer, node_id))
+
+    for cached in (answer_index, routes, _node_line, _edge_line, dot_body):
+        cached.cache_clear()
+
+
+# DOT statements are cached per element and state, so a new highlighted
+# path only rebuilds the statements along that path.
+@lru_cache(maxsize=None)
+def _node_line(node_id: str, on_path: bool) -> str:
+    node = NODES[node_id]
+
+    if is_leaf(node_id):
+        attrs = dict(_LEAF_STYLE, **(_PATH_LEAF_STYLE if on_path else {}))
+        label = node["label"]
+    else:
+        attrs = dict(_QUESTION_STYLE, **(_PATH_NODE_STYLE if on_path else {}))
+        label = node["question"]
+
+    return f"\t{quote(node_id)}{attr_list(label, attrs)}\n"
+
+
+@lru_cache(maxsize=None)
+def _edge_line(parent: str, child: str, answer: str, on_path: bool) -> str:
+    attrs = {"label": answer, **(_PATH_EDGE_STYLE if on_path else {})}
+    return f"\t{quote(parent)} -> {quote(child)}{attr_list(attributes=attrs)}\n"
+
+
+@lru_cache(maxsize=256)
+def dot_body(answers: tuple = ()) -> tuple:
+    """
+    DOT statements for the whole tree with the route of `answers`
+    highlighted (cached per route).
+    """
+
+    on_path = set(path_nodes(answers))
+    body = []
+
+    for node_id, node in NODES.items():
+        body.append(_node_line(node_id, node_id in on_path))
+
+        for answer, child in node.get("branches", ()):
+            body.append(_edge_line(node_id, child, answer, node_id in on_path and child in on_path))
+
+    return tuple(body)
+
+
+def build_graph(answers=()) -> Digraph:
+    """
+    Graphviz view of the decision tree, highlighting the route of
+    `answers` when given.
+    """
+
+    return Digraph(
+        comment="ClinSample AI Decision Tree",
+        graph_attr={"rankdir": "TB"},
+        body=list(dot_body(tuple(answers)))
+    )
+
+
+validate_tree()
@@ -3,72 +3,112 @@
 # Master Flowchart — Study Type Decision Tree
 # ==========================================
 
+import hashlib
+import os
+import tempfile
+
 from graphviz import Digraph
 
+from flowchart.decision_tree import build_graph
+
+
+# The chart is generated from the decision tree; renderings are keyed
+# on a hash of the DOT source, so registering a design (or highlighting
+# another route) never serves a stale image.
+FORMATS = ("svg", "png")
+
+# Rendered bytes per content hash
+_RENDERED = {}
+
+
+def build_flowchart(answers=()) -> Digraph:
+    """
+    Graphviz decision tree, with the route of `answers` highlighted.
+    """
+    return build_graph(answers)
+
+
+def flowchart_cache_dir() -> str:
+    """
+    Directory for rendered charts (CLINSAMPLE_FLOWCHART_DIR or
+    ~/.cache/clinsample/flowchart).
+    """
+    return os.environ.get(
+        "CLINSAMPLE_FLOWCHART_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "clinsample", "flowchart")
+    )
+
+
+def _content_hash(source: str, fmt: str) -> str:
+    return hashlib.sha256(f"{fmt}\n{source}".encode("utf-8")).hexdigest()
+
+
+def _write_atomic(path: str, data: bytes):
+    """
+    Writes via a temporary file in the same directory and os.replace,
+    so concurrent sessions never see a partial file.
+    """
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def render_flowchart(fmt: str = "svg", answers=()) -> bytes:
+    """
+    Rendered decision tree as bytes (SVG or PNG), optionally with a
+    highlighted route.
+
+    Looked up by content hash in memory, then on disk; `dot` is only
+    invoked (through a pipe, no temporary files) when the registered
+    designs have changed.
+    """
+
+    if fmt not in FORMATS:
+        raise ValueError(f"Format must be one of {FORMATS}.")
+
+    dot = build_flowchart(answers)
+    key = _content_hash(dot.source, fmt)
+
+    if key in _RENDERED:
+        return _RENDERED[key]
+
+    path = os.path.join(flowchart_cache_dir(), f"{key}.{fmt}")
+
+    try:
+        with open(path, "rb") as fh:
+            data = fh.read()
+    except OSError:
+        data = dot.pipe(format=fmt)
+        try:
+            _write_atomic(path, data)
+        except OSError:
+            # Read-only environment: keep the in-memory copy
+            pass
+
+    _RENDERED[key] = data
+    return data
+
 
 def generate_flowchart(output_path="flowchart.png"):
-    dot = Digraph(comment="ClinSample AI Decision Tree")
-
-    dot.attr(rankdir="TB")
-
-    # Root
-    dot.node("Start", "What is your primary outcome type?")
-
-    # Main branches
-    dot.node("Cont", "Continuous Outcome")
-    dot.node("Bin", "Binary Outcome")
-    dot.node("Assoc", "Association")
-    dot.node("Surv", "Time-to-Event")
-
-    dot.edges([
-        ("Start", "Cont"),
-        ("Start", "Bin"),
-        ("Start", "Assoc"),
-        ("Start", "Surv"),
-    ])
-
-    # Continuous
-    dot.node("C1", "One-Sample Mean")
-    dot.node("C2", "Two Independent Means")
-    dot.node("C3", "Paired Mean")
-    dot.node("C4", "One-Way ANOVA")
-
-    dot.edges([
-        ("Cont", "C1"),
-        ("Cont", "C2"),
-        ("Cont", "C3"),
-        ("Cont", "C4"),
-    ])
-
-    # Binary
-    dot.node("B1", "One Proportion")
-    dot.node("B2", "Two Proportions")
-    dot.node("B3", "Case-Control (OR)")
-    dot.node("B4", "Cohort / Risk Ratio")
-
-    dot.edges([
-        ("Bin", "B1"),
-        ("Bin", "B2"),
-        ("Bin", "B3"),
-        ("Bin", "B4"),
-    ])
-
-    # Association
-    dot.node("A1", "Correlation")
-    dot.node("A2", "Linear Regression")
-    dot.node("A3", "Logistic Regression (EPV)")
-
-    dot.edges([
-        ("Assoc", "A1"),
-        ("Assoc", "A2"),
-        ("Assoc", "A3"),
-    ])
-
-    # Survival
-    dot.node("S1", "Log-Rank Test")
-
-    dot.edge("Surv", "S1")
-
-    dot.render(output_path, format="png", cleanup=True)
+    """
+    Writes the rendered chart to output_path (format from the
+    extension, PNG by default) and returns the path.
+    """
+
+    fmt = os.path.splitext(output_path)[1].lstrip(".").lower()
+    if fmt not in FORMATS:
+        fmt = "png"
+
+    _write_atomic(output_path, render_flowchart(fmt))
 
     return output_path
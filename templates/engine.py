@@ -0,0 +1,163 @@
+
+# ==========================================
+# Manuscript Paragraph Template Engine
+# ==========================================
+
+from functools import lru_cache
+from string import Formatter
+
+
+# Registered templates: (design, language) -> template source in
+# str.format syntax. Sources are parsed once, on first use.
+_SOURCES = {}
+
+# Derived fields computed from other values before formatting:
+# name -> (input field names, function(*inputs, language))
+_DERIVED = {}
+
+
+def register_template(design: str, language: str, source: str):
+    """
+    Declares the paragraph template of a design in one language.
+    """
+
+    _SOURCES[(design, language)] = source
+    compile_template.cache_clear()
+    _renderer.cache_clear()
+
+
+def register_derived(name: str, inputs: tuple, function):
+    """
+    Declares a field computed from other fields, e.g. the localized
+    "two-sided" wording from two_sided.
+    """
+    _DERIVED[name] = (tuple(inputs), function)
+
+
+def languages(design: str) -> list:
+    return sorted(lang for d, lang in _SOURCES if d == design)
+
+
+@lru_cache(maxsize=None)
+def compile_template(design: str, language: str = "en") -> tuple:
+    """
+    Parses a template once into (literal, field, format spec) parts.
+    Conversions (!r, !s) and nested fields are not supported.
+    """
+
+    if (design, language) not in _SOURCES:
+        raise ValueError(f"No '{language}' template for design '{design}'.")
+
+    parts = []
+
+    for literal, field, spec, conversion in Formatter().parse(_SOURCES[(design, language)]):
+        if conversion or (spec and "{" in spec):
+            raise ValueError(f"Unsupported field in template '{design}': {field}")
+        parts.append((literal, field, spec or ""))
+
+    return tuple(parts)
+
+
+def _fields(parts) -> list:
+    return list(dict.fromkeys(field for _, field, _ in parts if field is not None))
+
+
+@lru_cache(maxsize=None)
+def _renderer(design: str, language: str):
+    """
+    Compiles a template into a Python function of the value dict (one
+    join of literals and format() calls), plus the derived fields it
+    needs. Cached per template, so rendering never re-parses.
+    """
+
+    parts = compile_template(design, language)
+    pieces = []
+
+    for literal, field, spec in parts:
+        if literal:
+            pieces.append(repr(literal))
+        if field is not None:
+            if not field.isidentifier():
+                raise ValueError(f"Unsupported field in template '{design}': {field}")
+            pieces.append(f"format(v[{field!r}], {spec!r})")
+
+    function = eval("lambda v: ''.join((" + ", ".join(pieces) + ",))", {"format": format})
+    derived = tuple(f for f in _fields(parts) if f in _DERIVED)
+
+    return function, derived
+
+
+def render(design: str, language: str = "en", **values) -> str:
+    """
+    Renders one paragraph with the compiled template.
+    """
+
+    function, derived = _renderer(design, language)
+
+    for name in derived:
+        if name not in values:
+            inputs, compute = _DERIVED[name]
+            values[name] = compute(*(values[i] for i in inputs), language)
+
+    return function(values)
+
+
+def render_many(design: str, columns: dict, language: str = "en") -> list:
+    """
+    Renders one paragraph per row from column sequences (scalars are
+    broadcast), e.g. the output of a *_grid calculator.
+
+    Each field is formatted once per distinct value (planning tables
+    repeat the same inputs across many rows) and the fragments are
+    joined row-wise.
+    """
+
+    parts = compile_template(design, language)
+    fields = _fields(parts)
+
+    lengths = {
+        len(v) for v in columns.values()
+        if hasattr(v, "__len__") and not isinstance(v, str)
+    }
+    if len(lengths) > 1:
+        raise ValueError("All columns must have the same length.")
+    n_rows = lengths.pop() if lengths else 1
+
+    def column(name):
+        v = columns[name]
+        if hasattr(v, "__len__") and not isinstance(v, str):
+            return list(v.tolist() if hasattr(v, "tolist") else v)
+        return [v] * n_rows
+
+    raw = {name: column(name) for name in columns}
+
+    # Derived fields are evaluated once per distinct input combination
+    for name in fields:
+        if name in raw or name not in _DERIVED:
+            continue
+        inputs, function = _DERIVED[name]
+        memo = {}
+        derived = []
+        for key in zip(*(raw[i] for i in inputs)):
+            if key not in memo:
+                memo[key] = function(*key, language)
+            derived.append(memo[key])
+        raw[name] = derived
+
+    pieces = []
+    for literal, field, spec in parts:
+        if field is None:
+            pieces.append([literal] * n_rows)
+            continue
+        # Keyed on type too: 1, 1.0 and True format differently
+        memo = {}
+        formatted = []
+        for v in raw[field]:
+            key = (v.__class__, v)
+            s = memo.get(key)
+            if s is None:
+                s = memo[key] = literal + format(v, spec)
+            formatted.append(s)
+        pieces.append(formatted)
+
+    return ["".join(row) for row in zip(*pieces)]
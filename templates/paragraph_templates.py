@@ -3,117 +3,871 @@
 # Thesis / Manuscript Paragraph Templates
 # ==========================================
 
-def paragraph_one_sample_mean(alpha, power, sd, delta, two_sided, dropout_rate, n_required):
-    sided = "two-sided" if two_sided else "one-sided"
-    return (
-        f"Sample size was calculated for a one-sample mean test ({sided}) with α={alpha:.3g} and power={power:.3g}. "
-        f"Assuming a standard deviation (SD) of {sd:g} and a clinically meaningful difference (Δ) of {delta:g}, "
-        f"the required sample size was {n_required} participants after adjusting for an anticipated dropout rate of "
-        f"{dropout_rate*100:.1f}%."
+from templates.engine import register_derived, register_template, render, render_many
+
+
+LANGUAGES = {"en": "English", "es": "Español"}
+
+_SIDED = {
+    "en": ("two-sided", "one-sided"),
+    "es": ("bilateral", "unilateral")
+}
+
+register_derived("sided", ("two_sided",), lambda two_sided, lang: _SIDED[lang][0 if two_sided else 1])
+register_derived("dropout_pct", ("dropout_rate",), lambda dropout_rate, lang: dropout_rate * 100)
+register_derived("confidence_pct", ("alpha",), lambda alpha, lang: (1 - alpha) * 100)
+
+# One-sided tests are reported as the equivalent two-sided interval
+register_derived(
+    "ci_level_pct", ("alpha", "two_sided"),
+    lambda alpha, two_sided, lang: (1 - alpha if two_sided else 1 - 2 * alpha) * 100
+)
+
+# Localized wording for coded choices: field -> (input, {language: {code: text}})
+_CHOICES = {
+    "hypothesis_text": ("hypothesis", {
+        "en": {"superiority": "superiority", "non_inferiority": "non-inferiority", "equivalence": "equivalence"},
+        "es": {"superiority": "superioridad", "non_inferiority": "no inferioridad", "equivalence": "equivalencia"}
+    }),
+    "interval_text": ("method", {
+        "en": {"wald": "Wald", "wilson": "Wilson score", "clopper_pearson": "Clopper–Pearson exact"},
+        "es": {"wald": "de Wald", "wilson": "de Wilson (score)", "clopper_pearson": "exacto de Clopper–Pearson"}
+    }),
+    "ssr_rule_text": ("rule", {
+        "en": {"chw": "Cui–Hung–Wang weighted test", "mehta_pocock": "Mehta–Pocock conventional test"},
+        "es": {"chw": "prueba ponderada de Cui–Hung–Wang", "mehta_pocock": "prueba convencional de Mehta–Pocock"}
+    }),
+    "bayes_prior_text": ("prior", {
+        "en": {"uniform": "uniform Beta(1, 1)", "jeffreys": "Jeffreys Beta(0.5, 0.5)"},
+        "es": {"uniform": "uniformes Beta(1, 1)", "jeffreys": "de Jeffreys Beta(0.5, 0.5)"}
+    }),
+    "evaluation_text": ("evaluation", {
+        "en": {"exact": "exact beta-binomial calculation", "simulation": "simulation"},
+        "es": {"exact": "cálculo exacto beta-binomial", "simulation": "simulación"}
+    }),
+    "correlation_method_text": ("method", {
+        "en": {"fisher_z": "Fisher’s z-transformation", "exact": "the exact distribution of the sample correlation coefficient"},
+        "es": {"fisher_z": "la transformación z de Fisher", "exact": "la distribución exacta del coeficiente de correlación muestral"}
+    }),
+    "logrank_method_text": ("method", {
+        "en": {
+            "schoenfeld": "Schoenfeld’s method",
+            "freedman": "Freedman’s method",
+            "lachin_foulkes": "the Lachin–Foulkes method (exponential survival)",
+            "lakatos": "Lakatos’ Markov chain method"
+        },
+        "es": {
+            "schoenfeld": "el método de Schoenfeld",
+            "freedman": "el método de Freedman",
+            "lachin_foulkes": "el método de Lachin–Foulkes (supervivencia exponencial)",
+            "lakatos": "el método de cadenas de Markov de Lakatos"
+        }
+    }),
+    "estimand_text": ("estimand", {
+        "en": {"slope": "slope (rate of change)", "mean": "time-averaged mean"},
+        "es": {"slope": "pendiente (tasa de cambio)", "mean": "media promediada en el tiempo"}
+    }),
+    "structure_text": ("structure", {
+        "en": {"cs": "compound symmetry", "ar1": "AR(1)"},
+        "es": {"cs": "simetría compuesta", "ar1": "AR(1)"}
+    }),
+    "outcome_text": ("outcome", {
+        "en": {"binary": "binary", "continuous": "continuous", "survival": "time-to-event"},
+        "es": {"binary": "binario", "continuous": "continuo", "survival": "de tiempo hasta el evento"}
+    }),
+    "r2_text": ("outcome", {
+        "en": {"binary": "Cox–Snell R²", "continuous": "adjusted R²", "survival": "Cox–Snell R²"},
+        "es": {"binary": "R² de Cox–Snell", "continuous": "R² ajustado", "survival": "R² de Cox–Snell"}
+    })
+}
+
+for _name, (_input, _texts) in _CHOICES.items():
+    register_derived(_name, (_input,), lambda code, lang, _texts=_texts: _texts[lang][code])
+
+# Two-proportion test names; the pooled Z-test is the default and is not named
+_TWO_PROPORTION_METHODS = {
+    "en": {
+        "fleiss_cc": "Fleiss continuity correction",
+        "casagrande_pike": "Casagrande–Pike–Smith",
+        "arcsine": "arcsine transformation",
+        "farrington_manning": "Farrington–Manning score"
+    },
+    "es": {
+        "fleiss_cc": "corrección de continuidad de Fleiss",
+        "casagrande_pike": "Casagrande–Pike–Smith",
+        "arcsine": "transformación arcoseno",
+        "farrington_manning": "score de Farrington–Manning"
+    }
+}
+
+_METHOD_CLAUSE = {"en": " using the {} method", "es": " mediante el método {}"}
+
+
+def _method_clause(method, lang):
+    if method == "pooled":
+        return ""
+    return _METHOD_CLAUSE[lang].format(_TWO_PROPORTION_METHODS[lang][method])
+
+
+def _width_criterion(assurance, half_width, lang):
+    if not assurance:
+        return {
+            "en": f"for an expected half-width of ±{half_width:g}",
+            "es": f"para una semiamplitud esperada de ±{half_width:g}"
+        }[lang]
+    return {
+        "en": f"with {assurance * 100:.0f}% assurance that the half-width will not exceed ±{half_width:g}",
+        "es": f"con una probabilidad del {assurance * 100:.0f}% de que la semiamplitud no supere ±{half_width:g}"
+    }[lang]
+
+
+def _sd_prior_text(sd, sd_cv, lang):
+    if not sd_cv:
+        return {"en": f"a fixed SD of {sd:g}", "es": f"una DE fija de {sd:g}"}[lang]
+    return {
+        "en": f"a gamma prior on the SD (mean {sd:g}, CV {sd_cv:g})",
+        "es": f"una distribución a priori gamma para la DE (media {sd:g}, CV {sd_cv:g})"
+    }[lang]
+
+
+def _tested_text(n_tested, n_predictors, lang):
+    if n_tested == n_predictors:
+        return {"en": "the overall model", "es": "el modelo global"}[lang]
+    return {
+        "en": f"a block of {n_tested} of the {n_predictors} predictors",
+        "es": f"un bloque de {n_tested} de los {n_predictors} predictores"
+    }[lang]
+
+
+def _cp_prior_text(prior_sd, lang):
+    if not prior_sd:
+        return {"en": "flat prior", "es": "a priori plana"}[lang]
+    return {
+        "en": f"normal prior on log(HR), SD {prior_sd:g}",
+        "es": f"a priori normal para log(HR), DE {prior_sd:g}"
+    }[lang]
+
+
+register_derived("method_clause", ("method",), _method_clause)
+register_derived("width_criterion", ("assurance", "half_width"), _width_criterion)
+register_derived("sd_prior_text", ("sd", "sd_cv"), _sd_prior_text)
+register_derived("tested_text", ("n_tested", "n_predictors"), _tested_text)
+register_derived("cp_prior_text", ("prior_sd",), _cp_prior_text)
+
+
+TEMPLATES = {
+    "one_sample_mean": {
+        "en": (
+            "Sample size was calculated for a one-sample mean test ({sided}) with α={alpha:.3g} and power={power:.3g}. "
+            "Assuming a standard deviation (SD) of {sd:g} and a clinically meaningful difference (Δ) of {delta:g}, "
+            "the required sample size was {n_required} participants after adjusting for an anticipated dropout rate of "
+            "{dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se calculó para una prueba de media de una muestra ({sided}) con α={alpha:.3g} y potencia={power:.3g}. "
+            "Asumiendo una desviación estándar (DE) de {sd:g} y una diferencia clínicamente relevante (Δ) de {delta:g}, "
+            "el tamaño muestral requerido fue de {n_required} participantes tras ajustar por una tasa de abandono prevista del "
+            "{dropout_pct:.1f}%."
+        )
+    },
+    "two_independent_means": {
+        "en": (
+            "Sample size was calculated for a two-sample comparison of means ({sided}) with α={alpha:.3g} and power={power:.3g}. "
+            "Assuming a common SD of {sd:g} and an expected mean difference (Δ) of {delta:g}, "
+            "with an allocation ratio of {allocation_ratio:g} (group 2 / group 1), the required sample size was "
+            "{n1} in group 1 and {n2} in group 2 after adjusting for an anticipated dropout rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se calculó para la comparación de medias de dos muestras ({sided}) con α={alpha:.3g} y potencia={power:.3g}. "
+            "Asumiendo una DE común de {sd:g} y una diferencia de medias esperada (Δ) de {delta:g}, "
+            "con una razón de asignación de {allocation_ratio:g} (grupo 2 / grupo 1), el tamaño muestral requerido fue de "
+            "{n1} en el grupo 1 y {n2} en el grupo 2 tras ajustar por una tasa de abandono prevista del {dropout_pct:.1f}%."
+        )
+    },
+    "paired_mean": {
+        "en": (
+            "Sample size was calculated for a paired mean difference test ({sided}) with α={alpha:.3g} and power={power:.3g}. "
+            "Assuming the SD of within-subject differences (SDd) was {sd_diff:g} and the expected mean difference (Δ) was {delta:g}, "
+            "the required sample size was {n_required} paired observations after adjusting for an anticipated dropout rate of "
+            "{dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se calculó para una prueba de diferencia de medias pareadas ({sided}) con α={alpha:.3g} y potencia={power:.3g}. "
+            "Asumiendo una DE de las diferencias intrasujeto (DEd) de {sd_diff:g} y una diferencia de medias esperada (Δ) de {delta:g}, "
+            "el tamaño muestral requerido fue de {n_required} observaciones pareadas tras ajustar por una tasa de abandono prevista del "
+            "{dropout_pct:.1f}%."
+        )
+    },
+    "anova": {
+        "en": (
+            "Sample size was calculated for a one-way ANOVA with {k_groups} groups, using α={alpha:.3g} and power={power:.3g}. "
+            "Assuming an effect size of Cohen’s f={effect_size_f:g} and a balanced design, the required total sample size was "
+            "{n_total} participants ({n_per_group} per group) after adjusting for an anticipated dropout rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se calculó para un ANOVA de un factor con {k_groups} grupos, con α={alpha:.3g} y potencia={power:.3g}. "
+            "Asumiendo un tamaño del efecto f de Cohen={effect_size_f:g} y un diseño equilibrado, el tamaño muestral total requerido fue de "
+            "{n_total} participantes ({n_per_group} por grupo) tras ajustar por una tasa de abandono prevista del {dropout_pct:.1f}%."
+        )
+    },
+    "one_proportion": {
+        "en": (
+            "Sample size was calculated for a one-sample proportion test ({sided}) with α={alpha:.3g} and power={power:.3g}. "
+            "Assuming a null proportion p0={p0:g} and an alternative proportion p1={p1:g}, the required sample size was "
+            "{n_required} participants after adjusting for an anticipated dropout/non-evaluable rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se calculó para una prueba de proporción de una muestra ({sided}) con α={alpha:.3g} y potencia={power:.3g}. "
+            "Asumiendo una proporción nula p0={p0:g} y una proporción alternativa p1={p1:g}, el tamaño muestral requerido fue de "
+            "{n_required} participantes tras ajustar por una tasa prevista de abandono/no evaluables del {dropout_pct:.1f}%."
+        )
+    },
+    "two_proportions": {
+        "en": (
+            "Sample size was calculated for a two-sample comparison of proportions ({sided}){method_clause} with α={alpha:.3g} and power={power:.3g}. "
+            "Assuming proportions of p1={p1:g} (group 1) and p2={p2:g} (group 2), with an allocation ratio of {allocation_ratio:g} "
+            "(group 2 / group 1), the required sample size was {n1} in group 1 and {n2} in group 2 after adjusting for an anticipated "
+            "dropout/non-evaluable rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se calculó para la comparación de proporciones de dos muestras ({sided}){method_clause} con α={alpha:.3g} y potencia={power:.3g}. "
+            "Asumiendo proporciones de p1={p1:g} (grupo 1) y p2={p2:g} (grupo 2), con una razón de asignación de {allocation_ratio:g} "
+            "(grupo 2 / grupo 1), el tamaño muestral requerido fue de {n1} en el grupo 1 y {n2} en el grupo 2 tras ajustar por una tasa "
+            "prevista de abandono/no evaluables del {dropout_pct:.1f}%."
+        )
+    },
+    "case_control_or": {
+        "en": (
+            "Sample size was calculated for an unmatched case–control study to detect an odds ratio (OR) of {odds_ratio:g}, "
+            "assuming an exposure prevalence among controls of p0={p0:g}. Using a {sided} test with α={alpha:.3g} and power={power:.3g}, "
+            "and a control-to-case ratio of {control_case_ratio:g}, the required sample size was {n_cases} cases and {n_controls} controls "
+            "after adjusting for an anticipated dropout/non-evaluable rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se calculó para un estudio de casos y controles no emparejado para detectar una odds ratio (OR) de {odds_ratio:g}, "
+            "asumiendo una prevalencia de exposición en los controles de p0={p0:g}. Con una prueba {sided}, α={alpha:.3g} y potencia={power:.3g}, "
+            "y una razón controles/casos de {control_case_ratio:g}, el tamaño muestral requerido fue de {n_cases} casos y {n_controls} controles "
+            "tras ajustar por una tasa prevista de abandono/no evaluables del {dropout_pct:.1f}%."
+        )
+    },
+    "cohort_rr": {
+        "en": (
+            "Sample size was calculated for a two-group comparison of risks ({sided}) with α={alpha:.3g} and power={power:.3g}. "
+            "Assuming a baseline risk of p0={baseline_risk:g} and a target risk ratio (RR) of {risk_ratio:g}, with an allocation ratio "
+            "of {allocation_ratio:g} (group 2 / group 1), the required sample size was {n1} in group 1 and {n2} in group 2 after adjusting "
+            "for an anticipated dropout/non-evaluable rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se calculó para la comparación de riesgos entre dos grupos ({sided}) con α={alpha:.3g} y potencia={power:.3g}. "
+            "Asumiendo un riesgo basal de p0={baseline_risk:g} y un riesgo relativo (RR) objetivo de {risk_ratio:g}, con una razón de asignación "
+            "de {allocation_ratio:g} (grupo 2 / grupo 1), el tamaño muestral requerido fue de {n1} en el grupo 1 y {n2} en el grupo 2 tras ajustar "
+            "por una tasa prevista de abandono/no evaluables del {dropout_pct:.1f}%."
+        )
+    },
+    "correlation": {
+        "en": (
+            "Sample size was calculated to detect a Pearson correlation of r={r:g} against a null value of ρ0={rho0:g} "
+            "using {correlation_method_text} with a {sided} test, α={alpha:.3g}, and power={power:.3g}. The required sample size "
+            "was {n_required} participants after adjusting for an anticipated dropout rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se calculó para detectar una correlación de Pearson de r={r:g} frente a un valor nulo de ρ0={rho0:g} "
+            "mediante {correlation_method_text} con una prueba {sided}, α={alpha:.3g} y potencia={power:.3g}. El tamaño muestral "
+            "requerido fue de {n_required} participantes tras ajustar por una tasa de abandono prevista del {dropout_pct:.1f}%."
+        )
+    },
+    "linear_regression": {
+        "en": (
+            "Sample size for multiple linear regression was planned using an approximate effect size approach (Cohen’s f²={f2:g}) "
+            "with a {sided} α={alpha:.3g} and power={power:.3g}. Assuming {n_predictors} predictors in the model, the required sample size "
+            "was {n_required} participants after adjusting for an anticipated dropout rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral para la regresión lineal múltiple se planificó mediante un enfoque aproximado de tamaño del efecto (f² de Cohen={f2:g}) "
+            "con α {sided}={alpha:.3g} y potencia={power:.3g}. Asumiendo {n_predictors} predictores en el modelo, el tamaño muestral requerido "
+            "fue de {n_required} participantes tras ajustar por una tasa de abandono prevista del {dropout_pct:.1f}%."
+        )
+    },
+    "logistic_regression_epv": {
+        "en": (
+            "Sample size for logistic regression was planned using an events-per-variable (EPV) approach. "
+            "Assuming an event rate of {event_rate:g} and {n_predictors} predictors, with EPV={epv}, at least {required_events} outcome events "
+            "and a total sample size of {n_required} participants were required after adjusting for an anticipated dropout rate of "
+            "{dropout_pct:.1f}%. "
+            "(Note: EPV is a model-stability planning rule rather than a hypothesis-testing power calculation.)"
+        ),
+        "es": (
+            "El tamaño muestral para la regresión logística se planificó mediante el criterio de eventos por variable (EPV). "
+            "Asumiendo una tasa de eventos de {event_rate:g} y {n_predictors} predictores, con EPV={epv}, se requirieron al menos {required_events} eventos "
+            "y un tamaño muestral total de {n_required} participantes tras ajustar por una tasa de abandono prevista del "
+            "{dropout_pct:.1f}%. "
+            "(Nota: el EPV es una regla de estabilidad del modelo, no un cálculo de potencia para un contraste de hipótesis.)"
+        )
+    },
+    "logrank": {
+        "en": (
+            "Sample size was calculated for a log-rank test ({sided}) based on {logrank_method_text}, with α={alpha:.3g} and power={power:.3g}. "
+            "Assuming a hazard ratio (HR) of {hazard_ratio:g} and an allocation ratio of {allocation_ratio:g} (group 2 / group 1), "
+            "the required number of events was {required_events}. Given an expected event fraction of {event_fraction:g} during follow-up, "
+            "the required total sample size was {n_total} participants ({n1} in group 1 and {n2} in group 2) after adjusting for an anticipated "
+            "dropout rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se calculó para una prueba log-rank ({sided}) según {logrank_method_text}, con α={alpha:.3g} y potencia={power:.3g}. "
+            "Asumiendo un hazard ratio (HR) de {hazard_ratio:g} y una razón de asignación de {allocation_ratio:g} (grupo 2 / grupo 1), "
+            "el número de eventos requerido fue de {required_events}. Dada una fracción de eventos esperada de {event_fraction:g} durante el seguimiento, "
+            "el tamaño muestral total requerido fue de {n_total} participantes ({n1} en el grupo 1 y {n2} en el grupo 2) tras ajustar por una "
+            "tasa de abandono prevista del {dropout_pct:.1f}%."
+        )
+    },
+    "rate_ratio": {
+        "en": (
+            "Sample size was calculated for a comparison of event rates ({sided}) with α={alpha:.3g} and power={power:.3g}, "
+            "using a Wald test of the log rate ratio. Assuming event rates of {rate1:g} (group 1) and {rate2:g} (group 2) per unit time, "
+            "a dispersion parameter of {dispersion:g} (negative binomial; 0 = Poisson), a mean follow-up of {follow_up:g} and an allocation "
+            "ratio of {allocation_ratio:g} (group 2 / group 1), the required sample size was {n1} in group 1 and {n2} in group 2 after "
+            "adjusting for an anticipated dropout rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se calculó para la comparación de tasas de eventos ({sided}) con α={alpha:.3g} y potencia={power:.3g}, "
+            "mediante una prueba de Wald del logaritmo de la razón de tasas. Asumiendo tasas de eventos de {rate1:g} (grupo 1) y {rate2:g} "
+            "(grupo 2) por unidad de tiempo, un parámetro de dispersión de {dispersion:g} (binomial negativa; 0 = Poisson), un seguimiento "
+            "medio de {follow_up:g} y una razón de asignación de {allocation_ratio:g} (grupo 2 / grupo 1), el tamaño muestral requerido fue "
+            "de {n1} en el grupo 1 y {n2} en el grupo 2 tras ajustar por una tasa de abandono prevista del {dropout_pct:.1f}%."
+        )
+    },
+    "mean_precision": {
+        "en": (
+            "Sample size was calculated to estimate the mean with a {confidence_pct:.0f}% confidence interval {width_criterion}, "
+            "assuming a standard deviation of {sd:g}. The required sample size was {n_before_dropout}, increased to {n_required} "
+            "participants to allow for an anticipated dropout rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se calculó para estimar la media con un intervalo de confianza del {confidence_pct:.0f}% {width_criterion}, "
+            "asumiendo una desviación estándar de {sd:g}. El tamaño muestral requerido fue de {n_before_dropout}, aumentado a {n_required} "
+            "participantes para una tasa de abandono prevista del {dropout_pct:.1f}%."
+        )
+    },
+    "two_means_margin": {
+        "en": (
+            "Sample size was calculated for a {hypothesis_text} comparison of two independent means with α={alpha:.3g} and power={power:.3g}, "
+            "using a margin of {margin:g} and an expected true difference of {delta:g} (SD={sd:g}, allocation ratio {allocation_ratio:g}; "
+            "{ci_level_pct:.0f}% confidence interval approach). The required sample size was {n1} in group 1 and {n2} in group 2 "
+            "after adjusting for an anticipated dropout rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se calculó para una comparación de {hypothesis_text} de dos medias independientes con α={alpha:.3g} y potencia={power:.3g}, "
+            "con un margen de {margin:g} y una diferencia real esperada de {delta:g} (DE={sd:g}, razón de asignación {allocation_ratio:g}; "
+            "enfoque del intervalo de confianza del {ci_level_pct:.0f}%). El tamaño muestral requerido fue de {n1} en el grupo 1 y {n2} en el grupo 2 "
+            "tras ajustar por una tasa de abandono prevista del {dropout_pct:.1f}%."
+        )
+    },
+    "two_means_assurance": {
+        "en": (
+            "Sample size was chosen to give an assurance (probability of a statistically significant result, averaged over prior uncertainty) "
+            "of at least {target:g}. A normal prior was assumed for the mean difference (mean {prior_mean:g}, SD {prior_sd:g}), with "
+            "{sd_prior_text}, α={alpha:.3g} and allocation ratio {allocation_ratio:g}. The required sample size was {n1} in group 1 and "
+            "{n2} in group 2 (assurance {assurance:.3f}), after adjusting for an anticipated dropout rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se eligió para alcanzar una probabilidad de éxito (assurance: probabilidad de un resultado estadísticamente "
+            "significativo, promediada sobre la incertidumbre a priori) de al menos {target:g}. Se asumió una distribución a priori normal para la "
+            "diferencia de medias (media {prior_mean:g}, DE {prior_sd:g}), con {sd_prior_text}, α={alpha:.3g} y razón de asignación {allocation_ratio:g}. "
+            "El tamaño muestral requerido fue de {n1} en el grupo 1 y {n2} en el grupo 2 (assurance {assurance:.3f}), tras ajustar por una "
+            "tasa de abandono prevista del {dropout_pct:.1f}%."
+        )
+    },
+    "sample_size_reestimation": {
+        "en": (
+            "An unblinded sample size re-estimation is planned after {interim_pct:.0f}% of the initial {n_planned} participants in group 1 "
+            "({ssr_rule_text}). If the conditional power lies in the promising zone ({cp_min:.2f} ≤ CP < {target_cp:g}), the sample size is "
+            "increased to reach a conditional power of {target_cp:g}, up to {max_factor:g}× the initial size. In {n_sims:,} simulated trials "
+            "with Δ={delta:g} and SD={sd:g}, power was {power_ssr:.3f} (fixed design {fixed_power:.3f}), the one-sided type I error "
+            "{type_i_error:.4f}, and the expected total sample size {expected_n_total:.0f} after adjusting for an anticipated dropout rate "
+            "of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "Se planifica una reestimación no ciega del tamaño muestral tras el {interim_pct:.0f}% de los {n_planned} participantes iniciales "
+            "del grupo 1 ({ssr_rule_text}). Si la potencia condicional se encuentra en la zona prometedora ({cp_min:.2f} ≤ PC < {target_cp:g}), "
+            "el tamaño muestral se aumenta hasta alcanzar una potencia condicional de {target_cp:g}, con un máximo de {max_factor:g} veces el "
+            "tamaño inicial. En {n_sims:,} ensayos simulados con Δ={delta:g} y DE={sd:g}, la potencia fue de {power_ssr:.3f} (diseño fijo "
+            "{fixed_power:.3f}), el error de tipo I unilateral de {type_i_error:.4f} y el tamaño muestral total esperado de {expected_n_total:.0f} "
+            "tras ajustar por una tasa de abandono prevista del {dropout_pct:.1f}%."
+        )
+    },
+    "simon_two_stage": {
+        "en": (
+            "A Simon optimal two-stage design was used to test H0: p ≤ {p0:g} against H1: p ≥ {p1:g} with one-sided α={alpha:.3g} "
+            "and power={power:.3g}. In stage 1, {n1} patients will be enrolled; the trial stops for futility if {r1} or fewer respond. "
+            "Otherwise enrolment continues to {n} patients, and the treatment is considered worthy of further study if more than {r} "
+            "respond (probability of early termination under H0 {pet0:.2f}, expected sample size {en0:.1f}). Accounting for "
+            "{dropout_pct:.1f}% non-evaluable patients, {n1_required} and {n_required} patients will be enrolled respectively."
+        ),
+        "es": (
+            "Se utilizó un diseño óptimo de dos etapas de Simon para contrastar H0: p ≤ {p0:g} frente a H1: p ≥ {p1:g} con α unilateral={alpha:.3g} "
+            "y potencia={power:.3g}. En la etapa 1 se incluirán {n1} pacientes; el ensayo se detiene por futilidad si responden {r1} o menos. "
+            "En caso contrario, la inclusión continúa hasta {n} pacientes, y el tratamiento se considera merecedor de estudio adicional si "
+            "responden más de {r} (probabilidad de finalización precoz bajo H0 {pet0:.2f}, tamaño muestral esperado {en0:.1f}). "
+            "Considerando un {dropout_pct:.1f}% de pacientes no evaluables, se incluirán {n1_required} y {n_required} pacientes respectivamente."
+        )
+    },
+    "proportion_precision": {
+        "en": (
+            "Sample size was calculated to estimate a proportion with a {confidence_pct:.0f}% {interval_text} confidence interval "
+            "{width_criterion}, assuming an expected proportion of {p:g}. The required sample size was {n_before_dropout}, increased to "
+            "{n_required} participants to allow for an anticipated dropout rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se calculó para estimar una proporción con un intervalo de confianza {interval_text} del {confidence_pct:.0f}% "
+            "{width_criterion}, asumiendo una proporción esperada de {p:g}. El tamaño muestral requerido fue de {n_before_dropout}, aumentado a "
+            "{n_required} participantes para una tasa de abandono prevista del {dropout_pct:.1f}%."
+        )
+    },
+    "two_proportions_margin": {
+        "en": (
+            "Sample size was calculated for a {hypothesis_text} comparison of two independent proportions with α={alpha:.3g} and "
+            "power={power:.3g}. Assuming event rates of {p1:g} and {p2:g} in the two groups, a margin of {margin:g} on the risk difference "
+            "and an allocation ratio of {allocation_ratio:g}, the required sample size was {n1} in group 1 and {n2} in group 2 after "
+            "adjusting for an anticipated dropout rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se calculó para una comparación de {hypothesis_text} de dos proporciones independientes con α={alpha:.3g} y "
+            "potencia={power:.3g}. Asumiendo tasas de eventos de {p1:g} y {p2:g} en los dos grupos, un margen de {margin:g} en la diferencia "
+            "de riesgos y una razón de asignación de {allocation_ratio:g}, el tamaño muestral requerido fue de {n1} en el grupo 1 y {n2} en "
+            "el grupo 2 tras ajustar por una tasa de abandono prevista del {dropout_pct:.1f}%."
+        )
+    },
+    "bayesian_two_proportions": {
+        "en": (
+            "A Bayesian design was used: the trial is successful if the posterior probability that the response rate differs in the "
+            "expected direction exceeds {threshold:g}, with independent {bayes_prior_text} priors on each rate. Assuming rates of {p1:g} "
+            "and {p2:g} and an allocation ratio of {allocation_ratio:g}, {n1} participants in group 1 and {n2} in group 2 give a "
+            "probability of success of {probability_of_success:.3f} ({evaluation_text}), after adjusting for an anticipated dropout "
+            "rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "Se utilizó un diseño bayesiano: el ensayo tiene éxito si la probabilidad a posteriori de que la tasa de respuesta difiera en "
+            "la dirección esperada supera {threshold:g}, con distribuciones a priori {bayes_prior_text} independientes para cada tasa. "
+            "Asumiendo tasas de {p1:g} y {p2:g} y una razón de asignación de {allocation_ratio:g}, {n1} participantes en el grupo 1 y {n2} "
+            "en el grupo 2 proporcionan una probabilidad de éxito de {probability_of_success:.3f} ({evaluation_text}), tras ajustar por una "
+            "tasa de abandono prevista del {dropout_pct:.1f}%."
+        )
+    },
+    "matched_case_control": {
+        "en": (
+            "Sample size was calculated for a 1:{controls_per_case} matched case–control study using Dupont's method for conditional "
+            "logistic regression. Assuming an exposure prevalence among controls of {p0:g}, a target odds ratio of {odds_ratio:g}, and an "
+            "exposure correlation between matched members of {phi:g}, the required sample size was {n_cases} cases and {n_controls} matched "
+            "controls (total {n_total}), after adjusting for an anticipated dropout rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se calculó para un estudio de casos y controles emparejado 1:{controls_per_case} mediante el método de Dupont "
+            "para regresión logística condicional. Asumiendo una prevalencia de exposición en los controles de {p0:g}, una odds ratio objetivo "
+            "de {odds_ratio:g} y una correlación de la exposición entre los miembros emparejados de {phi:g}, el tamaño muestral requerido fue "
+            "de {n_cases} casos y {n_controls} controles emparejados (total {n_total}), tras ajustar por una tasa de abandono prevista del "
+            "{dropout_pct:.1f}%."
+        )
+    },
+    "correlation_precision": {
+        "en": (
+            "Sample size was calculated to estimate a Pearson correlation of r={r:g} with a {confidence_pct:.0f}% confidence interval "
+            "(Fisher’s z-transformation) of half-width {half_width:g}. The required sample size was {n_before_dropout}, increased to "
+            "{n_required} participants to allow for an anticipated dropout rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se calculó para estimar una correlación de Pearson de r={r:g} con un intervalo de confianza del "
+            "{confidence_pct:.0f}% (transformación z de Fisher) de semiamplitud {half_width:g}. El tamaño muestral requerido fue de "
+            "{n_before_dropout}, aumentado a {n_required} participantes para una tasa de abandono prevista del {dropout_pct:.1f}%."
+        )
+    },
+    "linear_regression_exact": {
+        "en": (
+            "Sample size was calculated for multiple linear regression using the exact noncentral F-test for {tested_text}. "
+            "With α={alpha:.3g} and power={power:.3g}, assuming an effect size of f²={f2:g} and {n_predictors} predictors, the required "
+            "sample size was {n_required} participants after adjusting for an anticipated dropout rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se calculó para la regresión lineal múltiple mediante la prueba F no central exacta para {tested_text}. "
+            "Con α={alpha:.3g} y potencia={power:.3g}, asumiendo un tamaño del efecto f²={f2:g} y {n_predictors} predictores, el tamaño "
+            "muestral requerido fue de {n_required} participantes tras ajustar por una tasa de abandono prevista del {dropout_pct:.1f}%."
+        )
+    },
+    "logistic_regression_wald": {
+        "en": (
+            "Sample size for logistic regression ({sided}) was planned using a power-based Wald approximation. With α={alpha:.3g} and "
+            "power={power:.3g}, assuming an outcome event probability of p={event_rate:g} and a target odds ratio of OR={odds_ratio:g} "
+            "(β=ln(OR)), the required sample size was {n_required} participants after adjusting for an anticipated dropout rate of "
+            "{dropout_pct:.1f}%. Model stability was additionally assessed using an EPV threshold of {epv} with {n_predictors} predictors."
+        ),
+        "es": (
+            "El tamaño muestral para la regresión logística ({sided}) se planificó mediante una aproximación de Wald basada en la potencia. "
+            "Con α={alpha:.3g} y potencia={power:.3g}, asumiendo una probabilidad de evento de p={event_rate:g} y una odds ratio objetivo de "
+            "OR={odds_ratio:g} (β=ln(OR)), el tamaño muestral requerido fue de {n_required} participantes tras ajustar por una tasa de "
+            "abandono prevista del {dropout_pct:.1f}%. La estabilidad del modelo se evaluó además con un umbral de EPV de {epv} y "
+            "{n_predictors} predictores."
+        )
+    },
+    "conditional_power": {
+        "en": (
+            "At the interim analysis ({fraction_pct:.0f}% of the {events} planned events), the observed hazard ratio was "
+            "{observed_hr:g}. The conditional power of the final log-rank test was {cp_trend:.3f} under the current trend and "
+            "{cp_design:.3f} under the design hazard ratio of {hazard_ratio:g}; the predictive power ({cp_prior_text}) was "
+            "{predictive_power:.3f}."
+        ),
+        "es": (
+            "En el análisis intermedio ({fraction_pct:.0f}% de los {events} eventos planificados), el hazard ratio observado fue "
+            "{observed_hr:g}. La potencia condicional de la prueba log-rank final fue de {cp_trend:.3f} bajo la tendencia actual y de "
+            "{cp_design:.3f} bajo el hazard ratio del diseño de {hazard_ratio:g}; la potencia predictiva ({cp_prior_text}) fue de "
+            "{predictive_power:.3f}."
+        )
+    },
+    "ordinal": {
+        "en": (
+            "Sample size was calculated for an ordinal outcome with {n_categories} categories using the method of Whitehead (1993) "
+            "for the proportional odds model, with α={alpha:.3g} and power={power:.3g}. Assuming control-group category probabilities "
+            "of {control_probs} and a common odds ratio of {odds_ratio:g} (allocation ratio {allocation_ratio:g}), the required sample "
+            "size was {n1} in group 1 and {n2} in group 2 after adjusting for an anticipated dropout rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se calculó para una variable ordinal con {n_categories} categorías mediante el método de Whitehead (1993) "
+            "para el modelo de odds proporcionales, con α={alpha:.3g} y potencia={power:.3g}. Asumiendo probabilidades por categoría en el "
+            "grupo control de {control_probs} y una odds ratio común de {odds_ratio:g} (razón de asignación {allocation_ratio:g}), el tamaño "
+            "muestral requerido fue de {n1} en el grupo 1 y {n2} en el grupo 2 tras ajustar por una tasa de abandono prevista del {dropout_pct:.1f}%."
+        )
+    },
+    "stepped_wedge": {
+        "en": (
+            "Sample size was calculated for a stepped-wedge cluster randomized trial using the Hussey–Hughes method. With α={alpha:.3g} "
+            "and power={power:.3g}, assuming SD={sd:g}, a mean difference of {delta:g}, ICC={icc:g}, {n_steps} steps and {cluster_size:g} "
+            "participants per cluster per period, {n_clusters} clusters ({clusters_per_step} per step) were required, giving {n_total} "
+            "participants after adjusting for an anticipated dropout rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se calculó para un ensayo aleatorizado por conglomerados escalonado (stepped-wedge) mediante el método de "
+            "Hussey–Hughes. Con α={alpha:.3g} y potencia={power:.3g}, asumiendo DE={sd:g}, una diferencia de medias de {delta:g}, CCI={icc:g}, "
+            "{n_steps} pasos y {cluster_size:g} participantes por conglomerado y periodo, se requirieron {n_clusters} conglomerados "
+            "({clusters_per_step} por paso), con {n_total} participantes tras ajustar por una tasa de abandono prevista del {dropout_pct:.1f}%."
+        )
+    },
+    "cluster_parallel": {
+        "en": (
+            "Sample size was calculated for a parallel cluster randomized trial. With α={alpha:.3g} and power={power:.3g}, the individually "
+            "randomized sample size was inflated by a design effect of {design_effect:.3f} (ICC={icc:g}, mean cluster size {cluster_size:g}, "
+            "CV={cv:g}), requiring {clusters1} clusters in group 1 and {clusters2} clusters in group 2 ({n_total} participants in total) "
+            "after adjusting for an anticipated dropout rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se calculó para un ensayo aleatorizado por conglomerados en paralelo. Con α={alpha:.3g} y potencia={power:.3g}, "
+            "el tamaño muestral con aleatorización individual se multiplicó por un efecto de diseño de {design_effect:.3f} (CCI={icc:g}, tamaño "
+            "medio de conglomerado {cluster_size:g}, CV={cv:g}), lo que requirió {clusters1} conglomerados en el grupo 1 y {clusters2} en el "
+            "grupo 2 ({n_total} participantes en total) tras ajustar por una tasa de abandono prevista del {dropout_pct:.1f}%."
+        )
+    },
+    "repeated_measures": {
+        "en": (
+            "Sample size was calculated for a longitudinal comparison of two groups with {n_timepoints} measurements per participant "
+            "({estimand_text}, {structure_text} correlation with ρ={rho:g}). With α={alpha:.3g} and power={power:.3g}, assuming SD={sd:g} "
+            "and a between-group difference of {delta:g}, the required sample size was {n1} in group 1 and {n2} in group 2 after adjusting "
+            "for an anticipated dropout rate of {dropout_pct:.1f}%."
+        ),
+        "es": (
+            "El tamaño muestral se calculó para una comparación longitudinal de dos grupos con {n_timepoints} mediciones por participante "
+            "({estimand_text}, correlación {structure_text} con ρ={rho:g}). Con α={alpha:.3g} y potencia={power:.3g}, asumiendo DE={sd:g} "
+            "y una diferencia entre grupos de {delta:g}, el tamaño muestral requerido fue de {n1} en el grupo 1 y {n2} en el grupo 2 tras "
+            "ajustar por una tasa de abandono prevista del {dropout_pct:.1f}%."
+        )
+    },
+    "prediction_model": {
+        "en": (
+            "The minimum sample size for developing the prediction model ({outcome_text} outcome) was calculated using the criteria of "
+            "Riley et al., assuming {n_parameters} candidate predictor parameters and an anticipated {r2_text} of {r2:.4g}, targeting "
+            "expected shrinkage of at least {shrinkage:g} and optimism in R² of at most {optimism:g}. The required sample size was "
+            "{n_required} participants after adjusting for an anticipated dropout rate of {dropout_pct:.1f}% (criterion {binding} was binding)."
+        ),
+        "es": (
+            "El tamaño muestral mínimo para desarrollar el modelo de predicción (variable de resultado {outcome_text}) se calculó con los "
+            "criterios de Riley et al., asumiendo {n_parameters} parámetros predictores candidatos y un {r2_text} previsto de {r2:.4g}, con "
+            "el objetivo de una contracción (shrinkage) esperada de al menos {shrinkage:g} y un optimismo en el R² de como máximo {optimism:g}. "
+            "El tamaño muestral requerido fue de {n_required} participantes tras ajustar por una tasa de abandono prevista del "
+            "{dropout_pct:.1f}% (el criterio {binding} fue el determinante)."
+        )
+    }
+}
+
+for _design, _sources in TEMPLATES.items():
+    for _language, _source in _sources.items():
+        register_template(_design, _language, _source)
+
+
+# Defaults of the optional paragraph_* arguments, for bulk rendering
+_COLUMN_DEFAULTS = {
+    "two_proportions": {"method": "pooled"},
+    "correlation": {"rho0": 0.0, "method": "fisher_z"},
+    "logrank": {"method": "schoenfeld"}
+}
+
+
+def render_paragraphs(design: str, columns: dict, language: str = "en") -> list:
+    """
+    Bulk rendering for planning tables: one paragraph per row of the
+    column sequences (same field names as the paragraph_* arguments).
+    """
+    return render_many(design, {**_COLUMN_DEFAULTS.get(design, {}), **columns}, language)
+
+
+def paragraph_one_sample_mean(alpha, power, sd, delta, two_sided, dropout_rate, n_required, language="en"):
+    return render(
+        "one_sample_mean", language,
+        alpha=alpha, power=power, sd=sd, delta=delta, two_sided=two_sided,
+        dropout_rate=dropout_rate, n_required=n_required
+    )
+
+
+def paragraph_two_independent_means(alpha, power, sd, delta, allocation_ratio, two_sided, dropout_rate, n1, n2, language="en"):
+    return render(
+        "two_independent_means", language,
+        alpha=alpha, power=power, sd=sd, delta=delta, allocation_ratio=allocation_ratio,
+        two_sided=two_sided, dropout_rate=dropout_rate, n1=n1, n2=n2
+    )
+
+
+def paragraph_paired_mean(alpha, power, sd_diff, delta, two_sided, dropout_rate, n_required, language="en"):
+    return render(
+        "paired_mean", language,
+        alpha=alpha, power=power, sd_diff=sd_diff, delta=delta, two_sided=two_sided,
+        dropout_rate=dropout_rate, n_required=n_required
+    )
+
+
+def paragraph_anova(alpha, power, effect_size_f, k_groups, dropout_rate, n_total, n_per_group, language="en"):
+    return render(
+        "anova", language,
+        alpha=alpha, power=power, effect_size_f=effect_size_f, k_groups=k_groups,
+        dropout_rate=dropout_rate, n_total=n_total, n_per_group=n_per_group
+    )
+
+
+def paragraph_one_proportion(alpha, power, p0, p1, two_sided, dropout_rate, n_required, language="en"):
+    return render(
+        "one_proportion", language,
+        alpha=alpha, power=power, p0=p0, p1=p1, two_sided=two_sided,
+        dropout_rate=dropout_rate, n_required=n_required
+    )
+
+
+def paragraph_two_proportions(alpha, power, p1, p2, allocation_ratio, two_sided, dropout_rate, n1, n2, method="pooled", language="en"):
+    return render(
+        "two_proportions", language,
+        alpha=alpha, power=power, p1=p1, p2=p2, allocation_ratio=allocation_ratio,
+        two_sided=two_sided, dropout_rate=dropout_rate, n1=n1, n2=n2, method=method
+    )
+
+
+def paragraph_case_control_or(alpha, power, p0, odds_ratio, control_case_ratio, two_sided, dropout_rate, n_cases, n_controls, language="en"):
+    return render(
+        "case_control_or", language,
+        alpha=alpha, power=power, p0=p0, odds_ratio=odds_ratio, control_case_ratio=control_case_ratio,
+        two_sided=two_sided, dropout_rate=dropout_rate, n_cases=n_cases, n_controls=n_controls
+    )
+
+
+def paragraph_cohort_rr(alpha, power, baseline_risk, risk_ratio, allocation_ratio, two_sided, dropout_rate, n1, n2, language="en"):
+    return render(
+        "cohort_rr", language,
+        alpha=alpha, power=power, baseline_risk=baseline_risk, risk_ratio=risk_ratio,
+        allocation_ratio=allocation_ratio, two_sided=two_sided, dropout_rate=dropout_rate, n1=n1, n2=n2
+    )
+
+
+def paragraph_correlation(alpha, power, r, two_sided, dropout_rate, n_required, rho0=0.0, method="fisher_z", language="en"):
+    return render(
+        "correlation", language,
+        alpha=alpha, power=power, r=r, two_sided=two_sided,
+        dropout_rate=dropout_rate, n_required=n_required, rho0=rho0, method=method
+    )
+
+
+def paragraph_linear_regression(alpha, power, f2, n_predictors, two_sided, dropout_rate, n_required, language="en"):
+    return render(
+        "linear_regression", language,
+        alpha=alpha, power=power, f2=f2, n_predictors=n_predictors, two_sided=two_sided,
+        dropout_rate=dropout_rate, n_required=n_required
+    )
+
+
+def paragraph_logistic_regression_epv(event_rate, n_predictors, epv, dropout_rate, n_required, required_events, language="en"):
+    return render(
+        "logistic_regression_epv", language,
+        event_rate=event_rate, n_predictors=n_predictors, epv=epv, dropout_rate=dropout_rate,
+        n_required=n_required, required_events=required_events
+    )
+
+
+def paragraph_logrank(alpha, power, hazard_ratio, allocation_ratio, event_fraction, two_sided, dropout_rate, n1, n2, n_total, required_events, method="schoenfeld", language="en"):
+    return render(
+        "logrank", language,
+        alpha=alpha, power=power, hazard_ratio=hazard_ratio, allocation_ratio=allocation_ratio,
+        event_fraction=event_fraction, two_sided=two_sided, dropout_rate=dropout_rate,
+        n1=n1, n2=n2, n_total=n_total, required_events=required_events, method=method
+    )
+
+
+def paragraph_rate_ratio(alpha, power, rate1, rate2, dispersion, follow_up, allocation_ratio, two_sided, dropout_rate, n1, n2, language="en"):
+    return render(
+        "rate_ratio", language,
+        alpha=alpha, power=power, rate1=rate1, rate2=rate2, dispersion=dispersion,
+        follow_up=follow_up, allocation_ratio=allocation_ratio, two_sided=two_sided,
+        dropout_rate=dropout_rate, n1=n1, n2=n2
+    )
+
+
+def paragraph_mean_precision(alpha, sd, half_width, assurance, dropout_rate, n_before_dropout, n_required, language="en"):
+    return render(
+        "mean_precision", language,
+        alpha=alpha, sd=sd, half_width=half_width, assurance=assurance,
+        dropout_rate=dropout_rate, n_before_dropout=n_before_dropout, n_required=n_required
+    )
+
+
+def paragraph_two_means_margin(alpha, power, sd, delta, margin, allocation_ratio, hypothesis, two_sided, dropout_rate, n1, n2, language="en"):
+    return render(
+        "two_means_margin", language,
+        alpha=alpha, power=power, sd=sd, delta=delta, margin=margin, allocation_ratio=allocation_ratio,
+        hypothesis=hypothesis, two_sided=two_sided, dropout_rate=dropout_rate, n1=n1, n2=n2
+    )
+
+
+def paragraph_two_means_assurance(alpha, target, prior_mean, prior_sd, sd, sd_cv, allocation_ratio, dropout_rate, n1, n2, assurance, language="en"):
+    return render(
+        "two_means_assurance", language,
+        alpha=alpha, target=target, prior_mean=prior_mean, prior_sd=prior_sd, sd=sd, sd_cv=sd_cv,
+        allocation_ratio=allocation_ratio, dropout_rate=dropout_rate, n1=n1, n2=n2, assurance=assurance
+    )
+
+
+def paragraph_sample_size_reestimation(rule, interim_fraction, n_planned, cp_min, target_cp, max_factor, n_sims, delta, sd, power_ssr, fixed_power, type_i_error, expected_n_total, dropout_rate, language="en"):
+    return render(
+        "sample_size_reestimation", language,
+        rule=rule, interim_pct=interim_fraction * 100, n_planned=n_planned, cp_min=cp_min,
+        target_cp=target_cp, max_factor=max_factor, n_sims=n_sims, delta=delta, sd=sd,
+        power_ssr=power_ssr, fixed_power=fixed_power, type_i_error=type_i_error,
+        expected_n_total=expected_n_total, dropout_rate=dropout_rate
+    )
+
+
+def paragraph_simon_two_stage(alpha, power, p0, p1, dropout_rate, design, language="en"):
+    """
+    design = one design dict of calculate_simon_two_stage (e.g. "optimal")
+    """
+    return render(
+        "simon_two_stage", language,
+        alpha=alpha, power=power, p0=p0, p1=p1, dropout_rate=dropout_rate,
+        n1=design["n1"], r1=design["r1"], n=design["n"], r=design["r"], pet0=design["pet0"],
+        en0=design["en0"], n1_required=design["n1_required"], n_required=design["n_required"]
+    )
+
+
+def paragraph_proportion_precision(alpha, p, method, half_width, assurance, dropout_rate, n_before_dropout, n_required, language="en"):
+    return render(
+        "proportion_precision", language,
+        alpha=alpha, p=p, method=method, half_width=half_width, assurance=assurance,
+        dropout_rate=dropout_rate, n_before_dropout=n_before_dropout, n_required=n_required
+    )
+
+
+def paragraph_two_proportions_margin(alpha, power, p1, p2, margin, allocation_ratio, hypothesis, dropout_rate, n1, n2, language="en"):
+    return render(
+        "two_proportions_margin", language,
+        alpha=alpha, power=power, p1=p1, p2=p2, margin=margin, allocation_ratio=allocation_ratio,
+        hypothesis=hypothesis, dropout_rate=dropout_rate, n1=n1, n2=n2
     )
 
 
-def paragraph_two_independent_means(alpha, power, sd, delta, allocation_ratio, two_sided, dropout_rate, n1, n2):
-    sided = "two-sided" if two_sided else "one-sided"
-    return (
-        f"Sample size was calculated for a two-sample comparison of means ({sided}) with α={alpha:.3g} and power={power:.3g}. "
-        f"Assuming a common SD of {sd:g} and an expected mean difference (Δ) of {delta:g}, "
-        f"with an allocation ratio of {allocation_ratio:g} (group 2 / group 1), the required sample size was "
-        f"{n1} in group 1 and {n2} in group 2 after adjusting for an anticipated dropout rate of {dropout_rate*100:.1f}%."
+def paragraph_bayesian_two_proportions(threshold, p1, p2, allocation_ratio, prior, evaluation, dropout_rate, n1, n2, probability_of_success, language="en"):
+    return render(
+        "bayesian_two_proportions", language,
+        threshold=threshold, p1=p1, p2=p2, allocation_ratio=allocation_ratio, prior=prior,
+        evaluation=evaluation, dropout_rate=dropout_rate, n1=n1, n2=n2,
+        probability_of_success=probability_of_success
     )
 
 
-def paragraph_paired_mean(alpha, power, sd_diff, delta, two_sided, dropout_rate, n_required):
-    sided = "two-sided" if two_sided else "one-sided"
-    return (
-        f"Sample size was calculated for a paired mean difference test ({sided}) with α={alpha:.3g} and power={power:.3g}. "
-        f"Assuming the SD of within-subject differences (SDd) was {sd_diff:g} and the expected mean difference (Δ) was {delta:g}, "
-        f"the required sample size was {n_required} paired observations after adjusting for an anticipated dropout rate of "
-        f"{dropout_rate*100:.1f}%."
+def paragraph_matched_case_control(p0, odds_ratio, controls_per_case, phi, dropout_rate, n_cases, n_controls, n_total, language="en"):
+    return render(
+        "matched_case_control", language,
+        p0=p0, odds_ratio=odds_ratio, controls_per_case=controls_per_case, phi=phi,
+        dropout_rate=dropout_rate, n_cases=n_cases, n_controls=n_controls, n_total=n_total
     )
 
 
-def paragraph_anova(alpha, power, effect_size_f, k_groups, dropout_rate, n_total, n_per_group):
-    return (
-        f"Sample size was calculated for a one-way ANOVA with {k_groups} groups, using α={alpha:.3g} and power={power:.3g}. "
-        f"Assuming an effect size of Cohen’s f={effect_size_f:g} and a balanced design, the required total sample size was "
-        f"{n_total} participants ({n_per_group} per group) after adjusting for an anticipated dropout rate of {dropout_rate*100:.1f}%."
+def paragraph_correlation_precision(alpha, r, half_width, dropout_rate, n_before_dropout, n_required, language="en"):
+    return render(
+        "correlation_precision", language,
+        alpha=alpha, r=r, half_width=half_width, dropout_rate=dropout_rate,
+        n_before_dropout=n_before_dropout, n_required=n_required
     )
 
 
-def paragraph_one_proportion(alpha, power, p0, p1, two_sided, dropout_rate, n_required):
-    sided = "two-sided" if two_sided else "one-sided"
-    return (
-        f"Sample size was calculated for a one-sample proportion test ({sided}) with α={alpha:.3g} and power={power:.3g}. "
-        f"Assuming a null proportion p0={p0:g} and an alternative proportion p1={p1:g}, the required sample size was "
-        f"{n_required} participants after adjusting for an anticipated dropout/non-evaluable rate of {dropout_rate*100:.1f}%."
+def paragraph_linear_regression_exact(alpha, power, f2, n_predictors, n_tested, dropout_rate, n_required, language="en"):
+    return render(
+        "linear_regression_exact", language,
+        alpha=alpha, power=power, f2=f2, n_predictors=n_predictors, n_tested=n_tested,
+        dropout_rate=dropout_rate, n_required=n_required
     )
 
 
-def paragraph_two_proportions(alpha, power, p1, p2, allocation_ratio, two_sided, dropout_rate, n1, n2):
-    sided = "two-sided" if two_sided else "one-sided"
-    return (
-        f"Sample size was calculated for a two-sample comparison of proportions ({sided}) with α={alpha:.3g} and power={power:.3g}. "
-        f"Assuming proportions of p1={p1:g} (group 1) and p2={p2:g} (group 2), with an allocation ratio of {allocation_ratio:g} "
-        f"(group 2 / group 1), the required sample size was {n1} in group 1 and {n2} in group 2 after adjusting for an anticipated "
-        f"dropout/non-evaluable rate of {dropout_rate*100:.1f}%."
+def paragraph_logistic_regression_wald(alpha, power, event_rate, odds_ratio, n_predictors, epv, two_sided, dropout_rate, n_required, language="en"):
+    return render(
+        "logistic_regression_wald", language,
+        alpha=alpha, power=power, event_rate=event_rate, odds_ratio=odds_ratio, n_predictors=n_predictors,
+        epv=epv, two_sided=two_sided, dropout_rate=dropout_rate, n_required=n_required
     )
 
 
-def paragraph_case_control_or(alpha, power, p0, odds_ratio, control_case_ratio, two_sided, dropout_rate, n_cases, n_controls):
-    sided = "two-sided" if two_sided else "one-sided"
-    return (
-        f"Sample size was calculated for an unmatched case–control study to detect an odds ratio (OR) of {odds_ratio:g}, "
-        f"assuming an exposure prevalence among controls of p0={p0:g}. Using a {sided} test with α={alpha:.3g} and power={power:.3g}, "
-        f"and a control-to-case ratio of {control_case_ratio:g}, the required sample size was {n_cases} cases and {n_controls} controls "
-        f"after adjusting for an anticipated dropout/non-evaluable rate of {dropout_rate*100:.1f}%."
+def paragraph_conditional_power(fraction, events, observed_hr, hazard_ratio, prior_sd, cp_trend, cp_design, predictive_power, language="en"):
+    return render(
+        "conditional_power", language,
+        fraction_pct=fraction * 100, events=events, observed_hr=observed_hr, hazard_ratio=hazard_ratio,
+        prior_sd=prior_sd, cp_trend=cp_trend, cp_design=cp_design, predictive_power=predictive_power
     )
 
 
-def paragraph_cohort_rr(alpha, power, baseline_risk, risk_ratio, allocation_ratio, two_sided, dropout_rate, n1, n2):
-    sided = "two-sided" if two_sided else "one-sided"
-    return (
-        f"Sample size was calculated for a two-group comparison of risks ({sided}) with α={alpha:.3g} and power={power:.3g}. "
-        f"Assuming a baseline risk of p0={baseline_risk:g} and a target risk ratio (RR) of {risk_ratio:g}, with an allocation ratio "
-        f"of {allocation_ratio:g} (group 2 / group 1), the required sample size was {n1} in group 1 and {n2} in group 2 after adjusting "
-        f"for an anticipated dropout/non-evaluable rate of {dropout_rate*100:.1f}%."
+def paragraph_ordinal(alpha, power, control_probs, odds_ratio, allocation_ratio, dropout_rate, n1, n2, language="en"):
+    return render(
+        "ordinal", language,
+        alpha=alpha, power=power, n_categories=len(control_probs),
+        control_probs=", ".join(f"{p:.3g}" for p in control_probs), odds_ratio=odds_ratio,
+        allocation_ratio=allocation_ratio, dropout_rate=dropout_rate, n1=n1, n2=n2
     )
 
 
-def paragraph_correlation(alpha, power, r, two_sided, dropout_rate, n_required):
-    sided = "two-sided" if two_sided else "one-sided"
-    return (
-        f"Sample size was calculated to detect a correlation of r={r:g} using Fisher’s z transformation with a {sided} test, "
-        f"α={alpha:.3g}, and power={power:.3g}. The required sample size was {n_required} participants after adjusting for an anticipated "
-        f"dropout rate of {dropout_rate*100:.1f}%."
+def paragraph_stepped_wedge(alpha, power, sd, delta, icc, n_steps, cluster_size, dropout_rate, n_clusters, clusters_per_step, n_total, language="en"):
+    return render(
+        "stepped_wedge", language,
+        alpha=alpha, power=power, sd=sd, delta=delta, icc=icc, n_steps=n_steps, cluster_size=cluster_size,
+        dropout_rate=dropout_rate, n_clusters=n_clusters, clusters_per_step=clusters_per_step, n_total=n_total
     )
 
 
-def paragraph_linear_regression(alpha, power, f2, n_predictors, two_sided, dropout_rate, n_required):
-    sided = "two-sided" if two_sided else "one-sided"
-    return (
-        f"Sample size for multiple linear regression was planned using an approximate effect size approach (Cohen’s f²={f2:g}) "
-        f"with a {sided} α={alpha:.3g} and power={power:.3g}. Assuming {n_predictors} predictors in the model, the required sample size "
-        f"was {n_required} participants after adjusting for an anticipated dropout rate of {dropout_rate*100:.1f}%."
+def paragraph_cluster_parallel(alpha, power, design_effect, icc, cluster_size, cv, dropout_rate, clusters1, clusters2, n_total, language="en"):
+    return render(
+        "cluster_parallel", language,
+        alpha=alpha, power=power, design_effect=design_effect, icc=icc, cluster_size=cluster_size, cv=cv,
+        dropout_rate=dropout_rate, clusters1=clusters1, clusters2=clusters2, n_total=n_total
     )
 
 
-def paragraph_logistic_regression_epv(event_rate, n_predictors, epv, dropout_rate, n_required, required_events):
-    return (
-        f"Sample size for logistic regression was planned using an events-per-variable (EPV) approach. "
-        f"Assuming an event rate of {event_rate:g} and {n_predictors} predictors, with EPV={epv}, at least {required_events} outcome events "
-        f"and a total sample size of {n_required} participants were required after adjusting for an anticipated dropout rate of "
-        f"{dropout_rate*100:.1f}%. "
-        f"(Note: EPV is a model-stability planning rule rather than a hypothesis-testing power calculation.)"
+def paragraph_repeated_measures(alpha, power, sd, delta, n_timepoints, rho, structure, estimand, dropout_rate, n1, n2, language="en"):
+    return render(
+        "repeated_measures", language,
+        alpha=alpha, power=power, sd=sd, delta=delta, n_timepoints=n_timepoints, rho=rho,
+        structure=structure, estimand=estimand, dropout_rate=dropout_rate, n1=n1, n2=n2
     )
 
 
-def paragraph_logrank(alpha, power, hazard_ratio, allocation_ratio, event_fraction, two_sided, dropout_rate, n1, n2, n_total, required_events):
-    sided = "two-sided" if two_sided else "one-sided"
-    return (
-        f"Sample size was calculated for a log-rank test ({sided}) with α={alpha:.3g} and power={power:.3g}. "
-        f"Assuming a hazard ratio (HR) of {hazard_ratio:g} and an allocation ratio of {allocation_ratio:g} (group 2 / group 1), "
-        f"the required number of events was {required_events}. Given an expected event fraction of {event_fraction:g} during follow-up, "
-        f"the required total sample size was {n_total} participants ({n1} in group 1 and {n2} in group 2) after adjusting for an anticipated "
-        f"dropout rate of {dropout_rate*100:.1f}%."
+def paragraph_prediction_model(outcome, n_parameters, r2, shrinkage, optimism, dropout_rate, n_required, binding, language="en"):
+    return render(
+        "prediction_model", language,
+        outcome=outcome, n_parameters=n_parameters, r2=r2, shrinkage=shrinkage, optimism=optimism,
+        dropout_rate=dropout_rate, n_required=n_required, binding=binding
     )
@@ -0,0 +1,55 @@
+
+# ==========================================
+# Assurance — limiting value and large-n accuracy
+# ==========================================
+
+import numpy as np
+from scipy import integrate, stats
+
+from calculators.bayesian.assurance import calculate_assurance, calculate_assurance_sample_size
+from calculators.continuous.two_independent_means import power_two_independent_means
+
+
+PRIOR = {"delta": {"distribution": "normal", "mean": 5, "sd": 2}}
+FIXED = {"sd": 10}
+
+
+def test_limit_is_closed_form_for_normal_prior():
+    result = calculate_assurance("two_means", 0.05, 100, PRIOR, FIXED)
+    assert abs(result["assurance_limit"] - stats.norm.cdf(2.5)) < 1e-12
+
+
+def test_limit_for_lognormal_hazard_ratio():
+    prior = {"hazard_ratio": {"distribution": "lognormal", "mean": np.log(0.7), "sd": 0.15}}
+    result = calculate_assurance("logrank", 0.05, 500, prior, {"event_fraction": 0.5})
+    assert abs(result["assurance_limit"] - stats.norm.cdf(-np.log(0.7) / 0.15)) < 1e-12
+
+
+def test_target_between_quadrature_plateau_and_limit_is_reached():
+    # 0.992 lies above what a Gauss–Hermite step integral gives (0.9911)
+    result = calculate_assurance_sample_size("two_means", 0.05, 0.992, PRIOR, FIXED)
+    assert result["assurance"] >= 0.992
+
+
+def test_assurance_at_large_n_matches_adaptive_quadrature():
+    n = 10 ** 6
+
+    def integrand(d):
+        return power_two_independent_means(0.05, n, 10.0, d, 1.0, True) * stats.norm.pdf(d, 5, 2)
+
+    exact = integrate.quad(integrand, 0, 20, points=[0.01, 0.1], limit=500)[0]
+    result = calculate_assurance("two_means", 0.05, n, PRIOR, FIXED)
+
+    assert abs(result["assurance"] - exact) < 1e-3
+
+
+def test_nuisance_draws_outside_unit_interval_are_clipped():
+    priors = {
+        "difference": {"distribution": "normal", "mean": 0.15, "sd": 0.05},
+        "p2": {"distribution": "normal", "mean": 0.3, "sd": 0.05}
+    }
+    result = calculate_assurance("two_proportions", 0.05, 200, priors)
+    assert 0 < result["assurance"] < 1
+
+    sized = calculate_assurance_sample_size("two_proportions", 0.05, 0.7, priors)
+    assert sized["assurance"] >= 0.7
@@ -0,0 +1,38 @@
+
+# ==========================================
+# Cluster randomized trials — design effect inflation
+# ==========================================
+
+import pytest
+
+from calculators.cluster.cluster_randomized import (
+    calculate_cluster_two_means,
+    calculate_cluster_two_proportions,
+    design_effect
+)
+
+
+def test_design_effect_formulas():
+    # Equal sizes: 1 + (m − 1) ICC; unequal (Eldridge et al., 2006): CV² m ICC extra
+    assert design_effect(20, 0.05) == pytest.approx(1.95)
+    assert design_effect(20, 0.05, 0.5) == pytest.approx(1 + (1.25 * 20 - 1) * 0.05)
+
+
+def test_two_means_published_example():
+    # d = 0.5, 80% power, two-sided 5%: 63 per group individually;
+    # DE = 1.95 at m = 20, ICC = 0.05 → 123 per group → 7 clusters of 20
+    result = calculate_cluster_two_means(0.05, 0.8, 1.0, 0.5, 20, 0.05)
+
+    assert result["n1_individual"] == 63
+    assert result["n1_before_dropout"] == 123
+    assert result["clusters_group1"] == 7
+
+
+def test_two_proportions_published_example():
+    # 30% vs 20%, 80% power: 294 per group (Fleiss, pooled variance);
+    # DE = 1.58 at m = 30, ICC = 0.02 → 465 per group → 16 clusters of 30
+    result = calculate_cluster_two_proportions(0.05, 0.8, 0.3, 0.2, 30, 0.02)
+
+    assert result["n1_individual"] == 294
+    assert result["n1_before_dropout"] == 465
+    assert result["clusters_group1"] == 16
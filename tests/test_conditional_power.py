@@ -0,0 +1,57 @@
+
+# ==========================================
+# Conditional and predictive power — interim monitoring
+# ==========================================
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from calculators.adaptive.conditional_power import (
+    calculate_conditional_power,
+    conditional_power,
+    predictive_power
+)
+
+
+C = stats.norm.ppf(0.975)
+
+
+@pytest.mark.parametrize("z, t, drift", [(1.0, 0.5, 2.8), (2.0, 0.3, 1.5), (-0.5, 0.7, 3.0)])
+def test_conditional_power_matches_brownian_motion(z, t, drift):
+    # Z_final = √t Z_t + √(1 − t) Z_rest, Z_rest ~ N(θ √(1 − t), 1)
+    rng = np.random.default_rng(1982)
+    rest = drift * np.sqrt(1 - t) + rng.standard_normal(10 ** 6)
+    simulated = (np.sqrt(t) * z + np.sqrt(1 - t) * rest > C).mean()
+
+    assert conditional_power(z, t, C, drift) == pytest.approx(simulated, abs=2e-3)
+
+
+@pytest.mark.parametrize("z, t", [(1.0, 0.5), (2.2, 0.25), (0.3, 0.8)])
+def test_flat_prior_predictive_power(z, t):
+    # Spiegelhalter, Freedman & Blackburn (1986): Φ((z − c √t) / √(1 − t))
+    expected = stats.norm.cdf((z - C * np.sqrt(t)) / np.sqrt(1 - t))
+    assert predictive_power(z, t, C) == pytest.approx(expected, abs=1e-12)
+
+
+def test_predictive_power_averages_conditional_power_over_posterior():
+    z, t, prior_mean, prior_sd = 1.2, 0.4, 2.0, 1.0
+
+    precision = 1 / prior_sd ** 2 + t
+    posterior_mean = (prior_mean / prior_sd ** 2 + z * np.sqrt(t)) / precision
+
+    rng = np.random.default_rng(1986)
+    drift = posterior_mean + rng.standard_normal(10 ** 6) / np.sqrt(precision)
+
+    expected = conditional_power(z, t, C, drift).mean()
+    assert predictive_power(z, t, C, prior_mean, prior_sd) == pytest.approx(expected, abs=2e-3)
+
+
+def test_design_drift_gives_planned_power_at_start():
+    # At t → 0 with z = 0, conditional power under the design effect is
+    # the planned power (n = 63 per group for d = 0.5)
+    result = calculate_conditional_power(
+        "two_means", 0.05, 0.8, {"delta": 0.5, "sd": 1.0}, 1e-9, z_interim=0.0
+    )
+    assert result["n_group1"] == 63
+    assert result["conditional_power"]["design"] == pytest.approx(0.8, abs=3e-3)
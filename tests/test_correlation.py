@@ -0,0 +1,24 @@
+
+# ==========================================
+# Correlation — exact-method sample size search
+# ==========================================
+
+import numpy as np
+import pytest
+
+from calculators.association.correlation import power_correlation, solve_correlation_n
+
+
+@pytest.mark.parametrize("r, rho0", [(0.3, 0.0), (0.95, 0.9), (-0.2, 0.1), (0.6, 0.5)])
+def test_exact_n_is_smallest_reaching_power(r, rho0):
+    n = int(solve_correlation_n(0.05, 0.8, r, rho0))
+
+    assert power_correlation(0.05, n, r, rho0, True, "exact") >= 0.8
+    assert power_correlation(0.05, n - 1, r, rho0, True, "exact") < 0.8
+
+
+def test_unreachable_target_returns_minus_one():
+    n = solve_correlation_n(0.05, 0.8, np.array([0.1, 0.9]), 0.0, max_n=50)
+
+    assert n[0] == -1
+    assert n[1] > 0
@@ -0,0 +1,49 @@
+
+# ==========================================
+# Import-time regression test — closed-form calculators
+# ==========================================
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Modules whose closed-form calculators must load with the standard
+# library only; numpy / scipy / statsmodels are imported inside the
+# vectorized, exact and regression functions.
+CLOSED_FORM = (
+    "calculators",
+    "utils.stat_utils",
+    "utils.normal_quantile",
+    "calculators.continuous.one_sample_mean",
+    "calculators.continuous.paired_mean",
+    "calculators.continuous.two_independent_means",
+    "calculators.continuous.anova_oneway",
+    "calculators.binary.one_proportion",
+    "calculators.binary.two_proportions",
+    "calculators.binary.case_control_or",
+    "calculators.binary.cohort_rr",
+    "calculators.association.correlation",
+    "calculators.association.logistic_regression",
+    "calculators.ordinal.proportional_odds",
+    "calculators.survival.logrank"
+)
+
+HEAVY = ("numpy", "scipy", "statsmodels")
+
+
+@pytest.mark.parametrize("module", CLOSED_FORM)
+def test_closed_form_import_is_standard_library_only(module):
+    code = (
+        f"import sys, {module}\n"
+        f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == "", f"{module} imports {out.stdout.strip()}"
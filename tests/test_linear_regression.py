@@ -0,0 +1,32 @@
+
+# ==========================================
+# Linear regression — exact noncentral F power
+# ==========================================
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from calculators.association.linear_regression import (
+    calculate_linear_regression,
+    power_linear_regression
+)
+
+
+def test_gpower_published_example():
+    # G*Power, fixed-model R² deviation from zero: f² = 0.15, five
+    # predictors, α = 0.05, 80% power → N = 92
+    assert calculate_linear_regression(0.05, 0.8, 0.15, 5)["n_required"] == 92
+
+
+@pytest.mark.parametrize("n, f2, p, q", [(92, 0.15, 5, 5), (200, 0.05, 8, 2), (40, 0.35, 3, 1)])
+def test_power_matches_noncentral_f(n, f2, p, q):
+    df2 = n - p - 1
+    expected = stats.ncf.sf(stats.f.isf(0.05, q, df2), q, df2, f2 * n)
+    assert power_linear_regression(0.05, n, f2, p, q) == pytest.approx(expected, abs=1e-10)
+
+
+def test_required_n_is_minimal():
+    n = calculate_linear_regression(0.05, 0.8, 0.02, 10, n_tested=3)["n_required"]
+    power = power_linear_regression(0.05, np.array([n - 1, n]), 0.02, 10, 3)
+    assert power[0] < 0.8 <= power[1]
@@ -0,0 +1,53 @@
+
+# ==========================================
+# Log-rank — events and simulated power
+# ==========================================
+
+import numpy as np
+import pytest
+
+from calculators.survival.logrank import _control_hazard, calculate_logrank
+
+
+def _simulated_power(result, hazard_ratio, r, event_fraction, sims=4000):
+    # Exponential survival, administrative censoring at unit follow-up,
+    # two-sided log-rank test at 5%
+    n1, n2 = result["n_group1"], result["n_group2"]
+    lam1 = float(_control_hazard(hazard_ratio, 1 / (1 + r), r / (1 + r), event_fraction))
+
+    rng = np.random.default_rng(1983)
+    t = np.concatenate([
+        rng.exponential(1 / lam1, (sims, n1)),
+        rng.exponential(1 / (hazard_ratio * lam1), (sims, n2))
+    ], axis=1)
+    group = np.concatenate([np.zeros(n1), np.ones(n2)])
+
+    order = np.argsort(t, axis=1)
+    g = group[order]
+    event = np.take_along_axis(t, order, axis=1) < 1
+
+    at_risk = n1 + n2 - np.arange(n1 + n2)
+    at_risk2 = n2 - np.cumsum(g, axis=1) + g
+
+    observed = (event * g).sum(axis=1)
+    expected = (event * at_risk2 / at_risk).sum(axis=1)
+    variance = (event * at_risk2 * (at_risk - at_risk2) / at_risk ** 2).sum(axis=1)
+
+    return (np.abs(observed - expected) / np.sqrt(variance) > 1.959964).mean()
+
+
+def test_schoenfeld_published_events():
+    # HR 0.7, 80% power, two-sided 5%, 1:1 → 247 events
+    assert calculate_logrank(0.05, 0.8, 0.7)["required_events"] == 247
+
+
+@pytest.mark.parametrize("method", ["schoenfeld", "freedman", "lachin_foulkes", "lakatos"])
+def test_equal_allocation_power_matches_simulation(method):
+    result = calculate_logrank(0.05, 0.8, 0.6, 1.0, 0.5, method=method)
+    assert abs(_simulated_power(result, 0.6, 1.0, 0.5) - 0.8) < 0.025
+
+
+@pytest.mark.parametrize("r", [0.5, 2.0])
+def test_lachin_foulkes_handles_unequal_allocation(r):
+    result = calculate_logrank(0.05, 0.8, 0.7, r, 0.3, method="lachin_foulkes")
+    assert abs(_simulated_power(result, 0.7, r, 0.3) - 0.8) < 0.02
@@ -0,0 +1,59 @@
+
+# ==========================================
+# Non-inferiority and equivalence — reference values
+# ==========================================
+
+import numpy as np
+import pytest
+from scipy import integrate, stats
+
+from calculators.binary.two_proportions import calculate_two_proportions
+from calculators.continuous.two_independent_means import (
+    calculate_two_independent_means,
+    power_two_means_tost
+)
+
+
+def test_means_non_inferiority_chow_example():
+    # Chow, Shao & Wang (2008), §3.2: σ = 0.1, margin 0.05, no true
+    # difference, one-sided α = 0.05, 80% power → n ≈ 50 per group
+    result = calculate_two_independent_means(
+        0.05, 0.8, 0.1, 0.0, two_sided=False, hypothesis="non_inferiority", margin=0.05
+    )
+    assert result["n_group1"] == 50
+
+
+def test_means_equivalence_chow_example():
+    # Same setting for equivalence: 2(z_α + z_β/2)² σ² / δ² → n ≈ 69
+    result = calculate_two_independent_means(
+        0.05, 0.8, 0.1, 0.0, two_sided=False, hypothesis="equivalence",
+        margin=0.05, exact=False
+    )
+    assert result["n_group1"] == 69
+
+
+def test_proportions_non_inferiority_chow_example():
+    # Chow, Shao & Wang (2008), §4.2: p1 = 0.85, p2 = 0.65, margin 0.1,
+    # one-sided α = 0.05, 80% power → n ≈ 25 per group
+    result = calculate_two_proportions(
+        0.05, 0.8, 0.85, 0.65, two_sided=False, hypothesis="non_inferiority", margin=0.1
+    )
+    assert result["n_group1"] == 25
+
+
+@pytest.mark.parametrize("n, delta, margin", [(20, 0.0, 0.8), (35, 0.2, 0.6), (12, -0.3, 1.2)])
+def test_exact_tost_power_matches_adaptive_quadrature(n, delta, margin):
+    df = 2 * n - 2
+    s_d = np.sqrt(2 / n)
+    t_c = stats.t.ppf(0.95, df)
+
+    # Integrate over the pooled-SD ratio u = s / σ, with (df) u² ~ χ²(df)
+    def integrand(u):
+        inner = (stats.norm.cdf((margin - delta) / s_d - t_c * u)
+                 - stats.norm.cdf((-margin - delta) / s_d + t_c * u))
+        return max(inner, 0.0) * 2 * df * u * stats.chi2.pdf(df * u ** 2, df)
+
+    exact = integrate.quad(integrand, 0, margin / (t_c * s_d), limit=200)[0]
+    power = power_two_means_tost(0.05, n, 1.0, delta, margin, 1.0, two_sided=False)
+
+    assert power == pytest.approx(exact, abs=1e-8)
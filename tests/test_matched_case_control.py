@@ -0,0 +1,50 @@
+
+# ==========================================
+# Matched case-control — Dupont (1988) sample size
+# ==========================================
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from calculators.binary.matched_case_control import (
+    calculate_matched_case_control,
+    conditional_exposure
+)
+
+
+@pytest.mark.parametrize("p0, odds_ratio", [(0.3, 2.0), (0.1, 3.0), (0.5, 0.5)])
+def test_pairs_without_correlation_match_schlesselman(p0, odds_ratio):
+    # M = 1, φ = 0: Schlesselman (1982) matched-pairs formula
+    # n = [z_α/2 / 2 + z_β √(P(1 − P))]² / ((P − 1/2)² p_d), P = ψ / (1 + ψ)
+    p1 = odds_ratio * p0 / (1 + p0 * (odds_ratio - 1))
+    p_d = p1 * (1 - p0) + p0 * (1 - p1)
+    P = odds_ratio / (1 + odds_ratio)
+
+    n = (stats.norm.ppf(0.975) / 2 + stats.norm.ppf(0.8) * np.sqrt(P * (1 - P))) ** 2
+    n /= (P - 0.5) ** 2 * p_d
+
+    result = calculate_matched_case_control(0.05, 0.8, p0, odds_ratio)
+    assert result["n_cases"] == int(np.ceil(n))
+
+
+@pytest.mark.parametrize("p0, odds_ratio, M", [(0.3, 2.0, 3), (0.1, 3.0, 2)])
+def test_power_at_required_n_matches_simulation(p0, odds_ratio, M):
+    # Score (conditional logistic) test on simulated 1:M matched sets;
+    # with φ = 0 the within-set odds ratio equals ψ
+    phi = 0.0
+    n = calculate_matched_case_control(0.05, 0.8, p0, odds_ratio, M, phi)["n_cases"]
+
+    p1, p_plus, p_minus = (float(x) for x in conditional_exposure(p0, odds_ratio, phi))
+
+    rng = np.random.default_rng(1988)
+    sims = 20000
+    case = rng.random((sims, n)) < p1
+    controls = rng.binomial(M, np.where(case, p_plus, p_minus))
+    m = case + controls
+
+    score = (case - m / (M + 1)).sum(axis=1)
+    variance = (m * (M + 1 - m) / (M + 1) ** 2).sum(axis=1)
+    z = score / np.sqrt(variance)
+
+    assert abs((np.abs(z) > stats.norm.ppf(0.975)).mean() - 0.8) < 0.015
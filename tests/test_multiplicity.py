@@ -0,0 +1,44 @@
+
+# ==========================================
+# Multiplicity — Dunnett and co-primary endpoints
+# ==========================================
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from utils.multiplicity import (
+    coprimary_marginal_power,
+    dunnett_critical_value,
+    equicorrelated,
+    mvn_probability
+)
+
+
+@pytest.mark.parametrize("k, two_sided, table", [
+    (2, True, 2.212), (3, True, 2.349), (4, True, 2.442),
+    (2, False, 1.916), (3, False, 2.062), (4, False, 2.160)
+])
+def test_dunnett_matches_published_table(k, two_sided, table):
+    # Dunnett (1955, 1964) tables, infinite df, α = 0.05, equal allocation
+    assert dunnett_critical_value(0.05, k, 0.5, two_sided) == pytest.approx(table, abs=5e-4)
+
+
+def test_independent_coprimary_endpoints():
+    # Independent endpoints: each needs power √0.8 (Sozu et al., 2010)
+    assert coprimary_marginal_power(0.8, 2, 0.0) == pytest.approx(np.sqrt(0.8), abs=1e-6)
+
+
+@pytest.mark.parametrize("rho", [0.3, 0.5, 0.8])
+def test_coprimary_joint_power_matches_scipy(rho):
+    marginal = coprimary_marginal_power(0.8, 3, rho)
+    z = stats.norm.ppf(marginal)
+    joint = stats.multivariate_normal(np.zeros(3), equicorrelated(3, rho)).cdf(np.full(3, z))
+    assert joint == pytest.approx(0.8, abs=1e-4)
+
+
+def test_mvn_probability_matches_scipy():
+    R = np.array([[1.0, 0.4, 0.2], [0.4, 1.0, 0.6], [0.2, 0.6, 1.0]])
+    upper = np.array([0.5, 1.2, -0.3])
+    expected = stats.multivariate_normal(np.zeros(3), R).cdf(upper)
+    assert mvn_probability(np.full(3, -np.inf), upper, R) == pytest.approx(expected, abs=1e-4)
@@ -0,0 +1,64 @@
+
+# ==========================================
+# AS241 inverse normal — accuracy against scipy
+# ==========================================
+
+import numpy as np
+import pytest
+from scipy.special import ndtri
+
+from utils.normal_quantile import ndtri_array, ndtri_scalar, norm_ppf
+
+
+TOLERANCE = 1e-12
+
+
+def _probabilities():
+    # Log-spaced lower tail, a dense centre and the mirrored upper tail
+    # down to 1 − 1e-16
+    lower = np.logspace(-300, np.log10(0.5), 4000)
+    centre = np.linspace(0.01, 0.99, 4001)
+    upper = 1 - np.logspace(-16, np.log10(0.5), 4000)
+    return np.concatenate([lower, centre, upper])
+
+
+def _error(z, exact):
+    # Relative error for |z| ≥ 1, absolute near zero
+    return np.abs(z - exact) / np.maximum(np.abs(exact), 1.0)
+
+
+def test_array_form_matches_scipy():
+    p = _probabilities()
+    assert _error(ndtri_array(p), ndtri(p)).max() < TOLERANCE
+
+
+def test_scalar_form_matches_scipy():
+    p = _probabilities()[::10]
+    z = np.array([ndtri_scalar(float(x)) for x in p])
+    assert _error(z, ndtri(p)).max() < TOLERANCE
+
+
+def test_scalar_and_array_forms_agree():
+    p = _probabilities()[::10]
+    z = np.array([ndtri_scalar(float(x)) for x in p])
+    assert np.array_equal(z, ndtri_array(p))
+
+
+def test_edges():
+    assert ndtri_scalar(0.0) == -np.inf
+    assert ndtri_scalar(1.0) == np.inf
+    assert ndtri_scalar(0.5) == 0.0
+
+    with pytest.raises(ValueError):
+        ndtri_scalar(1.5)
+
+
+def test_default_method_does_not_depend_on_imports():
+    # scipy is loaded in this process; the default is still AS241
+    for p in (0.975, 0.8, 1e-10):
+        assert norm_ppf(p) == ndtri_scalar(p)
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        norm_ppf(0.975, method="table")
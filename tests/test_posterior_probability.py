@@ -0,0 +1,64 @@
+
+# ==========================================
+# Bayesian two proportions — decision boundary sweep
+# ==========================================
+
+import numpy as np
+import pytest
+from scipy import integrate, stats
+
+from calculators.bayesian import posterior_probability
+from calculators.bayesian.posterior_probability import _boundary, posterior_prob_greater
+
+
+JEFFREYS = (0.5, 0.5)
+
+
+@pytest.mark.parametrize("n1, n2, prior, threshold", [
+    (30, 30, (1.0, 1.0), 0.975),
+    (40, 20, (0.5, 0.5), 0.9),
+    (15, 45, (1.0, 1.0), 0.99),
+    (5, 3, (1.0, 1.0), 0.999)
+])
+def test_boundary_matches_brute_force(n1, n2, prior, threshold):
+    x1, x2 = np.meshgrid(np.arange(n1 + 1), np.arange(n2 + 1))
+    success = posterior_prob_greater(x1, n1, x2, n2, prior, prior) > threshold
+    expected = np.where(success.any(axis=1), success.argmax(axis=1), n1 + 1)
+
+    assert np.array_equal(_boundary(n1, n2, prior, prior, threshold), expected)
+
+
+def test_boundary_evaluations_are_linear(monkeypatch):
+    calls = []
+
+    def counting(*args):
+        calls.append(1)
+        return posterior_prob_greater(*args)
+
+    monkeypatch.setattr(posterior_probability, "posterior_prob_greater", counting)
+    _boundary.cache_clear()
+
+    n1, n2 = 400, 300
+    _boundary(n1, n2, (1.0, 1.0), (1.0, 1.0), 0.975)
+
+    assert len(calls) <= n1 + n2 + 2
+
+
+@pytest.mark.parametrize("x, n", [(0, 20), (20, 20), (3, 7)])
+def test_identical_groups_are_even(x, n):
+    assert abs(posterior_prob_greater(x, n, x, n, JEFFREYS, JEFFREYS) - 0.5) < 1e-9
+
+
+@pytest.mark.parametrize("x1, n1, x2, n2, prior", [
+    (5, 40, 0, 40, JEFFREYS),
+    (1, 300, 0, 300, JEFFREYS),
+    (12, 15, 15, 15, JEFFREYS),
+    (3, 50, 1, 50, (0.2, 0.3)),
+    (30, 100, 20, 100, (1.0, 1.0))
+])
+def test_posterior_matches_adaptive_quadrature(x1, n1, x2, n2, prior):
+    post1 = stats.beta(prior[0] + x1, prior[1] + n1 - x1)
+    post2 = stats.beta(prior[0] + x2, prior[1] + n2 - x2)
+    exact = integrate.quad(lambda y: post2.pdf(y) * post1.sf(y), 0, 1, limit=500, epsabs=1e-13)[0]
+
+    assert abs(posterior_prob_greater(x1, n1, x2, n2, prior, prior) - exact) < 1e-6
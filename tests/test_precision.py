@@ -0,0 +1,63 @@
+
+# ==========================================
+# Precision-based sample size — confidence interval half-width
+# ==========================================
+
+import numpy as np
+import pytest
+from scipy import stats
+from statsmodels.stats.proportion import proportion_confint
+
+from calculators.association.correlation import calculate_correlation_precision
+from calculators.binary.one_proportion import calculate_one_proportion_precision
+from calculators.continuous.one_sample_mean import calculate_one_sample_mean_precision
+
+
+def _expected_half_width(n, p, method):
+    # Average half-width of the statsmodels interval over all outcomes
+    x = np.arange(n + 1)
+    lower, upper = proportion_confint(x, n, alpha=0.05, method=method)
+    return stats.binom.pmf(x, n, p) @ ((upper - lower) / 2)
+
+
+def test_wald_published_example():
+    # ±5% around 50% at 95% confidence: 1.96² × 0.25 / 0.05² = 384.2 → 385
+    assert calculate_one_proportion_precision(0.05, 0.5, 0.05, method="wald")["n_required"] == 385
+
+
+@pytest.mark.parametrize("method, statsmodels_method, p, d", [
+    ("wilson", "wilson", 0.5, 0.05),
+    ("wilson", "wilson", 0.1, 0.03),
+    ("clopper_pearson", "beta", 0.5, 0.05),
+    ("clopper_pearson", "beta", 0.15, 0.04)
+])
+def test_exact_interval_n_is_minimal(method, statsmodels_method, p, d):
+    n = calculate_one_proportion_precision(0.05, p, d, method=method)["n_required"]
+
+    assert _expected_half_width(n, p, statsmodels_method) <= d
+    assert _expected_half_width(n - 1, p, statsmodels_method) > d
+
+
+def test_mean_with_known_sd():
+    # (1.96 × 1 / 0.2)² = 96.04 → 97
+    assert calculate_one_sample_mean_precision(0.05, 1.0, 0.2, known_sd=True)["n_required"] == 97
+
+
+def test_mean_assurance_matches_chi_square():
+    # P(t S / √n ≤ d) = P(χ²(n − 1) ≤ (n − 1) n d² / (t² σ²))
+    def assurance(n):
+        t = stats.t.ppf(0.975, n - 1)
+        return stats.chi2.cdf((n - 1) * n * 0.2 ** 2 / t ** 2, n - 1)
+
+    n = calculate_one_sample_mean_precision(0.05, 1.0, 0.2, assurance=0.9)["n_required"]
+    assert assurance(n) >= 0.9 > assurance(n - 1)
+
+
+def test_correlation_fisher_interval():
+    n = calculate_correlation_precision(0.05, 0.5, 0.1)["n_required"]
+
+    def half_width(n):
+        z, se = np.arctanh(0.5), stats.norm.ppf(0.975) / np.sqrt(n - 3)
+        return (np.tanh(z + se) - np.tanh(z - se)) / 2
+
+    assert half_width(n) <= 0.1 < half_width(n - 1)
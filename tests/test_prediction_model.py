@@ -0,0 +1,37 @@
+
+# ==========================================
+# Prediction model — Riley minimum sample size
+# ==========================================
+
+import pytest
+
+from calculators.association.prediction_model import calculate_prediction_model
+
+
+def test_binary_published_example():
+    # Riley et al. (BMJ 2020) / pmsampsize: 24 parameters, prevalence
+    # 0.174, R²_CS = 0.288 → criteria 623, 662, 221; n = 662
+    result = calculate_prediction_model("binary", 24, 0.288, prevalence=0.174)
+
+    assert result["criteria"] == [623, 662, 221]
+    assert result["n_required"] == 662
+    assert result["epp"] == pytest.approx(662 * 0.174 / 24)
+
+
+def test_survival_published_example():
+    # pmsampsize: 30 parameters, R²_CS = 0.051, rate 0.065, mean
+    # follow-up 2.07, horizon 2 → criteria 5143, 1039, 158; n = 5143
+    result = calculate_prediction_model(
+        "survival", 30, 0.051, rate=0.065, mean_followup=2.07, timepoint=2
+    )
+
+    assert result["criteria"] == [5143, 1039, 158]
+    assert result["n_required"] == 5143
+
+
+def test_nagelkerke_is_converted_with_max_r2():
+    cs = calculate_prediction_model("binary", 10, 0.1, prevalence=0.2)
+    nagelkerke = calculate_prediction_model(
+        "binary", 10, r2_nagelkerke=0.1 / cs["max_r2_cs"], prevalence=0.2
+    )
+    assert nagelkerke["n_required"] == cs["n_required"]
@@ -0,0 +1,56 @@
+
+# ==========================================
+# Ordinal outcome — score test simulation
+# ==========================================
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from calculators.ordinal.proportional_odds import (
+    calculate_ordinal_whitehead,
+    simulate_ordinal_power
+)
+
+
+PROBS = [0.2, 0.3, 0.3, 0.2]
+
+
+def test_two_sided_simulation_counts_both_tails():
+    # Near the null the two-sided size is alpha, not alpha / 2
+    sim = simulate_ordinal_power(0.05, 100, PROBS, 1.0001, n_sims=40000)
+    assert abs(sim["power"] - 0.05) < 0.005
+
+
+def test_one_sided_simulation_counts_the_favoured_tail():
+    sim = simulate_ordinal_power(0.05, 100, PROBS, 1.0001, two_sided=False, n_sims=40000)
+    assert abs(sim["power"] - 0.05) < 0.005
+
+
+def test_simulation_rejects_null_odds_ratio():
+    with pytest.raises(ValueError):
+        simulate_ordinal_power(0.05, 100, PROBS, 1.0)
+
+
+def test_two_categories_reduce_to_log_odds_ratio_formula():
+    # 1 − Σ p̄³ = 3 p̄ q̄ for two categories, so Whitehead (1993) gives
+    # N = (1 + r)² (z_α + z_β)² / (r ln(OR)² p̄ q̄)
+    p2, odds_ratio, r = 0.3, 2.5, 1.5
+    p1 = odds_ratio * p2 / (1 - p2 + odds_ratio * p2)
+    p_bar = (p1 + r * p2) / (1 + r)
+
+    z = stats.norm.ppf(0.975) + stats.norm.ppf(0.8)
+    N = (1 + r) ** 2 * z ** 2 / (r * np.log(odds_ratio) ** 2 * p_bar * (1 - p_bar))
+
+    result = calculate_ordinal_whitehead(0.05, 0.8, [p2, 1 - p2], odds_ratio, r)
+    assert result["n1_before_dropout"] == int(np.ceil(N / (1 + r)))
+
+
+@pytest.mark.parametrize("probs, odds_ratio", [
+    (PROBS, 2.0),
+    ([0.1, 0.15, 0.15, 0.2, 0.15, 0.1, 0.15], 1.5)
+])
+def test_whitehead_n_reaches_simulated_power(probs, odds_ratio):
+    n = calculate_ordinal_whitehead(0.05, 0.8, probs, odds_ratio)["n1_before_dropout"]
+    sim = simulate_ordinal_power(0.05, n, probs, odds_ratio, n_sims=20000)
+    assert abs(sim["power"] - 0.8) < 0.015
@@ -0,0 +1,46 @@
+
+# ==========================================
+# Count outcomes — Poisson and negative binomial rate ratio
+# ==========================================
+
+import numpy as np
+import pytest
+from scipy import integrate, stats
+
+from calculators.count.rate_ratio import (
+    calculate_negative_binomial_rate_ratio,
+    calculate_poisson_rate_ratio,
+    expected_information,
+    simulate_rate_ratio_power
+)
+
+
+def test_poisson_closed_form():
+    # Fixed exposure t: n = (z_α + z_β)² (1/λ1 + 1/λ2) / (t ln(λ1/λ2)²)
+    rate1, rate2, t = 0.6, 0.8, 1.5
+    z = stats.norm.ppf(0.975) + stats.norm.ppf(0.8)
+    n = z ** 2 * (1 / rate1 + 1 / rate2) / (t * np.log(rate1 / rate2) ** 2)
+
+    assert calculate_poisson_rate_ratio(0.05, 0.8, rate1, rate2, t)["n_group1"] == int(np.ceil(n))
+
+
+def test_negative_binomial_keene_closed_form():
+    # Keene et al. (2007): n = (z_α + z_β)² (1/(λ1 t) + 1/(λ2 t) + 2k) / ln(RR)²
+    rate1, rate2, k, t = 0.6, 0.8, 0.5, 1.0
+    z = stats.norm.ppf(0.975) + stats.norm.ppf(0.8)
+    n = z ** 2 * (1 / (rate1 * t) + 1 / (rate2 * t) + 2 * k) / np.log(rate1 / rate2) ** 2
+
+    result = calculate_negative_binomial_rate_ratio(0.05, 0.8, rate1, rate2, k, t)
+    assert result["n_group1"] == int(np.ceil(n))
+
+
+def test_uniform_follow_up_information_matches_quadrature():
+    rate, k, a, b = 1.3, 0.7, 0.5, 2.0
+    exact = integrate.quad(lambda t: t / (1 + k * rate * t), a, b)[0] / (b - a)
+    assert expected_information(rate, k, b, a) == pytest.approx(exact, rel=1e-12)
+
+
+def test_required_n_reaches_simulated_power():
+    n = calculate_negative_binomial_rate_ratio(0.05, 0.8, 1.0, 2.0, 0.5, 1.0, min_follow_up=0.5)["n_group1"]
+    sim = simulate_rate_ratio_power(0.05, n, 1.0, 2.0, 0.5, 1.0, min_follow_up=0.5, n_sims=4000)
+    assert abs(sim["power"] - 0.8) < 0.03
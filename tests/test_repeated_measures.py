@@ -0,0 +1,96 @@
+
+# ==========================================
+# Repeated measures — input validation
+# ==========================================
+
+import numpy as np
+import pytest
+
+from calculators.continuous.repeated_measures import (
+    calculate_repeated_measures,
+    repeated_measures_grid
+)
+
+
+BASE = (0.05, 0.8, 1.0, 0.5)
+
+
+def test_cs_rejects_rho_below_positive_definite_bound():
+    with pytest.raises(ValueError, match="1/\\(k−1\\)"):
+        calculate_repeated_measures(*BASE, 4, rho=-0.6, structure="cs", estimand="mean")
+
+
+def test_cs_just_above_bound_is_accepted():
+    result = calculate_repeated_measures(*BASE, 4, rho=-0.3, structure="cs", estimand="mean")
+    assert result["n_group1"] > 0
+
+
+@pytest.mark.parametrize("corr_matrix, message", [
+    ([[1.0, 0.5, 0.2], [0.4, 1.0, 0.5], [0.2, 0.5, 1.0]], "symmetric"),
+    ([[1.0, 0.9, -0.9], [0.9, 1.0, 0.9], [-0.9, 0.9, 1.0]], "positive definite"),
+    ([[2.0, 0.5, 0.2], [0.5, 1.0, 0.5], [0.2, 0.5, 1.0]], "unit diagonal")
+])
+def test_unstructured_matrix_must_be_a_correlation_matrix(corr_matrix, message):
+    with pytest.raises(ValueError, match=message):
+        calculate_repeated_measures(
+            *BASE, 3, structure="unstructured", corr_matrix=corr_matrix
+        )
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"times": [0, 1, 2]},
+    {"times": [0, 1, 2, 3, 4]},
+    {"estimand": "contrast", "contrast": [-1, 0, 1]},
+    {"estimand": "contrast", "contrast": [-1, 0, 0, 0, 1]}
+])
+def test_times_and_contrast_must_have_k_entries(kwargs):
+    with pytest.raises(ValueError, match="entries|entry"):
+        calculate_repeated_measures(*BASE, 4, **kwargs)
+
+
+def test_zero_contrast_is_rejected():
+    with pytest.raises(ValueError, match="Variance factor"):
+        calculate_repeated_measures(*BASE, 3, estimand="contrast", contrast=[0, 0, 0])
+
+
+def test_grid_applies_the_same_guards():
+    with pytest.raises(ValueError, match="1/\\(k−1\\)"):
+        repeated_measures_grid(*BASE, np.array([0.2, -0.4]), 4, estimand="mean")
+
+    with pytest.raises(ValueError, match="entries"):
+        repeated_measures_grid(*BASE, 0.5, np.array([3, 5]), times=[0, 1, 2])
+
+    with pytest.raises(ValueError, match="entry"):
+        repeated_measures_grid(
+            *BASE, 0.5, np.array([3, 4]), estimand="contrast", contrast=[-1, 0, 1]
+        )
+
+
+def test_grid_matches_scalar_calculation():
+    rhos = np.array([0.2, 0.5, 0.8])
+    ks = np.array([3, 5])
+    grid = repeated_measures_grid(*BASE, rhos[:, None], ks[None, :], structure="ar1")
+
+    for i, rho in enumerate(rhos):
+        for j, k in enumerate(ks):
+            single = calculate_repeated_measures(*BASE, int(k), rho=rho, structure="ar1")
+            assert grid["n_group1"][i, j] == single["n_group1"]
+
+
+@pytest.mark.parametrize("k, rho", [(3, 0.2), (4, 0.5), (6, 0.8)])
+def test_compound_symmetry_matches_diggle_formulas(k, rho):
+    # Diggle et al. (2002), §2.4: per-subject variance factor
+    # time-averaged mean (1 + (k − 1) ρ) / k, slope (1 − ρ) / Σ(t − t̄)²
+    t = np.arange(k)
+
+    mean = calculate_repeated_measures(*BASE, k, rho=rho, estimand="mean")
+    slope = calculate_repeated_measures(*BASE, k, rho=rho, estimand="slope")
+
+    assert mean["variance_factor"] == pytest.approx((1 + (k - 1) * rho) / k)
+    assert slope["variance_factor"] == pytest.approx((1 - rho) / ((t - t.mean()) ** 2).sum())
+
+
+def test_time_averaged_mean_sample_size():
+    # n = 2 (z_α + z_β)² σ² (1 + (k − 1) ρ) / (k d²) = 39.2 for k = 4, ρ = 0.5, d = 0.5
+    result = calculate_repeated_measures(*BASE, 4, rho=0.5, estimand="mean")
+    assert result["n_group1"] == 40
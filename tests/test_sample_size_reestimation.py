@@ -0,0 +1,36 @@
+
+# ==========================================
+# Promising-zone re-estimation — operating characteristics
+# ==========================================
+
+import pytest
+
+from calculators.adaptive.sample_size_reestimation import (
+    promising_zone_lower_bound,
+    simulate_sample_size_reestimation
+)
+
+
+PARAMS = {"delta": 2.0, "sd": 7.5}
+
+
+def test_mehta_pocock_published_lower_bound():
+    # Mehta & Pocock (2011), schizophrenia example: 221 per group
+    # planned, interim at 104, at most 442 → promising zone from CP ≈ 0.365
+    assert promising_zone_lower_bound(104, 221, 442, 0.025, 0.8) == pytest.approx(0.365, abs=0.01)
+
+
+@pytest.mark.parametrize("rule", ["chw", "mehta_pocock"])
+def test_type_i_error_is_preserved(rule):
+    result = simulate_sample_size_reestimation(
+        "two_means", 0.025, PARAMS, 221, 104, 442, rule=rule, target_cp=0.8, n_sims=2 * 10 ** 6
+    )
+    assert result["type_i_error"] <= 0.025 + 3e-4
+
+
+def test_without_increase_power_matches_fixed_design():
+    result = simulate_sample_size_reestimation(
+        "two_means", 0.025, PARAMS, 221, 104, 221, rule="chw", target_cp=0.8, n_sims=2 * 10 ** 6
+    )
+    assert result["expected_n_before_dropout_group1"] == 221
+    assert result["power"] == pytest.approx(result["fixed_power"], abs=1.5e-3)
@@ -0,0 +1,37 @@
+
+# ==========================================
+# Phase II designs — Simon (1989) and A'Hern (2001) tables
+# ==========================================
+
+import pytest
+
+from calculators.binary.simon_two_stage import (
+    calculate_ahern_single_stage,
+    calculate_simon_two_stage
+)
+
+
+@pytest.mark.parametrize("p0, p1, optimal, minimax", [
+    # (r1, n1, r, n) from Simon (1989), Table 1, α = 0.05, β = 0.2
+    (0.1, 0.3, (1, 10, 5, 29), (1, 15, 5, 25)),
+    (0.2, 0.4, (3, 13, 12, 43), (4, 18, 10, 33))
+])
+def test_simon_published_designs(p0, p1, optimal, minimax):
+    result = calculate_simon_two_stage(0.05, 0.8, p0, p1)
+
+    for name, expected in (("optimal", optimal), ("minimax", minimax)):
+        design = result[name]
+        assert (design["r1"], design["n1"], design["r"], design["n"]) == expected
+        assert design["alpha_actual"] <= 0.05
+        assert design["power_actual"] >= 0.8
+
+
+def test_simon_optimal_expected_size():
+    # Simon (1989): EN(p0) = 15.0 for the 1/10, 5/29 design
+    assert calculate_simon_two_stage(0.05, 0.8, 0.1, 0.3)["optimal"]["en0"] == pytest.approx(15.01, abs=0.01)
+
+
+def test_ahern_published_design():
+    # A'Hern (2001): p0 = 0.1, p1 = 0.3 → n = 25, promising with ≥ 6 responses
+    result = calculate_ahern_single_stage(0.05, 0.8, 0.1, 0.3)
+    assert (result["n_required"], result["r"] + 1) == (25, 6)
@@ -0,0 +1,70 @@
+
+# ==========================================
+# Stepped-wedge cluster trial — cluster search
+# ==========================================
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from calculators.cluster.stepped_wedge import calculate_stepped_wedge, power_stepped_wedge
+
+
+@pytest.mark.parametrize("args", [
+    (0.05, 0.8, 1.0, 0.3, 10, 0.05, 4),
+    (0.05, 0.9, 1.0, 0.05, 5, 0.2, 3),
+    (0.05, 0.8, 2.0, 0.5, 20, 0.01, 6, 2)
+])
+def test_search_finds_smallest_clusters_per_step(args):
+    alpha, power, sd, delta, m, icc, steps, *baseline = args
+    result = calculate_stepped_wedge(*args)
+    k = result["clusters_per_step"]
+
+    achieved = power_stepped_wedge(alpha, np.array([k - 1, k]), m, icc, sd, delta, steps, *baseline)
+    assert achieved[1] >= power > achieved[0]
+
+
+def test_search_beyond_the_old_fixed_range():
+    result = calculate_stepped_wedge(0.05, 0.9, 1.0, 0.02, 5, 0.2, 3)
+    assert result["clusters_per_step"] > 1000
+
+
+def test_unreachable_target_raises():
+    with pytest.raises(ValueError, match="not reached"):
+        calculate_stepped_wedge(0.05, 0.8, 1.0, 0.001, 2, 0.5, 2, max_clusters_per_step=1000)
+
+
+def test_single_step_is_rejected():
+    with pytest.raises(ValueError, match="2 steps"):
+        calculate_stepped_wedge(0.05, 0.8, 1.0, 0.3, 10, 0.05, 1)
+
+
+@pytest.mark.parametrize("k, steps, baseline, m, icc", [
+    (2, 4, 1, 10, 0.05),
+    (3, 3, 2, 25, 0.2),
+    (1, 6, 1, 5, 0.01)
+])
+def test_hussey_hughes_matches_generalized_least_squares(k, steps, baseline, m, icc):
+    # Cluster-period means Y_ij = β_j + θ X_ij + a_i + e_ij with
+    # Var(a_i) = τ², Var(e_ij) = σ²/m; Var(θ̂) from the full GLS fit
+    T = steps + baseline
+    sd = 1.0
+    tau2 = icc * sd ** 2
+    sigma2 = (1 - icc) * sd ** 2 / m
+
+    first_treated = np.repeat(np.arange(steps) + baseline, k)
+    X = (np.arange(T)[None, :] >= first_treated[:, None]).astype(float)
+
+    V_inv = np.linalg.inv(sigma2 * np.eye(T) + tau2 * np.ones((T, T)))
+    info = np.zeros((T + 1, T + 1))
+    for row in X:
+        Z = np.column_stack([np.eye(T), row])
+        info += Z.T @ V_inv @ Z
+
+    gls_variance = np.linalg.inv(info)[-1, -1]
+
+    delta = 0.3
+    expected = stats.norm.cdf(delta / np.sqrt(gls_variance) - stats.norm.ppf(0.975))
+    result = power_stepped_wedge(0.05, k, m, icc, sd, delta, steps, baseline)
+
+    assert result == pytest.approx(expected, rel=1e-10)
@@ -0,0 +1,56 @@
+
+# ==========================================
+# Two proportions — method comparison
+# ==========================================
+
+import numpy as np
+import pytest
+from scipy import optimize
+
+from calculators.binary.two_proportions import (
+    exact_power_two_proportions,
+    restricted_mle,
+    two_proportions_methods
+)
+
+
+@pytest.mark.parametrize("h, cohen", [(0.5, 63), (0.8, 25)])
+def test_arcsine_matches_cohen_table(h, cohen):
+    # Cohen (1988), Table 6.4.1: n per group for effect size h,
+    # two-sided α = 0.05, 80% power
+    p2 = 0.5
+    p1 = np.sin((2 * np.arcsin(np.sqrt(p2)) + h) / 2) ** 2
+
+    table = two_proportions_methods(0.05, 0.8, p1, p2, methods=("arcsine",))
+    assert table["n_group1"]["arcsine"] == cohen
+
+
+def test_fleiss_and_casagrande_pike_agree_for_equal_groups():
+    p1, p2 = np.meshgrid([0.1, 0.3, 0.6], [0.2, 0.45, 0.8])
+    table = two_proportions_methods(0.05, 0.8, p1, p2)
+    assert np.array_equal(table["n_group1"]["fleiss_cc"], table["n_group1"]["casagrande_pike"])
+
+
+@pytest.mark.parametrize("p1, p2", [(0.3, 0.2), (0.15, 0.3), (0.6, 0.4)])
+def test_continuity_corrected_n_reaches_exact_power(p1, p2):
+    # The corrected n is planned for the corrected chi-square test
+    n = int(two_proportions_methods(0.05, 0.8, p1, p2)["n_group1"]["fleiss_cc"])
+    assert abs(exact_power_two_proportions(0.05, n, n, p1, p2, "fleiss_cc") - 0.8) < 0.01
+
+
+@pytest.mark.parametrize("p1, p2, r, d", [(0.7, 0.6, 1.0, -0.1), (0.4, 0.5, 2.0, 0.05), (0.2, 0.25, 0.5, -0.15)])
+def test_restricted_mle_maximizes_constrained_likelihood(p1, p2, r, d):
+    # Farrington & Manning (1990): maximize the likelihood subject to
+    # p̃1 − p̃2 = d, with observed proportions p1, p2 and n2 = r n1
+    def negative_log_likelihood(t2):
+        t1 = t2 + d
+        return -(p1 * np.log(t1) + (1 - p1) * np.log(1 - t1)
+                 + r * (p2 * np.log(t2) + (1 - p2) * np.log(1 - t2)))
+
+    bounds = (max(0, -d) + 1e-12, min(1, 1 - d) - 1e-12)
+    t2 = optimize.minimize_scalar(negative_log_likelihood, bounds=bounds, method="bounded",
+                                  options={"xatol": 1e-12}).x
+
+    t1_hat, t2_hat = restricted_mle(p1, p2, r, d)
+    assert t2_hat == pytest.approx(t2, abs=1e-7)
+    assert t1_hat == pytest.approx(t2 + d, abs=1e-7)
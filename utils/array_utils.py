@@ -0,0 +1,54 @@
+
+# ==========================================
+# ClinSample AI — Array Utilities
+# ==========================================
+
+import numpy as np
+
+
+def as_float_array(x) -> np.ndarray:
+    """
+    Converts scalar or array-like input to a float ndarray.
+    """
+    return np.asarray(x, dtype=float)
+
+
+def outer_grid(*axes):
+    """
+    Expands 1-D parameter axes into an outer-product grid.
+
+    Returns one broadcastable array per axis, each shaped so that
+    combining them yields shape (len(axis_1), len(axis_2), ...).
+    """
+    arrays = [np.atleast_1d(as_float_array(a)) for a in axes]
+    return np.ix_(*arrays)
+
+
+def search_min_n(is_enough, lo, hi):
+    """
+    Vectorized search for the smallest integer n in [lo, hi]
+    such that is_enough(n) is True.
+
+    is_enough must be monotone in n and accept an integer ndarray,
+    returning a boolean ndarray of the same shape.
+    Entries that are not satisfied at hi are returned as -1.
+    """
+    lo = np.asarray(lo, dtype=np.int64)
+    hi = np.asarray(hi, dtype=np.int64)
+    lo, hi = np.broadcast_arrays(lo, hi)
+    lo = lo.copy()
+    hi = hi.copy()
+
+    reachable = np.asarray(is_enough(hi), dtype=bool)
+
+    # Bisection: invariant is_enough(hi) is True, answer in [lo, hi]
+    while True:
+        active = reachable & (lo < hi)
+        if not active.any():
+            break
+        mid = (lo + hi) // 2
+        ok = np.asarray(is_enough(mid), dtype=bool)
+        hi = np.where(active & ok, mid, hi)
+        lo = np.where(active & ~ok, mid + 1, lo)
+
+    return np.where(reachable, hi, -1)
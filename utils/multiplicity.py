@@ -0,0 +1,253 @@
+
+# ==========================================
+# ClinSample AI — Multiplicity Adjustments
+# ==========================================
+
+from functools import lru_cache
+
+import numpy as np
+from scipy.optimize import brentq
+from scipy.special import ndtr, ndtri
+
+from utils.quadrature import gauss_hermite
+
+
+METHODS = ("none", "bonferroni", "holm", "dunnett", "coprimary")
+
+# Sobol points per evaluation (2^m); the estimate is deterministic
+_QMC_LOG2_POINTS = 14
+
+
+@lru_cache(maxsize=None)
+def qmc_points(dim: int, log2_points: int = _QMC_LOG2_POINTS):
+    """
+    Scrambled Sobol points in [0, 1)^dim, cached per dimension with a
+    fixed seed so repeated probabilities are reproducible (read-only).
+    """
+    from scipy.stats import qmc
+
+    pts = qmc.Sobol(dim, scramble=True, seed=20240601).random_base2(log2_points)
+    pts.flags.writeable = False
+    return pts
+
+
+def mvn_probability(lower, upper, corr, log2_points: int = _QMC_LOG2_POINTS):
+    """
+    P(lower < Z < upper) for Z ~ N(0, corr), by Genz's separation of
+    variables with cached quasi-Monte Carlo points.
+
+    lower and upper have shape (..., K) (±inf allowed); the batch
+    dimensions are evaluated together.
+    """
+
+    corr = np.asarray(corr, dtype=float)
+    K = corr.shape[0]
+    L = np.linalg.cholesky(corr)
+
+    a = np.asarray(lower, dtype=float)
+    b = np.asarray(upper, dtype=float)
+    a, b = np.broadcast_arrays(a, b)
+
+    if K == 1:
+        return ndtr(b[..., 0]) - ndtr(a[..., 0])
+
+    w = qmc_points(K - 1, log2_points)
+
+    a = a[..., None, :]
+    b = b[..., None, :]
+
+    d = ndtr(a[..., 0] / L[0, 0])
+    e = ndtr(b[..., 0] / L[0, 0])
+    f = e - d
+
+    y = np.zeros(np.broadcast_shapes(a.shape[:-1], (w.shape[0],)) + (K - 1,))
+
+    for i in range(1, K):
+        u = d + w[:, i - 1] * (e - d)
+        y[..., i - 1] = ndtri(np.clip(u, 1e-16, 1 - 1e-16))
+
+        shift = y[..., :i] @ L[i, :i]
+        d = ndtr((a[..., i] - shift) / L[i, i])
+        e = ndtr((b[..., i] - shift) / L[i, i])
+        f = f * (e - d)
+
+    return f.mean(axis=-1)
+
+
+def equicorrelated(n: int, rho: float) -> np.ndarray:
+    """
+    n × n correlation matrix with common off-diagonal rho.
+    """
+    return np.full((n, n), rho) + (1 - rho) * np.eye(n)
+
+
+def dunnett_correlation(control_ratio: float = 1.0) -> float:
+    """
+    Correlation between two treatment-vs-control statistics sharing
+    the control arm: rho = 1 / (1 + r), r = n_control / n_treatment.
+    """
+    return 1 / (1 + control_ratio)
+
+
+@lru_cache(maxsize=256)
+def dunnett_critical_value(
+    alpha: float,
+    n_comparisons: int,
+    rho: float = 0.5,
+    two_sided: bool = True,
+    n_nodes: int = 64
+) -> float:
+    """
+    Large-sample Dunnett critical value c with
+    P(max_i Z_i ≤ c) = 1 − alpha (|Z_i| if two-sided) for k
+    equicorrelated statistics.
+
+    Conditioning on the shared component U reduces the k-variate
+    normal probability to one Gauss–Hermite integral:
+    Z_i = √ρ U + √(1−ρ) E_i.
+    """
+
+    u, w = gauss_hermite(n_nodes)
+    s, t = np.sqrt(rho), np.sqrt(1 - rho)
+
+    def coverage(c):
+        upper = ndtr((c - s * u) / t)
+        if two_sided:
+            upper = upper - ndtr((-c - s * u) / t)
+        return (w * upper ** n_comparisons).sum() - (1 - alpha)
+
+    a = alpha / 2 if two_sided else alpha
+    lo = -ndtri(a)
+    hi = -ndtri(a / n_comparisons)
+
+    return brentq(coverage, lo - 1e-9, hi + 1e-9)
+
+
+@lru_cache(maxsize=256)
+def _coprimary_marginal_power(power: float, corr: tuple) -> float:
+    """
+    Per-endpoint power π with P(all endpoints significant) = power
+    when every endpoint has marginal power π: Φ_K(z_π, ..., z_π; R) = power.
+    """
+
+    R = np.array(corr)
+    K = R.shape[0]
+
+    if K == 1:
+        return power
+
+    def joint(z):
+        return float(mvn_probability(np.full(K, -np.inf), np.full(K, z), R)) - power
+
+    lo = ndtri(power)
+    hi = ndtri(power ** (1 / K))
+
+    return float(ndtr(brentq(joint, lo - 1e-9, hi + 1e-9, xtol=1e-7)))
+
+
+def coprimary_marginal_power(power: float, n_endpoints: int, corr=0.0) -> float:
+    """
+    Marginal power each of K co-primary endpoints must reach so that
+    all K succeed jointly with the target power.
+
+    corr = common correlation between endpoint statistics, or a
+           K × K correlation matrix. Conservative when endpoints have
+           unequal effects (size on the largest n).
+    """
+
+    if np.ndim(corr) == 0:
+        R = equicorrelated(n_endpoints, float(corr))
+    else:
+        R = np.asarray(corr, dtype=float)
+
+    return _coprimary_marginal_power(float(power), tuple(map(tuple, R)))
+
+
+def holm_alphas(alpha: float, n_comparisons: int) -> np.ndarray:
+    """
+    Holm step-down levels alpha / k, alpha / (k − 1), ..., alpha.
+    """
+    return alpha / np.arange(n_comparisons, 0, -1)
+
+
+def adjusted_alpha(
+    alpha: float,
+    method: str = "none",
+    n_comparisons: int = 1,
+    two_sided: bool = True,
+    rho: float = 0.5
+) -> float:
+    """
+    Per-comparison alpha to pass to a calculator.
+
+    bonferroni / holm: alpha / k (Holm plans at its first, strictest step)
+    dunnett: level whose z critical value equals the Dunnett value
+             for k arms vs a shared control (correlation rho)
+    coprimary / none: alpha (each endpoint is tested at full alpha)
+    """
+
+    if method not in METHODS:
+        raise ValueError(f"Method must be one of {METHODS}.")
+
+    if n_comparisons < 1:
+        raise ValueError("Number of comparisons must be at least 1.")
+
+    if method in ("bonferroni", "holm"):
+        return alpha / n_comparisons
+
+    if method == "dunnett":
+        c = dunnett_critical_value(float(alpha), int(n_comparisons), float(rho), bool(two_sided))
+        tail = float(ndtr(-c))
+        return 2 * tail if two_sided else tail
+
+    return alpha
+
+
+def adjusted_power(
+    power: float,
+    method: str = "none",
+    n_endpoints: int = 1,
+    corr=0.0
+) -> float:
+    """
+    Per-endpoint power to pass to a calculator (co-primary endpoints);
+    other methods leave power unchanged.
+    """
+
+    if method == "coprimary":
+        return coprimary_marginal_power(power, n_endpoints, corr)
+
+    return power
+
+
+def plan_with_multiplicity(
+    calculator,
+    alpha: float,
+    power: float,
+    scenarios,
+    method: str = "bonferroni",
+    n_comparisons: int = 1,
+    two_sided: bool = True,
+    rho: float = 0.5,
+    corr=0.0
+) -> dict:
+    """
+    Runs a calculator over a batch of scenarios (one kwargs dict per
+    comparison or endpoint) at the adjusted alpha and power.
+
+    The adjusted levels are computed once for the whole batch.
+    For co-primary endpoints, n_comparisons is the number of endpoints
+    and the design size is the largest requirement across them.
+    """
+
+    a = adjusted_alpha(alpha, method, n_comparisons, two_sided, rho)
+    p = adjusted_power(power, method, n_comparisons, corr)
+
+    results = [calculator(alpha=a, power=p, **kw) for kw in scenarios]
+
+    return {
+        "adjusted_alpha": a,
+        "adjusted_power": p,
+        "method": method,
+        "results": results
+    }
@@ -0,0 +1,151 @@
+
+# ==========================================
+# ClinSample AI — Inverse Normal (AS241)
+# ==========================================
+
+import math
+
+
+NORM_PPF_METHODS = ("as241",)
+
+# Used by norm_ppf (and so z_alpha / z_beta) unless a method is passed;
+# fixed rather than chosen from what happens to be imported, so the same
+# call always returns the same value.
+NORM_PPF_METHOD = "as241"
+
+# Wichura (1988), Algorithm AS241 PPND16: rational approximations
+# accurate to about 1e-16 relative error.
+# Central region |p − 0.5| ≤ 0.425: r = 0.180625 − q², z = q·A(r)/B(r)
+_A = (
+    3.3871328727963666080e0, 1.3314166789178437745e2,
+    1.9715909503065514427e3, 1.3731693765509461125e4,
+    4.5921953931549871457e4, 6.7265770927008700853e4,
+    3.3430575583588128105e4, 2.5090809287301226727e3
+)
+_B = (
+    1.0, 4.2313330701600911252e1,
+    6.8718700749205790830e2, 5.3941960214247511077e3,
+    2.1213794301586595867e4, 3.9307895800092710610e4,
+    2.8729085735721942674e4, 5.2264952788528545610e3
+)
+
+# Intermediate tail, r = √(−ln min(p, 1 − p)) ≤ 5: z = C(r − 1.6)/D(r − 1.6)
+_C = (
+    1.42343711074968357734e0, 4.63033784615654529590e0,
+    5.76949722146069140550e0, 3.64784832476320460504e0,
+    1.27045825245236838258e0, 2.41780725177450611770e-1,
+    2.27238449892691845833e-2, 7.74545014278341407640e-4
+)
+_D = (
+    1.0, 2.05319162663775882187e0,
+    1.67638483018380384940e0, 6.89767334985100004550e-1,
+    1.48103976427480074590e-1, 1.51986665636164571966e-2,
+    5.47593808499534494600e-4, 1.05075007164441684324e-9
+)
+
+# Far tail, r > 5: z = E(r − 5)/F(r − 5)
+_E = (
+    6.65790464350110377720e0, 5.46378491116411436990e0,
+    1.78482653991729133580e0, 2.96560571828504891230e-1,
+    2.65321895265761230930e-2, 1.24266094738807843860e-3,
+    2.71155556874348757815e-5, 2.01033439929228813265e-7
+)
+_F = (
+    1.0, 5.99832206555887937690e-1,
+    1.36929880922735805310e-1, 1.48753612908506148525e-2,
+    7.86869131145613259100e-4, 1.84631831751005468180e-5,
+    1.42151175831644588870e-7, 2.04426310338993978564e-15
+)
+
+
+def _poly(coef, x):
+    """
+    Horner evaluation of coef[0] + coef[1] x + ... (scalar or array).
+    """
+    result = coef[-1]
+    for c in coef[-2::-1]:
+        result = result * x + c
+    return result
+
+
+def ndtri_scalar(p: float) -> float:
+    """
+    Standard normal quantile Φ⁻¹(p) with the standard library only.
+    Returns ±inf at p = 0 / 1.
+    """
+
+    p = float(p)
+
+    if not 0.0 <= p <= 1.0:
+        raise ValueError("Probability must be between 0 and 1.")
+
+    q = p - 0.5
+
+    if abs(q) <= 0.425:
+        r = 0.180625 - q * q
+        return q * _poly(_A, r) / _poly(_B, r)
+
+    r = p if q < 0 else 1.0 - p
+
+    if r == 0.0:
+        return math.copysign(math.inf, q)
+
+    r = math.sqrt(-math.log(r))
+
+    if r <= 5.0:
+        z = _poly(_C, r - 1.6) / _poly(_D, r - 1.6)
+    else:
+        z = _poly(_E, r - 5.0) / _poly(_F, r - 5.0)
+
+    return -z if q < 0 else z
+
+
+def ndtri_array(p):
+    """
+    Vectorized AS241 (NumPy only, no scipy). Returns ±inf at p = 0 / 1
+    and nan outside [0, 1].
+    """
+
+    import numpy as np
+
+    p = np.asarray(p, dtype=float)
+    q = p - 0.5
+
+    central = np.abs(q) <= 0.425
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = 0.180625 - q * q
+        z_central = q * _poly(_A, r) / _poly(_B, r)
+
+        s = np.sqrt(-np.log(np.where(q < 0, p, 1.0 - p)))
+        z_tail = np.where(
+            s <= 5.0,
+            _poly(_C, s - 1.6) / _poly(_D, s - 1.6),
+            _poly(_E, s - 5.0) / _poly(_F, s - 5.0)
+        )
+
+    z = np.where(central, z_central, np.where(q < 0, -z_tail, z_tail))
+    z = np.where(p == 0, -np.inf, np.where(p == 1, np.inf, z))
+    z = np.where((p >= 0) & (p <= 1), z, np.nan)
+
+    return z[()] if z.ndim == 0 else z
+
+
+def norm_ppf(p, method: str = None):
+    """
+    Standard normal quantile, scalar or array.
+
+    method = "as241" (default, NORM_PPF_METHOD): AS241 with the
+             standard library (scalars) or NumPy (arrays), so
+             lightweight callers never import scipy
+    """
+
+    method = NORM_PPF_METHOD if method is None else method
+
+    if method not in NORM_PPF_METHODS:
+        raise ValueError(f"Method must be one of {NORM_PPF_METHODS}.")
+
+    if isinstance(p, (int, float)):
+        return ndtri_scalar(p)
+
+    return ndtri_array(p)
@@ -0,0 +1,53 @@
+
+# ==========================================
+# ClinSample AI — Cached Quadrature Rules
+# ==========================================
+
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def gauss_legendre(n_nodes: int = 64):
+    """
+    Gauss–Legendre nodes and weights on [-1, 1].
+
+    Cached per node count; arrays are read-only so they can be
+    shared safely between callers.
+    """
+    x, w = np.polynomial.legendre.leggauss(n_nodes)
+    x.flags.writeable = False
+    w.flags.writeable = False
+    return x, w
+
+
+def integrate_interval(f, lower, upper, n_nodes: int = 64):
+    """
+    Vectorized Gauss–Legendre integral of f over [lower, upper].
+
+    lower and upper may be arrays; f receives an array with one
+    trailing node axis and must return values of the same shape.
+    """
+    x, w = gauss_legendre(n_nodes)
+
+    lower = np.asarray(lower, dtype=float)[..., None]
+    upper = np.asarray(upper, dtype=float)[..., None]
+
+    half = (upper - lower) / 2
+    nodes = lower + half * (x + 1)
+
+    return (f(nodes) * w * half).sum(axis=-1)
+
+
+@lru_cache(maxsize=None)
+def gauss_hermite(n_nodes: int = 64):
+    """
+    Gauss–Hermite nodes and weights for a standard normal density
+    (weights sum to 1), cached and read-only.
+    """
+    x, w = np.polynomial.hermite_e.hermegauss(n_nodes)
+    w = w / w.sum()
+    x.flags.writeable = False
+    w.flags.writeable = False
+    return x, w
@@ -4,7 +4,11 @@
 # ==========================================
 
 import math
-from scipy.stats import norm
+
+# Normal quantiles come from the standard-library AS241 routine
+# (normal_quantile.NORM_PPF_METHOD), so the closed-form calculators run
+# without importing numpy or scipy
+from utils.normal_quantile import norm_ppf
 
 
 def z_alpha(alpha: float, two_sided: bool = True) -> float:
@@ -12,15 +16,15 @@ def z_alpha(alpha: float, two_sided: bool = True) -> float:
     Returns Z critical value for given alpha.
     """
     if two_sided:
-        return norm.ppf(1 - alpha/2)
-    return norm.ppf(1 - alpha)
+        return norm_ppf(1 - alpha/2)
+    return norm_ppf(1 - alpha)
 
 
 def z_beta(power: float) -> float:
     """
     Returns Z value corresponding to desired power (1 - beta).
     """
-    return norm.ppf(power)
+    return norm_ppf(power)
 
 
 def ceil_int(x: float) -> int: